@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Measure the cold import time of the ADF Lambda handlers.
+
+Every handler is imported in a fresh Python process that runs with
+`python -X importtime`. The cumulative import time of the handler module is
+reported, the fastest of the repeated imports is used to reduce the noise.
+
+The import time of every handler and the budget it should stay within are
+stored in the import_time_baseline.json file. The script exits with exit
+code 1 when a handler exceeds its budget. The unit tests in
+src/lambda_codebase/tests compare the handlers against the same budgets.
+After an intended change, record a new baseline with the --output option.
+The budget of every handler is set to twice its measured import time,
+rounded up to the next 100 milliseconds, to leave room for slower machines.
+
+Usage:
+    import_time.py [--handler <name>]... [--repeat <count>]
+            [--output <path>]
+
+    import_time.py -h | --help
+
+Options:
+    --handler <name>
+                Only measure the given handler(s). Defaults to all handlers.
+
+    --repeat <count>
+                The number of times every handler is imported, the fastest
+                import is reported. [default: 3]
+
+    --output <path>
+                The path to write the baseline to. When omitted, the
+                results are compared against the budgets of the baseline.
+
+    -h, --help  Show this help message.
+"""
+
+import json
+import logging
+import math
+import os
+import platform
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from docopt import docopt
+
+from scenarios import ADF_BUILD, BENCHMARK_ENVIRONMENT, REPOSITORY_ROOT
+
+LOGGER = logging.getLogger("benchmarks")
+BASELINE_PATH = Path(__file__).resolve().parent / "import_time_baseline.json"
+LAMBDA_CODEBASE = REPOSITORY_ROOT / "src/lambda_codebase"
+HANDLERS = {
+    **{
+        f"account_processing.{module}": (
+            LAMBDA_CODEBASE / "account_processing",
+            module,
+        )
+        for module in [
+            "configure_account_alias",
+            "configure_account_ou",
+            "configure_account_regions",
+            "configure_account_tags",
+            "create_account",
+            "delete_default_vpc",
+            "get_account_regions",
+            "process_account_files",
+            "register_account_for_support",
+        ]
+    },
+    "jump_role_manager.main": (LAMBDA_CODEBASE / "jump_role_manager", "main"),
+}
+BUDGET_FACTOR = 2
+BUDGET_GRANULARITY_MS = 100
+# Only the AWS API calls need to be traced, the AWS X-Ray SDK should not
+# patch any of the other libraries it supports.
+TRACED_LIBRARIES = ["botocore"]
+IMPORT_TIME_PATTERN = re.compile(
+    r"^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| (?P<module>\S+)$",
+)
+PROBE = """
+import {module}
+import json
+import sys
+boto3 = sys.modules.get("boto3")
+print(json.dumps({{
+    "boto3_default_session": bool(boto3 and boto3.DEFAULT_SESSION),
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+
+def _import_once(handler):
+    directory, module = HANDLERS[handler]
+    environment = {
+        **os.environ,
+        **BENCHMARK_ENVIRONMENT,
+        "PYTHONPATH": os.pathsep.join([
+            str(directory),
+            str(ADF_BUILD / "shared/python"),
+        ]),
+    }
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        capture_output=True,
+        check=True,
+        cwd=directory,
+        env=environment,
+        text=True,
+    )
+    cumulative_us = next(
+        int(match.group("cumulative"))
+        for match in map(IMPORT_TIME_PATTERN.match, process.stderr.splitlines())
+        if match and match.group("module") == module
+    )
+    return cumulative_us / 1000, json.loads(process.stdout.splitlines()[-1])
+
+
+def measure_import_time(handler, repeat):
+    """
+    Import the handler `repeat` times, each time in a new Python process.
+
+    Returns:
+        dict: The fastest import time in milliseconds, whether a boto3
+            client or resource was created at import time, and the
+            libraries that the AWS X-Ray SDK patched.
+    """
+    import_times = []
+    probe = {}
+    for _ in range(repeat):
+        import_time_ms, probe = _import_once(handler)
+        import_times.append(import_time_ms)
+    return {
+        "import_time_ms": round(min(import_times), 1),
+        "creates_clients_at_import": probe["boto3_default_session"],
+        "traced_libraries": sorted(
+            module.split(".")[2]
+            for module in probe["modules"]
+            if re.match(r"^aws_xray_sdk\.ext\.[^.]+\.patch$", module)
+        ),
+    }
+
+
+def compare_to_budgets(baseline, results):
+    """
+    Compare the measured import times against the budgets of the baseline.
+
+    Returns:
+        list[str]: The handlers that exceeded their budget, empty if none.
+    """
+    violations = []
+    for handler, result in results.items():
+        budget_ms = baseline["handlers"][handler]["budget_ms"]
+        if result["import_time_ms"] > budget_ms:
+            violations.append(
+                f"{handler}: import took {result['import_time_ms']}ms, "
+                f"the budget is {budget_ms}ms"
+            )
+        if result["creates_clients_at_import"]:
+            violations.append(
+                f"{handler}: creates boto3 clients at import time"
+            )
+        if result["traced_libraries"] != TRACED_LIBRARIES:
+            violations.append(
+                f"{handler}: patches {result['traced_libraries']} for "
+                f"tracing instead of {TRACED_LIBRARIES}"
+            )
+    return violations
+
+
+def create_baseline(results):
+    return {
+        "python_version": platform.python_version(),
+        "handlers": {
+            handler: {
+                "import_time_ms": result["import_time_ms"],
+                "budget_ms": math.ceil(
+                    result["import_time_ms"]
+                    * BUDGET_FACTOR
+                    / BUDGET_GRANULARITY_MS
+                ) * BUDGET_GRANULARITY_MS,
+            }
+            for handler, result in sorted(results.items())
+        },
+    }
+
+
+def main():
+    """Main function to measure the import times"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    options = docopt(__doc__)
+
+    handlers = options["--handler"] or list(HANDLERS)
+    unknown_handlers = set(handlers) - set(HANDLERS)
+    if unknown_handlers:
+        LOGGER.error("Unknown handler(s): %s", sorted(unknown_handlers))
+        sys.exit(2)
+
+    results = {}
+    for handler in handlers:
+        results[handler] = measure_import_time(handler, int(options["--repeat"]))
+        LOGGER.info(
+            "Importing %s took %.1fms",
+            handler,
+            results[handler]["import_time_ms"],
+        )
+
+    if options["--output"]:
+        with open(options["--output"], mode="w", encoding="utf-8") as output:
+            json.dump(create_baseline(results), output, indent=2)
+            output.write("\n")
+        LOGGER.info("Wrote the import time baseline to %s", options["--output"])
+        return
+
+    with open(BASELINE_PATH, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    violations = compare_to_budgets(baseline, results)
+    for violation in violations:
+        LOGGER.error("Over budget: %s", violation)
+    if violations:
+        sys.exit(1)
+    LOGGER.info("All handlers are within their import time budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Compare the deployment map validation of the schema library against the
+compiled validator.
+
+A synthetic deployment map is generated with the given number of
+pipelines, using every source, build, and deploy provider that ADF
+supports. The map is validated by the schema library, as ADF did before,
+and by `SchemaValidation`, which uses the compiled validator. The fastest
+of the repeated runs is reported. The time it takes to compile the schema
+once per process is reported separately.
+
+The script exits with exit code 1 if the validated maps are not the same.
+
+Usage:
+    map_validation.py [--pipelines <count>] [--repeat <count>]
+            [--output <path>]
+
+    map_validation.py -h | --help
+
+Options:
+    --pipelines <count>
+                The number of pipelines in the deployment map.
+                [default: 1000]
+
+    --repeat <count>
+                The number of times the map is validated by either
+                validator, the fastest run is reported. [default: 3]
+
+    --output <path>
+                The path to write the JSON report to, if any.
+
+    -h, --help  Show this help message.
+"""
+
+import copy
+import json
+import logging
+import platform
+import sys
+import time
+
+from docopt import docopt
+
+import scenarios
+
+LOGGER = logging.getLogger("benchmarks")
+REPORT_VERSION = 1
+ACCOUNT_ID = "111111111111"
+DEFAULT_PROVIDERS = [
+    {
+        "source": {
+            "provider": "codecommit",
+            "properties": {"account_id": ACCOUNT_ID},
+        },
+        "build": {
+            "provider": "codebuild",
+            "properties": {"image": "STANDARD_7_0"},
+        },
+        "deploy": {
+            "provider": "codebuild",
+            "properties": {"image": "STANDARD_7_0"},
+        },
+    },
+    {
+        "source": {
+            "provider": "codeconnections",
+            "properties": {
+                "repository": "some-repository",
+                "owner": "some-owner",
+                "codeconnections_param_path": "/adf/some-connection",
+            },
+        },
+        "build": {
+            "provider": "codebuild",
+            "properties": {"image": "STANDARD_7_0"},
+        },
+        "deploy": {
+            "provider": "cloudformation",
+            "properties": {"action": "replace_on_failure"},
+        },
+    },
+    {
+        "source": {
+            "provider": "s3",
+            "properties": {
+                "account_id": ACCOUNT_ID,
+                "bucket_name": "some-bucket",
+                "object_key": "some-object.zip",
+            },
+        },
+        "build": {
+            "provider": "jenkins",
+            "properties": {
+                "project_name": "some-project",
+                "server_url": "https://jenkins.example.com",
+                "provider_name": "some-provider",
+            },
+        },
+        "deploy": {
+            "provider": "s3",
+            "properties": {
+                "bucket_name": "some-bucket",
+                "object_key": "some-object.zip",
+            },
+        },
+    },
+    {
+        "source": {
+            "provider": "codecommit",
+            "properties": {"account_id": ACCOUNT_ID},
+        },
+        "build": {"enabled": False},
+        "deploy": {
+            "provider": "lambda",
+            "properties": {"function_name": "some-function"},
+        },
+    },
+    {
+        "source": {
+            "provider": "codecommit",
+            "properties": {"account_id": ACCOUNT_ID},
+        },
+        "build": {
+            "provider": "codebuild",
+            "properties": {"image": "STANDARD_7_0", "size": "medium"},
+        },
+        "deploy": {
+            "provider": "service_catalog",
+            "properties": {"product_id": "prod-some-product"},
+        },
+    },
+    {
+        "source": {
+            "provider": "codecommit",
+            "properties": {"account_id": ACCOUNT_ID},
+        },
+        "build": {"enabled": False},
+        "deploy": {
+            "provider": "codedeploy",
+            "properties": {
+                "application_name": "some-application",
+                "deployment_group_name": "some-group",
+            },
+        },
+    },
+]
+TARGETS = [
+    "/banking/testing",
+    222222222222,
+    {"path": "/banking/production", "wave": {"size": 20}},
+    {"tags": {"team": "banking", "environment": "production"}},
+    {"name": "approve", "provider": "approval", "properties": {
+        "message": "Approve the deployment to production",
+    }},
+    {
+        "path": ["/banking/production", "/banking/staging"],
+        "regions": ["eu-west-1", "us-east-1"],
+        "exclude": ["333333333333"],
+    },
+    {"target": 444444444444, "properties": {
+        "template_filename": "template.yml",
+        "param_filename": "params.json",
+    }},
+]
+
+
+def synthetic_deployment_map(pipelines):
+    """
+    Returns:
+        dict: A deployment map with the given number of pipelines.
+    """
+    return {
+        "x-anchors": {"owner": "benchmark"},
+        "pipelines": [
+            {
+                "name": f"benchmark-{index}",
+                "default_providers": copy.deepcopy(
+                    DEFAULT_PROVIDERS[index % len(DEFAULT_PROVIDERS)],
+                ),
+                "params": {
+                    "notification_endpoint": "team@example.com",
+                    "restart_execution_on_update": index % 2 == 0,
+                },
+                "tags": {"owner": "benchmark"},
+                "regions": "eu-west-1",
+                "targets": copy.deepcopy(
+                    TARGETS[:1 + index % len(TARGETS)],
+                ),
+            }
+            for index in range(pipelines)
+        ],
+    }
+
+
+def _fastest(validate, map_input, repeat):
+    durations = []
+    validated = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        validated = validate(map_input)
+        durations.append(time.perf_counter() - start)
+    return round(min(durations), 4), validated
+
+
+def measure_map_validation(pipelines, repeat):
+    """
+    Validate a synthetic deployment map with the schema library and with
+    the compiled validator.
+
+    Returns:
+        dict: The report of the validation durations.
+    """
+    scenarios.configure_environment()
+    # pylint: disable=import-outside-toplevel
+    from schema import Schema
+    import schema_validation
+
+    map_input = synthetic_deployment_map(pipelines)
+
+    start = time.perf_counter()
+    schema_validation.compiled_top_level_schema()
+    compile_seconds = round(time.perf_counter() - start, 4)
+
+    schema_seconds, schema_validated = _fastest(
+        Schema(schema_validation.TOP_LEVEL_SCHEMA).validate,
+        map_input,
+        repeat,
+    )
+    compiled_seconds, compiled_validated = _fastest(
+        lambda map_input: schema_validation.SchemaValidation(
+            map_input,
+        ).validated,
+        map_input,
+        repeat,
+    )
+    return {
+        "report_version": REPORT_VERSION,
+        "python_version": platform.python_version(),
+        "pipelines": pipelines,
+        "repeat": repeat,
+        "schema_seconds": schema_seconds,
+        "compile_seconds": compile_seconds,
+        "compiled_seconds": compiled_seconds,
+        "speedup": round(schema_seconds / max(compiled_seconds, 1e-6), 1),
+        "same_result": schema_validated == compiled_validated,
+    }
+
+
+def main():
+    """Main function to compare the map validation durations"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    options = docopt(__doc__)
+
+    report = measure_map_validation(
+        int(options["--pipelines"]),
+        int(options["--repeat"]),
+    )
+    LOGGER.info(
+        "Validating %d pipelines took %.3fs with the schema library and "
+        "%.3fs with the compiled validator (%.1fx), compiling took %.3fs",
+        report["pipelines"],
+        report["schema_seconds"],
+        report["compiled_seconds"],
+        report["speedup"],
+        report["compile_seconds"],
+    )
+    if options["--output"]:
+        with open(options["--output"], mode="w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        LOGGER.info("Wrote the map validation report to %s", options["--output"])
+    if not report["same_result"]:
+        LOGGER.error("The validated maps are not the same")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
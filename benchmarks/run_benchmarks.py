@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Run the ADF benchmarks against a synthetic organization.
+
+Every scenario runs inside a fresh moto mock, such that no AWS account is
+required. The duration of every run and the number of AWS API calls per
+service and operation are written to a JSON report. When a baseline report
+is passed, the results are compared against it, and the script exits with
+a non-zero exit code if any scenario regressed beyond the threshold.
+
+Usage:
+    run_benchmarks.py [--accounts <count>] [--depth <levels>]
+            [--fanout <count>] [--region <region>]... [--pipelines <count>]
+            [--files <count>] [--repeat <count>] [--scenario <name>]...
+            [--output <path>] [--baseline <path>] [--threshold <ratio>]
+
+    run_benchmarks.py -h | --help
+
+Options:
+    --accounts <count>
+                The number of member accounts in the organization.
+                [default: 20]
+
+    --depth <levels>
+                The number of nested organizational unit levels.
+                [default: 2]
+
+    --fanout <count>
+                The number of child organizational units of every
+                organizational unit. [default: 3]
+
+    --region <region>
+                The regions to bootstrap and deploy to. The first region is
+                the deployment account region. Defaults to eu-central-1 and
+                eu-west-1.
+
+    --pipelines <count>
+                The number of pipelines in the deployment map. [default: 10]
+
+    --files <count>
+                The number of files to sync to S3. [default: 100]
+
+    --repeat <count>
+                The number of times every scenario runs, the median duration
+                is reported. [default: 3]
+
+    --scenario <name>
+                Only run the given scenario(s). Defaults to all scenarios:
+                bootstrap_worker_thread, generate_pipeline_inputs,
+                target_resolution, create_parameter_files, sync_to_s3, and
+                clean_pipelines.
+
+    --output <path>
+                The path to write the JSON report to.
+                [default: benchmark-report.json]
+
+    --baseline <path>
+                The path of a previous JSON report to compare against.
+
+    --threshold <ratio>
+                The relative increase in the median duration or the number of
+                API calls of a scenario that is tolerated when comparing
+                against the baseline. [default: 0.25]
+
+    -h, --help  Show this help message.
+
+Examples:
+    Record a baseline:
+
+        $ python run_benchmarks.py --output baseline.json
+
+    Compare a change against that baseline:
+
+        $ python run_benchmarks.py --baseline baseline.json
+"""
+
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import boto3
+from docopt import docopt
+from moto import mock_aws
+
+import scenarios
+from synthetic_org import OrganizationSpec, build_organization
+
+LOGGER = logging.getLogger("benchmarks")
+REPORT_VERSION = 1
+
+
+def _count_api_calls(recorder):
+    return {
+        f"{service}.{operation}": summary["Calls"]
+        for service, operation, summary in sorted(recorder.summarize())
+    }
+
+
+def run_scenario(name, spec, repeat, recorder):
+    """
+    Run the given scenario `repeat` times, every time against a freshly
+    built synthetic organization.
+
+    Returns:
+        dict: The scenario results, as stored in the report.
+    """
+    durations = []
+    api_calls = {}
+    for _ in range(repeat):
+        with mock_aws(), tempfile.TemporaryDirectory() as workdir:
+            # Moto replaces the default boto3 session while it is active
+            # pylint: disable=protected-access
+            recorder.instrument(boto3._get_default_session())
+            organization = build_organization(spec)
+            measured = scenarios.SCENARIOS[name](organization, workdir)
+            recorder.reset()
+            start = time.perf_counter()
+            measured()
+            durations.append(time.perf_counter() - start)
+            api_calls = _count_api_calls(recorder)
+    return {
+        "duration_seconds": {
+            "median": round(statistics.median(durations), 4),
+            "min": round(min(durations), 4),
+            "max": round(max(durations), 4),
+        },
+        "api_calls": sum(api_calls.values()),
+        "api_calls_per_operation": api_calls,
+    }
+
+
+def run_benchmarks(spec, scenario_names, repeat):
+    """
+    Run the given scenarios and return the report.
+    """
+    scenarios.configure_environment()
+    # pylint: disable=import-outside-toplevel
+    import instrumentation
+    recorder = instrumentation.enable()
+
+    results = {}
+    for name in scenario_names:
+        LOGGER.info("Running scenario %s", name)
+        results[name] = run_scenario(name, spec, repeat, recorder)
+        LOGGER.info(
+            "Scenario %s took %.3fs (median) with %d API calls",
+            name,
+            results[name]["duration_seconds"]["median"],
+            results[name]["api_calls"],
+        )
+    return {
+        "report_version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python_version": platform.python_version(),
+        "organization": spec.to_dict(),
+        "repeat": repeat,
+        "scenarios": results,
+    }
+
+
+def _exceeds(baseline_value, current_value, threshold):
+    if not baseline_value:
+        return current_value > 0
+    return current_value > baseline_value * (1 + threshold)
+
+
+def compare_reports(baseline, current, threshold):
+    """
+    Compare the current report against the baseline report.
+
+    Returns:
+        list[str]: The regressions that were found, empty if none.
+    """
+    regressions = []
+    if baseline.get("organization") != current.get("organization"):
+        LOGGER.warning(
+            "The baseline was recorded with a different organization: %s, "
+            "the comparison might not be meaningful",
+            baseline.get("organization"),
+        )
+    for name, result in current["scenarios"].items():
+        baseline_result = baseline["scenarios"].get(name)
+        if baseline_result is None:
+            LOGGER.info("Scenario %s is not part of the baseline", name)
+            continue
+        baseline_duration = baseline_result["duration_seconds"]["median"]
+        current_duration = result["duration_seconds"]["median"]
+        if _exceeds(baseline_duration, current_duration, threshold):
+            regressions.append(
+                f"{name}: median duration increased from "
+                f"{baseline_duration}s to {current_duration}s"
+            )
+        if _exceeds(
+            baseline_result["api_calls"],
+            result["api_calls"],
+            threshold,
+        ):
+            regressions.append(
+                f"{name}: API calls increased from "
+                f"{baseline_result['api_calls']} to {result['api_calls']}"
+            )
+    return regressions
+
+
+def main():
+    """Main function to run the benchmarks"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("botocore").setLevel(logging.WARNING)
+    options = docopt(__doc__)
+
+    scenario_names = options["--scenario"] or list(scenarios.SCENARIOS)
+    unknown_scenarios = set(scenario_names) - set(scenarios.SCENARIOS)
+    if unknown_scenarios:
+        LOGGER.error("Unknown scenario(s): %s", sorted(unknown_scenarios))
+        sys.exit(2)
+
+    spec = OrganizationSpec(
+        accounts=int(options["--accounts"]),
+        depth=int(options["--depth"]),
+        fanout=int(options["--fanout"]),
+        pipelines=int(options["--pipelines"]),
+        files=int(options["--files"]),
+    )
+    if options["--region"]:
+        spec.regions = options["--region"]
+
+    report = run_benchmarks(spec, scenario_names, int(options["--repeat"]))
+    with open(options["--output"], mode="w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    LOGGER.info("Wrote the benchmark report to %s", options["--output"])
+
+    if options["--baseline"]:
+        with open(options["--baseline"], encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_reports(
+            baseline,
+            report,
+            float(options["--threshold"]),
+        )
+        for regression in regressions:
+            LOGGER.error("Regression: %s", regression)
+        if regressions:
+            sys.exit(1)
+        LOGGER.info("No regressions found compared to the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Benchmark scenarios that exercise the ADF hot paths against a synthetic
+organization.
+
+Every scenario is a function that accepts the synthetic organization and a
+working directory. It prepares the required state and returns the callable
+that is measured. Only the API calls made by that callable are counted.
+
+The ADF modules read their configuration from environment variables at
+import time. Hence, the scenarios import them lazily, and
+`configure_environment` should be called before the first scenario runs.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import boto3
+
+from synthetic_org import (
+    BOOTSTRAP_BUCKET,
+    CROSS_ACCOUNT_ACCESS_ROLE,
+    DEPLOYMENT_REGION,
+    MANAGEMENT_ACCOUNT_ID,
+    PIPELINE_BUCKET,
+    SHARED_MODULES_BUCKET,
+    TEAM_TAG_KEY,
+    TEAMS,
+    create_s3_client,
+    create_tagging_client,
+)
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+BOOTSTRAP_REPOSITORY = (
+    REPOSITORY_ROOT
+    / "src/lambda_codebase/initial_commit/bootstrap_repository"
+)
+ADF_BUILD = BOOTSTRAP_REPOSITORY / "adf-build"
+MODULE_PATHS = [
+    ADF_BUILD / "shared/python",
+    ADF_BUILD,
+    ADF_BUILD / "shared",
+    ADF_BUILD / "shared/helpers",
+    ADF_BUILD / "shared/cdk",
+    (
+        BOOTSTRAP_REPOSITORY
+        / "adf-bootstrap/deployment/lambda_codebase/pipeline_management"
+    ),
+]
+BENCHMARK_ENVIRONMENT = {
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+    "AWS_REGION": DEPLOYMENT_REGION,
+    "AWS_DEFAULT_REGION": DEPLOYMENT_REGION,
+    "ACCOUNT_ID": MANAGEMENT_ACCOUNT_ID,
+    "MANAGEMENT_ACCOUNT_ID": MANAGEMENT_ACCOUNT_ID,
+    "ORGANIZATION_ID": "o-benchmark",
+    "ADF_VERSION": "benchmark",
+    "ADF_LOG_LEVEL": "CRITICAL",
+    "ADF_PIPELINE_PREFIX": "adf-pipeline-",
+    "ADF_PROJECT_NAME": "benchmark",
+    "S3_BUCKET": BOOTSTRAP_BUCKET,
+    "S3_BUCKET_NAME": BOOTSTRAP_BUCKET,
+    "PIPELINE_DEFINITION_BUCKET_NAME": PIPELINE_BUCKET,
+    "SHARED_MODULES_BUCKET": SHARED_MODULES_BUCKET,
+}
+ADF_CONFIG = """
+roles:
+  cross-account-access: {role}
+regions:
+  deployment-account: {deployment_region}
+  targets:
+{target_regions}
+config:
+  main-notification-endpoint:
+    - type: email
+      target: benchmark@example.com
+  moves:
+    - name: to-root
+      action: safe
+"""
+
+
+def configure_environment():
+    """
+    Set the environment variables and module search paths that the ADF
+    modules require. This needs to happen before the first ADF module
+    is imported.
+    """
+    for key, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ[key] = value
+    for path in reversed(MODULE_PATHS):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+
+
+def _leaf_targets(organization):
+    return [
+        {
+            "path": path,
+            "regions": organization.spec.regions,
+        }
+        for path in organization.populated_ou_paths
+    ]
+
+
+def _pipeline_definitions(organization):
+    member_account_ids = organization.member_account_ids
+    return [
+        {
+            "name": f"benchmark-{index}",
+            "default_providers": {
+                "source": {
+                    "provider": "codecommit",
+                    "properties": {
+                        "account_id": member_account_ids[0],
+                    },
+                },
+            },
+            "targets": [
+                *_leaf_targets(organization),
+                {"tags": {TEAM_TAG_KEY: TEAMS[index % len(TEAMS)]}},
+                member_account_ids[index % len(member_account_ids)],
+            ],
+        }
+        for index in range(organization.spec.pipelines)
+    ]
+
+
+def _create_organizations(organization):
+    # pylint: disable=import-outside-toplevel
+    from organizations import Organizations
+    return Organizations(
+        org_client=boto3.client("organizations", region_name="us-east-1"),
+        tagging_client=create_tagging_client(organization),
+    )
+
+
+def bootstrap_worker_thread(organization, workdir):
+    """
+    Update the base stacks of every member account, using a thread per
+    account like main.py does.
+    """
+    # pylint: disable=import-outside-toplevel
+    import main
+    from bootstrap_templates import BootstrapTemplateIndex
+    from cache import Cache
+    from config import Config
+    from s3 import S3
+    from sts import STS
+    from thread import PropagatingThread
+
+    config_path = Path(workdir) / "adfconfig.yml"
+    config_path.write_text(
+        ADF_CONFIG.format(
+            role=CROSS_ACCOUNT_ACCESS_ROLE,
+            deployment_region=DEPLOYMENT_REGION,
+            target_regions="\n".join(
+                f"    - {region}"
+                for region in organization.spec.regions
+            ),
+        ),
+        encoding="utf-8",
+    )
+    config = Config(config_path=str(config_path))
+    kms_and_bucket_dict = {
+        region: {
+            "kms": f"arn:aws:kms:{region}:111111111111:key/benchmark",
+            "s3_regional_bucket": f"adf-benchmark-regional-{region}",
+        }
+        for region in config.sorted_regions()
+    }
+    s3 = S3(region=DEPLOYMENT_REGION, bucket=BOOTSTRAP_BUCKET)
+    cache = Cache()
+    sts = STS()
+
+    def run():
+        template_index = BootstrapTemplateIndex(s3)
+        threads = []
+        for account_id in organization.member_account_ids:
+            thread = PropagatingThread(
+                target=main.worker_thread,
+                args=(
+                    account_id,
+                    organization.deployment_account_id,
+                    sts,
+                    config,
+                    s3,
+                    template_index,
+                    cache,
+                    kms_and_bucket_dict,
+                ),
+            )
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+    return run
+
+
+def generate_pipeline_inputs(organization, _workdir):
+    """
+    Generate the pipeline inputs of every pipeline in the deployment map.
+    """
+    # pylint: disable=import-outside-toplevel
+    import generate_pipeline_inputs as pipeline_inputs
+    from parameter_store import ParameterStore
+
+    parameter_store = ParameterStore(DEPLOYMENT_REGION, boto3)
+    organizations = _create_organizations(organization)
+    pipelines = _pipeline_definitions(organization)
+
+    def run():
+        for pipeline in pipelines:
+            pipeline_inputs.generate_pipeline_inputs(
+                pipeline,
+                "S3",
+                organizations,
+                parameter_store,
+            )
+
+    return run
+
+
+def target_resolution(organization, _workdir):
+    """
+    Resolve the accounts of every leaf OU path, account id, and tag target.
+    """
+    # pylint: disable=import-outside-toplevel
+    from target import Target, TargetStructure
+
+    organizations = _create_organizations(organization)
+    targets = [
+        *_leaf_targets(organization),
+        *[
+            {"path": account_id}
+            for account_id in organization.member_account_ids
+        ],
+        *[
+            {"tags": {TEAM_TAG_KEY: team}}
+            for team in TEAMS
+        ],
+    ]
+
+    def run():
+        for target in targets:
+            target_structure = TargetStructure(target)
+            for step in target_structure.target:
+                for path_or_tag in [
+                    *step.get("path", []),
+                    *([step["tags"]] if step.get("tags") else []),
+                ]:
+                    Target(
+                        path_or_tag,
+                        target_structure,
+                        organizations,
+                        step,
+                    ).fetch_accounts_for_target()
+
+    return run
+
+
+def create_parameter_files(organization, workdir):
+    """
+    Generate the parameter files of every pipeline, where every target
+    resolves a value from Parameter Store.
+    """
+    # pylint: disable=import-outside-toplevel
+    from generate_params import Parameters
+    from parameter_store import ParameterStore
+    from pipeline_definition import store_definition
+    from s3 import S3
+
+    s3_client = boto3.client("s3", region_name=DEPLOYMENT_REGION)
+    s3_client.create_bucket(
+        Bucket=PIPELINE_BUCKET,
+        CreateBucketConfiguration={"LocationConstraint": DEPLOYMENT_REGION},
+    )
+    wave_targets = [
+        {
+            "id": account_id,
+            "name": f"member-{account_id}",
+            "path": path,
+            "regions": organization.spec.regions,
+        }
+        for account_id, path in sorted(organization.account_paths.items())
+        if path != "/deployment"
+    ]
+    directories = []
+    for index in range(organization.spec.pipelines):
+        name = f"benchmark-{index}"
+        store_definition(
+            s3_client,
+            PIPELINE_BUCKET,
+            {
+                "pipeline_input": {
+                    "name": name,
+                    "environments": {
+                        "targets": [[wave_targets]],
+                    },
+                },
+            },
+        )
+        directory = Path(workdir) / name
+        (directory / "params").mkdir(parents=True)
+        (directory / "params/global.json").write_text(
+            json.dumps({
+                "Parameters": {
+                    "SharedModulesBucket": "resolve:/adf/shared_modules_bucket",
+                    "Pipeline": name,
+                },
+                "Tags": {"Pipeline": name},
+            }),
+            encoding="utf-8",
+        )
+        directories.append((name, str(directory)))
+
+    parameter_store = ParameterStore(DEPLOYMENT_REGION, boto3)
+    definition_s3 = S3(DEPLOYMENT_REGION, PIPELINE_BUCKET)
+
+    def run():
+        for name, directory in directories:
+            Parameters(
+                name,
+                parameter_store,
+                definition_s3,
+                directory=directory,
+            ).create_parameter_files()
+
+    return run
+
+
+def sync_to_s3(organization, workdir):
+    """
+    Sync a directory of templates to S3, after a tenth of the files changed
+    and another tenth got removed since the previous sync.
+    """
+    # pylint: disable=import-outside-toplevel
+    import sync_to_s3 as sync
+
+    s3_client = create_s3_client()
+    s3_client.create_bucket(
+        Bucket=SHARED_MODULES_BUCKET,
+        CreateBucketConfiguration={"LocationConstraint": DEPLOYMENT_REGION},
+    )
+    source = Path(workdir) / "templates"
+    files = [
+        source / f"team-{index % len(TEAMS)}" / f"template-{index}.yml"
+        for index in range(organization.spec.files)
+    ]
+    for file_path in files:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(
+            f"Description: {file_path.name}\n",
+            encoding="utf-8",
+        )
+    sync_arguments = {
+        "s3_client": s3_client,
+        "local_path": str(source),
+        "file_extensions": [".yml"],
+        "s3_url": f"s3://{SHARED_MODULES_BUCKET}/templates",
+        "recursive": True,
+        "delete": True,
+        "metadata_to_check": {
+            "always_apply": {"adf_version": "benchmark"},
+            "upon_upload_apply": {},
+        },
+        "force": False,
+    }
+    sync.sync_files(**sync_arguments)
+
+    changed_files = max(len(files) // 10, 1)
+    for file_path in files[:changed_files]:
+        file_path.write_text(
+            f"Description: {file_path.name} changed\n",
+            encoding="utf-8",
+        )
+    for file_path in files[-changed_files:]:
+        file_path.unlink()
+
+    def run():
+        sync.sync_files(**sync_arguments)
+
+    return run
+
+
+class _DeploymentMap:
+    """
+    Stand-in for the DeploymentMap class, holding the parsed map contents.
+    """
+
+    def __init__(self, pipelines):
+        self.map_contents = {"pipelines": pipelines}
+
+
+def clean_pipelines(organization, _workdir):
+    """
+    Clean up the parameters and stacks of the pipelines that were removed
+    from the deployment map, being half of the pipelines.
+    """
+    # pylint: disable=import-outside-toplevel
+    import clean_pipelines as cleaner
+    from parameter_store import ParameterStore
+
+    parameter_store = ParameterStore(DEPLOYMENT_REGION, boto3)
+    cloudformation_client = boto3.client(
+        "cloudformation",
+        region_name=DEPLOYMENT_REGION,
+    )
+    pipelines = _pipeline_definitions(organization)
+    for pipeline in pipelines:
+        parameter_store.put_parameter(
+            f"deployment/S3/{pipeline['name']}/regions",
+            str(organization.spec.regions),
+        )
+        cloudformation_client.create_stack(
+            StackName=f"adf-pipeline-{pipeline['name']}",
+            TemplateBody=json.dumps({
+                "Resources": {
+                    "Topic": {"Type": "AWS::SNS::Topic"},
+                },
+            }),
+        )
+    deployment_map = _DeploymentMap(pipelines[::2])
+
+    def run():
+        cleaner.clean(parameter_store, deployment_map)
+
+    return run
+
+
+SCENARIOS = {
+    "bootstrap_worker_thread": bootstrap_worker_thread,
+    "generate_pipeline_inputs": generate_pipeline_inputs,
+    "target_resolution": target_resolution,
+    "create_parameter_files": create_parameter_files,
+    "sync_to_s3": sync_to_s3,
+    "clean_pipelines": clean_pipelines,
+}
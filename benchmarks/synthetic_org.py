@@ -0,0 +1,371 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Builds a synthetic AWS Organization inside the moto mock, such that the
+ADF code paths can be exercised against an organization of a known size.
+
+The organization consists of:
+  - The management account, which hosts the bootstrap templates bucket.
+  - A `/deployment` organizational unit holding the deployment account.
+  - A tree of organizational units, `depth` levels deep, where every
+    organizational unit has `fanout` child organizational units.
+  - `accounts` member accounts, spread evenly across the leaf
+    organizational units. Every account is tagged with a `team` tag.
+"""
+
+import json
+from dataclasses import dataclass, field
+from itertools import cycle
+from typing import Dict, List
+
+import boto3
+from botocore.awsrequest import AWSResponse
+from moto.cloudformation import models as cloudformation_models
+from moto.cloudformation.responses import CloudFormationResponse
+from moto.core.responses import ActionResult
+
+
+MANAGEMENT_ACCOUNT_ID = "123456789012"
+DEPLOYMENT_REGION = "eu-central-1"
+BOOTSTRAP_BUCKET = "adf-benchmark-bootstrap-templates"
+SHARED_MODULES_BUCKET = "adf-benchmark-shared-modules"
+PIPELINE_BUCKET = "adf-benchmark-pipelines"
+CROSS_ACCOUNT_ACCESS_ROLE = "OrganizationAccountAccessRole"
+TEAM_TAG_KEY = "team"
+TEAMS = ["alpha", "beta", "gamma"]
+
+BASE_TEMPLATE = {
+    "AWSTemplateFormatVersion": "2010-09-09",
+    "Description": "ADF benchmark base stack",
+    "Resources": {
+        "Topic": {
+            "Type": "AWS::SNS::Topic",
+        },
+    },
+}
+DEPLOYMENT_REGIONAL_TEMPLATE = {
+    **BASE_TEMPLATE,
+    "Outputs": {
+        "DeploymentFrameworkRegionalKMSKey": {
+            "Value": "arn:aws:kms:eu-central-1:111111111111:key/benchmark",
+        },
+        "DeploymentFrameworkRegionalS3Bucket": {
+            "Value": "adf-benchmark-regional-bucket",
+        },
+    },
+}
+
+
+@dataclass
+class OrganizationSpec:
+    """
+    The shape of the synthetic organization to build, and the size of
+    the workload that the benchmark scenarios generate for it.
+    """
+    accounts: int = 20
+    depth: int = 2
+    fanout: int = 3
+    regions: List[str] = field(
+        default_factory=lambda: [DEPLOYMENT_REGION, "eu-west-1"],
+    )
+    # Number of pipelines in the deployment map
+    pipelines: int = 10
+    # Number of files to sync to S3
+    files: int = 100
+
+    def to_dict(self):
+        return {
+            "accounts": self.accounts,
+            "depth": self.depth,
+            "fanout": self.fanout,
+            "regions": self.regions,
+            "pipelines": self.pipelines,
+            "files": self.files,
+        }
+
+
+@dataclass
+class SyntheticOrganization:
+    """
+    The synthetic organization that was built.
+    """
+    spec: OrganizationSpec
+    organization_id: str
+    root_id: str
+    deployment_account_id: str
+    # Maps the OU path, like /unit-0/unit-0-1, to the OU id
+    ou_paths: Dict[str, str] = field(default_factory=dict)
+    # Maps the account id to its OU path
+    account_paths: Dict[str, str] = field(default_factory=dict)
+    # Maps the account id to its tags
+    account_tags: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    @property
+    def leaf_ou_paths(self):
+        return sorted(
+            path for path in self.ou_paths
+            if path != "/deployment"
+            and path.count("/") == self.spec.depth
+        )
+
+    @property
+    def populated_ou_paths(self):
+        return sorted(
+            set(self.account_paths.values()) - set(["/deployment"]),
+        )
+
+    @property
+    def member_account_ids(self):
+        return sorted(
+            account_id for account_id, path in self.account_paths.items()
+            if path != "/deployment"
+        )
+
+
+def _update_termination_protection(self):
+    stack = self.cloudformation_backend.get_stack(self._get_param("StackName"))
+    stack.enable_termination_protection = self._get_bool_param(
+        "EnableTerminationProtection",
+        False,
+    )
+    return ActionResult({"StackId": stack.stack_id})
+
+
+def install_moto_extensions():
+    """
+    Add the API operations that ADF relies on, but moto does not implement.
+
+    Also skip the cfn-lint run that moto performs on ValidateTemplate.
+    It takes more than half a second per call, which would otherwise
+    dominate the measured durations.
+    """
+    cloudformation_models.validate_template_cfn_lint = lambda _template: []
+    if not hasattr(CloudFormationResponse, "update_termination_protection"):
+        CloudFormationResponse.update_termination_protection = (
+            _update_termination_protection
+        )
+
+
+def create_tagging_client(organization):
+    """
+    Create a Resource Groups Tagging API client that is able to find the
+    tagged accounts of the synthetic organization.
+
+    Moto does not return AWS Organizations resources via the Resource
+    Groups Tagging API. Hence, the GetResources calls that filter on the
+    organizations resource type are answered from the synthetic
+    organization instead. The calls still count as API calls.
+    """
+    client = boto3.client("resourcegroupstaggingapi", region_name="us-east-1")
+
+    def get_organization_resources(params, **_kwargs):
+        # The params hold the serialized request here
+        params = json.loads(params["body"])
+        if params.get("ResourceTypeFilters") != ["organizations"]:
+            return None
+        resources = [
+            {
+                "ResourceARN": (
+                    f"arn:aws:organizations::{MANAGEMENT_ACCOUNT_ID}:account/"
+                    f"{organization.organization_id}/{account_id}"
+                ),
+                "Tags": [
+                    {"Key": key, "Value": value}
+                    for key, value in tags.items()
+                ],
+            }
+            for account_id, tags in sorted(organization.account_tags.items())
+            if all(
+                tags.get(tag_filter["Key"]) in tag_filter["Values"]
+                for tag_filter in params.get("TagFilters", [])
+            )
+        ]
+        return (
+            AWSResponse(None, 200, {}, None),
+            {
+                "ResourceTagMappingList": resources,
+                "PaginationToken": "",
+            },
+        )
+
+    client.meta.events.register(
+        "before-call.resource-groups-tagging-api.GetResources",
+        get_organization_resources,
+    )
+    return client
+
+
+def create_s3_client():
+    """
+    Create an S3 client that returns the user-defined object metadata keys
+    as they were stored.
+
+    Moto replaces the underscores in metadata keys with dashes, which
+    would make the sync_to_s3 helper upload every file on every sync.
+    """
+    client = boto3.client("s3", region_name=DEPLOYMENT_REGION)
+
+    def restore_metadata_keys(parsed, **_kwargs):
+        if "Metadata" in parsed:
+            parsed["Metadata"] = {
+                key.replace("-", "_"): value
+                for key, value in parsed["Metadata"].items()
+            }
+
+    client.meta.events.register(
+        "after-call.s3.HeadObject",
+        restore_metadata_keys,
+    )
+    return client
+
+
+def _create_account(org_client, name):
+    response = org_client.create_account(
+        Email=f"{name}@example.com",
+        AccountName=name,
+    )
+    return response["CreateAccountStatus"]["AccountId"]
+
+
+def _create_ou_tree(org_client, parent_id, parent_path, depth, fanout):
+    ou_paths = {}
+    if depth == 0:
+        return ou_paths
+    for index in range(fanout):
+        # OU names should not start with `ou-`, as ADF would treat
+        # those as OU ids.
+        name = f"{parent_path.replace('/', '-').strip('-') or 'unit'}-{index}"
+        ou_id = org_client.create_organizational_unit(
+            ParentId=parent_id,
+            Name=name,
+        )["OrganizationalUnit"]["Id"]
+        path = f"{parent_path}/{name}"
+        ou_paths[path] = ou_id
+        ou_paths.update(
+            _create_ou_tree(org_client, ou_id, path, depth - 1, fanout),
+        )
+    return ou_paths
+
+
+def _upload_bootstrap_templates(s3_client, organization):
+    s3_client.create_bucket(
+        Bucket=BOOTSTRAP_BUCKET,
+        CreateBucketConfiguration={"LocationConstraint": DEPLOYMENT_REGION},
+    )
+    objects = {
+        "adf-bootstrap/global.yml": BASE_TEMPLATE,
+        "adf-bootstrap/regional.yml": BASE_TEMPLATE,
+        "adf-bootstrap/global-iam.yml": BASE_TEMPLATE,
+        "adf-bootstrap/deployment/global.yml": DEPLOYMENT_REGIONAL_TEMPLATE,
+        "adf-bootstrap/deployment/regional.yml": DEPLOYMENT_REGIONAL_TEMPLATE,
+    }
+    # Give every other leaf OU its own regional template, such that both
+    # the direct hit and the fall back to the parent OU are exercised.
+    for path in organization.leaf_ou_paths[::2]:
+        objects[f"adf-bootstrap{path}/regional.yml"] = BASE_TEMPLATE
+    # An empty parameter file for the global stacks of all accounts
+    objects["adf-bootstrap/global-params.json"] = []
+    for key, body in objects.items():
+        s3_client.put_object(
+            Bucket=BOOTSTRAP_BUCKET,
+            Key=key,
+            Body=json.dumps(body).encode("utf-8"),
+        )
+
+
+def _put_deployment_parameters(spec):
+    for region in spec.regions:
+        ssm_client = boto3.client("ssm", region_name=region)
+        parameters = {
+            f"/adf/cross_region/s3_regional_bucket/{region}": (
+                f"adf-benchmark-regional-{region}"
+            ),
+            f"/adf/cross_region/kms_arn/{region}": (
+                f"arn:aws:kms:{region}:111111111111:key/benchmark"
+            ),
+            "/adf/deployment_maps/allow_empty_target": "disabled",
+        }
+        if region == DEPLOYMENT_REGION:
+            parameters.update({
+                "/adf/shared_modules_bucket": SHARED_MODULES_BUCKET,
+                "/adf/scm/default_scm_branch": "main",
+                "/adf/scm/default_scm_codecommit_account_id": (
+                    "111111111111"
+                ),
+            })
+        for name, value in parameters.items():
+            ssm_client.put_parameter(
+                Name=name,
+                Value=value,
+                Type="String",
+                Overwrite=True,
+            )
+
+
+def build_organization(spec: OrganizationSpec) -> SyntheticOrganization:
+    """
+    Build the synthetic organization in the active moto mock.
+
+    Args:
+        spec (OrganizationSpec): The shape of the organization to build.
+
+    Returns:
+        SyntheticOrganization: The organization that was built.
+    """
+    install_moto_extensions()
+    org_client = boto3.client("organizations", region_name="us-east-1")
+    organization_id = org_client.create_organization(
+        FeatureSet="ALL",
+    )["Organization"]["Id"]
+    root_id = org_client.list_roots()["Roots"][0]["Id"]
+
+    ou_paths = {
+        "/deployment": org_client.create_organizational_unit(
+            ParentId=root_id,
+            Name="deployment",
+        )["OrganizationalUnit"]["Id"],
+    }
+    ou_paths.update(
+        _create_ou_tree(org_client, root_id, "", spec.depth, spec.fanout),
+    )
+    organization = SyntheticOrganization(
+        spec=spec,
+        organization_id=organization_id,
+        root_id=root_id,
+        deployment_account_id=_create_account(org_client, "deployment"),
+        ou_paths=ou_paths,
+    )
+    org_client.move_account(
+        AccountId=organization.deployment_account_id,
+        SourceParentId=root_id,
+        DestinationParentId=ou_paths["/deployment"],
+    )
+    organization.account_paths[organization.deployment_account_id] = (
+        "/deployment"
+    )
+
+    for index, leaf_path, team in zip(
+        range(spec.accounts),
+        cycle(organization.leaf_ou_paths),
+        cycle(TEAMS),
+    ):
+        account_id = _create_account(org_client, f"member-{index}")
+        org_client.move_account(
+            AccountId=account_id,
+            SourceParentId=root_id,
+            DestinationParentId=ou_paths[leaf_path],
+        )
+        org_client.tag_resource(
+            ResourceId=account_id,
+            Tags=[{"Key": TEAM_TAG_KEY, "Value": team}],
+        )
+        organization.account_paths[account_id] = leaf_path
+        organization.account_tags[account_id] = {TEAM_TAG_KEY: team}
+
+    _upload_bootstrap_templates(
+        boto3.client("s3", region_name=DEPLOYMENT_REGION),
+        organization,
+    )
+    _put_deployment_parameters(spec)
+    return organization
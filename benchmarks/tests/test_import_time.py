@@ -0,0 +1,52 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+
+from pytest import fixture
+
+import import_time
+
+
+@fixture(scope="module")
+def baseline():
+    with open(import_time.BASELINE_PATH, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+
+def test_baseline_covers_all_handlers(baseline):
+    assert sorted(baseline["handlers"]) == sorted(import_time.HANDLERS)
+
+
+def test_compare_to_budgets_reports_violations(baseline):
+    handler = "jump_role_manager.main"
+    budget_ms = baseline["handlers"][handler]["budget_ms"]
+    results = {
+        handler: {
+            "import_time_ms": budget_ms + 1,
+            "creates_clients_at_import": True,
+            "traced_libraries": ["botocore", "requests"],
+        },
+    }
+    assert import_time.compare_to_budgets(baseline, results) == [
+        f"{handler}: import took {budget_ms + 1}ms, the budget is "
+        f"{budget_ms}ms",
+        f"{handler}: creates boto3 clients at import time",
+        f"{handler}: patches ['botocore', 'requests'] for tracing instead "
+        "of ['botocore']",
+    ]
+
+
+def test_create_baseline_rounds_up_budget():
+    baseline = import_time.create_baseline({
+        "jump_role_manager.main": {
+            "import_time_ms": 321.5,
+            "creates_clients_at_import": False,
+            "traced_libraries": ["botocore"],
+        },
+    })
+    assert baseline["handlers"] == {
+        "jump_role_manager.main": {"import_time_ms": 321.5, "budget_ms": 700},
+    }
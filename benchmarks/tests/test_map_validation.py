@@ -0,0 +1,23 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import map_validation
+
+
+def test_synthetic_deployment_map():
+    deployment_map = map_validation.synthetic_deployment_map(20)
+    assert len(deployment_map["pipelines"]) == 20
+    assert {
+        pipeline["default_providers"]["source"]["provider"]
+        for pipeline in deployment_map["pipelines"]
+    } == {"codecommit", "codeconnections", "s3"}
+
+
+def test_measure_map_validation():
+    report = map_validation.measure_map_validation(pipelines=12, repeat=1)
+    assert report["pipelines"] == 12
+    assert report["same_result"]
+    assert report["schema_seconds"] > 0
+    assert report["compiled_seconds"] > 0
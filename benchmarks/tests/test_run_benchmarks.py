@@ -0,0 +1,80 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+from copy import deepcopy
+
+from pytest import fixture
+
+import scenarios
+from run_benchmarks import compare_reports, run_benchmarks
+from synthetic_org import OrganizationSpec
+
+
+@fixture
+def baseline():
+    return {
+        "organization": OrganizationSpec().to_dict(),
+        "scenarios": {
+            "sync_to_s3": {
+                "duration_seconds": {"median": 1.0, "min": 0.9, "max": 1.2},
+                "api_calls": 100,
+                "api_calls_per_operation": {"s3.PutObject": 100},
+            },
+        },
+    }
+
+
+def test_compare_reports_within_threshold(baseline):
+    current = deepcopy(baseline)
+    current["scenarios"]["sync_to_s3"]["duration_seconds"]["median"] = 1.2
+    current["scenarios"]["sync_to_s3"]["api_calls"] = 110
+    assert compare_reports(baseline, current, 0.25) == []
+
+
+def test_compare_reports_regressions(baseline):
+    current = deepcopy(baseline)
+    current["scenarios"]["sync_to_s3"]["duration_seconds"]["median"] = 1.5
+    current["scenarios"]["sync_to_s3"]["api_calls"] = 130
+    assert compare_reports(baseline, current, 0.25) == [
+        "sync_to_s3: median duration increased from 1.0s to 1.5s",
+        "sync_to_s3: API calls increased from 100 to 130",
+    ]
+
+
+def test_compare_reports_ignores_new_scenarios(baseline):
+    current = deepcopy(baseline)
+    current["scenarios"]["clean_pipelines"] = {
+        "duration_seconds": {"median": 5.0, "min": 5.0, "max": 5.0},
+        "api_calls": 10,
+        "api_calls_per_operation": {},
+    }
+    assert compare_reports(baseline, current, 0.25) == []
+
+
+def test_run_benchmarks_on_tiny_organization():
+    spec = OrganizationSpec(
+        accounts=3,
+        depth=1,
+        fanout=2,
+        pipelines=2,
+        files=10,
+    )
+    report = run_benchmarks(spec, list(scenarios.SCENARIOS), repeat=1)
+    assert report["organization"] == spec.to_dict()
+    assert list(report["scenarios"]) == list(scenarios.SCENARIOS)
+    for result in report["scenarios"].values():
+        assert result["api_calls"] > 0
+        assert result["api_calls"] == sum(
+            result["api_calls_per_operation"].values()
+        )
+    sync_calls = report["scenarios"]["sync_to_s3"]["api_calls_per_operation"]
+    # One in ten files changed and another one got removed
+    assert sync_calls["s3.PutObject"] == 1
+    assert sync_calls["s3.DeleteObjects"] == 1
+    clean_calls = (
+        report["scenarios"]["clean_pipelines"]["api_calls_per_operation"]
+    )
+    # One of the two pipelines got removed from the deployment map
+    assert clean_calls["cloudformation.DeleteStack"] == 1
@@ -6,9 +6,17 @@ The Initial step for the Bootstrap process State Machine.
 This determines the event and the details about the account
 that has been moved and starts the creation of the base CloudFormation
 Stack on the target account.
+
+The base stack of the deployment account region is created or updated
+first, such that its outputs exist before the other regions are deployed
+to concurrently. The regions that completed are checkpointed in the
+event, if the time left in this execution is not sufficient to deploy the
+remaining regions, the state machine invokes this function again to resume
+with the unfinished regions only.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from botocore.exceptions import ClientError
@@ -33,6 +41,9 @@ PARTITION = get_partition(REGION_DEFAULT)
 MANAGEMENT_ACCOUNT_ID = os.environ["MANAGEMENT_ACCOUNT_ID"]
 LOGGER = configure_logger(__name__)
 DEPLOY_TIME_IN_MS = 5 * 60 * 1000
+MAX_CONCURRENT_REGIONS = 8
+COMPLETED_REGIONS_KEY = "base_stacks_completed_regions"
+PENDING_KEY = "base_stacks_pending"
 
 
 def configure_generic_account(sts, event, region, role):
@@ -137,6 +148,78 @@ def configure_deployment_account_parameters(event, role):
             parameter_store.put_parameter(key, value)
 
 
+def deploy_base_stacks(event, context, region, cloudformation):
+    """
+    Creates or updates the base stack(s) of the account in the given region.
+
+    Returns:
+        bool: True if the base stack(s) got deployed, False if the time
+            left in this execution is not sufficient to deploy.
+    """
+    if context.get_remaining_time_in_millis() < DEPLOY_TIME_IN_MS:
+        LOGGER.info(
+            "Cannot deploy the base stack in %s %s, as the time available "
+            "for this lambda execution is less than the time required to "
+            "deploy. It will be deployed by the next execution.",
+            event["account_id"],
+            region,
+        )
+        return False
+    LOGGER.info(
+        "Creating/updating base stack in %s %s",
+        event["account_id"],
+        region,
+    )
+    cloudformation.create_stack()
+    if region == event["deployment_account_region"]:
+        cloudformation.create_iam_stack()
+    return True
+
+
+def deploy_regional_base_stacks(event, context, cloudformation_by_region):
+    """
+    Creates or updates the base stacks in the given regions concurrently.
+
+    Returns:
+        set: The regions that got deployed. If any region failed, the
+            first error is raised once all regions finished instead.
+    """
+    completed_regions = set()
+    if not cloudformation_by_region:
+        return completed_regions
+
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_CONCURRENT_REGIONS, len(cloudformation_by_region)),
+    ) as executor:
+        futures = {
+            region: executor.submit(
+                deploy_base_stacks,
+                event,
+                context,
+                region,
+                cloudformation,
+            )
+            for region, cloudformation in cloudformation_by_region.items()
+        }
+
+    first_error = None
+    for region, future in futures.items():
+        error = future.exception()
+        if error:
+            LOGGER.error(
+                "Failed to create/update base stack in %s %s: %s",
+                event["account_id"],
+                region,
+                error,
+            )
+            first_error = first_error or error
+        elif future.result():
+            completed_regions.add(region)
+    if first_error:
+        raise first_error
+    return completed_regions
+
+
 def lambda_handler(event, context):
     try:
         return _lambda_handler(event, context)
@@ -166,52 +249,70 @@ def _lambda_handler(event, context):
         configure_management_account_parameters(event)
         configure_deployment_account_parameters(event, role)
 
-    s3 = S3(
-        region=REGION_DEFAULT,
-        bucket=S3_BUCKET,
-    )
-
-    regions = list(
+    regions = sorted(
         set(
             [event["deployment_account_region"]]
             + event["regions"]
         )
     )
+    completed_regions = set(event.get(COMPLETED_REGIONS_KEY, []))
+    pending_regions = [
+        region for region in regions
+        if region not in completed_regions
+    ]
     LOGGER.debug(
-        "Looping through regions to deploy the base stack in %s, regions: %s",
+        "Deploying the base stack in %s, regions: %s, completed already: %s",
         event["account_id"],
-        regions,
+        pending_regions,
+        sorted(completed_regions),
     )
-    for region in regions:
-        if context.get_remaining_time_in_millis() < DEPLOY_TIME_IN_MS:
-            LOGGER.info(
-                "Cannot deploy another region, as the time available for this "
-                "lambda execution is less than the time required to deploy."
-            )
-            raise GenericAccountConfigureError(
-                'Execution time remaining is not sufficient to deploy '
-                'another region, aborting this execution so it can restart.'
-            )
+    # The clients are created upfront, as creating clients from the
+    # same session is not thread-safe. Every region gets its own S3
+    # helper too, as boto3 resources are not thread-safe either.
+    cloudformation_by_region = {}
+    for region in pending_regions:
         if not event["is_deployment_account"]:
             configure_generic_account(sts, event, region, role)
-        LOGGER.info(
-            "Creating/updating base stack in %s %s",
-            event["account_id"],
-            region,
-        )
-        cloudformation = CloudFormation(
+        cloudformation_by_region[region] = CloudFormation(
             region=region,
             deployment_account_region=event["deployment_account_region"],
             role=role,
             wait=True,
             # Stack name will be automatically defined based on event
             stack_name=None,
-            s3=s3,
+            s3=S3(
+                region=REGION_DEFAULT,
+                bucket=S3_BUCKET,
+            ),
             s3_key_path=event["full_path"],
             account_id=account_id
         )
-        cloudformation.create_stack()
-        if region == event["deployment_account_region"]:
-            cloudformation.create_iam_stack()
 
+    global_cloudformation = cloudformation_by_region.pop(
+        event["deployment_account_region"],
+        None,
+    )
+    if global_cloudformation is None or deploy_base_stacks(
+        event,
+        context,
+        event["deployment_account_region"],
+        global_cloudformation,
+    ):
+        completed_regions.add(event["deployment_account_region"])
+        completed_regions.update(deploy_regional_base_stacks(
+            event,
+            context,
+            cloudformation_by_region,
+        ))
+
+    event[COMPLETED_REGIONS_KEY] = sorted(completed_regions)
+    event[PENDING_KEY] = int(bool(set(regions) - completed_regions))
+    if event[PENDING_KEY]:
+        LOGGER.info(
+            "Deployed the base stack in %s, regions: %s. Regions that will "
+            "be deployed by the next execution: %s",
+            event["account_id"],
+            event[COMPLETED_REGIONS_KEY],
+            sorted(set(regions) - completed_regions),
+        )
     return event
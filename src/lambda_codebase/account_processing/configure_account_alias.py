@@ -3,22 +3,27 @@
 
 """
 Creates or updates an ALIAS for an account
+
+Accepts a single account, or a batch of accounts in the accounts list.
+The jump role is assumed once per invocation.
 """
 
 import os
-
-from aws_xray_sdk.core import patch_all
+from functools import partial
 
 # ADF imports
+from account_batch import get_accounts, process_accounts
+from clients import enable_tracing
 from logger import configure_logger
 from sts import STS
 
-patch_all()
+enable_tracing()
 
 LOGGER = configure_logger(__name__)
 ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME = os.getenv("ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME")
 AWS_PARTITION = os.getenv("AWS_PARTITION")
 MANAGEMENT_ACCOUNT_ID = os.getenv('MANAGEMENT_ACCOUNT_ID')
+ROLE_SESSION_NAME = "adf_account_alias_config"
 
 
 def delete_account_aliases(account, iam_client, current_aliases):
@@ -72,16 +77,16 @@ def ensure_account_has_alias(account, iam_client):
     create_account_alias(account, iam_client)
 
 
-def lambda_handler(event, _):
+def configure_account_alias(sts, jump_role_sts, event):
     if event.get("alias"):
-        sts = STS()
         account_id = event.get("account_id")
         role = sts.assume_bootstrap_deployment_role(
             AWS_PARTITION,
             MANAGEMENT_ACCOUNT_ID,
             account_id,
             ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME,
-            "adf_account_alias_config",
+            ROLE_SESSION_NAME,
+            jump_role_sts=jump_role_sts,
         )
         ensure_account_has_alias(event, role.client("iam"))
     else:
@@ -90,3 +95,18 @@ def lambda_handler(event, _):
             event.get('account_full_name'),
         )
     return event
+
+
+def lambda_handler(event, _):
+    sts = STS()
+    jump_role_sts = None
+    if any(account.get("alias") for account in get_accounts(event)):
+        jump_role_sts = sts.assume_jump_role(
+            AWS_PARTITION,
+            MANAGEMENT_ACCOUNT_ID,
+            ROLE_SESSION_NAME,
+        )
+    return process_accounts(
+        event,
+        partial(configure_account_alias, sts, jump_role_sts),
+    )
@@ -5,14 +5,14 @@
 Moves an account to the specified OU.
 """
 import boto3
-from aws_xray_sdk.core import patch_all
 
 # ADF imports
+from clients import enable_tracing
 from logger import configure_logger
 from organizations import Organizations
 
 
-patch_all()
+enable_tracing()
 LOGGER = configure_logger(__name__)
 
 
@@ -3,16 +3,20 @@
 
 """
 Takes regions that the account is not-opted into and opts into them.
+
+Accepts a single account, or a batch of accounts in the accounts list.
+The target regions and the management account id are looked up once per
+invocation.
 """
 from ast import literal_eval
-
-import boto3
-from aws_xray_sdk.core import patch_all
+from functools import partial
 
 # ADF imports
+from account_batch import process_accounts
+from clients import enable_tracing, get_client
 from logger import configure_logger
 
-patch_all()
+enable_tracing()
 LOGGER = configure_logger(__name__)
 
 
@@ -80,15 +84,17 @@ def enable_regions_for_account(
     return all(regions_enabled.values())
 
 
-def lambda_handler(event, _):
-    desired_regions = []
+def configure_account_regions(
+    account_client,
+    desired_regions,
+    org_root_account_id,
+    event,
+):
     if event.get("regions"):
         LOGGER.info(
             "Account Level Regions is not currently supported."
             "Ignoring these values for now and using SSM only"
         )
-    desired_regions.extend(get_regions_from_ssm(boto3.client("ssm")))
-    org_root_account_id = boto3.client("sts").get_caller_identity().get("Account")
     target_account_id = event.get("account_id")
     LOGGER.info(
         "Target Account Id: %s - This is running in %s. These are the same: %s",
@@ -97,11 +103,26 @@ def lambda_handler(event, _):
         target_account_id == org_root_account_id,
     )
     all_regions_enabled = enable_regions_for_account(
-        boto3.client("account"),
+        account_client,
         target_account_id,
         desired_regions,
         org_root_account_id,
     )
-    event["all_regions_enabled"] = all_regions_enabled
+    return {
+        **event,
+        "all_regions_enabled": all_regions_enabled,
+    }
+
 
-    return event
+def lambda_handler(event, _):
+    desired_regions = get_regions_from_ssm(get_client("ssm"))
+    org_root_account_id = get_client("sts").get_caller_identity().get("Account")
+    return process_accounts(
+        event,
+        partial(
+            configure_account_regions,
+            get_client("account"),
+            desired_regions,
+            org_root_account_id,
+        ),
+    )
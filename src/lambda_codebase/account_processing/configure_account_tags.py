@@ -6,16 +6,18 @@ Creates or adds tags to an account.
 Currently only appends new tags.
 Will not delete tags that aren't
 in the config file.
+
+Accepts a single account, or a batch of accounts in the accounts list.
 """
-import boto3
-from aws_xray_sdk.core import patch_all
+from functools import partial
 
 # ADF imports
+from account_batch import process_accounts
+from clients import enable_tracing, get_client
 from logger import configure_logger
 
-patch_all()
+enable_tracing()
 LOGGER = configure_logger(__name__)
-ORG_CLIENT = boto3.client("organizations")
 
 
 def create_account_tags(account_id, tags, client):
@@ -37,12 +39,12 @@ def create_account_tags(account_id, tags, client):
     client.tag_resource(ResourceId=account_id, Tags=formatted_tags)
 
 
-def lambda_handler(event, _):
+def configure_account_tags(org_client, event):
     if event.get("tags"):
         create_account_tags(
             event.get("account_id"),
             event.get("tags"),
-            ORG_CLIENT,
+            org_client,
         )
     else:
         LOGGER.info(
@@ -50,3 +52,10 @@ def lambda_handler(event, _):
             event.get("account_full_name"),
         )
     return event
+
+
+def lambda_handler(event, _):
+    return process_accounts(
+        event,
+        partial(configure_account_tags, get_client("organizations")),
+    )
@@ -6,13 +6,12 @@ Creates an account within your organization.
 """
 
 import os
-from aws_xray_sdk.core import patch_all
-import boto3
 
 # ADF imports
+from clients import enable_tracing, get_client
 from logger import configure_logger
 
-patch_all()
+enable_tracing()
 
 LOGGER = configure_logger(__name__)
 ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME = os.getenv("ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME")
@@ -43,5 +42,5 @@ def create_account(account, adf_privileged_role_name, org_client):
 
 
 def lambda_handler(event, _):
-    org_client = boto3.client("organizations")
+    org_client = get_client("organizations")
     return create_account(event, ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME, org_client)
@@ -2,19 +2,25 @@
 # SPDX-License-Identifier: MIT-0
 
 """
-Deletes the default VPC in a particular region
+Deletes the default VPC in the given regions.
+
+The regions are processed concurrently, using a single assumed role.
+Both the single region and the regions input are supported.
 """
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from aws_xray_sdk.core import patch_all
 from botocore.exceptions import ClientError
 import tenacity
 
 # ADF imports
+from clients import enable_tracing
 from logger import configure_logger
+from paginator import paginator
 from sts import STS
 
-patch_all()
+enable_tracing()
 
 LOGGER = configure_logger(__name__)
 ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME = os.getenv(
@@ -22,6 +28,8 @@ ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME = os.getenv(
 )
 AWS_PARTITION = os.getenv("AWS_PARTITION")
 MANAGEMENT_ACCOUNT_ID = os.getenv('MANAGEMENT_ACCOUNT_ID')
+MAX_CONCURRENT_REGIONS = 20
+MAX_CONCURRENT_DELETES = 10
 
 
 def assume_role(account_id):
@@ -43,7 +51,9 @@ def assume_role(account_id):
 )
 def find_default_vpc(ec2_client):
     try:
-        vpc_response = ec2_client.describe_vpcs()
+        vpc_response = ec2_client.describe_vpcs(
+            Filters=[{"Name": "is-default", "Values": ["true"]}],
+        )
         for vpc in vpc_response["Vpcs"]:
             if vpc.get("IsDefault", False):
                 return vpc["VpcId"]
@@ -56,51 +66,263 @@ def find_default_vpc(ec2_client):
     return None
 
 
-def delete_default_vpc(ec2_resource, ec2_client, default_vpc_id):
-    vpc = ec2_resource.Vpc(default_vpc_id)
+def _timed_delete(resource_type, resource_id, delete, **kwargs):
+    started_at = time.perf_counter()
+    delete(**kwargs)
+    duration = time.perf_counter() - started_at
+    LOGGER.debug("Deleted %s %s in %.2fs", resource_type, resource_id, duration)
+    return {
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "duration_seconds": round(duration, 3),
+    }
 
-    LOGGER.info("Deleting gateways of VPC %s", default_vpc_id)
-    for gateway in vpc.internet_gateways.all():
-        vpc.detach_internet_gateway(InternetGatewayId=gateway.id)
-        gateway.delete()
 
-    LOGGER.info("Deleting route tables associations of VPC %s", default_vpc_id)
-    for route_table in vpc.route_tables.all():
-        for association in route_table.associations:
-            if not association.main:
-                association.delete()
+def _delete_concurrently(executor, deletes):
+    futures = [
+        executor.submit(
+            _timed_delete,
+            resource_type,
+            resource_id,
+            delete,
+            **kwargs,
+        )
+        for resource_type, resource_id, delete, kwargs in deletes
+    ]
+    return [future.result() for future in futures]
 
-    LOGGER.info("Deleting security groups of VPC %s", default_vpc_id)
-    for security_group in vpc.security_groups.all():
-        if security_group.group_name != "default":
-            security_group.delete()
 
-    LOGGER.info("Deleting subnets and interfaces of VPC %s", default_vpc_id)
-    for subnet in vpc.subnets.all():
-        for interface in subnet.network_interfaces.all():
-            interface.delete()
-        subnet.delete()
+def _delete_internet_gateway(ec2_client, default_vpc_id, gateway_id):
+    ec2_client.detach_internet_gateway(
+        InternetGatewayId=gateway_id,
+        VpcId=default_vpc_id,
+    )
+    ec2_client.delete_internet_gateway(InternetGatewayId=gateway_id)
 
-    LOGGER.info("Deleting default VPC %s", default_vpc_id)
-    ec2_client.delete_vpc(VpcId=default_vpc_id)
 
+def delete_default_vpc(ec2_client, default_vpc_id):
+    """
+    Deletes the default VPC and the resources it depends on.
 
+    The resources are described in bulk, filtered on the VPC id. Resources
+    that do not depend on each other are deleted concurrently. The network
+    interfaces are deleted before the subnets and security groups that
+    they use.
 
-def lambda_handler(event, _):
-    event = event.get("Payload")
-    LOGGER.info("Checking for default VPC: %s", event.get('account_full_name'))
+    Returns:
+        list[dict]: The type, id, and delete duration per deleted resource.
+    """
+    vpc_filter = [{"Name": "vpc-id", "Values": [default_vpc_id]}]
+    gateway_ids = [
+        gateway["InternetGatewayId"]
+        for gateway in paginator(
+            ec2_client.describe_internet_gateways,
+            Filters=[
+                {"Name": "attachment.vpc-id", "Values": [default_vpc_id]},
+            ],
+        )
+    ]
+    association_ids = [
+        association["RouteTableAssociationId"]
+        for route_table in paginator(
+            ec2_client.describe_route_tables,
+            Filters=vpc_filter,
+        )
+        for association in route_table.get("Associations", [])
+        if not association.get("Main")
+    ]
+    security_group_ids = [
+        security_group["GroupId"]
+        for security_group in paginator(
+            ec2_client.describe_security_groups,
+            Filters=vpc_filter,
+        )
+        if security_group["GroupName"] != "default"
+    ]
+    interface_ids = [
+        interface["NetworkInterfaceId"]
+        for interface in paginator(
+            ec2_client.describe_network_interfaces,
+            Filters=vpc_filter,
+        )
+    ]
+    subnet_ids = [
+        subnet["SubnetId"]
+        for subnet in paginator(
+            ec2_client.describe_subnets,
+            Filters=vpc_filter,
+        )
+    ]
 
-    role = assume_role(account_id=event.get("account_id"))
-    ec2_client = role.client("ec2", region_name=event.get("region"))
+    LOGGER.info(
+        "Deleting %d gateways, %d route table associations, "
+        "%d network interfaces, %d subnets, and %d security groups "
+        "of VPC %s",
+        len(gateway_ids),
+        len(association_ids),
+        len(interface_ids),
+        len(subnet_ids),
+        len(security_group_ids),
+        default_vpc_id,
+    )
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DELETES) as executor:
+        timings = _delete_concurrently(executor, [
+            (
+                "internet-gateway",
+                gateway_id,
+                _delete_internet_gateway,
+                {
+                    "ec2_client": ec2_client,
+                    "default_vpc_id": default_vpc_id,
+                    "gateway_id": gateway_id,
+                },
+            )
+            for gateway_id in gateway_ids
+        ] + [
+            (
+                "route-table-association",
+                association_id,
+                ec2_client.disassociate_route_table,
+                {"AssociationId": association_id},
+            )
+            for association_id in association_ids
+        ] + [
+            (
+                "network-interface",
+                interface_id,
+                ec2_client.delete_network_interface,
+                {"NetworkInterfaceId": interface_id},
+            )
+            for interface_id in interface_ids
+        ])
+        timings.extend(_delete_concurrently(executor, [
+            (
+                "subnet",
+                subnet_id,
+                ec2_client.delete_subnet,
+                {"SubnetId": subnet_id},
+            )
+            for subnet_id in subnet_ids
+        ] + [
+            (
+                "security-group",
+                security_group_id,
+                ec2_client.delete_security_group,
+                {"GroupId": security_group_id},
+            )
+            for security_group_id in security_group_ids
+        ]))
+
+    LOGGER.info("Deleting default VPC %s", default_vpc_id)
+    timings.append(_timed_delete(
+        "vpc",
+        default_vpc_id,
+        ec2_client.delete_vpc,
+        VpcId=default_vpc_id,
+    ))
+    return timings
 
+
+def delete_default_vpc_in_region(ec2_client, account_full_name, region):
+    """
+    Finds and deletes the default VPC in the region of the given client.
+
+    Returns:
+        dict: The default VPC id, or None if there was no default VPC,
+            and the timings of the deleted resources.
+    """
     default_vpc_id = find_default_vpc(ec2_client)
-    if default_vpc_id:
+    if not default_vpc_id:
+        return {"vpc_id": None, "timings": []}
+    LOGGER.info(
+        "Default VPC found: %s in %s %s",
+        default_vpc_id,
+        account_full_name,
+        region,
+    )
+    return {
+        "vpc_id": default_vpc_id,
+        "timings": delete_default_vpc(ec2_client, default_vpc_id),
+    }
+
+
+def delete_default_vpcs(ec2_client_by_region, account_full_name):
+    """
+    Deletes the default VPCs in the given regions concurrently.
+
+    Returns:
+        dict: The result of delete_default_vpc_in_region per region. If any
+            region failed, the first error is raised once all regions
+            finished instead.
+    """
+    with ThreadPoolExecutor(
+        max_workers=max(min(MAX_CONCURRENT_REGIONS, len(ec2_client_by_region)), 1),
+    ) as executor:
+        futures = {
+            region: executor.submit(
+                delete_default_vpc_in_region,
+                ec2_client,
+                account_full_name,
+                region,
+            )
+            for region, ec2_client in ec2_client_by_region.items()
+        }
+
+    results = {}
+    first_error = None
+    for region, future in futures.items():
+        error = future.exception()
+        if error:
+            LOGGER.error(
+                "Failed to delete the default VPC of %s in %s: %s",
+                account_full_name,
+                region,
+                error,
+            )
+            first_error = first_error or error
+        else:
+            results[region] = future.result()
+    if first_error:
+        raise first_error
+    return results
+
+
+def lambda_handler(event, _):
+    event = event.get("Payload")
+    regions = (
+        event["regions"] if "regions" in event
+        else [event.get("region")]
+    )
+    if not regions:
         LOGGER.info(
-            "Default VPC found: %s in %s",
-            default_vpc_id,
+            "No regions to check for default VPCs: %s",
             event.get('account_full_name'),
         )
-        ec2_resource = role.resource("ec2", region_name=event.get("region"))
-        delete_default_vpc(ec2_resource, ec2_client, default_vpc_id)
+        return {
+            "Payload": {
+                **event,
+                "deleted_default_vpcs": {},
+            },
+        }
+    LOGGER.info(
+        "Checking for default VPCs: %s in %s",
+        event.get('account_full_name'),
+        regions,
+    )
 
-    return {"Payload": event}
+    role = assume_role(account_id=event.get("account_id"))
+    # Clients are created upfront, as creating clients is not thread-safe.
+    ec2_client_by_region = {
+        region: role.client("ec2", region_name=region)
+        for region in regions
+    }
+    results = delete_default_vpcs(
+        ec2_client_by_region,
+        event.get('account_full_name'),
+    )
+    return {
+        "Payload": {
+            **event,
+            "deleted_default_vpcs": results,
+        },
+    }
@@ -3,16 +3,21 @@
 
 """
 Gets all the default regions for an account.
+
+Accepts a single account, or a batch of accounts in the accounts list.
+The jump role is assumed once per invocation.
 """
 
 import os
-from aws_xray_sdk.core import patch_all
+from functools import partial
 
 # ADF imports
+from account_batch import process_accounts
+from clients import enable_tracing
 from logger import configure_logger
 from sts import STS
 
-patch_all()
+enable_tracing()
 
 LOGGER = configure_logger(__name__)
 ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME = os.getenv(
@@ -20,6 +25,7 @@ ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME = os.getenv(
 )
 AWS_PARTITION = os.getenv("AWS_PARTITION")
 MANAGEMENT_ACCOUNT_ID = os.getenv('MANAGEMENT_ACCOUNT_ID')
+ROLE_SESSION_NAME = "adf_account_get_regions"
 
 
 def get_default_regions_for_account(ec2_client):
@@ -39,16 +45,16 @@ def get_default_regions_for_account(ec2_client):
     return default_regions
 
 
-def lambda_handler(event, _):
+def get_account_regions(sts, jump_role_sts, event):
     LOGGER.info("Fetching Default regions %s", event.get("account_full_name"))
-    sts = STS()
     account_id = event.get("account_id")
     role = sts.assume_bootstrap_deployment_role(
         AWS_PARTITION,
         MANAGEMENT_ACCOUNT_ID,
         account_id,
         ADF_PRIVILEGED_CROSS_ACCOUNT_ROLE_NAME,
-        "adf_account_get_regions",
+        ROLE_SESSION_NAME,
+        jump_role_sts=jump_role_sts,
     )
     default_regions = get_default_regions_for_account(role.client("ec2"))
 
@@ -57,3 +63,16 @@ def lambda_handler(event, _):
         **event,
         "default_regions": default_regions,
     }
+
+
+def lambda_handler(event, _):
+    sts = STS()
+    jump_role_sts = sts.assume_jump_role(
+        AWS_PARTITION,
+        MANAGEMENT_ACCOUNT_ID,
+        ROLE_SESSION_NAME,
+    )
+    return process_accounts(
+        event,
+        partial(get_account_regions, sts, jump_role_sts),
+    )
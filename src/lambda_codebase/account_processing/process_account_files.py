@@ -5,34 +5,62 @@
 Listens to notifications from the adf-account-bucket
 Identifies accounts that need to be created and then
 invokes the account processing step function per account.
+
+To avoid processing accounts that did not change since the last run, a
+fingerprint of each processed account definition is stored alongside the
+account file in the adf-account-bucket. The fingerprint covers whether the
+account exists, its desired organizational unit, tags, and alias, the rest
+of its definition, and the ADF version. Accounts whose fingerprint did not
+change and whose last state machine execution did not fail are skipped.
+
+The fingerprint only describes the desired state. When the organizational
+unit, tags, or alias of an account are changed outside of ADF, the account
+file does not change and the drift would not be corrected. Hence, accounts
+are processed again when their last processing started more than
+ACCOUNT_REPROCESS_INTERVAL_HOURS ago (24 hours by default). This trades
+the drift correction delay against the number of state machine executions
+that are started for unchanged accounts. The interval is configured by the
+AccountReprocessIntervalHours parameter of the ADF installation, set it to
+0 to process all accounts on every run.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
 import os
 import tempfile
 import logging
-from typing import Any, TypedDict
+from typing import Any, Dict, List, Optional, TypedDict
 import re
+import time
 
 import yaml
 from yaml.error import YAMLError
 
 import boto3
 from botocore.exceptions import ClientError
-from aws_xray_sdk.core import patch_all
 
 # ADF imports
+from clients import enable_tracing, get_client
 from logger import configure_logger
 from organizations import Organizations
 
 
-patch_all()
+enable_tracing()
 LOGGER = configure_logger(__name__)
 ACCOUNT_MANAGEMENT_STATEMACHINE = os.getenv(
     "ACCOUNT_MANAGEMENT_STATEMACHINE_ARN",
 )
 ADF_VERSION = os.getenv("ADF_VERSION")
 ADF_VERSION_METADATA_KEY = "adf_version"
+PROCESSING_STATE_PREFIX = "adf-account-management-state"
+MAX_CONCURRENT_EXECUTION_STARTS = 10
+SKIPPABLE_EXECUTION_STATUSES = ["RUNNING", "SUCCEEDED"]
+ACCOUNT_REPROCESS_INTERVAL_SECONDS = int(
+    float(os.getenv("ACCOUNT_REPROCESS_INTERVAL_HOURS", "24")) * 3600,
+)
+DESIRED_STATE_FIELDS = ["organizational_unit_path", "tags", "alias"]
+EXISTENCE_FIELDS = ["account_id", "needs_created"]
 
 
 class S3ObjectLocation(TypedDict):
@@ -50,6 +78,19 @@ class AccountFileData(TypedDict):
     execution_id: str
 
 
+class AccountProcessingState(TypedDict):
+    """
+    Class used to keep track of the fingerprint of an account definition
+    that was processed, along with the state machine execution that
+    processed it and the time it was started at, in seconds since epoch.
+    """
+
+    fingerprint: str
+    execution_arn: str
+    status: str
+    processed_at: int
+
+
 def get_details_from_event(event: dict) -> S3ObjectLocation:
     s3_details = event.get("Records", [{}])[0].get("s3")
     if not s3_details:
@@ -147,12 +188,205 @@ def sanitize_account_name_for_snf(account_name):
     return re.sub(r"[^a-zA-Z0-9_]", "_", account_name[:30])
 
 
+def get_processing_state_location(
+    s3_object_location: S3ObjectLocation,
+) -> S3ObjectLocation:
+    return {
+        "bucket_name": s3_object_location["bucket_name"],
+        "key": f"{PROCESSING_STATE_PREFIX}/{s3_object_location['key']}.json",
+    }
+
+
+def get_processing_state(
+    state_location: S3ObjectLocation,
+    s3_resource: boto3.resource,
+) -> Dict[str, AccountProcessingState]:
+    """
+    Fetch the processing state of the accounts that were defined in the
+    account file the last time it was processed.
+
+    Args:
+        state_location (S3ObjectLocation): The location of the state object.
+        s3_resource (boto3.resource): The S3 resource to use.
+
+    Returns:
+        dict: The account processing state, keyed by account full name.
+            An empty dict is returned if no state was recorded yet.
+    """
+    try:
+        s3_object = s3_resource.Object(**state_location)
+        return json.loads(
+            s3_object.get()["Body"].read(),
+        ).get("accounts", {})
+    except ClientError as error:
+        if error.response["Error"]["Code"] in ["NoSuchKey", "404"]:
+            LOGGER.info(
+                "No account processing state found at %s, "
+                "processing all accounts",
+                state_location,
+            )
+            return {}
+        raise
+
+
+def put_processing_state(
+    state_location: S3ObjectLocation,
+    s3_resource: boto3.resource,
+    processing_state: Dict[str, AccountProcessingState],
+):
+    LOGGER.debug(
+        "Storing account processing state at %s",
+        state_location,
+    )
+    s3_resource.Object(**state_location).put(
+        Body=json.dumps({"accounts": processing_state}, indent=2),
+        ContentType="application/json",
+    )
+
+
+def compute_account_fingerprint(processed_account: dict) -> str:
+    """
+    Compute the fingerprint of a processed account definition.
+
+    The fingerprint changes when the account got created in the AWS
+    Organization, when its desired organizational unit, tags, or alias
+    changed, or when any other part of its definition changed. The ADF
+    version is included too, such that all accounts are processed again
+    after an upgrade.
+
+    Args:
+        processed_account (dict): The processed account definition.
+
+    Returns:
+        str: The SHA-256 hex digest of the account definition.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "existence": {
+                    field: processed_account.get(field)
+                    for field in EXISTENCE_FIELDS
+                },
+                "desired_state": {
+                    field: processed_account.get(field)
+                    for field in DESIRED_STATE_FIELDS
+                },
+                "definition": {
+                    field: value
+                    for field, value in processed_account.items()
+                    if field not in EXISTENCE_FIELDS + DESIRED_STATE_FIELDS
+                },
+                "adf_version": ADF_VERSION,
+            },
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8"),
+    ).hexdigest()
+
+
+def get_execution_status(sfn_client, execution_arn: Optional[str]) -> str:
+    if not execution_arn:
+        return "UNKNOWN"
+    try:
+        return sfn_client.describe_execution(
+            executionArn=execution_arn,
+        )["status"]
+    except sfn_client.exceptions.ExecutionDoesNotExist:
+        return "UNKNOWN"
+
+
+def _refresh_account_state(
+    sfn_client,
+    processed_account: dict,
+    previous_state: Optional[AccountProcessingState],
+    now: float,
+) -> Optional[AccountProcessingState]:
+    fingerprint = compute_account_fingerprint(processed_account)
+    if not previous_state or previous_state.get("fingerprint") != fingerprint:
+        return None
+    processed_at = previous_state.get("processed_at", 0)
+    if now - processed_at >= ACCOUNT_REPROCESS_INTERVAL_SECONDS:
+        # Process the account again, to correct any drift that was
+        # introduced outside of ADF.
+        return None
+    status = previous_state.get("status")
+    if status != "SUCCEEDED":
+        # Only look up executions that were not known to have succeeded.
+        # Once an execution succeeded, it does not need to be looked up again.
+        status = get_execution_status(
+            sfn_client,
+            previous_state.get("execution_arn"),
+        )
+    if status not in SKIPPABLE_EXECUTION_STATUSES:
+        return None
+    return {
+        **previous_state,
+        "status": status,
+    }
+
+
+def filter_changed_accounts(
+    sfn_client,
+    processed_account_list: List[dict],
+    processing_state: Dict[str, AccountProcessingState],
+):
+    """
+    Filter the processed accounts, such that only accounts that changed
+    since they were processed last time, those that failed to process, and
+    those that were processed longer than the reprocess interval ago remain.
+
+    Args:
+        sfn_client (boto3.client): The Step Functions client to use.
+        processed_account_list (list(dict)): The processed accounts.
+        processing_state (dict): The account processing state as it was
+            recorded the last time the account file was processed.
+
+    Returns:
+        tuple(list(dict), dict): The list of accounts that need to be
+            processed, along with the state of the accounts that remained
+            unchanged.
+    """
+    now = time.time()
+    with ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_EXECUTION_STARTS,
+    ) as executor:
+        refreshed_states = list(executor.map(
+            lambda account: _refresh_account_state(
+                sfn_client,
+                account,
+                processing_state.get(account.get("account_full_name")),
+                now,
+            ),
+            processed_account_list,
+        ))
+
+    changed_accounts = []
+    unchanged_state = {}
+    for account, refreshed_state in zip(
+        processed_account_list,
+        refreshed_states,
+    ):
+        if refreshed_state:
+            unchanged_state[account.get("account_full_name")] = refreshed_state
+        else:
+            changed_accounts.append(account)
+
+    LOGGER.info(
+        "%d out of %d accounts changed or need to be processed again, "
+        "skipping %d unchanged accounts",
+        len(changed_accounts),
+        len(processed_account_list),
+        len(unchanged_state),
+    )
+    return changed_accounts, unchanged_state
+
+
 def start_executions(
     sfn_client,
     processed_account_list,
     codepipeline_execution_id: str,
     request_id: str,
-):
+) -> Dict[str, AccountProcessingState]:
     if not codepipeline_execution_id:
         codepipeline_execution_id = "no-codepipeline-exec-id-found"
     short_request_id = request_id[-12:]
@@ -162,7 +396,8 @@ def start_executions(
         ACCOUNT_MANAGEMENT_STATEMACHINE,
         run_id,
     )
-    for account in processed_account_list:
+
+    def _start_execution(account):
         full_account_name = account.get("account_full_name", "no-account-name")
         # AWS Step Functions supports max 80 characters.
         # Since the run_id equals 49 characters plus the dash, we have 30
@@ -176,11 +411,28 @@ def start_executions(
             sfn_execution_name,
             account,
         )
-        sfn_client.start_execution(
+        response = sfn_client.start_execution(
             stateMachineArn=ACCOUNT_MANAGEMENT_STATEMACHINE,
             name=sfn_execution_name,
             input=f"{json.dumps(account)}",
         )
+        return {
+            "fingerprint": compute_account_fingerprint(account),
+            "execution_arn": response.get("executionArn"),
+            "status": "RUNNING",
+            "processed_at": int(time.time()),
+        }
+
+    with ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_EXECUTION_STARTS,
+    ) as executor:
+        started_states = list(
+            executor.map(_start_execution, processed_account_list),
+        )
+    return {
+        account.get("account_full_name"): state
+        for account, state in zip(processed_account_list, started_states)
+    }
 
 
 def lambda_handler(event, context):
@@ -191,11 +443,12 @@ def lambda_handler(event, context):
         if LOGGER.isEnabledFor(logging.DEBUG)
         else "--data-hidden--",
     )
-    sfn_client = boto3.client("stepfunctions")
+    sfn_client = get_client("stepfunctions")
     s3_resource = boto3.resource("s3")
 
     all_accounts = get_all_accounts()
-    account_file = get_file_from_s3(get_details_from_event(event), s3_resource)
+    s3_object_location = get_details_from_event(event)
+    account_file = get_file_from_s3(s3_object_location, s3_resource)
 
     processed_account_list = process_account_list(
         all_accounts=all_accounts,
@@ -203,10 +456,20 @@ def lambda_handler(event, context):
     )
 
     if processed_account_list:
-        start_executions(
+        state_location = get_processing_state_location(s3_object_location)
+        changed_account_list, processing_state = filter_changed_accounts(
             sfn_client,
             processed_account_list,
-            codepipeline_execution_id=account_file.get("execution_id"),
-            request_id=context.aws_request_id,
+            get_processing_state(state_location, s3_resource),
         )
+        if changed_account_list:
+            processing_state.update(
+                start_executions(
+                    sfn_client,
+                    changed_account_list,
+                    codepipeline_execution_id=account_file.get("execution_id"),
+                    request_id=context.aws_request_id,
+                )
+            )
+        put_processing_state(state_location, s3_resource, processing_state)
     return event
@@ -5,20 +5,24 @@
 If enterprise support is enabled.
 Will automatically create a ticket in your OU root account
 to register the newly created account for support.
+
+Accepts a single account, or a batch of accounts in the accounts list.
 """
 
 from enum import Enum
+from functools import partial
 import boto3
 from botocore.exceptions import ClientError, BotoCoreError
 from botocore.config import Config
-from aws_xray_sdk.core import patch_all
 
 # ADF imports
+from account_batch import process_accounts
+from clients import enable_tracing
 from logger import configure_logger
 
 
 LOGGER = configure_logger(__name__)
-patch_all()
+enable_tracing()
 
 
 class SupportLevel(Enum):
@@ -212,10 +216,17 @@ class Support:  # pylint: disable=R0904
             raise
 
 
-def lambda_handler(event, _):
-    support = Support(boto3)
+def register_account_for_support(support, event):
     support.set_support_level_for_account(
         account=event,
         account_id=event.get("account_id"),
     )
     return event
+
+
+def lambda_handler(event, _):
+    support = Support(boto3)
+    return process_accounts(
+        event,
+        partial(register_account_for_support, support),
+    )
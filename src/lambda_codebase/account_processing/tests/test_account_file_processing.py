@@ -4,14 +4,29 @@
 """
 Tests the account file processing lambda
 """
+import time
 import unittest
+import boto3
+from botocore.stub import Stubber
+from aws_xray_sdk import global_sdk_config
 from ..process_account_files import (
     process_account,
     process_account_list,
     get_details_from_event,
+    get_processing_state_location,
+    compute_account_fingerprint,
+    filter_changed_accounts,
+    ACCOUNT_REPROCESS_INTERVAL_SECONDS,
     sanitize_account_name_for_snf,
 )
 
+global_sdk_config.set_sdk_enabled(False)
+
+EXECUTION_ARN = (
+    "arn:aws:states:eu-central-1:123456789012:execution:"
+    "adf-account-management:myTestAccountName-123"
+)
+
 
 class SuccessTestCase(unittest.TestCase):
     # pylint: disable=W0106
@@ -104,6 +119,226 @@ class SuccessTestCase(unittest.TestCase):
             30,
         )
 
+    def test_get_processing_state_location(self):
+        self.assertDictEqual(
+            get_processing_state_location({
+                "bucket_name": "some-bucket",
+                "key": "adf.yml",
+            }),
+            {
+                "bucket_name": "some-bucket",
+                "key": "adf-account-management-state/adf.yml.json",
+            },
+        )
+
+    def test_compute_account_fingerprint_ignores_key_order(self):
+        self.assertEqual(
+            compute_account_fingerprint({
+                "account_full_name": "myTestAccountName",
+                "alias": "MyCoolAlias",
+            }),
+            compute_account_fingerprint({
+                "alias": "MyCoolAlias",
+                "account_full_name": "myTestAccountName",
+            }),
+        )
+        self.assertNotEqual(
+            compute_account_fingerprint({
+                "account_full_name": "myTestAccountName",
+                "alias": "MyCoolAlias",
+            }),
+            compute_account_fingerprint({
+                "account_full_name": "myTestAccountName",
+                "alias": "MyOtherAlias",
+            }),
+        )
+
+    def test_filter_changed_accounts_skips_succeeded(self):
+        unchanged_account = {
+            "account_full_name": "myTestAccountName",
+            "account_id": "123456789012",
+            "needs_created": False,
+        }
+        new_account = {
+            "account_full_name": "myNewAccountName",
+            "needs_created": True,
+        }
+        sfn_client = boto3.client("stepfunctions")
+        stubber = Stubber(sfn_client)
+        stubber.activate()
+        previous_state = {
+            "fingerprint": compute_account_fingerprint(unchanged_account),
+            "execution_arn": EXECUTION_ARN,
+            "status": "SUCCEEDED",
+            "processed_at": int(time.time()),
+        }
+        changed, unchanged_state = filter_changed_accounts(
+            sfn_client,
+            [unchanged_account, new_account],
+            {"myTestAccountName": previous_state},
+        )
+        self.assertListEqual(changed, [new_account])
+        self.assertDictEqual(
+            unchanged_state,
+            {"myTestAccountName": previous_state},
+        )
+        stubber.assert_no_pending_responses()
+
+    def test_filter_changed_accounts_processes_changed_definition(self):
+        account = {
+            "account_full_name": "myTestAccountName",
+            "account_id": "123456789012",
+            "alias": "MyNewAlias",
+            "needs_created": False,
+        }
+        sfn_client = boto3.client("stepfunctions")
+        stubber = Stubber(sfn_client)
+        stubber.activate()
+        changed, unchanged_state = filter_changed_accounts(
+            sfn_client,
+            [account],
+            {
+                "myTestAccountName": {
+                    "fingerprint": compute_account_fingerprint({
+                        **account,
+                        "alias": "MyOldAlias",
+                    }),
+                    "execution_arn": EXECUTION_ARN,
+                    "status": "SUCCEEDED",
+                },
+            },
+        )
+        self.assertListEqual(changed, [account])
+        self.assertDictEqual(unchanged_state, {})
+        stubber.assert_no_pending_responses()
+
+    def test_filter_changed_accounts_retries_failed_execution(self):
+        account = {
+            "account_full_name": "myTestAccountName",
+            "account_id": "123456789012",
+            "needs_created": False,
+        }
+        sfn_client = boto3.client("stepfunctions")
+        stubber = Stubber(sfn_client)
+        stubber.add_response(
+            "describe_execution",
+            {
+                "executionArn": EXECUTION_ARN,
+                "stateMachineArn": (
+                    "arn:aws:states:eu-central-1:123456789012:"
+                    "stateMachine:adf-account-management"
+                ),
+                "status": "FAILED",
+                "startDate": "2024-01-01T00:00:00Z",
+            },
+            {"executionArn": EXECUTION_ARN},
+        )
+        stubber.activate()
+        changed, unchanged_state = filter_changed_accounts(
+            sfn_client,
+            [account],
+            {
+                "myTestAccountName": {
+                    "fingerprint": compute_account_fingerprint(account),
+                    "execution_arn": EXECUTION_ARN,
+                    "status": "RUNNING",
+                    "processed_at": int(time.time()),
+                },
+            },
+        )
+        self.assertListEqual(changed, [account])
+        self.assertDictEqual(unchanged_state, {})
+        stubber.assert_no_pending_responses()
+
+    def test_filter_changed_accounts_marks_succeeded_execution(self):
+        account = {
+            "account_full_name": "myTestAccountName",
+            "account_id": "123456789012",
+            "needs_created": False,
+        }
+        sfn_client = boto3.client("stepfunctions")
+        stubber = Stubber(sfn_client)
+        stubber.add_response(
+            "describe_execution",
+            {
+                "executionArn": EXECUTION_ARN,
+                "stateMachineArn": (
+                    "arn:aws:states:eu-central-1:123456789012:"
+                    "stateMachine:adf-account-management"
+                ),
+                "status": "SUCCEEDED",
+                "startDate": "2024-01-01T00:00:00Z",
+            },
+            {"executionArn": EXECUTION_ARN},
+        )
+        stubber.activate()
+        changed, unchanged_state = filter_changed_accounts(
+            sfn_client,
+            [account],
+            {
+                "myTestAccountName": {
+                    "fingerprint": compute_account_fingerprint(account),
+                    "execution_arn": EXECUTION_ARN,
+                    "status": "RUNNING",
+                    "processed_at": int(time.time()),
+                },
+            },
+        )
+        self.assertListEqual(changed, [])
+        self.assertEqual(
+            unchanged_state["myTestAccountName"]["status"],
+            "SUCCEEDED",
+        )
+        stubber.assert_no_pending_responses()
+
+    def test_compute_account_fingerprint_covers_desired_state(self):
+        account = {
+            "account_full_name": "myTestAccountName",
+            "account_id": "123456789012",
+            "needs_created": False,
+            "organizational_unit_path": "/banking/production",
+            "tags": {"team": "banking"},
+            "alias": "MyCoolAlias",
+        }
+        for field, value in [
+            ("organizational_unit_path", "/banking/testing"),
+            ("tags", {"team": "insurance"}),
+            ("alias", "MyOtherAlias"),
+            ("needs_created", True),
+        ]:
+            with self.subTest(field=field):
+                self.assertNotEqual(
+                    compute_account_fingerprint(account),
+                    compute_account_fingerprint({**account, field: value}),
+                )
+
+    def test_filter_changed_accounts_reprocesses_after_interval(self):
+        account = {
+            "account_full_name": "myTestAccountName",
+            "account_id": "123456789012",
+            "needs_created": False,
+        }
+        sfn_client = boto3.client("stepfunctions")
+        stubber = Stubber(sfn_client)
+        stubber.activate()
+        changed, unchanged_state = filter_changed_accounts(
+            sfn_client,
+            [account],
+            {
+                "myTestAccountName": {
+                    "fingerprint": compute_account_fingerprint(account),
+                    "execution_arn": EXECUTION_ARN,
+                    "status": "SUCCEEDED",
+                    "processed_at": int(
+                        time.time() - ACCOUNT_REPROCESS_INTERVAL_SECONDS - 1
+                    ),
+                },
+            },
+        )
+        self.assertListEqual(changed, [account])
+        self.assertDictEqual(unchanged_state, {})
+        stubber.assert_no_pending_responses()
+
 
 class FailureTestCase(unittest.TestCase):
     # pylint: disable=W0106
@@ -7,16 +7,21 @@ Tests the delete_default_vpc lambda
 
 import unittest
 from unittest.mock import MagicMock, patch
-from delete_default_vpc import find_default_vpc
+from delete_default_vpc import (
+    delete_default_vpc,
+    delete_default_vpcs,
+    find_default_vpc,
+    lambda_handler,
+)
 from botocore.exceptions import ClientError
 
 
 class TestFindDefaultVPC(unittest.TestCase):
 
     @patch("tenacity.nap.time.sleep", MagicMock())
-    @patch('delete_default_vpc.patch_all')
+    @patch('delete_default_vpc.enable_tracing')
     # pylint: disable=unused-argument
-    def test_find_default_vpc(self, mock_patch_all):
+    def test_find_default_vpc(self, mock_enable_tracing):
         # Create a mock ec2_client
         mock_ec2_client = MagicMock()
 
@@ -44,5 +49,145 @@ class TestFindDefaultVPC(unittest.TestCase):
         self.assertEqual(mock_ec2_client.describe_vpcs.call_count, 3)
 
 
+def _describe_responses(ec2_client):
+    responses = {
+        ec2_client.describe_internet_gateways: [
+            {"InternetGatewayId": "igw-1"},
+        ],
+        ec2_client.describe_route_tables: [
+            {
+                "Associations": [
+                    {"RouteTableAssociationId": "rtbassoc-main", "Main": True},
+                    {"RouteTableAssociationId": "rtbassoc-1", "Main": False},
+                ],
+            },
+        ],
+        ec2_client.describe_security_groups: [
+            {"GroupId": "sg-default", "GroupName": "default"},
+            {"GroupId": "sg-1", "GroupName": "custom"},
+        ],
+        ec2_client.describe_network_interfaces: [
+            {"NetworkInterfaceId": "eni-1"},
+        ],
+        ec2_client.describe_subnets: [
+            {"SubnetId": "subnet-1"},
+            {"SubnetId": "subnet-2"},
+        ],
+    }
+    return lambda method, **_: responses[method]
+
+
+class TestDeleteDefaultVPC(unittest.TestCase):
+
+    @patch("delete_default_vpc.paginator")
+    def test_delete_default_vpc(self, mock_paginator):
+        mock_ec2_client = MagicMock()
+        mock_paginator.side_effect = _describe_responses(mock_ec2_client)
+
+        timings = delete_default_vpc(mock_ec2_client, "vpc-123")
+
+        for call in mock_paginator.call_args_list:
+            self.assertIn("vpc-123", str(call.kwargs["Filters"]))
+        mock_ec2_client.detach_internet_gateway.assert_called_once_with(
+            InternetGatewayId="igw-1",
+            VpcId="vpc-123",
+        )
+        mock_ec2_client.delete_internet_gateway.assert_called_once_with(
+            InternetGatewayId="igw-1",
+        )
+        mock_ec2_client.disassociate_route_table.assert_called_once_with(
+            AssociationId="rtbassoc-1",
+        )
+        mock_ec2_client.delete_security_group.assert_called_once_with(
+            GroupId="sg-1",
+        )
+        mock_ec2_client.delete_network_interface.assert_called_once_with(
+            NetworkInterfaceId="eni-1",
+        )
+        self.assertEqual(mock_ec2_client.delete_subnet.call_count, 2)
+        mock_ec2_client.delete_vpc.assert_called_once_with(VpcId="vpc-123")
+        self.assertEqual(
+            [(timing["resource_type"], timing["resource_id"]) for timing in timings],
+            [
+                ("internet-gateway", "igw-1"),
+                ("route-table-association", "rtbassoc-1"),
+                ("network-interface", "eni-1"),
+                ("subnet", "subnet-1"),
+                ("subnet", "subnet-2"),
+                ("security-group", "sg-1"),
+                ("vpc", "vpc-123"),
+            ],
+        )
+
+    @patch("delete_default_vpc.delete_default_vpc")
+    @patch("delete_default_vpc.find_default_vpc")
+    def test_delete_default_vpcs(self, mock_find, mock_delete):
+        mock_find.side_effect = lambda client: client.vpc_id
+        mock_delete.return_value = []
+        clients = {
+            "eu-west-1": MagicMock(vpc_id="vpc-1"),
+            "us-east-1": MagicMock(vpc_id=None),
+        }
+
+        results = delete_default_vpcs(clients, "some-account")
+
+        self.assertEqual(results, {
+            "eu-west-1": {"vpc_id": "vpc-1", "timings": []},
+            "us-east-1": {"vpc_id": None, "timings": []},
+        })
+        mock_delete.assert_called_once_with(clients["eu-west-1"], "vpc-1")
+
+    @patch("delete_default_vpc.delete_default_vpc")
+    @patch("delete_default_vpc.find_default_vpc")
+    def test_delete_default_vpcs_raises_after_all_regions(
+        self,
+        mock_find,
+        mock_delete,
+    ):
+        mock_find.return_value = "vpc-1"
+        mock_delete.side_effect = [ValueError("failed"), []]
+        clients = {"eu-west-1": MagicMock(), "us-east-1": MagicMock()}
+
+        with self.assertRaises(ValueError):
+            delete_default_vpcs(clients, "some-account")
+
+        self.assertEqual(mock_delete.call_count, 2)
+
+
+class TestLambdaHandler(unittest.TestCase):
+
+    @patch("delete_default_vpc.delete_default_vpcs")
+    @patch("delete_default_vpc.assume_role")
+    def test_lambda_handler_falls_back_to_region(
+        self,
+        mock_assume_role,
+        mock_delete_vpcs,
+    ):
+        mock_delete_vpcs.return_value = {}
+
+        lambda_handler({"Payload": {"region": "eu-west-1"}}, None)
+
+        mock_assume_role.return_value.client.assert_called_once_with(
+            "ec2",
+            region_name="eu-west-1",
+        )
+
+    @patch("delete_default_vpc.delete_default_vpcs")
+    @patch("delete_default_vpc.assume_role")
+    def test_lambda_handler_skips_empty_regions(
+        self,
+        mock_assume_role,
+        mock_delete_vpcs,
+    ):
+        result = lambda_handler(
+            {"Payload": {"regions": [], "region": "eu-west-1"}},
+            None,
+        )
+
+        self.assertEqual(result["Payload"]["deleted_default_vpcs"], {})
+        mock_assume_role.assert_not_called()
+        mock_delete_vpcs.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
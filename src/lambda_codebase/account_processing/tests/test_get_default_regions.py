@@ -6,11 +6,13 @@ Tests the account tag configuration lambda
 """
 
 import unittest
+from unittest.mock import MagicMock, patch
 import boto3
 from botocore.stub import Stubber
 from aws_xray_sdk import global_sdk_config
 from ..get_account_regions import (
     get_default_regions_for_account,
+    lambda_handler,
 )
 
 global_sdk_config.set_sdk_enabled(False)
@@ -63,3 +65,38 @@ class SuccessTestCase(unittest.TestCase):
         stubber.activate()
         regions = get_default_regions_for_account(ec2_client)
         assert regions == ["us-east-1", "us-east-2", "us-east-3", "us-east-4"]
+
+    @staticmethod
+    @patch(f"{lambda_handler.__module__}.get_default_regions_for_account")
+    @patch(f"{lambda_handler.__module__}.STS")
+    def test_lambda_handler_batch_assumes_jump_role_once(
+        sts_cls,
+        get_default_regions_mock,
+    ):
+        sts = sts_cls.return_value
+        get_default_regions_mock.return_value = ["us-east-1"]
+        sts.assume_bootstrap_deployment_role.side_effect = [
+            MagicMock(),
+            Exception("Access denied"),
+        ]
+
+        result = lambda_handler(
+            {
+                "accounts": [
+                    {"account_id": "111111111111"},
+                    {"account_id": "222222222222"},
+                ],
+            },
+            None,
+        )
+
+        sts.assume_jump_role.assert_called_once()
+        for call in sts.assume_bootstrap_deployment_role.call_args_list:
+            assert call.kwargs["jump_role_sts"] == (
+                sts.assume_jump_role.return_value
+            )
+        statuses = sorted(
+            account["processing_status"]
+            for account in result["accounts"]
+        )
+        assert statuses == ["FAILED", "SUCCEEDED"]
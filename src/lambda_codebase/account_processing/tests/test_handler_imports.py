@@ -0,0 +1,75 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Tests the modules that the account processing lambdas load at import time
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ACCOUNT_PROCESSING = Path(__file__).resolve().parent.parent
+HANDLERS = [
+    "configure_account_alias",
+    "configure_account_ou",
+    "configure_account_regions",
+    "configure_account_tags",
+    "create_account",
+    "delete_default_vpc",
+    "get_account_regions",
+    "process_account_files",
+    "register_account_for_support",
+]
+# The modules that the AWS X-Ray SDK loads to patch botocore only
+BOTOCORE_TRACING_MODULES = {"boto_utils", "botocore", "util"}
+PROBE = """
+import {handler}
+import json
+import sys
+boto3 = sys.modules.get("boto3")
+print(json.dumps({{
+    "boto3_default_session": bool(boto3 and boto3.DEFAULT_SESSION),
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+
+def _import_in_fresh_process(handler):
+    process = subprocess.run(
+        [sys.executable, "-c", PROBE.format(handler=handler)],
+        capture_output=True,
+        check=True,
+        cwd=ACCOUNT_PROCESSING,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(
+                [str(ACCOUNT_PROCESSING)]
+                + os.environ.get("PYTHONPATH", "").split(os.pathsep)
+            ),
+        },
+        text=True,
+    )
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+class TestHandlerImports(unittest.TestCase):
+
+    def test_handlers_only_trace_botocore_and_create_no_clients(self):
+        for handler in HANDLERS:
+            with self.subTest(handler=handler):
+                result = _import_in_fresh_process(handler)
+                traced = {
+                    module.split(".")[2]
+                    for module in result["modules"]
+                    if module.startswith("aws_xray_sdk.ext.")
+                }
+                self.assertLessEqual(traced, BOTOCORE_TRACING_MODULES)
+                self.assertFalse(result["boto3_default_session"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Admission control for the account bootstrapping process.
+
+When many accounts are moved at once, an execution of the bootstrapping
+state machine starts for every account. To prevent these from saturating
+the STS, CloudFormation, and SSM throttling limits, every execution needs
+to acquire a slot in each of the regions its base stacks are deployed to.
+The number of slots per region is limited by the concurrency limit.
+
+Waiting executions are admitted in the order in which they started
+waiting. When no slot is available, a ConcurrencyLimitReachedError is
+raised. This will cause Step Functions to retry the acquisition later,
+without losing the position of the execution in the queue. Once the base
+stacks are deployed, the slots are released again.
+
+The queue depth, active bootstraps, and the time an execution waited for
+its slots are reported as CloudWatch metrics.
+"""
+
+import os
+from datetime import datetime, timezone
+
+import boto3
+
+# ADF imports
+from cloudwatch import ADFMetrics
+from errors import ConcurrencyLimitReachedError
+from logger import configure_logger
+from semaphore import DynamoDBSemaphore
+
+REGION_DEFAULT = os.environ["AWS_REGION"]
+CONCURRENCY_TABLE_NAME = os.environ["BOOTSTRAP_CONCURRENCY_TABLE_NAME"]
+CONCURRENCY_LIMIT = int(os.environ["BOOTSTRAP_CONCURRENCY_LIMIT"])
+# Slots held and queue positions taken by executions that stopped without
+# releasing them are released by one of the waiting executions, at most
+# once per interval.
+MAINTENANCE_INTERVAL_SECONDS = 300
+LOGGER = configure_logger(__name__)
+METRICS = ADFMetrics(None, "ACCOUNT_BOOTSTRAPPING/ADMISSION", emit_as_emf=True)
+
+
+def get_bootstrap_regions(event):
+    return sorted(
+        set(
+            [event["deployment_account_region"]]
+            + event["regions"]
+        ),
+    )
+
+
+def _seconds_since(timestamp):
+    started_at = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return max(
+        (datetime.now(timezone.utc) - started_at).total_seconds(),
+        0,
+    )
+
+
+def _put_region_metrics(state):
+    for region, region_state in state.items():
+        dimensions = [{"Name": "Region", "Value": region}]
+        METRICS.put_metric_data([
+            {
+                "MetricName": "QueueDepth",
+                "Value": len(region_state["waiting"]),
+                "Unit": "Count",
+                "Dimensions": dimensions,
+            },
+            {
+                "MetricName": "ActiveBootstraps",
+                "Value": len(region_state["holders"]),
+                "Unit": "Count",
+                "Dimensions": dimensions,
+            },
+        ])
+
+
+def release_stopped_executions(semaphore, stepfunctions, state):
+    """
+    Release the slots and queue positions of the executions that are no
+    longer running. For example, when an execution timed out or got aborted.
+
+    Returns:
+        list[str]: The execution ids that got released.
+    """
+    released = []
+    execution_ids = set()
+    for region_state in state.values():
+        execution_ids.update(region_state["holders"])
+        execution_ids.update(region_state["waiting"])
+    for execution_id in sorted(execution_ids):
+        try:
+            status = stepfunctions.describe_execution(
+                executionArn=execution_id,
+            )["status"]
+        except stepfunctions.exceptions.ExecutionDoesNotExist:
+            status = None
+        if status == "RUNNING":
+            continue
+        LOGGER.warning(
+            "Releasing the bootstrap slots and queue position of %s, as its "
+            "status is %s",
+            execution_id,
+            status,
+        )
+        semaphore.release(execution_id, list(state))
+        released.append(execution_id)
+    return released
+
+
+def acquire(semaphore, stepfunctions, event, execution_id, waiting_since):
+    """
+    Acquire a bootstrap slot in every region the base stacks of the account
+    are deployed to.
+    """
+    regions = get_bootstrap_regions(event)
+    if semaphore.try_acquire(execution_id, regions, waiting_since):
+        waited_seconds = _seconds_since(waiting_since)
+        LOGGER.info(
+            "Acquired bootstrap slots for account %s in %s after %d seconds",
+            event["account_id"],
+            regions,
+            waited_seconds,
+        )
+        METRICS.put_metric_data([
+            {
+                "MetricName": "AdmissionWaitTime",
+                "Value": round(waited_seconds),
+                "Unit": "Seconds",
+                "Dimensions": [{"Name": "Region", "Value": region}],
+            }
+            for region in regions
+        ])
+        _put_region_metrics(semaphore.describe(regions))
+        return event
+
+    state = semaphore.describe(regions)
+    _put_region_metrics(state)
+    if semaphore.try_claim_maintenance(
+        regions[0],
+        MAINTENANCE_INTERVAL_SECONDS,
+    ) and release_stopped_executions(semaphore, stepfunctions, state):
+        return acquire(
+            semaphore,
+            stepfunctions,
+            event,
+            execution_id,
+            waiting_since,
+        )
+    raise ConcurrencyLimitReachedError(
+        f"Account {event['account_id']} is waiting for a bootstrap slot in "
+        f"{regions}, waiting for {round(_seconds_since(waiting_since))} "
+        "seconds so far",
+    )
+
+
+def release(semaphore, event, execution_id):
+    """
+    Release the bootstrap slots of the execution.
+    """
+    regions = get_bootstrap_regions(event)
+    semaphore.release(execution_id, regions)
+    LOGGER.info(
+        "Released the bootstrap slots for account %s in %s",
+        event["account_id"],
+        regions,
+    )
+    return event
+
+
+@METRICS.flush_after
+def lambda_handler(event, _):
+    semaphore = DynamoDBSemaphore(
+        CONCURRENCY_TABLE_NAME,
+        boto3,
+        REGION_DEFAULT,
+        CONCURRENCY_LIMIT,
+    )
+    if event["action"] == "release":
+        return release(semaphore, event["event"], event["execution_id"])
+    return acquire(
+        semaphore,
+        boto3.client("stepfunctions", region_name=REGION_DEFAULT),
+        event["event"],
+        event["execution_id"],
+        event["waiting_since"],
+    )
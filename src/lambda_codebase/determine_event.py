@@ -16,16 +16,26 @@ from organizations import Organizations
 from parameter_store import ParameterStore
 
 REGION_DEFAULT = os.environ["AWS_REGION"]
+# The configuration parameters and organization details are cached in the
+# warm Lambda container for a short time, as accounts are often moved in
+# bulk. Parameters that were not found are only cached for the duration of
+# a single invocation, as these could be created at any time.
+CACHE_TTL_SECONDS = 60
+CACHE = Cache(ttl_seconds=CACHE_TTL_SECONDS)
 
 
 def lambda_handler(event, _):
-    parameters = ParameterStore(region=REGION_DEFAULT, role=boto3)
     account_id = event.get('detail').get('requestParameters').get('accountId')
-    cache = Cache()
-    organizations = Organizations(role=boto3, account_id=account_id, cache=cache)
+    organizations = Organizations(role=boto3, account_id=account_id, cache=CACHE)
+    parameter_store = ParameterStore(
+        region=REGION_DEFAULT,
+        role=boto3,
+        cache=CACHE,
+        not_found_cache=Cache(),
+    )
     parsed_event = Event(
         event=event,
-        parameter_store=parameters,
+        parameter_store=parameter_store,
         organizations=organizations,
         account_id=account_id
     )
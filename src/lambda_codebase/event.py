@@ -8,6 +8,7 @@ when accounts are moved into Organizational Units.
 
 import ast
 import os
+from functools import lru_cache
 
 # ADF imports
 from errors import ParameterNotFoundError, RootOUIDError
@@ -17,6 +18,22 @@ SHARED_MODULES_BUCKET = os.environ["SHARED_MODULES_BUCKET"]
 BOOTSTRAP_TEMPLATES_BUCKET = os.environ["S3_BUCKET_NAME"]
 ADF_VERSION = os.environ["ADF_VERSION"]
 ADF_LOG_LEVEL = os.environ["ADF_LOG_LEVEL"]
+# The parameters that are read to construct the event, these are fetched
+# in a single batch.
+EVENT_PARAMETERS = [
+    'config',
+    'target_regions',
+    'deployment_account_region',
+    'cross_account_access_role',
+    'deployment_account_id',
+    'extensions/terraform/enabled',
+]
+
+
+@lru_cache(maxsize=8)
+def _parse_parameter_value(value):
+    # The parsed values are shared across events, these must not be mutated.
+    return ast.literal_eval(value)
 
 
 class Event:
@@ -27,7 +44,8 @@ class Event:
     # pylint: disable=too-many-instance-attributes
     def __init__(self, event, parameter_store, organizations, account_id):
         self.parameter_store = parameter_store
-        self.config = ast.literal_eval(
+        parameter_store.fetch_parameters(EVENT_PARAMETERS)
+        self.config = _parse_parameter_value(
             parameter_store.fetch_parameter('config'),
         )
         self.account_id = account_id
@@ -40,7 +58,7 @@ class Event:
             event.get('detail').get('requestParameters').get('sourceParentId')
         )
         self.main_notification_endpoint = (
-            self.config.get('main-notification-endpoint').pop().get('target')
+            self.config.get('main-notification-endpoint')[-1].get('target')
         )
         self.notification_type = (
             'lambda' if '@' not in self.main_notification_endpoint
@@ -59,8 +77,8 @@ class Event:
             1 if self.destination_ou_id in self.protected_ou_list
             else 0
         )
-        self.regions = (
-            ast.literal_eval(
+        self.regions = list(
+            _parse_parameter_value(
                 parameter_store.fetch_parameter('target_regions')
             )
             or []
@@ -5,14 +5,22 @@
 Enables the connection between the deployment account
 and the account that is being bootstrapped.
 This runs as part of Step Functions on the Deployment Account
+
+Accepts a single account in the account_id property of the event, or a
+batch of accounts in the account_ids list. The accounts of a batch are
+updated concurrently.
 """
 
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from botocore.exceptions import ClientError
 
 # ADF imports
+from errors import ParameterNotFoundError
 from iam_cfn_deploy_role_policy import IAMCfnDeployRolePolicy
 from logger import configure_logger
 from parameter_store import ParameterStore
@@ -25,6 +33,15 @@ S3_BUCKET = os.environ["S3_BUCKET_NAME"]
 DEPLOYMENT_ACCOUNT_ID = os.environ["DEPLOYMENT_ACCOUNT_ID"]
 REGION_DEFAULT = os.getenv("AWS_REGION")
 LOGGER = configure_logger(__name__)
+MAX_CONCURRENT_ACCOUNTS = 10
+
+# The digests of the resources that the role policies of an account were
+# updated to grant access to, keyed by the state machine execution and the
+# account id. When a step of the execution is retried, the accounts that
+# were updated already in that execution are skipped. The bootstrap stacks
+# are not updated while the execution runs, so their policies still
+# contain all resources.
+POLICY_DIGEST_CACHE = {}
 
 # Target Role Policies are updated in target accounts
 TARGET_ROLE_POLICIES = {
@@ -57,11 +74,11 @@ DEPLOYMENT_ROLE_POLICIES = {
 }
 
 
-def _assume_role_if_required(account_id: str):
+def _assume_role_if_required(account_id: str, sts: STS = None):
     if account_id == DEPLOYMENT_ACCOUNT_ID:
         return None
 
-    sts = STS()
+    sts = sts or STS()
     partition = get_partition(REGION_DEFAULT)
     try:
         role_arn_to_assume = (
@@ -85,6 +102,123 @@ def _assume_role_if_required(account_id: str):
         raise
 
 
+def fetch_regional_resources(parameter_store, regions):
+    """
+    Fetch the S3 bucket names and KMS Key ARNs of the given regions, in as
+    few SSM API calls as possible.
+
+    Args:
+        parameter_store (ParameterStore): The parameter store in the
+            deployment account region.
+
+        regions (list[str]): The regions to fetch the resources of.
+
+    Returns:
+        tuple[list[str], list[str]]: The sorted S3 bucket names and KMS
+            Key ARNs of the regions.
+    """
+    parameter_names = {
+        region: (
+            f"cross_region/s3_regional_bucket/{region}",
+            f"cross_region/kms_arn/{region}",
+        )
+        for region in sorted(set(regions))
+    }
+    values = parameter_store.fetch_parameters([
+        name
+        for names in parameter_names.values()
+        for name in names
+    ])
+    for names in parameter_names.values():
+        for name in names:
+            if name not in values:
+                raise ParameterNotFoundError(f"Parameter /adf/{name} Not Found")
+    s3_buckets = sorted({
+        values[bucket_name]
+        for bucket_name, _ in parameter_names.values()
+    })
+    kms_key_arns = sorted({
+        values[kms_key_name]
+        for _, kms_key_name in parameter_names.values()
+    })
+    return s3_buckets, kms_key_arns
+
+
+def get_policy_digest(role_policies, s3_buckets, kms_key_arns):
+    """
+    Returns:
+        str: The digest of the role policies and the resources these
+            should grant access to.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            [role_policies, sorted(s3_buckets), sorted(kms_key_arns)],
+            sort_keys=True,
+        ).encode("utf-8"),
+    ).hexdigest()
+
+
+def enable_cross_account_access(
+    account_id,
+    s3_buckets,
+    kms_key_arns,
+    sts=None,
+    execution_id=None,
+):
+    """
+    Update the role policies of the given account to grant access to the
+    regional S3 buckets and KMS keys.
+
+    Args:
+        account_id (str): The account to update.
+
+        s3_buckets (list[str]): All regional S3 bucket names.
+
+        kms_key_arns (list[str]): All regional KMS Key ARNs.
+
+        sts (STS): The STS instance to assume the cross-account role with.
+
+        execution_id (str): The state machine execution id, if the digest
+            cache should be used to skip accounts that were updated in the
+            same execution already.
+
+    Returns:
+        bool: False if the account was skipped, True otherwise.
+    """
+    role_policies = (
+        DEPLOYMENT_ROLE_POLICIES
+        if account_id == DEPLOYMENT_ACCOUNT_ID
+        else TARGET_ROLE_POLICIES
+    )
+    digest = get_policy_digest(role_policies, s3_buckets, kms_key_arns)
+    cache_key = (execution_id, account_id)
+    if execution_id and POLICY_DIGEST_CACHE.get(cache_key) == digest:
+        LOGGER.info(
+            "Role policies of account %s grant access already, skipping.",
+            account_id,
+        )
+        return False
+
+    # Assume into the target account if required, unless we are updating the
+    # deployment account itself. In that case we should use boto3
+    # directly instead.
+    target_account_role = _assume_role_if_required(account_id, sts) or boto3
+    updated_policies = IAMCfnDeployRolePolicy.update_iam_role_policies(
+        target_account_role.client("iam"),
+        s3_buckets,  # All regional S3 buckets
+        kms_key_arns,  # All regional KMS Keys
+        role_policies,
+    )
+    LOGGER.info(
+        "Updated %d role policies of account %s",
+        updated_policies,
+        account_id,
+    )
+    if execution_id:
+        POLICY_DIGEST_CACHE[cache_key] = digest
+    return True
+
+
 def lambda_handler(event, _):
     """
     Lambda handler of the enable cross-account access orchestrator.
@@ -93,8 +227,8 @@ def lambda_handler(event, _):
 
     Args:
         event (any): The input event submitted to AWS Lambda. This event will
-            hold the deployment_account_region, target regions, and account id
-            that should be configured.
+            hold the deployment_account_region, target regions, and the
+            account_id or the account_ids that should be configured.
 
     Returns:
         event (any): The input event that was submitted is passed forward, so
@@ -104,40 +238,47 @@ def lambda_handler(event, _):
     parameter_store = ParameterStore(
         region=event.get("deployment_account_region"), role=boto3
     )
-    account_id = event.get("account_id")
-
-    kms_key_arns = []
-    s3_buckets = []
-    for region in list(
-        set(
-            [event.get("deployment_account_region")]
-            + event.get("regions", [])
-        )
-    ):
-        kms_key_arn = parameter_store.fetch_parameter(
-            f"cross_region/kms_arn/{region}"
-        )
-        kms_key_arns.append(kms_key_arn)
-        s3_bucket = parameter_store.fetch_parameter(
-            f"cross_region/s3_regional_bucket/{region}"
-        )
-        s3_buckets.append(s3_bucket)
-
-    # Assume into the target account if required, unless we are updating the
-    # deployment account itself. In that case we should use boto3
-    # directly instead.
-    target_account_role = _assume_role_if_required(account_id) or boto3
-    role_policies = (
-        DEPLOYMENT_ROLE_POLICIES
-        if account_id == DEPLOYMENT_ACCOUNT_ID
-        else TARGET_ROLE_POLICIES
+    s3_buckets, kms_key_arns = fetch_regional_resources(
+        parameter_store,
+        [event.get("deployment_account_region")] + event.get("regions", []),
     )
+    account_ids = (
+        [event["account_id"]]
+        if event.get("account_id")
+        else event.get("account_ids", [])
+    )
+    sts = STS()
 
-    IAMCfnDeployRolePolicy.update_iam_role_policies(
-        target_account_role.client("iam"),
-        s3_buckets,  # All regional S3 buckets
-        kms_key_arns,  # All regional KMS Keys
-        role_policies,
+    with ThreadPoolExecutor(
+        max_workers=max(min(MAX_CONCURRENT_ACCOUNTS, len(account_ids)), 1),
+    ) as executor:
+        futures = {
+            executor.submit(
+                enable_cross_account_access,
+                account_id,
+                s3_buckets,
+                kms_key_arns,
+                sts,
+                event.get("execution_id"),
+            ): account_id
+            for account_id in account_ids
+        }
+    errors = []
+    for future, account_id in futures.items():
+        if future.exception() is not None:
+            LOGGER.error(
+                "Failed to enable cross-account access for account %s: %s",
+                account_id,
+                future.exception(),
+            )
+            errors.append(future.exception())
+    if errors:
+        raise errors[0]
+    updated_accounts = sum(future.result() for future in futures)
+    LOGGER.info(
+        "Enabled cross-account access for %d accounts, skipped %d",
+        updated_accounts,
+        len(futures) - updated_accounts,
     )
 
     return event
@@ -60,6 +60,19 @@ class IAMCfnDeployRolePolicy:
             )
         return None
 
+    @staticmethod
+    def _get_resources(statement):
+        resources = statement['Resource']
+        if isinstance(resources, list):
+            return set(resources)
+        return {resources}
+
+    def _add_resources(self, statement, resource_arns):
+        self.policy_changed = True
+        if not isinstance(statement['Resource'], list):
+            statement['Resource'] = [statement['Resource']]
+        statement['Resource'].extend(resource_arns)
+
     def grant_access_to_s3_buckets(self, bucket_names):
         """
         Updates the IAM Role Policy to grant access to the specified S3 Bucket.
@@ -79,8 +92,10 @@ class IAMCfnDeployRolePolicy:
         if statement is None:
             return
 
+        existing_resources = self._get_resources(statement)
         for bucket_name in bucket_names:
-            if f"arn:{PARTITION}:s3:::{bucket_name}" in statement['Resource']:
+            bucket_arn = f"arn:{PARTITION}:s3:::{bucket_name}"
+            if bucket_arn in existing_resources:
                 # The bucket is in the resource statement already, great!
                 continue
 
@@ -90,15 +105,8 @@ class IAMCfnDeployRolePolicy:
                 self.policy_name,
                 bucket_name,
             )
-            self.policy_changed = True
-            if not isinstance(statement['Resource'], list):
-                statement['Resource'] = [statement['Resource']]
-            statement['Resource'].append(
-                f"arn:{PARTITION}:s3:::{bucket_name}",
-            )
-            statement['Resource'].append(
-                f"arn:{PARTITION}:s3:::{bucket_name}/*",
-            )
+            self._add_resources(statement, [bucket_arn, f"{bucket_arn}/*"])
+            existing_resources.update([bucket_arn, f"{bucket_arn}/*"])
 
     def grant_access_to_kms_keys(self, kms_key_arns):
         """
@@ -119,8 +127,9 @@ class IAMCfnDeployRolePolicy:
         if statement is None:
             return
 
+        existing_resources = self._get_resources(statement)
         for kms_key_arn in kms_key_arns:
-            if kms_key_arn in statement['Resource']:
+            if kms_key_arn in existing_resources:
                 # The Key is in the resource statement already, great!
                 continue
             LOGGER.info(
@@ -129,27 +138,29 @@ class IAMCfnDeployRolePolicy:
                 self.policy_name,
                 kms_key_arn,
             )
-            self.policy_changed = True
-            if not isinstance(statement['Resource'], list):
-                statement['Resource'] = [statement['Resource']]
-            statement['Resource'].append(kms_key_arn)
+            self._add_resources(statement, [kms_key_arn])
+            existing_resources.add(kms_key_arn)
 
     def save(self):
         """
         Save the role policy if it was modified.
+
+        Returns:
+            bool: True if the policy was modified and saved.
         """
         if self.policy_changed is False:
             LOGGER.debug(
                 "Request to save the policy %s, while no changes were made.",
                 self.policy_name,
             )
-            return
+            return False
         self.client.put_role_policy(
             RoleName=self.role_name,
             PolicyName=self.policy_name,
             PolicyDocument=json.dumps(self.policy_document)
         )
         self.policy_changed = False
+        return True
 
     @staticmethod
     def update_iam_role_policies(
@@ -174,7 +185,11 @@ class IAMCfnDeployRolePolicy:
             role_policies (dict[str, list[str]): The role policies to update.
                 Where the key is the role name and the value captures the list
                 of policies names to update.
+
+        Returns:
+            int: The number of role policies that were updated.
         """
+        updated_policies = 0
         for role_name, policy_names in role_policies.items():
             for policy_name in policy_names:
                 iam_role_policy = IAMCfnDeployRolePolicy(
@@ -184,4 +199,6 @@ class IAMCfnDeployRolePolicy:
                 )
                 iam_role_policy.grant_access_to_s3_buckets(s3_bucket_names)
                 iam_role_policy.grant_access_to_kms_keys(kms_key_arns)
-                iam_role_policy.save()
+                if iam_role_policy.save():
+                    updated_policies += 1
+        return updated_policies
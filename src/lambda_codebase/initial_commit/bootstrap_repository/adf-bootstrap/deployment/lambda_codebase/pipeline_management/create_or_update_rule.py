@@ -20,12 +20,12 @@ from parameter_store import ParameterStore
 LOGGER = configure_logger(__name__)
 DEPLOYMENT_ACCOUNT_ID = os.environ["ACCOUNT_ID"]
 DEPLOYMENT_ACCOUNT_REGION = os.environ["AWS_REGION"]
-CLOUDWATCH = boto3.client("cloudwatch")
-METRICS = ADFMetrics(CLOUDWATCH, "PIPELINE_MANAGEMENT/RULE")
+METRICS = ADFMetrics(None, "PIPELINE_MANAGEMENT/RULE", emit_as_emf=True)
 
 _CACHE = None
 
 
+@METRICS.flush_after
 def lambda_handler(event, _):
     """
     Main Lambda Entry point, creating the cross-account EventBridge rule
@@ -15,12 +15,12 @@ from cloudwatch import ADFMetrics
 from parameter_store import ParameterStore
 
 
-CLOUDWATCH = boto3.client("cloudwatch")
-METRICS = ADFMetrics(CLOUDWATCH, "PIPELINE_MANAGEMENT/REPO")
+METRICS = ADFMetrics(None, "PIPELINE_MANAGEMENT/REPO", emit_as_emf=True)
 LOGGER = configure_logger(__name__)
 DEPLOYMENT_ACCOUNT_REGION = os.environ["AWS_REGION"]
 
 
+@METRICS.flush_after
 def lambda_handler(event, _):
     """
     Main Lambda Entry point, responsible for creating the CodeCommit
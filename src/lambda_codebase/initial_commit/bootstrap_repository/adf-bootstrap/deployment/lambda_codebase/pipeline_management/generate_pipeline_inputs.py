@@ -4,13 +4,24 @@
 """
 Pipeline Management Lambda Function
 Generates Pipeline Inputs
+
+The pipeline inputs are stored in the compact pipeline definition format
+in S3. Only the location of the definition is returned, as the definition
+of a pipeline that targets many accounts would exceed the state size limit
+of AWS Step Functions.
 """
 
 import os
 import boto3
 
 from pipeline import Pipeline
-from target import Target, TargetStructure
+from pipeline_definition import store_definition
+from target import (
+    Target,
+    TargetStructure,
+    fetch_allow_empty_target,
+    resolve_targets,
+)
 from organizations import Organizations
 from parameter_store import ParameterStore
 from sts import STS
@@ -22,6 +33,7 @@ LOGGER = configure_logger(__name__)
 DEPLOYMENT_ACCOUNT_REGION = os.environ["AWS_REGION"]
 DEPLOYMENT_ACCOUNT_ID = os.environ["ACCOUNT_ID"]
 MANAGEMENT_ACCOUNT_ID = os.environ["MANAGEMENT_ACCOUNT_ID"]
+PIPELINE_DEFINITION_BUCKET_NAME = os.environ["PIPELINE_DEFINITION_BUCKET_NAME"]
 
 ORGANIZATIONS_READONLY_ROLE = "adf/organizations/adf-organizations-readonly"
 
@@ -129,10 +141,13 @@ def generate_pipeline_inputs(
     """
     data = {}
     pipeline_object = Pipeline(pipeline)
+    allow_empty_target = fetch_allow_empty_target(parameter_store)
     total_pipeline_actions = 2
     # Assumption is that a Source and Build Stage is = 2 Actions
+    target_structures = []
     for target in pipeline.get("targets", []):
         target_structure = TargetStructure(target)
+        pipeline_targets = []
         for raw_step in target_structure.target:
             step = pipeline_object.merge_in_deploy_defaults(raw_step)
             paths_tags = []
@@ -142,13 +157,24 @@ def generate_pipeline_inputs(
                 paths_tags.append(step.get("tags", {}))
             for path_or_tag in paths_tags:
                 pipeline_object.stage_regions.append(step.get("regions"))
-                pipeline_target = Target(
+                pipeline_targets.append(Target(
                     path_or_tag,
                     target_structure,
                     organizations,
                     step,
-                )
-                pipeline_target.fetch_accounts_for_target()
+                    allow_empty_target=allow_empty_target,
+                ))
+        target_structures.append((target_structure, pipeline_targets))
+
+    # The targets are independent of one another, hence these are resolved
+    # concurrently. The order of the accounts found is preserved.
+    resolve_targets([
+        pipeline_target
+        for _, pipeline_targets in target_structures
+        for pipeline_target in pipeline_targets
+    ])
+
+    for target_structure, pipeline_targets in target_structures:
         # Targets should be a list of lists.
 
         # Note: This is a big shift away from how ADF handles targets natively.
@@ -159,8 +185,8 @@ def generate_pipeline_inputs(
         # consisting of multiple "waves". So if you see any reference to
         # a wave going forward it will be the individual batch of account ids.
 
-        waves, wave_action_count =  target_structure.generate_waves(
-            target=pipeline_target
+        waves, wave_action_count = target_structure.generate_waves(
+            target=pipeline_targets[-1],
         )
         pipeline_object.template_dictionary["targets"].append(list(waves))
         # Add the actions from the waves to the total_pipeline_actions count
@@ -209,7 +235,8 @@ def lambda_handler(event, _):
             holding the pipeline definition.
 
     Returns:
-        dict: The input event enriched with the pipeline inputs and ssm
+        dict: The input event enriched with the location of the stored
+            pipeline definition, holding the pipeline inputs and ssm
             parameter values retrieved.
     """
     parameter_store = ParameterStore(DEPLOYMENT_ACCOUNT_REGION, boto3)
@@ -230,7 +257,27 @@ def lambda_handler(event, _):
         parameter_store,
     )
 
+    definition_key = store_definition(
+        boto3.client("s3"),
+        PIPELINE_DEFINITION_BUCKET_NAME,
+        {
+            **event,
+            **pipeline_input_data,
+        },
+    )
+    LOGGER.info(
+        "Stored the pipeline definition at s3://%s/%s",
+        PIPELINE_DEFINITION_BUCKET_NAME,
+        definition_key,
+    )
+
     return {
         **event,
-        **pipeline_input_data,
+        "definition_key": definition_key,
+        # The folder that holds the definition, used as the source location
+        # of the pipeline management CodeBuild project.
+        "definition_location": (
+            f"{PIPELINE_DEFINITION_BUCKET_NAME}/"
+            f"{definition_key.rsplit('/', 1)[0]}/"
+        ),
     }
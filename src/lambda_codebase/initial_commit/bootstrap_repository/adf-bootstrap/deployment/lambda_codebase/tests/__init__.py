@@ -2,3 +2,8 @@
 # SPDX-License-Identifier: MIT-0
 
 # pylint: skip-file
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,223 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+from copy import deepcopy
+
+from mock import Mock, patch
+from pytest import fixture, raises
+
+import enable_cross_account_access
+from enable_cross_account_access import (
+    DEPLOYMENT_ROLE_POLICIES,
+    TARGET_ROLE_POLICIES,
+    enable_cross_account_access as enable_account,
+    fetch_regional_resources,
+    lambda_handler,
+)
+from errors import ParameterNotFoundError
+from iam_cfn_deploy_role_policy import IAMCfnDeployRolePolicy
+from .stubs import stub_iam
+
+DEPLOYMENT_ACCOUNT_ID = enable_cross_account_access.DEPLOYMENT_ACCOUNT_ID
+REGIONAL_PARAMETERS = {
+    "cross_region/s3_regional_bucket/eu-west-1": "bucket-eu-west-1",
+    "cross_region/kms_arn/eu-west-1": "kms-eu-west-1",
+    "cross_region/s3_regional_bucket/us-east-1": "bucket-us-east-1",
+    "cross_region/kms_arn/us-east-1": "kms-us-east-1",
+}
+
+
+@fixture(autouse=True)
+def clear_digest_cache():
+    enable_cross_account_access.POLICY_DIGEST_CACHE.clear()
+
+
+def _event(account_ids, execution_id=None):
+    return {
+        "deployment_account_region": "eu-west-1",
+        "deployment_account_id": DEPLOYMENT_ACCOUNT_ID,
+        "regions": ["us-east-1"],
+        "account_ids": account_ids,
+        "execution_id": execution_id,
+    }
+
+
+def test_fetch_regional_resources():
+    parameter_store = Mock()
+    parameter_store.fetch_parameters.return_value = REGIONAL_PARAMETERS
+
+    assert fetch_regional_resources(
+        parameter_store,
+        ["us-east-1", "eu-west-1", "us-east-1"],
+    ) == (
+        ["bucket-eu-west-1", "bucket-us-east-1"],
+        ["kms-eu-west-1", "kms-us-east-1"],
+    )
+    parameter_store.fetch_parameters.assert_called_once_with(
+        list(REGIONAL_PARAMETERS.keys()),
+    )
+
+
+def test_fetch_regional_resources_not_found():
+    parameter_store = Mock()
+    parameter_store.fetch_parameters.return_value = {
+        "cross_region/s3_regional_bucket/eu-west-1": "bucket-eu-west-1",
+    }
+
+    with raises(ParameterNotFoundError) as excinfo:
+        fetch_regional_resources(parameter_store, ["eu-west-1"])
+
+    assert str(excinfo.value) == (
+        "Parameter /adf/cross_region/kms_arn/eu-west-1 Not Found"
+    )
+
+
+@patch("enable_cross_account_access.boto3")
+@patch.object(IAMCfnDeployRolePolicy, "update_iam_role_policies")
+def test_enable_account_deployment_account(update_policies, boto3_mock):
+    sts = Mock()
+    update_policies.return_value = 2
+
+    assert enable_account(
+        DEPLOYMENT_ACCOUNT_ID,
+        ["bucket"],
+        ["kms"],
+        sts,
+    ) is True
+
+    sts.assume_cross_account_role.assert_not_called()
+    update_policies.assert_called_once_with(
+        boto3_mock.client.return_value,
+        ["bucket"],
+        ["kms"],
+        DEPLOYMENT_ROLE_POLICIES,
+    )
+
+
+@patch.object(IAMCfnDeployRolePolicy, "update_iam_role_policies")
+def test_enable_account_digest_cache(update_policies):
+    sts = Mock()
+
+    assert enable_account("222222222222", ["b"], ["k"], sts, "exec-1") is True
+    assert enable_account("222222222222", ["b"], ["k"], sts, "exec-1") is False
+    assert enable_account("222222222222", ["b"], ["k"], sts, "exec-2") is True
+    assert enable_account("222222222222", ["b"], ["k"], sts) is True
+    assert enable_account(
+        "222222222222",
+        ["b", "new-bucket"],
+        ["k"],
+        sts,
+        "exec-1",
+    ) is True
+
+    assert update_policies.call_count == 4
+    assert sts.assume_cross_account_role.call_count == 4
+    update_policies.assert_called_with(
+        sts.assume_cross_account_role.return_value.client.return_value,
+        ["b", "new-bucket"],
+        ["k"],
+        TARGET_ROLE_POLICIES,
+    )
+
+
+@patch("enable_cross_account_access.STS")
+@patch("enable_cross_account_access.ParameterStore")
+@patch.object(IAMCfnDeployRolePolicy, "update_iam_role_policies")
+def test_lambda_handler_batch(update_policies, parameter_store_cls, sts_cls):
+    parameter_store_cls.return_value.fetch_parameters.return_value = (
+        REGIONAL_PARAMETERS
+    )
+    account_ids = [f"{index}" * 12 for index in range(2, 8)]
+    event = _event(account_ids, "exec-1")
+
+    assert lambda_handler(event, None) == event
+    assert lambda_handler(event, None) == event
+
+    assert parameter_store_cls.return_value.fetch_parameters.call_count == 2
+    assert sts_cls.call_count == 2
+    assert update_policies.call_count == len(account_ids)
+    assert sorted(
+        call.args[0]
+        for call in sts_cls.return_value.assume_cross_account_role.call_args_list
+    ) == [
+        f"arn:aws:iam::{account_id}:role/adf/bootstrap/"
+        "adf-update-cross-account-access"
+        for account_id in account_ids
+    ]
+    for call in update_policies.call_args_list:
+        assert call.args[1:] == (
+            ["bucket-eu-west-1", "bucket-us-east-1"],
+            ["kms-eu-west-1", "kms-us-east-1"],
+            TARGET_ROLE_POLICIES,
+        )
+
+
+@patch("enable_cross_account_access.STS")
+@patch("enable_cross_account_access.ParameterStore")
+@patch.object(IAMCfnDeployRolePolicy, "update_iam_role_policies")
+def test_lambda_handler_batch_failure(
+    update_policies,
+    parameter_store_cls,
+    sts_cls,
+):
+    parameter_store_cls.return_value.fetch_parameters.return_value = (
+        REGIONAL_PARAMETERS
+    )
+    account_ids = ["222222222222", "333333333333", "444444444444"]
+    update_policies.side_effect = [None, Exception("Access denied"), None]
+
+    with raises(Exception, match="Access denied"):
+        lambda_handler(_event(account_ids), None)
+
+    assert update_policies.call_count == 3
+
+
+@patch("enable_cross_account_access.STS")
+@patch("enable_cross_account_access.ParameterStore")
+@patch.object(IAMCfnDeployRolePolicy, "update_iam_role_policies")
+def test_lambda_handler_single_account(
+    update_policies,
+    parameter_store_cls,
+    sts_cls,
+):
+    parameter_store_cls.return_value.fetch_parameters.return_value = (
+        REGIONAL_PARAMETERS
+    )
+    event = _event(["333333333333"])
+    event["account_id"] = "222222222222"
+
+    lambda_handler(event, None)
+
+    update_policies.assert_called_once()
+    sts_cls.return_value.assume_cross_account_role.assert_called_once_with(
+        "arn:aws:iam::222222222222:role/adf/bootstrap/"
+        "adf-update-cross-account-access",
+        "base_cfn_role",
+    )
+
+
+def test_update_iam_role_policies_counts_updated_policies():
+    iam_client = Mock()
+    iam_client.get_role_policy.side_effect = (
+        lambda **kwargs: deepcopy(stub_iam.get_role_policy)
+    )
+
+    assert IAMCfnDeployRolePolicy.update_iam_role_policies(
+        iam_client,
+        ["existing_bucket"],
+        ["arn:aws:kms:eu-west-1:111111111111:key/existing_key"],
+        {"RoleName": ["PolicyA", "PolicyB"]},
+    ) == 0
+    assert IAMCfnDeployRolePolicy.update_iam_role_policies(
+        iam_client,
+        ["existing_bucket", "new_bucket", "new_bucket"],
+        [],
+        {"RoleName": ["PolicyA"]},
+    ) == 1
+    iam_client.put_role_policy.assert_called_once()
+    policy_document = iam_client.put_role_policy.call_args.kwargs[
+        "PolicyDocument"
+    ]
+    assert policy_document.count("arn:aws:s3:::new_bucket\"") == 1
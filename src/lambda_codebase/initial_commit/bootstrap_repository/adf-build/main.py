@@ -8,22 +8,23 @@ is executed from within AWS CodeBuild in the management account
 
 import os
 import sys
-import time
 from math import floor
 from datetime import datetime, timezone
 from thread import PropagatingThread
 
 import boto3
 
+import instrumentation
 from logger import configure_logger
 from cache import Cache
 from cloudformation import CloudFormation
 from parameter_store import ParameterStore
 from organizations import Organizations
-from stepfunctions import StepFunctions
+from stepfunctions import ExecutionWatcher, StepFunctions
 from errors import GenericAccountConfigureError, ParameterNotFoundError, Error
 from sts import STS
 from s3 import S3
+from bootstrap_templates import BootstrapTemplateIndex
 from partition import get_partition
 from config import Config
 from organization_policy import OrganizationPolicy
@@ -234,12 +235,15 @@ def worker_thread(
     sts,
     config,
     s3,
+    template_index,
     cache,
     updated_kms_bucket_dict,
 ):
     """
     The Worker thread function that is created for each account
-    in which CloudFormation create_stack is called
+    in which CloudFormation create_stack is called.
+    The template index is shared by all worker threads, such that the
+    bootstrap templates are resolved without additional S3 requests.
     """
     LOGGER.debug("%s - Starting new worker thread", account_id)
 
@@ -301,6 +305,7 @@ def worker_thread(
                 s3=s3,
                 s3_key_path="adf-bootstrap/" + account_path,
                 account_id=account_id,
+                template_index=template_index,
             )
             try:
                 cloudformation.delete_deprecated_base_stacks()
@@ -327,29 +332,37 @@ def worker_thread(
 
 
 def await_sfn_executions(sfn_client):
-    _await_running_sfn_executions(
-        sfn_client,
+    management_watcher = ExecutionWatcher(sfn_client)
+    management_watcher.track_executions_started_after(
         ACCOUNT_MANAGEMENT_STATE_MACHINE_ARN,
+        started_after=CODEBUILD_START_TIME_UNIXTS,
         filter_lambda=lambda item: (
             item.get("name", "").find(CODEPIPELINE_EXECUTION_ID) > 0
         ),
-        status_filter="RUNNING",
     )
-    _await_running_sfn_executions(
-        sfn_client,
+    LOGGER.info(
+        "Awaiting the executions of %s",
+        ACCOUNT_MANAGEMENT_STATE_MACHINE_ARN,
+    )
+    management_watcher.wait()
+
+    # The account management executions can trigger account bootstrapping
+    # executions, hence these are only discovered after the former finished.
+    bootstrapping_watcher = ExecutionWatcher(sfn_client)
+    bootstrapping_watcher.track_running_executions(
         ACCOUNT_BOOTSTRAPPING_STATE_MACHINE_ARN,
-        filter_lambda=None,
-        status_filter="RUNNING",
     )
-    if _sfn_execution_exists_with(
-        sfn_client,
-        ACCOUNT_MANAGEMENT_STATE_MACHINE_ARN,
-        filter_lambda=lambda item: (
-            item.get("name", "").find(CODEPIPELINE_EXECUTION_ID) > 0
-            and item.get("status") in ["FAILED", "TIMED_OUT", "ABORTED"]
-        ),
-        status_filter=None,
-    ):
+    bootstrapping_watcher.track_executions_started_after(
+        ACCOUNT_BOOTSTRAPPING_STATE_MACHINE_ARN,
+        started_after=CODEBUILD_START_TIME_UNIXTS,
+    )
+    LOGGER.info(
+        "Awaiting the executions of %s",
+        ACCOUNT_BOOTSTRAPPING_STATE_MACHINE_ARN,
+    )
+    bootstrapping_watcher.wait()
+
+    if management_watcher.failed_executions():
         LOGGER.error(
             "Account Management State Machine encountered a failed, "
             "timed out, or aborted execution. Please look into this problem "
@@ -370,18 +383,7 @@ def await_sfn_executions(sfn_client):
             "the state machine's progress.",
         )
         sys.exit(1)
-    if _sfn_execution_exists_with(
-        sfn_client,
-        ACCOUNT_BOOTSTRAPPING_STATE_MACHINE_ARN,
-        filter_lambda=lambda item: (
-            (
-                item.get("startDate", datetime.now(timezone.utc)).timestamp()
-                >= CODEBUILD_START_TIME_UNIXTS
-            )
-            and item.get("status") in ["FAILED", "TIMED_OUT", "ABORTED"]
-        ),
-        status_filter=None,
-    ):
+    if bootstrapping_watcher.failed_executions():
         LOGGER.error(
             "Account Bootstrapping State Machine encountered a failed, "
             "timed out, or aborted execution. Please look into this problem "
@@ -396,54 +398,10 @@ def await_sfn_executions(sfn_client):
         sys.exit(2)
 
 
-def _await_running_sfn_executions(
-    sfn_client,
-    sfn_arn,
-    filter_lambda,
-    status_filter,
-):
-    while _sfn_execution_exists_with(sfn_client, sfn_arn, filter_lambda, status_filter):
-        LOGGER.info(
-            "Waiting for 30 seconds for the executions of %s to finish.",
-            sfn_arn,
-        )
-        time.sleep(30)
-
-
-def _sfn_execution_exists_with(
-    sfn_client,
-    sfn_arn,
-    filter_lambda,
-    status_filter,
-):
-    request_params = {
-        "stateMachineArn": sfn_arn,
-    }
-    if status_filter:
-        request_params["statusFilter"] = status_filter
-
-    paginator = sfn_client.get_paginator("list_executions")
-    for page in paginator.paginate(**request_params):
-        filtered = (
-            list(filter(filter_lambda, page["executions"]))
-            if filter_lambda
-            else page["executions"]
-        )
-        if filtered:
-            LOGGER.info(
-                "Found %d state machine %s that %s running.",
-                len(filtered),
-                "executions" if len(filtered) > 1 else "execution",
-                "are" if len(filtered) > 1 else "is",
-            )
-            return True
-
-    return False
-
-
 def main():  # pylint: disable=R0915
     LOGGER.info("ADF Version %s", ADF_VERSION)
     LOGGER.info("ADF Log Level is %s", ADF_LOG_LEVEL)
+    instrumentation.enable_from_environment()
 
     await_sfn_executions(boto3.client("stepfunctions"))
 
@@ -470,6 +428,7 @@ def main():  # pylint: disable=R0915
             account_path=[],
         )
         s3 = S3(region=REGION_DEFAULT, bucket=S3_BUCKET_NAME)
+        template_index = BootstrapTemplateIndex(s3)
 
         kms_and_bucket_dict = {}
         # First Setup/Update the Deployment Account in all regions (KMS Key and
@@ -484,6 +443,7 @@ def main():  # pylint: disable=R0915
                 s3=s3,
                 s3_key_path="adf-bootstrap/" + account_path,
                 account_id=deployment_account_id,
+                template_index=template_index,
             )
             cloudformation.delete_deprecated_base_stacks()
             cloudformation.create_stack()
@@ -517,6 +477,7 @@ def main():  # pylint: disable=R0915
                     sts,
                     config,
                     s3,
+                    template_index,
                     cache,
                     kms_and_bucket_dict,
                 ),
@@ -548,4 +509,7 @@ def main():  # pylint: disable=R0915
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        instrumentation.report()
@@ -7,14 +7,19 @@ Organizations Policy (SCP/Tagging) module used throughout the ADF.
 
 import glob
 import ast
+import hashlib
+import json
 import os
 
-from organizations import Organizations
+from organizations import Organizations, OrganizationsException
 from errors import ParameterNotFoundError
 from logger import configure_logger
 
 LOGGER = configure_logger(__name__)
 REGION_DEFAULT = os.getenv("AWS_REGION")
+# The length of the policy hashes that are stored in Parameter Store,
+# these are truncated to stay within the standard parameter size limit.
+POLICY_HASH_LENGTH = 16
 
 
 class OrganizationPolicy:
@@ -108,10 +113,53 @@ class OrganizationPolicy:
             path,
         )
 
+    @staticmethod
+    def _hash_policy(policy_body, access_identifier=None):
+        """
+        Returns the hash of the policy as it would be applied. For SCPs,
+        the keep-default-scp setting is part of the hash, as changing it
+        requires the FullAWSAccess attachment to be updated.
+        """
+        keep_default_scp = (access_identifier or {}).get("keep-default-scp")
+        return hashlib.sha256(
+            json.dumps([policy_body, keep_default_scp]).encode("utf-8"),
+        ).hexdigest()[:POLICY_HASH_LENGTH]
+
+    @staticmethod
+    def _fetch_applied_policies(parameter_store, parameter_name):
+        """
+        Returns the policy files that were applied by the last run, mapped
+        to their hashes. The hashes are None if the policies were applied
+        by a version of ADF that did not store them. Returns None if no
+        policy was applied before.
+        """
+        try:
+            applied_policies = ast.literal_eval(
+                parameter_store.fetch_parameter(parameter_name)
+            )
+        except ParameterNotFoundError:
+            LOGGER.debug(
+                "Parameter %s was not found in Parameter Store, continuing.",
+                parameter_name,
+            )
+            return None
+        if isinstance(applied_policies, dict):
+            return applied_policies
+        return dict.fromkeys(applied_policies)
+
+    @staticmethod
+    def _trim_policy_file_name(policy, policy_file):
+        return (
+            OrganizationPolicy._trim_scp_file_name(policy_file)
+            if policy == "scp"
+            else OrganizationPolicy._trim_tagging_policy_file_name(
+                policy_file,
+            )
+        )
+
     def apply(
         self, organizations, parameter_store, config
     ):
-        # pylint: disable=too-many-locals
         status = organizations.get_organization_info()
         if status.get("feature_set") != "ALL":
             LOGGER.info(
@@ -124,11 +172,6 @@ class OrganizationPolicy:
             "Determining if Organization Policy changes are required. "
             "(Tagging or Service Controls)",
         )
-        organization_mapping = organizations.get_organization_map(
-            {
-                "/": organizations.get_ou_root_id(),
-            }
-        )
 
         supported_policies = ["scp", "tagging-policy"]
 
@@ -136,109 +179,192 @@ class OrganizationPolicy:
             supported_policies = ["scp"]
 
         for policy in supported_policies:
-            _type = "SERVICE_CONTROL_POLICY" if policy == "scp" else "TAG_POLICY"
-            organizations.enable_organization_policies(_type)
-            _policies = OrganizationPolicy._find_all(policy)
+            self._apply_policies(organizations, parameter_store, config, policy)
+
+    def _apply_policies(self, organizations, parameter_store, config, policy):
+        """
+        Applies the policy files of the given policy type that changed
+        since the last run. The hashes of the applied policy files are
+        stored in Parameter Store. Only the targets of the policies that
+        changed or got removed are resolved and updated.
+        """
+        _type = "SERVICE_CONTROL_POLICY" if policy == "scp" else "TAG_POLICY"
+        # Make the key consistently use underscores instead of dashes.
+        # So tagging-policy gets changed into tagging_policy.
+        parameter_name = policy.replace('-', '_')
+        access_identifier = config.get("scp") if policy == "scp" else None
+        policy_bodies = {
+            policy_file: Organizations.get_policy_body(policy_file)
+            for policy_file in OrganizationPolicy._find_all(policy)
+        }
+        policy_hashes = {
+            policy_file: OrganizationPolicy._hash_policy(
+                policy_body,
+                access_identifier,
+            )
+            for policy_file, policy_body in policy_bodies.items()
+        }
+        applied_policies = OrganizationPolicy._fetch_applied_policies(
+            parameter_store,
+            parameter_name,
+        )
+        if applied_policies == policy_hashes:
+            LOGGER.info(
+                "Policies (%s) did not change since they were applied last, "
+                "no updates are required.",
+                policy,
+            )
+            return
+
+        organizations.enable_organization_policies(_type)
+        self._remove_policies(
+            organizations,
+            policy,
+            applied_policies or {},
+            policy_hashes,
+        )
+        self._update_policies(
+            organizations,
+            policy,
+            access_identifier,
+            policy_bodies,
+            {
+                policy_file: policy_hash
+                for policy_file, policy_hash in policy_hashes.items()
+                if (applied_policies or {}).get(policy_file) != policy_hash
+            },
+        )
+        parameter_store.put_parameter(
+            parameter_name,
+            str(policy_hashes),
+        )
+
+    @staticmethod
+    def _remove_policies(
+        organizations, policy, applied_policies, policy_hashes,
+    ):
+        """
+        Detaches and deletes the policies of the policy files that were
+        applied before, but that no longer exist.
+        """
+        _type = "SERVICE_CONTROL_POLICY" if policy == "scp" else "TAG_POLICY"
+        for applied_policy in applied_policies:
+            if applied_policy in policy_hashes:
+                continue
+            path = OrganizationPolicy._trim_policy_file_name(
+                policy,
+                applied_policy,
+            )
             try:
-                current_stored_policy = ast.literal_eval(
-                    parameter_store.fetch_parameter(policy.replace('-', '_'))
-                )
-                for stored_policy in current_stored_policy:
-                    path = (
-                        OrganizationPolicy._trim_scp_file_name(stored_policy)
-                        if policy == "scp"
-                        else OrganizationPolicy._trim_tagging_policy_file_name(
-                            stored_policy
-                        )
-                    )
-                    OrganizationPolicy.set_scp_attachment(
-                        config.get("scp"), organization_mapping, path, organizations
-                    )
-                    if stored_policy not in _policies:
-                        OrganizationPolicy.clean_and_remove_policy_attachment(
-                            organization_mapping,
-                            path,
-                            organizations,
-                            _type,
-                        )
-            except ParameterNotFoundError:
-                LOGGER.debug(
-                    "Parameter %s was not found in Parameter Store, continuing.",
+                target_id = organizations.get_policy_target_id(path)
+            except OrganizationsException:
+                LOGGER.warning(
+                    "Policy (%s) cannot be removed, as its target no longer "
+                    "exists. Path is: %s",
                     policy,
+                    path,
                 )
+                continue
+            OrganizationPolicy.clean_and_remove_policy_attachment(
+                {path: target_id},
+                path,
+                organizations,
+                _type,
+            )
 
-            for _policy in _policies:
-                path = (
-                    OrganizationPolicy._trim_scp_file_name(_policy)
-                    if policy == "scp"
-                    else OrganizationPolicy._trim_tagging_policy_file_name(
-                        _policy,
-                    )
+    def _update_policies(
+        self, organizations, policy, access_identifier, policy_bodies,
+        changed_policies,
+    ):
+        """
+        Creates or updates and attaches the policies of the policy files
+        that changed since the last run.
+        """
+        for policy_file in changed_policies:
+            path = OrganizationPolicy._trim_policy_file_name(
+                policy,
+                policy_file,
+            )
+            organization_mapping = {
+                path: organizations.get_policy_target_id(path),
+            }
+            self._apply_policy(
+                organizations,
+                organization_mapping,
+                path,
+                policy,
+                policy_bodies[policy_file],
+            )
+            if policy == "scp":
+                OrganizationPolicy.set_scp_attachment(
+                    access_identifier,
+                    organization_mapping,
+                    path,
+                    organizations,
                 )
-                policy_id = organizations.describe_policy_id_for_target(
+
+    def _apply_policy(
+        self, organizations, organization_mapping, path, policy,
+        proposed_policy,
+    ):
+        _type = "SERVICE_CONTROL_POLICY" if policy == "scp" else "TAG_POLICY"
+        policy_id = organizations.describe_policy_id_for_target(
+            organization_mapping[path],
+            _type,
+        )
+        if policy_id:
+            current_policy = organizations.describe_policy(policy_id)
+            if self._compare_ordered_policy(
+                current_policy.get("Content")
+            ) == self._compare_ordered_policy(proposed_policy):
+                LOGGER.info(
+                    "Policy (%s) %s does not require updating. Path is: %s",
+                    policy,
                     organization_mapping[path],
-                    _type,
+                    path,
                 )
-                proposed_policy = Organizations.get_policy_body(_policy)
-                if policy_id:
-                    current_policy = organizations.describe_policy(policy_id)
-                    if self._compare_ordered_policy(
-                        current_policy.get("Content")
-                    ) == self._compare_ordered_policy(proposed_policy):
-                        LOGGER.info(
-                            "Policy (%s) %s does not require updating. Path is: %s",
-                            policy,
-                            organization_mapping[path],
-                            path,
-                        )
-                        continue
-                    LOGGER.info(
-                        "Policy (%s) will be updated for %s. Path is: %s",
-                        policy,
-                        organization_mapping[path],
-                        path,
-                    )
-                    organizations.update_policy(
-                        proposed_policy,
-                        policy_id,
-                    )
-                    continue
-                try:
-                    policy_id = organizations.create_policy(
-                        proposed_policy,
-                        path,
-                        _type,
-                    )
-                    LOGGER.info(
-                        "Policy (%s) has been created for %s. Path is: %s",
-                        policy,
-                        organization_mapping[path],
-                        path,
-                    )
-                    organizations.attach_policy(
-                        policy_id,
-                        organization_mapping[path],
-                    )
-                except organizations.client.exceptions.DuplicatePolicyAttachmentException:
-                    LOGGER.info(
-                        "Policy (%s) for %s exists and is attached already.",
-                        policy,
-                        organization_mapping[path],
-                    )
-                except organizations.client.exceptions.DuplicatePolicyException:
-                    LOGGER.info(
-                        "Policy (%s) for %s exists ensuring attached.",
-                        policy,
-                        organization_mapping[path],
-                    )
-                    policy_id = organizations.list_policies(
-                        f"adf-{policy}-{path}",
-                        _type,
-                    )
-                    organizations.attach_policy(policy_id, organization_mapping[path])
-            parameter_store.put_parameter(
-                # Make the key consistently use underscores instead of dashes.
-                # So tagging-policy gets changed into tagging_policy.
-                policy.replace('-', '_'),
-                str(_policies),
+                return
+            LOGGER.info(
+                "Policy (%s) will be updated for %s. Path is: %s",
+                policy,
+                organization_mapping[path],
+                path,
+            )
+            organizations.update_policy(
+                proposed_policy,
+                policy_id,
+            )
+            return
+        try:
+            policy_id = organizations.create_policy(
+                proposed_policy,
+                path,
+                _type,
+            )
+            LOGGER.info(
+                "Policy (%s) has been created for %s. Path is: %s",
+                policy,
+                organization_mapping[path],
+                path,
+            )
+            organizations.attach_policy(
+                policy_id,
+                organization_mapping[path],
+            )
+        except organizations.client.exceptions.DuplicatePolicyAttachmentException:
+            LOGGER.info(
+                "Policy (%s) for %s exists and is attached already.",
+                policy,
+                organization_mapping[path],
+            )
+        except organizations.client.exceptions.DuplicatePolicyException:
+            LOGGER.info(
+                "Policy (%s) for %s exists ensuring attached.",
+                policy,
+                organization_mapping[path],
+            )
+            policy_id = organizations.list_policies(
+                f"adf-{policy}-{path}",
+                _type,
             )
+            organizations.attach_policy(policy_id, organization_mapping[path])
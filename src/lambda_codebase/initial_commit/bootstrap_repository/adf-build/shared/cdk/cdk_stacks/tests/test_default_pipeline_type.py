@@ -5,6 +5,7 @@
 
 from aws_cdk import App
 from cdk_stacks.main import PipelineStack
+from pipeline_definition import deserialize_definition, serialize_definition
 
 
 def test_pipeline_creation_outputs_as_expected_when_input_has_1_target_with_2_waves():
@@ -142,3 +143,76 @@ def test_pipeline_creation_outputs_as_expected_when_input_has_2_targets_with_2_w
     target_2_wave_1 = code_pipeline["Properties"]["Stages"][4]
     assert target_2_wave_1["Name"] == "deployment-stage-2-wave-0"
     assert len(target_2_wave_1["Actions"]) == 1
+
+
+def test_pipeline_creation_from_compact_definition_matches_regular_definition():
+    region_name = "eu-central-1"
+    account_id = "123456789012"
+    step = {
+        "path": "/some/ou",
+        "properties": {},
+        "provider": "cloudformation",
+        "regions": ["eu-west-1", "eu-central-1"],
+        "step_name": "",
+    }
+    stack_input = {
+        "pipeline_input": {
+            "name": "test-stack",
+            "params": {},
+            "default_providers": {
+                "source": {
+                    "provider": "codecommit",
+                    "properties": {"account_id": account_id},
+                },
+                "build": {
+                    "provider": "codebuild",
+                    "properties": {"image": "STANDARD_7_0"},
+                },
+                "deploy": {"provider": "cloudformation"},
+            },
+            "regions": {},
+            "environments": {
+                "targets": [
+                    [
+                        [
+                            {"id": "001", "name": "account-1", **step},
+                            {"id": "002", "name": "account-2", **step},
+                        ],
+                        [
+                            {"id": "003", "name": "account-3", **step},
+                        ],
+                    ],
+                ],
+            },
+        },
+        "ssm_params": {
+            region_name: {
+                "modules": "fake-bucket-name",
+                "kms": (
+                    f"arn:aws:kms:{region_name}:{account_id}:key/"
+                    "my-unique-kms-key-id"
+                ),
+            },
+            "eu-west-1": {
+                "s3": "fake-bucket-name",
+                "kms": (
+                    f"arn:aws:kms:eu-west-1:{account_id}:key/"
+                    "my-unique-kms-key-id"
+                ),
+            },
+        },
+        "deployment_map_source": "S3",
+        "deployment_map_name": "deployment_map.yml",
+    }
+
+    templates = []
+    for definition in [
+        stack_input,
+        deserialize_definition(serialize_definition(stack_input)),
+    ]:
+        app = App()
+        PipelineStack(app, definition)
+        templates.append(app.synth().stacks[0].template)
+
+    assert templates[0] == templates[1]
+
@@ -8,6 +8,8 @@ This file is pulled into CodeBuild containers
 and used to build the pipeline CloudFormation stacks via the AWS CDK.
 """
 
+import hashlib
+import json
 import random
 import os
 import glob
@@ -15,6 +17,7 @@ import time
 from thread import PropagatingThread
 import boto3
 
+import instrumentation
 from s3 import S3
 from logger import configure_logger
 from cloudformation import CloudFormation
@@ -31,24 +34,108 @@ ADF_PIPELINE_PREFIX = os.environ["ADF_PIPELINE_PREFIX"]
 ADF_VERSION = os.environ["ADF_VERSION"]
 ADF_LOG_LEVEL = os.environ["ADF_LOG_LEVEL"]
 CLOUDFORMATION_ROLE_ARN = os.environ["CLOUDFORMATION_ROLE_ARN"]
+# The hash of the synthesized template is stored in the metadata of the
+# uploaded template and as an output of the deployed pipeline stack.
+TEMPLATE_HASH_METADATA_KEY = "adf-template-hash"
+TEMPLATE_HASH_OUTPUT = "ADFTemplateHash"
+# The stack states in which the stack runs the template it last reported
+# the hash of in its outputs.
+STABLE_STACK_STATES = [
+    "CREATE_COMPLETE",
+    "UPDATE_COMPLETE",
+    "UPDATE_ROLLBACK_COMPLETE",
+]
 
 
-def upload_pipeline(template_path, name, s3):
+def prepare_template(template_path):
+    """
+    Calculate the hash of the synthesized template and write the template
+    that should be uploaded, with the hash added to its outputs.
+
+    CloudFormation reads templates of up to 1 MB from S3, the template is
+    written without whitespace to keep large pipelines within that limit.
+
+    Args:
+        template_path (str): The path of the synthesized template.
+
+    Returns:
+        tuple[str, str]: The path of the template to upload and the hash
+            of the synthesized template.
+    """
+    with open(template_path, encoding='utf-8') as template_file:
+        template = json.load(template_file)
+    template_hash = hashlib.sha256(
+        json.dumps(
+            template,
+            sort_keys=True,
+            separators=(',', ':'),
+        ).encode('utf-8'),
+    ).hexdigest()
+    template.setdefault('Outputs', {})[TEMPLATE_HASH_OUTPUT] = {
+        'Value': template_hash,
+    }
+    upload_path = f"{os.path.splitext(template_path)[0]}.upload.json"
+    with open(upload_path, mode='w', encoding='utf-8') as upload_file:
+        json.dump(template, upload_file, separators=(',', ':'))
+    return upload_path, template_hash
+
+
+def upload_pipeline(template_path, name, s3, template_hash):
     """
     Responsible for uploading the object (global.yml) to S3
     and returning the URL that can be referenced in the
     CloudFormation create_stack call.
+
+    The upload is skipped when the object in S3 holds the template with
+    the given hash already.
+
+    Returns:
+        tuple[str, bool]: The URL of the object and whether it was
+            uploaded.
     """
+    s3_key = f"pipelines/{name}/global.yml"
+    metadata = s3.get_object_metadata(s3_key) or {}
+    if metadata.get(TEMPLATE_HASH_METADATA_KEY) == template_hash:
+        LOGGER.debug('Pipeline Template %s is up to date in S3', s3_key)
+        return s3.build_pathing_style('path', s3_key), False
+
     s3_object_path = s3.put_object(
-        f"pipelines/{name}/global.yml",
+        s3_key,
         template_path,
+        metadata={TEMPLATE_HASH_METADATA_KEY: template_hash},
     )
     LOGGER.debug('Uploaded Pipeline Template %s to S3', s3_object_path)
-    return s3_object_path
+    return s3_object_path, True
+
+
+def is_stack_up_to_date(cloudformation, template_hash):
+    """
+    Returns:
+        bool: True if the stack runs the template with the given hash.
+    """
+    outputs = cloudformation.get_stack_outputs()
+    return (
+        outputs.get(TEMPLATE_HASH_OUTPUT) == template_hash
+        and cloudformation.get_stack_status() in STABLE_STACK_STATES
+    )
 
 
 def worker_thread(template_path, name, s3):
-    s3_object_path = upload_pipeline(template_path, name, s3)
+    """
+    Upload the pipeline template and deploy the pipeline stack, unless
+    neither the template in S3 nor the stack changed.
+
+    Returns:
+        tuple[bool, bool]: Whether the template was uploaded and whether
+            the stack was deployed.
+    """
+    upload_path, template_hash = prepare_template(template_path)
+    s3_object_path, uploaded = upload_pipeline(
+        upload_path,
+        name,
+        s3,
+        template_hash,
+    )
     cloudformation = CloudFormation(
         region=DEPLOYMENT_ACCOUNT_REGION,
         deployment_account_region=DEPLOYMENT_ACCOUNT_REGION,
@@ -62,12 +149,17 @@ def worker_thread(template_path, name, s3):
         account_id=DEPLOYMENT_ACCOUNT_ID,
         role_arn=CLOUDFORMATION_ROLE_ARN,
     )
+    if not uploaded and is_stack_up_to_date(cloudformation, template_hash):
+        LOGGER.info('Pipeline %s is up to date, skipping its stack', name)
+        return uploaded, False
     cloudformation.create_stack()
+    return uploaded, True
 
 
 def main():
     LOGGER.info('ADF Version %s', ADF_VERSION)
     LOGGER.info("ADF Log Level is %s", ADF_LOG_LEVEL)
+    instrumentation.enable_from_environment()
     s3 = S3(
         region=DEPLOYMENT_ACCOUNT_REGION,
         bucket=S3_BUCKET_NAME,
@@ -101,9 +193,19 @@ def main():
                 )
                 time.sleep(delay)
 
-    for thread in threads:
-        thread.join()
+    results = [thread.join() for thread in threads]
+    LOGGER.info(
+        'Processed %d pipelines: uploaded %d templates, deployed %d stacks, '
+        'skipped %d unchanged pipelines',
+        len(results),
+        sum(uploaded for uploaded, _ in results),
+        sum(deployed for _, deployed in results),
+        sum(not deployed for _, deployed in results),
+    )
 
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    finally:
+        instrumentation.report()
@@ -10,13 +10,13 @@ and used to build the pipeline CloudFormation stacks via the AWS CDK
 
 import glob
 import os
-import json
 
 # CDK Specific
 from aws_cdk import App, BootstraplessSynthesizer
 from cdk_stacks.main import PipelineStack
 
 from logger import configure_logger
+from pipeline_definition import load_definition_file
 
 LOGGER = configure_logger(__name__)
 ADF_VERSION = os.environ["ADF_VERSION"]
@@ -26,17 +26,21 @@ ADF_LOG_LEVEL = os.environ["ADF_LOG_LEVEL"]
 def main():
     LOGGER.info("ADF Version %s", ADF_VERSION)
     LOGGER.info("ADF Log Level is %s", ADF_LOG_LEVEL)
-    _templates = glob.glob("cdk_inputs/*.json")
+    # The pipeline definitions are stored in the compact and gzip compressed
+    # format. Definitions stored in the legacy JSON format are supported too.
+    _templates = sorted(
+        glob.glob("cdk_inputs/*.json")
+        + glob.glob("cdk_inputs/*.json.gz")
+    )
     for template_path in _templates:
-        with open(template_path, encoding="utf-8") as template:
-            stack_input = json.load(template)
-            app = App()
-            PipelineStack(
-                app,
-                stack_input,
-                synthesizer=BootstraplessSynthesizer(),
-            )
-            app.synth()
+        stack_input = load_definition_file(template_path)
+        app = App()
+        PipelineStack(
+            app,
+            stack_input,
+            synthesizer=BootstraplessSynthesizer(),
+        )
+        app.synth()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+
+from mock import Mock, patch
+
+from execute_pipeline_stacks import (
+    TEMPLATE_HASH_METADATA_KEY,
+    TEMPLATE_HASH_OUTPUT,
+    prepare_template,
+    upload_pipeline,
+    worker_thread,
+)
+
+TEMPLATE = {
+    "Resources": {
+        "Pipeline": {
+            "Type": "AWS::CodePipeline::Pipeline",
+            "Properties": {"Name": "some-pipeline"},
+        },
+    },
+}
+S3_URL = "https://s3-eu-central-1.amazonaws.com/some_bucket/pipelines/x"
+
+
+def _write_template(tmp_path, template=None, indent=1):
+    template_path = tmp_path / "some-pipeline.template.json"
+    template_path.write_text(json.dumps(template or TEMPLATE, indent=indent))
+    return str(template_path)
+
+
+def test_prepare_template(tmp_path):
+    upload_path, template_hash = prepare_template(_write_template(tmp_path))
+
+    assert upload_path == str(tmp_path / "some-pipeline.template.upload.json")
+    with open(upload_path, encoding="utf-8") as upload_file:
+        body = upload_file.read()
+    assert "\n" not in body
+    assert json.loads(body) == {
+        **TEMPLATE,
+        "Outputs": {TEMPLATE_HASH_OUTPUT: {"Value": template_hash}},
+    }
+    assert prepare_template(
+        _write_template(tmp_path, indent=4),
+    )[1] == template_hash
+    assert prepare_template(_write_template(tmp_path, {
+        "Resources": {},
+    }))[1] != template_hash
+
+
+def test_upload_pipeline_skips_unchanged_template():
+    s3 = Mock()
+    s3.get_object_metadata.return_value = {
+        TEMPLATE_HASH_METADATA_KEY: "some-hash",
+    }
+    s3.build_pathing_style.return_value = S3_URL
+
+    assert upload_pipeline(
+        "template.json",
+        "some-pipeline",
+        s3,
+        "some-hash",
+    ) == (S3_URL, False)
+    s3.get_object_metadata.assert_called_once_with(
+        "pipelines/some-pipeline/global.yml",
+    )
+    s3.put_object.assert_not_called()
+
+
+def test_upload_pipeline_uploads_changed_template():
+    s3 = Mock()
+    s3.get_object_metadata.return_value = None
+    s3.put_object.return_value = S3_URL
+
+    assert upload_pipeline(
+        "template.json",
+        "some-pipeline",
+        s3,
+        "some-hash",
+    ) == (S3_URL, True)
+    s3.put_object.assert_called_once_with(
+        "pipelines/some-pipeline/global.yml",
+        "template.json",
+        metadata={TEMPLATE_HASH_METADATA_KEY: "some-hash"},
+    )
+
+
+def _deploy(tmp_path, cloudformation_cls, metadata_hash, output_hash, status):
+    template_path = _write_template(tmp_path)
+    template_hash = prepare_template(template_path)[1]
+    s3 = Mock()
+    s3.get_object_metadata.return_value = {
+        TEMPLATE_HASH_METADATA_KEY: metadata_hash or template_hash,
+    }
+    cloudformation = cloudformation_cls.return_value
+    cloudformation.get_stack_outputs.return_value = {
+        TEMPLATE_HASH_OUTPUT: output_hash or template_hash,
+    }
+    cloudformation.get_stack_status.return_value = status
+    return worker_thread(template_path, "some-pipeline", s3), s3
+
+
+@patch("execute_pipeline_stacks.CloudFormation")
+def test_worker_thread_skips_unchanged_pipeline(cloudformation_cls, tmp_path):
+    result, s3 = _deploy(
+        tmp_path, cloudformation_cls, None, None, "UPDATE_COMPLETE",
+    )
+
+    assert result == (False, False)
+    s3.put_object.assert_not_called()
+    cloudformation_cls.return_value.create_stack.assert_not_called()
+
+
+@patch("execute_pipeline_stacks.CloudFormation")
+def test_worker_thread_deploys_changed_template(cloudformation_cls, tmp_path):
+    result, s3 = _deploy(
+        tmp_path, cloudformation_cls, "old-hash", None, "UPDATE_COMPLETE",
+    )
+
+    assert result == (True, True)
+    s3.put_object.assert_called_once()
+    cloudformation_cls.return_value.get_stack_outputs.assert_not_called()
+    cloudformation_cls.return_value.create_stack.assert_called_once()
+
+
+@patch("execute_pipeline_stacks.CloudFormation")
+def test_worker_thread_deploys_outdated_stack(cloudformation_cls, tmp_path):
+    result, s3 = _deploy(
+        tmp_path, cloudformation_cls, None, "old-hash", "UPDATE_COMPLETE",
+    )
+
+    assert result == (False, True)
+    s3.put_object.assert_not_called()
+    cloudformation_cls.return_value.create_stack.assert_called_once()
+
+
+@patch("execute_pipeline_stacks.CloudFormation")
+def test_worker_thread_deploys_failed_stack(cloudformation_cls, tmp_path):
+    result, _ = _deploy(
+        tmp_path, cloudformation_cls, None, None, "ROLLBACK_COMPLETE",
+    )
+
+    assert result == (False, True)
+    cloudformation_cls.return_value.create_stack.assert_called_once()
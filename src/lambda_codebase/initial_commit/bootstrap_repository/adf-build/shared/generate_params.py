@@ -20,9 +20,15 @@ from typing import Dict, Iterator, List, Optional, Union
 from typing_extensions import TypedDict
 import yaml
 import boto3
+from botocore.exceptions import ClientError
 
 from logger import configure_logger
 from parameter_store import ParameterStore
+from pipeline_definition import (
+    LEGACY_DEFINITION_FILE_NAME,
+    deserialize_definition,
+    get_definition_key,
+)
 from resolver import Resolver
 from s3 import S3
 
@@ -143,11 +149,19 @@ class Parameters:
         )
 
     def _retrieve_pipeline_definition(self) -> PipelineDefinition:
-        return json.loads(
-            self.definition_s3.read_object(
-                f"pipelines/{self.build_name}/definition.json",
-            ),
-        )
+        try:
+            body = self.definition_s3.read_object_bytes(
+                get_definition_key(self.build_name),
+            )
+        except ClientError as error:
+            if error.response["Error"]["Code"] != "NoSuchKey":
+                raise
+            # Fallback to the definition as stored before the compact
+            # definition format was introduced.
+            body = self.definition_s3.read_object_bytes(
+                f"pipelines/{self.build_name}/{LEGACY_DEFINITION_FILE_NAME}",
+            )
+        return deserialize_definition(body)
 
     def _retrieve_pipeline_targets(self) -> PipelineTargets:
         pipeline_targets = {}
@@ -8,10 +8,18 @@ This script will retrieve the trigger for the given CodePipeline execution.
 It also allows you to match it against a specific trigger that you expect and
 return an exit code if it did not match.
 
+The trigger is retrieved with the GetPipelineExecution API. Only if that
+does not return the trigger, it will look for the execution in the
+pipeline execution history instead. Triggers that were found are cached in
+a local file, such that repeated calls for the same execution do not need
+to call the CodePipeline APIs again.
+
 Usage:
     describe_codepipeline_trigger.py
             [--should-match <trigger_type>]
             [--json]
+            [--max-pages <count>]
+            [--cache-file <path> | --no-cache]
             [-v... | --verbose...]
             CODEPIPELINE_NAME
             EXECUTION_ID
@@ -28,6 +36,10 @@ Arguments:
                 The CodePipeline Execution Id that we want to check.
 
 Options:
+    --cache-file <path>
+                The file to cache the triggers that were found in
+                [default: /tmp/adf-codepipeline-triggers.json].
+
     -h, --help  Show this help message.
 
     --json      Return the trigger type and details as a JSON object.
@@ -37,6 +49,13 @@ Options:
                     "trigger_detail": "..."
                 }
 
+    --max-pages <count>
+                The maximum number of pages of the pipeline execution history
+                to look through, if the trigger could not be retrieved
+                directly [default: 10].
+
+    --no-cache  Do not read or write the trigger cache file.
+
     --should-match <trigger_type>
                 When set, it will stop with exit code 0 if it matches the
                 expected trigger. If it does not match the trigger, it will
@@ -55,11 +74,14 @@ from typing import Any, Optional, TypedDict
 import json
 import logging
 import boto3
+from botocore.exceptions import ClientError
 from docopt import docopt
 
 
 ADF_VERSION = os.environ.get("ADF_VERSION")
 ADF_LOG_LEVEL = os.environ.get("ADF_LOG_LEVEL", "INFO")
+# The maximum number of executions returned per ListPipelineExecutions call.
+EXECUTIONS_PER_PAGE = 100
 
 logging.basicConfig(level=logging.ERROR)
 LOGGER = logging.getLogger(__name__)
@@ -74,10 +96,64 @@ class TriggerData(TypedDict):
     trigger_detail: str
 
 
+def _to_trigger_data(trigger: dict) -> TriggerData:
+    return {
+        "trigger_type": trigger['triggerType'],
+        "trigger_detail": trigger['triggerDetail'],
+    }
+
+
+def get_codepipeline_execution_trigger(
+    cp_client: Any,
+    codepipeline_name: str,
+    execution_id: str,
+) -> Optional[TriggerData]:
+    """
+    Get the CodePipeline Execution Trigger directly, using the
+    GetPipelineExecution API.
+
+    Args:
+        cp_client (boto3.client): The CodePipeline Boto3 client.
+
+        codepipeline_name (str): The CodePipeline name.
+
+        execution_id (str): The CodePipeline Execution id.
+
+    Returns:
+        TriggerData: The trigger type and trigger detail if found.
+
+        None: if it could not be retrieved this way.
+
+    Raises:
+        ClientError: When the execution does not exist.
+    """
+    try:
+        execution = cp_client.get_pipeline_execution(
+            pipelineName=codepipeline_name,
+            pipelineExecutionId=execution_id,
+        )['pipelineExecution']
+    except ClientError as error:
+        if error.response['Error']['Code'] == (
+            'PipelineExecutionNotFoundException'
+        ):
+            raise
+        LOGGER.debug(
+            "Could not get execution %s of the %s pipeline directly: %s",
+            execution_id,
+            codepipeline_name,
+            error,
+        )
+        return None
+    if 'trigger' not in execution:
+        return None
+    return _to_trigger_data(execution['trigger'])
+
+
 def fetch_codepipeline_execution_trigger(
     cp_client: Any,
     codepipeline_name: str,
     execution_id: str,
+    max_pages: Optional[int] = None,
 ) -> Optional[TriggerData]:
     """
     Fetch the CodePipeline Execution Trigger that matches
@@ -90,23 +166,94 @@ def fetch_codepipeline_execution_trigger(
 
         execution_id (str): The CodePipeline Execution id.
 
+        max_pages (int): The maximum number of pages of the execution
+            history to look through when the trigger could not be
+            retrieved directly, or None to look through all of them.
+
     Returns:
         TriggerData: The trigger type and trigger detail if found.
 
         None: if it was not found.
     """
+    try:
+        trigger = get_codepipeline_execution_trigger(
+            cp_client,
+            codepipeline_name,
+            execution_id,
+        )
+    except ClientError:
+        # The execution does not exist, so it will not be listed in the
+        # execution history either.
+        return None
+    if trigger is not None:
+        return trigger
+
     paginator = cp_client.get_paginator('list_pipeline_executions')
-    response_iterator = paginator.paginate(pipelineName=codepipeline_name)
-    for page in response_iterator:
+    response_iterator = paginator.paginate(
+        pipelineName=codepipeline_name,
+        PaginationConfig={'PageSize': EXECUTIONS_PER_PAGE},
+    )
+    for page_number, page in enumerate(response_iterator, start=1):
         for execution in page['pipelineExecutionSummaries']:
             if execution['pipelineExecutionId'] == execution_id:
-                return {
-                    "trigger_type": execution['trigger']['triggerType'],
-                    "trigger_detail": execution['trigger']['triggerDetail'],
-                }
+                return _to_trigger_data(execution['trigger'])
+        if max_pages is not None and page_number >= max_pages:
+            LOGGER.debug(
+                "Stopped looking for execution %s after %d pages.",
+                execution_id,
+                page_number,
+            )
+            break
     return None
 
 
+def _get_cache_key(codepipeline_name: str, execution_id: str) -> str:
+    return f"{codepipeline_name}/{execution_id}"
+
+
+def read_cached_trigger(
+    cache_file: str,
+    codepipeline_name: str,
+    execution_id: str,
+) -> Optional[TriggerData]:
+    """
+    Returns:
+        TriggerData: The cached trigger of the execution.
+
+        None: if it was not cached.
+    """
+    try:
+        with open(cache_file, mode='r', encoding='utf-8') as cache:
+            return json.load(cache).get(
+                _get_cache_key(codepipeline_name, execution_id),
+            )
+    except (OSError, ValueError):
+        return None
+
+
+def write_cached_trigger(
+    cache_file: str,
+    codepipeline_name: str,
+    execution_id: str,
+    trigger: TriggerData,
+) -> None:
+    """
+    Add the trigger of the execution to the cache file. The trigger of an
+    execution does not change, so cached triggers do not expire.
+    """
+    try:
+        with open(cache_file, mode='r', encoding='utf-8') as cache:
+            triggers = json.load(cache)
+    except (OSError, ValueError):
+        triggers = {}
+    triggers[_get_cache_key(codepipeline_name, execution_id)] = trigger
+    try:
+        with open(cache_file, mode='w', encoding='utf-8') as cache:
+            json.dump(triggers, cache)
+    except OSError as error:
+        LOGGER.warning("Could not write the trigger cache: %s", error)
+
+
 def main():
     """Main function to describe the codepipeline trigger """
     options = docopt(__doc__, version=ADF_VERSION, options_first=True)
@@ -128,13 +275,34 @@ def main():
     should_match_type = options.get('--should-match')
     output_in_json = options.get('--json')
 
-    cp_client = boto3.client("codepipeline")
-    trigger = fetch_codepipeline_execution_trigger(
-        cp_client,
-        codepipeline_name,
-        execution_id,
+    max_pages = int(options.get('--max-pages'))
+    cache_file = None if options.get('--no-cache') else options.get(
+        '--cache-file',
     )
 
+    trigger = None
+    if cache_file:
+        trigger = read_cached_trigger(
+            cache_file,
+            codepipeline_name,
+            execution_id,
+        )
+    if trigger is None:
+        cp_client = boto3.client("codepipeline")
+        trigger = fetch_codepipeline_execution_trigger(
+            cp_client,
+            codepipeline_name,
+            execution_id,
+            max_pages,
+        )
+        if trigger is not None and cache_file:
+            write_cached_trigger(
+                cache_file,
+                codepipeline_name,
+                execution_id,
+                trigger,
+            )
+
     if trigger is None:
         LOGGER.error(
             "Could not find execution %s in the %s pipeline.",
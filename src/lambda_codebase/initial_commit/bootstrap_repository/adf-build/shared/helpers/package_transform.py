@@ -0,0 +1,594 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Package transform.
+
+This script will package all source code and make it available in the
+regional S3 bucket of every region where the template needs to be deployed
+to. It generates a template_<region>.yml file for every region.
+
+Unlike the package_transform.sh script, that runs `sam package` for every
+region one after the other, this script runs `sam package` only once, for
+the first target region. SAM uploads the artifacts using the hash of their
+content as the object key. For the other regions, the uploaded artifacts are
+copied to the regional buckets concurrently. An artifact is only copied if
+an object with the same key does not exist in the regional bucket yet. The
+packaged template and the nested templates are updated to refer to the
+regional bucket.
+
+When the CONTAINS_TRANSFORM environment variable is not set, the
+template.yml file is copied for every region instead.
+
+The ADF_PROJECT_NAME and ADF_DEPLOYMENT_MAP_SOURCE environment variables are
+passed to the CodeBuild Project. The CODEBUILD_SRC_DIR environment variable
+is provided by CodeBuild.
+
+Usage:
+    package_transform.py [-v... | --verbose...] [--no-build]
+            [--max-workers <count>]
+
+    package_transform.py -h | --help
+
+    package_transform.py --version
+
+Options:
+    -h, --help  Show this help message.
+
+    --max-workers <count>
+                The maximum number of regions to copy artifacts to at the
+                same time [default: 10].
+
+    --no-build  Skip the `sam build` step.
+
+    -v, --verbose
+                Show verbose logging information.
+"""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import boto3
+import yaml
+from botocore.exceptions import ClientError
+from docopt import docopt
+
+
+ADF_VERSION = os.environ.get("ADF_VERSION")
+ADF_LOG_LEVEL = os.environ.get("ADF_LOG_LEVEL", "INFO")
+
+logging.basicConfig(level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(ADF_LOG_LEVEL)
+
+# The SSM GetParameters API accepts up to 10 parameter names per call.
+MAX_PARAMETERS_PER_CALL = 10
+# The extension that SAM uses for the nested templates it uploads.
+NESTED_TEMPLATE_EXTENSION = ".template"
+
+
+@dataclass(frozen=True)
+class RegionConfig:
+    """
+    Region Config Class.
+    """
+    bucket_name: str
+    kms_key_arn: str
+
+
+class _TemplateLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
+    """
+    YAML loader that accepts the CloudFormation intrinsic function tags,
+    like !Ref and !Sub. The tags are dropped, only their values are kept.
+    """
+
+
+def _construct_tagged_node(loader, _tag_suffix, node):
+    if isinstance(node, yaml.MappingNode):
+        return loader.construct_mapping(node, deep=True)
+    if isinstance(node, yaml.SequenceNode):
+        return loader.construct_sequence(node, deep=True)
+    return loader.construct_scalar(node)
+
+
+_TemplateLoader.add_multi_constructor("!", _construct_tagged_node)
+
+
+def get_target_regions(
+    ssm_client: Any,
+    deployment_map_source: str,
+    project_name: str,
+) -> List[str]:
+    """
+    Get the list of regions supported by this application.
+
+    Args:
+        ssm_client (boto3.client): The SSM client in the deployment region.
+
+        deployment_map_source (str): The source of the deployment map.
+
+        project_name (str): The name of the pipeline.
+
+    Returns:
+        list[str]: The target regions.
+    """
+    response = ssm_client.get_parameters(
+        Names=[
+            f"/adf/deployment/{deployment_map_source}/{project_name}/regions",
+        ],
+        WithDecryption=True,
+    )
+    # The regions are stored as a string representation of a list,
+    # for example: ['eu-west-1', 'us-east-1']
+    value = response["Parameters"][0]["Value"]
+    return [
+        region.strip().strip("'\"")
+        for region in value.strip().strip("[]").split(",")
+        if region.strip().strip("'\"")
+    ]
+
+
+def get_region_configs(
+    ssm_client: Any,
+    regions: List[str],
+) -> Dict[str, RegionConfig]:
+    """
+    Look up the regional S3 bucket and KMS key of every region, using as
+    few SSM API calls as possible.
+
+    Args:
+        ssm_client (boto3.client): The SSM client in the deployment region.
+
+        regions (list[str]): The target regions.
+
+    Returns:
+        dict[str, RegionConfig]: The configuration per region.
+    """
+    parameter_names = [
+        name
+        for region in regions
+        for name in (
+            f"/adf/cross_region/s3_regional_bucket/{region}",
+            f"/adf/cross_region/kms_arn/{region}",
+        )
+    ]
+    values = {}
+    for index in range(0, len(parameter_names), MAX_PARAMETERS_PER_CALL):
+        response = ssm_client.get_parameters(
+            Names=parameter_names[index:index + MAX_PARAMETERS_PER_CALL],
+            WithDecryption=True,
+        )
+        if response.get("InvalidParameters"):
+            raise ValueError(
+                "Could not find the SSM parameters: "
+                f"{', '.join(response['InvalidParameters'])}",
+            )
+        values.update({
+            parameter["Name"]: parameter["Value"]
+            for parameter in response["Parameters"]
+        })
+    return {
+        region: RegionConfig(
+            bucket_name=values[f"/adf/cross_region/s3_regional_bucket/{region}"],
+            kms_key_arn=values[f"/adf/cross_region/kms_arn/{region}"],
+        )
+        for region in regions
+    }
+
+
+def get_template_path(source_dir: str, region: str) -> str:
+    return os.path.join(source_dir, f"template_{region}.yml")
+
+
+def sam_package(source_dir: str, region: str, config: RegionConfig) -> str:
+    """
+    Package the template and its artifacts in the given region.
+
+    Returns:
+        str: The path to the packaged template.
+    """
+    output_template = get_template_path(source_dir, region)
+    subprocess.run(
+        [
+            "sam", "package",
+            "--s3-bucket", config.bucket_name,
+            "--kms-key-id", config.kms_key_arn,
+            "--output-template-file", output_template,
+            "--region", region,
+        ],
+        check=True,
+    )
+    return output_template
+
+
+def find_artifact_keys(template_body: str, bucket_name: str) -> Set[str]:
+    """
+    Find the object keys of the artifacts in the given bucket that the
+    packaged template refers to.
+
+    Args:
+        template_body (str): The packaged template.
+
+        bucket_name (str): The bucket that the artifacts were uploaded to.
+
+    Returns:
+        set[str]: The object keys.
+    """
+    uri_pattern = re.compile(
+        rf"^(?:s3://|https://[^/]+/){re.escape(bucket_name)}/([^?]+)",
+    )
+    keys = set()
+
+    def _walk(node):
+        if isinstance(node, dict):
+            for bucket_key, object_key in (
+                ("S3Bucket", "S3Key"),
+                ("Bucket", "Key"),
+            ):
+                if (
+                    node.get(bucket_key) == bucket_name
+                    and isinstance(node.get(object_key), str)
+                ):
+                    keys.add(node[object_key])
+            for value in node.values():
+                _walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                _walk(value)
+        elif isinstance(node, str):
+            match = uri_pattern.match(node)
+            if match:
+                keys.add(match.group(1))
+
+    _walk(yaml.load(template_body, Loader=_TemplateLoader))  # nosec
+    return keys
+
+
+def localize_template(
+    template_body: str,
+    source_region: str,
+    source_config: RegionConfig,
+    region: str,
+    config: RegionConfig,
+) -> str:
+    """
+    Update the template that was packaged in the source region, such that
+    it refers to the artifacts in the bucket of the given region instead.
+
+    Returns:
+        str: The updated template.
+    """
+    if source_region == region:
+        return template_body
+    # Path style URLs, as used by the TemplateURL of nested stacks, include
+    # the region of the bucket in the host name.
+    template_body = re.sub(
+        r"https://s3(?:[.-][a-z0-9-]+)?\.amazonaws\.com(\.cn)?/"
+        rf"{re.escape(source_config.bucket_name)}/",
+        lambda match: (
+            f"https://s3.{region}.amazonaws.com{match.group(1) or ''}/"
+            f"{config.bucket_name}/"
+        ),
+        template_body,
+    )
+    return template_body.replace(
+        source_config.bucket_name,
+        config.bucket_name,
+    )
+
+
+def find_nested_templates(
+    s3_client: Any,
+    template_body: str,
+    bucket_name: str,
+) -> Dict[str, Optional[str]]:
+    """
+    Find the artifacts of the packaged template, including those of the
+    nested templates that SAM uploaded.
+
+    Returns:
+        dict[str, str]: The artifact keys, mapped to the body of the object
+            for nested templates, or None for other artifacts.
+    """
+    artifacts = {}
+    templates_to_scan = [template_body]
+    while templates_to_scan:
+        for key in find_artifact_keys(templates_to_scan.pop(), bucket_name):
+            if key in artifacts:
+                continue
+            artifacts[key] = None
+            if key.endswith(NESTED_TEMPLATE_EXTENSION):
+                artifacts[key] = (
+                    s3_client.get_object(Bucket=bucket_name, Key=key)["Body"]
+                    .read()
+                    .decode("utf-8")
+                )
+                templates_to_scan.append(artifacts[key])
+    return artifacts
+
+
+def _object_exists(s3_client: Any, bucket_name: str, key: str) -> bool:
+    try:
+        s3_client.head_object(Bucket=bucket_name, Key=key)
+        return True
+    except ClientError as error:
+        if error.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+
+
+def copy_artifacts(
+    s3_client: Any,
+    source_s3_client: Any,
+    artifacts: Dict[str, Optional[str]],
+    source_region: str,
+    source_config: RegionConfig,
+    region: str,
+    config: RegionConfig,
+) -> Dict[str, int]:
+    """
+    Copy the artifacts from the source bucket to the bucket of the given
+    region. Artifacts that exist in the regional bucket already are skipped.
+    Nested templates are updated to refer to the regional bucket.
+
+    Returns:
+        dict[str, int]: The number of copied and skipped artifacts.
+    """
+    counts = {"copied": 0, "skipped": 0}
+    encryption = {
+        "ServerSideEncryption": "aws:kms",
+        "SSEKMSKeyId": config.kms_key_arn,
+    }
+    for key, template_body in sorted(artifacts.items()):
+        if _object_exists(s3_client, config.bucket_name, key):
+            counts["skipped"] += 1
+            continue
+        if template_body is None:
+            s3_client.copy(
+                CopySource={"Bucket": source_config.bucket_name, "Key": key},
+                Bucket=config.bucket_name,
+                Key=key,
+                ExtraArgs=encryption,
+                SourceClient=source_s3_client,
+            )
+        else:
+            s3_client.put_object(
+                Bucket=config.bucket_name,
+                Key=key,
+                Body=localize_template(
+                    template_body,
+                    source_region,
+                    source_config,
+                    region,
+                    config,
+                ).encode("utf-8"),
+                **encryption,
+            )
+        counts["copied"] += 1
+    return counts
+
+
+def package_source_region(
+    source_dir: str,
+    s3_client: Any,
+    region: str,
+    config: RegionConfig,
+) -> Tuple[str, Dict[str, Optional[str]]]:
+    """
+    Package the template in the source region.
+
+    Returns:
+        tuple[str, dict[str, Optional[str]]]: The packaged template and
+            the artifacts it refers to, as returned by
+            find_nested_templates.
+    """
+    start_time = time.monotonic()
+    LOGGER.info("Packaging templates for region %s", region)
+    with open(
+        sam_package(source_dir, region, config),
+        mode="r",
+        encoding="utf-8",
+    ) as template_file:
+        template_body = template_file.read()
+    artifacts = find_nested_templates(
+        s3_client,
+        template_body,
+        config.bucket_name,
+    )
+    LOGGER.info(
+        "Packaged %d artifacts for region %s in %.1fs",
+        len(artifacts),
+        region,
+        time.monotonic() - start_time,
+    )
+    return template_body, artifacts
+
+
+def package_region(
+    source_dir: str,
+    template_body: str,
+    artifacts: Dict[str, Optional[str]],
+    source_s3_client: Any,
+    source_region: str,
+    source_config: RegionConfig,
+    s3_client: Any,
+    region: str,
+    config: RegionConfig,
+) -> None:
+    """
+    Make the artifacts that were packaged in the source region available
+    in the given region, and write the template that refers to these.
+    """
+    start_time = time.monotonic()
+    counts = copy_artifacts(
+        s3_client,
+        source_s3_client,
+        artifacts,
+        source_region,
+        source_config,
+        region,
+        config,
+    )
+    with open(
+        get_template_path(source_dir, region),
+        mode="w",
+        encoding="utf-8",
+    ) as template_file:
+        template_file.write(
+            localize_template(
+                template_body,
+                source_region,
+                source_config,
+                region,
+                config,
+            ),
+        )
+    LOGGER.info(
+        "Packaged templates for region %s in %.1fs, "
+        "copied %d and skipped %d existing artifacts",
+        region,
+        time.monotonic() - start_time,
+        counts["copied"],
+        counts["skipped"],
+    )
+
+
+def package_regions(
+    source_dir: str,
+    regions: List[str],
+    region_configs: Dict[str, RegionConfig],
+    s3_clients: Dict[str, Any],
+    max_workers: int,
+) -> None:
+    """
+    Package the template in the first region, and make the artifacts
+    available in the other regions concurrently.
+
+    Args:
+        source_dir (str): The directory to write the templates to.
+
+        regions (list[str]): The target regions.
+
+        region_configs (dict[str, RegionConfig]): The configuration of
+            every target region.
+
+        s3_clients (dict[str, boto3.client]): The S3 client of every target
+            region.
+
+        max_workers (int): The maximum number of regions to process
+            concurrently.
+    """
+    start_time = time.monotonic()
+    source_region = regions[0]
+    source_config = region_configs[source_region]
+    template_body, artifacts = package_source_region(
+        source_dir,
+        s3_clients[source_region],
+        source_region,
+        source_config,
+    )
+
+    other_regions = regions[1:]
+    with ThreadPoolExecutor(
+        max_workers=max(min(max_workers, len(other_regions)), 1),
+    ) as executor:
+        futures = [
+            executor.submit(
+                package_region,
+                source_dir,
+                template_body,
+                artifacts,
+                s3_clients[source_region],
+                source_region,
+                source_config,
+                s3_clients[region],
+                region,
+                region_configs[region],
+            )
+            for region in other_regions
+        ]
+    errors = [
+        future.exception()
+        for future in futures
+        if future.exception() is not None
+    ]
+    for error in errors:
+        LOGGER.error("Failed to package templates: %s", error)
+    if errors:
+        raise errors[0]
+    LOGGER.info(
+        "Packaged templates for %d regions in %.1fs",
+        len(regions),
+        time.monotonic() - start_time,
+    )
+
+
+def copy_templates(source_dir: str, regions: List[str]) -> None:
+    """
+    If package is not needed, just copy the template for each region.
+    """
+    for region in regions:
+        LOGGER.info("Copying template for region %s", region)
+        shutil.copy(
+            os.path.join(source_dir, "template.yml"),
+            get_template_path(source_dir, region),
+        )
+
+
+def main():
+    """Main function to package the template for every region"""
+
+    options = docopt(__doc__, version=ADF_VERSION, options_first=True)
+    # In case the user asked for verbose logging, increase
+    # the log level to debug.
+    if options["--verbose"] > 0:
+        LOGGER.setLevel(logging.DEBUG)
+    if options["--verbose"] > 1:
+        # Also enable DEBUG mode for other libraries, like boto3
+        logging.basicConfig(level=logging.DEBUG)
+
+    LOGGER.debug("Input arguments: %s", options)
+
+    if options["--no-build"]:
+        LOGGER.info("Skip build step")
+    else:
+        LOGGER.info("Perform build step")
+        subprocess.run(["sam", "build"], check=True)
+
+    source_dir = os.environ["CODEBUILD_SRC_DIR"]
+    ssm_client = boto3.client("ssm")
+    LOGGER.info("Determine which regions need to be prepared")
+    regions = get_target_regions(
+        ssm_client,
+        os.environ["ADF_DEPLOYMENT_MAP_SOURCE"],
+        os.environ["ADF_PROJECT_NAME"],
+    )
+    if not os.environ.get("CONTAINS_TRANSFORM"):
+        copy_templates(source_dir, regions)
+        return
+    package_regions(
+        source_dir,
+        regions,
+        get_region_configs(ssm_client, regions),
+        {
+            region: boto3.client("s3", region_name=region)
+            for region in regions
+        },
+        int(options["--max-workers"]),
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except subprocess.CalledProcessError as error:
+        LOGGER.error("%s", error)
+        sys.exit(error.returncode)
@@ -13,7 +13,9 @@ required for services like AWS Security Hub and Amazon GuardDuty.
 This helper script will allow you to retrieve all the member account
 details of the accounts in the organization as part of the CodeBuild
 step. The member account details will be written to a JSON file on the
-path as specified during execution.
+path as specified during execution. The accounts are written while these
+are retrieved, either as a JSON array or as JSON Lines. Optionally, a
+compact index of the account ids, emails, and names is written too.
 
 For example, to get the account details required for AWS Security Hub
 to send the invites correctly, you would need to execute the script
@@ -29,6 +31,7 @@ Usage:
     retrieve_organization_accounts.py [-v | --verbose] [-h | --help]
                 [-r <role-name>] [-o <output-file-path>] [-s <session-name>]
                 [--session-ttl <seconds>] [-f <field>]...
+                [--format <format>] [--index-file <index-file-path>]
 
 Options:
     -f <field>, --field <field>
@@ -40,9 +43,20 @@ Options:
                 AWS Organizations: ListAccounts API call will be ignored
                 [default: Id Email Name].
 
+    --format <format>
+                The format to write the account details in. Either json,
+                to write a JSON array, or jsonl to write one JSON document
+                per line [default: json].
+
     -h, --help  Show help info related to generic or command
                 execution.
 
+    --index-file <index-file-path>
+                The file path to write a compact index of the accounts to.
+                It holds one line per account with the tab-separated
+                account id, email, and name. This allows shell scripts to
+                read the account details without parsing the JSON file.
+
     -o <output-file-path>, --output-file <output-file-path>
                 The output file path to use to output the retrieved
                 data to in JSON format. Define a file path or set to - to
@@ -68,18 +82,23 @@ Example:
     retrieve_organization_accounts.py -v -o src/lambda/accounts.json
 
     retrieve_organization_accounts.py -v -f Id -f Email -o src/lambda/dat.json
+
+    retrieve_organization_accounts.py -f Id --format jsonl \
+        --index-file accounts.idx -o accounts.jsonl
 """
 
 import os
 import sys
 import logging
-import json
 
 import boto3
 from botocore.exceptions import ClientError
 
 from docopt import docopt
 
+# ADF imports
+from account_writer import AccountWriter
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -129,7 +148,7 @@ def main():
     or run the script with `--help` to get the list of options instead.
 
     Based on the input, it will traverse the accounts linked to the
-    AWS Organization and store the details as requested in a JSON file.
+    AWS Organization and stream the details as requested to a JSON file.
 
     Returns:
         int: Exit code 0 when all went well.
@@ -194,7 +213,8 @@ def _get_member_accounts(billing_account_id, options):
             argument options as passed when executing the script.
 
     Returns:
-        list(dict)): The list of account details as requested.
+        Iterator[dict]: The details of the active member accounts, as these
+            are paginated.
     """
     assumed_credentials = _request_sts_credentials(
         billing_account_id=billing_account_id,
@@ -207,45 +227,38 @@ def _get_member_accounts(billing_account_id, options):
     )
     org_client = billing_account_session.client("organizations")
     list_accounts_paginator = org_client.get_paginator("list_accounts")
-    accounts = []
     for page in list_accounts_paginator.paginate():
-        accounts.extend(page["Accounts"])
-
-    # Remove any account that is not actively part of this organization yet.
-    only_active_accounts = filter(lambda a: a["Status"] == "ACTIVE", accounts)
-
-    # Only return the key: value pairs that are defined in the --field option.
-    only_certain_fields_of_active = list(
-        map(
-            lambda a: {k: v for k, v in a.items() if k in options["--field"]},
-            only_active_accounts,
+        # Skip any account that is not actively part of this organization yet.
+        yield from (
+            account
+            for account in page["Accounts"]
+            if account["Status"] == "ACTIVE"
         )
-    )
-    return only_certain_fields_of_active
 
 
 def _flush_out(accounts, options):
     """
-    Flush the account details to the specified output target. When the output
-    file option equals `-` it will output to the INFO logger. Otherwise, it
-    will write to the specified target file as requested.
+    Flush the account details to the specified output target while these are
+    retrieved. When the output file option equals `-` it will output to
+    stdout. Otherwise, it will write to the specified target file as
+    requested. Only the key: value pairs that are defined in the --field
+    option are written.
 
     Args:
-        accounts (list(dict)): The account details to flush to the file/logs.
+        accounts (Iterator[dict]): The account details to flush to the file.
         options (dict): The options which host where to write the account
             details to among other flags.
     """
-    json_accounts = json.dumps(accounts, indent=2, default=str)
-
-    if options["--output-file"] == "-":
-        LOGGER.info(
-            "Accounts JSON: %s",
-            json_accounts,
-        )
-        return
-
-    with open(options["--output-file"], mode="w", encoding="utf-8") as output_file:
-        output_file.write(json_accounts)
+    with AccountWriter(
+        options["--output-file"],
+        fields=options["--field"],
+        output_format=options["--format"],
+        indent=2 if options["--format"] == "json" else None,
+        index_path=options["--index-file"],
+    ) as writer:
+        for account in accounts:
+            writer.write(account)
+    LOGGER.debug("Wrote the details of %d accounts", writer.count)
 
 
 def _request_sts_credentials(billing_account_id, options):
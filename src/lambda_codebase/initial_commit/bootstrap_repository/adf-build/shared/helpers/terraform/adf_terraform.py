@@ -0,0 +1,635 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Run the Terraform stage on every target account and region.
+
+For every target account and region, the Terraform code in the tf folder
+is copied into its own workspace at tmp/<account_id>-<region>, together
+with the account and region specific variables in the tfvars folder.
+The workspaces are initialized and planned, applied, or destroyed
+concurrently by a bounded pool of worker processes.
+
+The regional S3 bucket and KMS key that hold the Terraform state are
+looked up once per region. The providers are downloaded once into a
+plugin cache that is shared by all workspaces. The output of every run is
+written to its own log file at tmp/logs/<account_id>-<region>.log, which
+is printed as a whole when the run finished.
+
+The script is configured through the same environment variables as the
+adf_terraform.sh script:
+
+    TF_STAGE: The Terraform stage to run, either init, plan, apply, or
+        destroy.
+    REGIONS: Comma separated list of target regions. Defaults to the
+        AWS_DEFAULT_REGION, i.e. the main ADF deployment region.
+    TARGET_ACCOUNTS: Comma separated list of target accounts.
+    TARGET_OUS: Comma separated list of target organizational units, the
+        accounts of which are read from the accounts_from_ous.json file.
+        When neither TARGET_ACCOUNTS nor TARGET_OUS are defined, all
+        accounts in the accounts.json file are targeted.
+    ADF_PROJECT_NAME: The name of the project, used in the state key.
+    TF_MAX_CONCURRENT_RUNS: The number of workspaces that run at the same
+        time, defaults to 4.
+    TF_FAILURE_POLICY: Either fail-fast, to cancel the runs that did not
+        start yet when a run failed, or continue, to run all workspaces
+        regardless. Defaults to fail-fast.
+"""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import boto3
+from account_writer import read_account_index
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(os.environ.get("ADF_LOG_LEVEL", logging.INFO))
+
+STAGE_STEPS = {
+    "init": (),
+    "plan": ("plan",),
+    "apply": ("plan", "apply"),
+    "destroy": ("plan_destroy", "destroy"),
+}
+FAIL_FAST = "fail-fast"
+CONTINUE = "continue"
+FAILURE_POLICIES = (FAIL_FAST, CONTINUE)
+DEFAULT_MAX_CONCURRENT_RUNS = 4
+LOCK_TABLE_NAME = "adf-tflocktable"
+LOCK_FILE_NAME = ".terraform.lock.hcl"
+# The SSM GetParameters API accepts up to 10 parameter names per call.
+MAX_PARAMETERS_PER_CALL = 10
+
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+
+@dataclass(frozen=True)
+class RegionConfig:
+    bucket_name: str
+    kms_key_arn: str
+
+
+@dataclass(frozen=True)
+class WorkspaceRun:
+    """
+    A single Terraform run, targeting one account in one region.
+    """
+    account_id: str
+    region: str
+    stage: str
+    project_name: str
+    base_dir: str
+    region_config: RegionConfig
+    plugin_cache_dir: str
+    lock_file_path: Optional[str] = None
+
+    @property
+    def name(self):
+        return f"{self.account_id}-{self.region}"
+
+    @property
+    def work_dir(self):
+        return os.path.join(self.base_dir, "tmp", self.name)
+
+    @property
+    def log_path(self):
+        return os.path.join(self.base_dir, "tmp", "logs", f"{self.name}.log")
+
+    @property
+    def plan_file_name(self):
+        return f"{self.project_name}-{self.account_id}"
+
+
+@dataclass(frozen=True)
+class RunResult:
+    account_id: str
+    region: str
+    status: str
+    log_path: str
+    duration: float = 0.0
+    error: Optional[str] = None
+    plan_log_path: Optional[str] = None
+
+
+def get_regions(regions, default_region):
+    """
+    Returns:
+        list[str]: The target regions, as defined in the comma separated
+            regions string. Or the default region if none are defined.
+    """
+    return [
+        region.strip()
+        for region in (regions or default_region).split(",")
+        if region.strip()
+    ]
+
+
+def _read_account_ids(path):
+    # Prefer the compact index that get_accounts.py writes next to the
+    # accounts file, such that the JSON document does not need parsing.
+    index_path = f"{os.path.splitext(path)[0]}.idx"
+    if os.path.exists(index_path):
+        return [entry.account_id for entry in read_account_index(index_path)]
+    with open(path, mode="r", encoding="utf-8") as accounts_file:
+        return [account["AccountId"] for account in json.load(accounts_file)]
+
+
+def get_target_accounts(base_dir, target_accounts, target_ous):
+    """
+    Returns:
+        list[str]: The target account ids, in the order the
+            adf_terraform.sh script would process them. Accounts that are
+            targeted both directly and through an organizational unit are
+            only returned once, as their workspace would be shared.
+    """
+    account_ids = []
+    if not target_accounts and not target_ous:
+        account_ids.extend(
+            _read_account_ids(os.path.join(base_dir, "accounts.json")),
+        )
+    if target_accounts:
+        account_ids.extend(
+            account_id.strip()
+            for account_id in target_accounts.split(",")
+            if account_id.strip()
+        )
+    if target_ous:
+        account_ids.extend(
+            _read_account_ids(
+                os.path.join(base_dir, "accounts_from_ous.json"),
+            ),
+        )
+    return list(dict.fromkeys(account_ids))
+
+
+def get_region_configs(ssm_client, regions):
+    """
+    Look up the regional S3 bucket and KMS key of every region, using as
+    few SSM API calls as possible.
+
+    Args:
+        ssm_client (boto3.client): The SSM client in the main ADF
+            deployment region.
+
+        regions (list[str]): The target regions.
+
+    Returns:
+        dict[str, RegionConfig]: The configuration per region.
+    """
+    parameter_names = [
+        name
+        for region in regions
+        for name in (
+            f"/adf/cross_region/s3_regional_bucket/{region}",
+            f"/adf/cross_region/kms_arn/{region}",
+        )
+    ]
+    values = {}
+    for index in range(0, len(parameter_names), MAX_PARAMETERS_PER_CALL):
+        response = ssm_client.get_parameters(
+            Names=parameter_names[index:index + MAX_PARAMETERS_PER_CALL],
+        )
+        if response.get("InvalidParameters"):
+            raise ValueError(
+                "Could not find the SSM parameters: "
+                f"{', '.join(response['InvalidParameters'])}. "
+                "Please check that the regions are ADF target regions.",
+            )
+        values.update({
+            parameter["Name"]: parameter["Value"]
+            for parameter in response["Parameters"]
+        })
+    return {
+        region: RegionConfig(
+            bucket_name=values[f"/adf/cross_region/s3_regional_bucket/{region}"],
+            kms_key_arn=values[f"/adf/cross_region/kms_arn/{region}"],
+        )
+        for region in regions
+    }
+
+
+def _copy_tree(source, destination):
+    if os.path.isdir(source):
+        shutil.copytree(source, destination, dirs_exist_ok=True)
+
+
+def prepare_workspace(run):
+    """
+    Copy the Terraform code and the variables that apply to the account
+    and region of the run into the workspace of the run.
+    """
+    tfvars_dir = os.path.join(run.base_dir, "tfvars")
+    _copy_tree(os.path.join(run.base_dir, "tf"), run.work_dir)
+    _copy_tree(os.path.join(tfvars_dir, run.account_id), run.work_dir)
+    _copy_tree(
+        os.path.join(tfvars_dir, run.account_id, run.region),
+        run.work_dir,
+    )
+    global_tfvars = os.path.join(tfvars_dir, "global.auto.tfvars")
+    if os.path.isfile(global_tfvars):
+        shutil.copy(global_tfvars, run.work_dir)
+    if run.lock_file_path and not os.path.exists(
+        os.path.join(run.work_dir, LOCK_FILE_NAME),
+    ):
+        shutil.copy(run.lock_file_path, run.work_dir)
+
+
+def _run_environment(run):
+    return {
+        **os.environ,
+        "AWS_REGION": run.region,
+        "TF_VAR_TARGET_REGION": run.region,
+        "TF_VAR_TARGET_ACCOUNT_ID": run.account_id,
+        "TF_PLUGIN_CACHE_DIR": run.plugin_cache_dir,
+    }
+
+
+def _terraform(run, args, log_file, output_path=None):
+    log_file.write(f"$ terraform {' '.join(args)}\n")
+    log_file.flush()
+    if output_path is None:
+        subprocess.run(
+            ["terraform", *args],
+            cwd=run.work_dir,
+            env=_run_environment(run),
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            check=True,
+        )
+        return
+    # Keep a copy of the output in its own file too, such that it can be
+    # uploaded to S3 after the run finished.
+    with open(output_path, mode="w", encoding="utf-8") as output_file:
+        process = subprocess.run(
+            ["terraform", *args],
+            cwd=run.work_dir,
+            env=_run_environment(run),
+            stdout=output_file,
+            stderr=subprocess.STDOUT,
+            check=False,
+        )
+    with open(output_path, mode="r", encoding="utf-8") as output_file:
+        shutil.copyfileobj(output_file, log_file)
+    log_file.flush()
+    if process.returncode:
+        raise subprocess.CalledProcessError(
+            process.returncode,
+            ["terraform", *args],
+        )
+
+
+def _terraform_init(run, log_file):
+    config = run.region_config
+    state_key = f"{run.project_name}/{run.account_id}.tfstate"
+    backend_config = [
+        f"bucket={config.bucket_name}",
+        "encrypt=true",
+        f"kms_key_id={config.kms_key_arn}",
+        f"region={run.region}",
+        f"key={state_key}",
+        f"dynamodb_table={LOCK_TABLE_NAME}",
+    ]
+    _terraform(
+        run,
+        [
+            "init",
+            *[
+                argument
+                for config_item in backend_config
+                for argument in ("-backend-config", config_item)
+            ],
+        ],
+        log_file,
+    )
+    log_file.write(
+        f"Bucket:         {config.bucket_name}\n"
+        "Encrypt:        true\n"
+        f"KMS Key ARN:    {config.kms_key_arn}\n"
+        f"Region:         {run.region}\n"
+        f"Key:            {state_key}\n"
+        f"DynamoDB table: {LOCK_TABLE_NAME}\n"
+    )
+
+
+def run_workspace(run):
+    """
+    Prepare the workspace and run the Terraform stage in it. This function
+    is executed in a worker process.
+
+    Args:
+        run (WorkspaceRun): The run to execute.
+
+    Returns:
+        RunResult: The outcome of the run, the output of Terraform is
+            written to the log file of the run.
+    """
+    start_time = time.monotonic()
+    plan_log_path = None
+    os.makedirs(os.path.dirname(run.log_path), exist_ok=True)
+    with open(run.log_path, mode="w", encoding="utf-8") as log_file:
+        try:
+            log_file.write(
+                f"Running terraform {run.stage} on account {run.account_id} "
+                f"and region {run.region}\n",
+            )
+            prepare_workspace(run)
+            _terraform_init(run, log_file)
+            for step in STAGE_STEPS[run.stage]:
+                if step == "plan":
+                    timestamp = datetime.now(timezone.utc).strftime(
+                        "%Y%m%d%H%M%S",
+                    )
+                    plan_log_path = os.path.join(
+                        run.work_dir,
+                        f"{run.plan_file_name}-{timestamp}.log",
+                    )
+                    _terraform(
+                        run,
+                        ["plan", "-out", run.plan_file_name],
+                        log_file,
+                        output_path=plan_log_path,
+                    )
+                elif step == "apply":
+                    _terraform(run, ["apply", run.plan_file_name], log_file)
+                elif step == "plan_destroy":
+                    _terraform(
+                        run,
+                        ["plan", "-destroy", "-out",
+                         f"{run.plan_file_name}-destroy"],
+                        log_file,
+                    )
+                elif step == "destroy":
+                    _terraform(
+                        run,
+                        ["apply", f"{run.plan_file_name}-destroy"],
+                        log_file,
+                    )
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            log_file.write(f"Error: {error}\n")
+            return RunResult(
+                account_id=run.account_id,
+                region=run.region,
+                status=FAILED,
+                log_path=run.log_path,
+                duration=time.monotonic() - start_time,
+                error=str(error),
+                plan_log_path=plan_log_path,
+            )
+    return RunResult(
+        account_id=run.account_id,
+        region=run.region,
+        status=SUCCEEDED,
+        log_path=run.log_path,
+        duration=time.monotonic() - start_time,
+        plan_log_path=plan_log_path,
+    )
+
+
+def run_workspaces(runs, max_workers, failure_policy, on_result=None):
+    """
+    Run the workspaces concurrently in a bounded pool of worker processes.
+
+    Args:
+        runs (list[WorkspaceRun]): The runs to execute.
+
+        max_workers (int): The maximum number of concurrent runs.
+
+        failure_policy (str): With fail-fast, the runs that did not start
+            yet are cancelled as soon as a run failed. With continue, all
+            runs are executed.
+
+        on_result (Callable[[RunResult], None]): Optional callback that is
+            invoked in the main process as soon as a run finished.
+
+    Returns:
+        list[RunResult]: The results, in the same order as the runs.
+    """
+    if failure_policy not in FAILURE_POLICIES:
+        raise ValueError(
+            f"Invalid failure policy: {failure_policy}, "
+            f"expected one of: {', '.join(FAILURE_POLICIES)}",
+        )
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=max(min(max_workers, len(runs)), 1),
+    ) as executor:
+        futures = {
+            executor.submit(run_workspace, run): run
+            for run in runs
+        }
+        for future in as_completed(futures):
+            run = futures[future]
+            if future.cancelled():
+                result = RunResult(
+                    account_id=run.account_id,
+                    region=run.region,
+                    status=CANCELLED,
+                    log_path=run.log_path,
+                )
+            elif future.exception() is not None:
+                result = RunResult(
+                    account_id=run.account_id,
+                    region=run.region,
+                    status=FAILED,
+                    log_path=run.log_path,
+                    error=str(future.exception()),
+                )
+            else:
+                result = future.result()
+            results[run] = result
+            if on_result:
+                on_result(result)
+            if result.status == FAILED and failure_policy == FAIL_FAST:
+                for pending_future in futures:
+                    pending_future.cancel()
+    return [results[run] for run in runs]
+
+
+def warm_plugin_cache(base_dir, plugin_cache_dir):
+    """
+    Initialize the Terraform code once without its backend, such that the
+    providers are downloaded into the plugin cache before the workspaces
+    are initialized concurrently. The plugin cache is not safe for
+    concurrent writes.
+
+    Returns:
+        str: The path to the dependency lock file to copy into every
+            workspace, or None if the Terraform code includes one.
+            Without a lock file, Terraform would not use the plugin cache.
+    """
+    warm_up_dir = os.path.join(base_dir, "tmp", "plugin-cache-warm-up")
+    os.makedirs(plugin_cache_dir, exist_ok=True)
+    _copy_tree(os.path.join(base_dir, "tf"), warm_up_dir)
+    subprocess.run(
+        ["terraform", "init", "-backend=false", "-input=false"],
+        cwd=warm_up_dir,
+        env={**os.environ, "TF_PLUGIN_CACHE_DIR": plugin_cache_dir},
+        check=True,
+    )
+    if os.path.exists(os.path.join(base_dir, "tf", LOCK_FILE_NAME)):
+        return None
+    lock_file_path = os.path.join(warm_up_dir, LOCK_FILE_NAME)
+    return lock_file_path if os.path.exists(lock_file_path) else None
+
+
+def upload_plan_log(s3_client, run, result):
+    """
+    Store the output of the Terraform plan in the regional bucket.
+
+    Returns:
+        str: The S3 URL of the stored plan output.
+    """
+    date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    key = (
+        f"{run.project_name}/tf-plan/{date}/{run.account_id}/"
+        f"{os.path.basename(result.plan_log_path)}"
+    )
+    s3_client.upload_file(
+        result.plan_log_path,
+        run.region_config.bucket_name,
+        key,
+        ExtraArgs={
+            "ServerSideEncryption": "aws:kms",
+            "SSEKMSKeyId": run.region_config.kms_key_arn,
+        },
+    )
+    return f"s3://{run.region_config.bucket_name}/{key}"
+
+
+def build_runs(base_dir, stage, project_name, region_configs, account_ids):
+    """
+    Warm the plugin cache and define the run of every target account in
+    every region.
+
+    Returns:
+        list[WorkspaceRun]: The runs, grouped by region.
+    """
+    plugin_cache_dir = os.path.join(base_dir, "tmp", "plugin-cache")
+    lock_file_path = warm_plugin_cache(base_dir, plugin_cache_dir)
+    return [
+        WorkspaceRun(
+            account_id=account_id,
+            region=region,
+            stage=stage,
+            project_name=project_name,
+            base_dir=base_dir,
+            region_config=region_config,
+            plugin_cache_dir=plugin_cache_dir,
+            lock_file_path=lock_file_path,
+        )
+        for region, region_config in region_configs.items()
+        for account_id in account_ids
+    ]
+
+
+class ResultReporter:
+    """
+    Prints the log of every run as soon as it finished and stores the
+    output of its Terraform plan in the regional bucket, if any.
+    """
+
+    def __init__(self, runs):
+        self.runs_by_name = {run.name: run for run in runs}
+        self.s3_clients = {
+            region: boto3.client("s3", region_name=region)
+            for region in sorted({run.region for run in runs})
+        }
+
+    def __call__(self, result):
+        _print_log(result)
+        if result.plan_log_path and os.path.exists(result.plan_log_path):
+            run = self.runs_by_name[f"{result.account_id}-{result.region}"]
+            LOGGER.info(
+                "Path to terraform plan %s",
+                upload_plan_log(self.s3_clients[run.region], run, result),
+            )
+
+
+def _print_log(result):
+    sys.stdout.write(
+        f"\n===== {result.status}: terraform on account "
+        f"{result.account_id} and region {result.region} "
+        f"({result.duration:.1f}s) =====\n",
+    )
+    if os.path.exists(result.log_path):
+        with open(result.log_path, mode="r", encoding="utf-8") as log_file:
+            shutil.copyfileobj(log_file, sys.stdout)
+    sys.stdout.flush()
+
+
+def main():
+    stage = os.environ["TF_STAGE"]
+    if stage not in STAGE_STEPS:
+        LOGGER.error("Invalid Terraform stage: TF_STAGE = %s", stage)
+        sys.exit(1)
+    failure_policy = os.environ.get("TF_FAILURE_POLICY", FAIL_FAST)
+    max_workers = int(
+        os.environ.get("TF_MAX_CONCURRENT_RUNS", DEFAULT_MAX_CONCURRENT_RUNS),
+    )
+    base_dir = os.getcwd()
+    os.environ["PATH"] = f"{os.environ['PATH']}:{base_dir}"
+    deployment_region = os.environ["AWS_DEFAULT_REGION"]
+    subprocess.run(["terraform", "--version"], check=True)
+    LOGGER.info("Terraform stage: %s", stage)
+
+    regions = get_regions(os.environ.get("REGIONS"), deployment_region)
+    LOGGER.info("List of target regions: %s", ", ".join(regions))
+    account_ids = get_target_accounts(
+        base_dir,
+        os.environ.get("TARGET_ACCOUNTS"),
+        os.environ.get("TARGET_OUS"),
+    )
+    LOGGER.info("List of target accounts: %s", ", ".join(account_ids))
+
+    runs = build_runs(
+        base_dir,
+        stage,
+        os.environ["ADF_PROJECT_NAME"],
+        get_region_configs(
+            boto3.client("ssm", region_name=deployment_region),
+            regions,
+        ),
+        account_ids,
+    )
+    start_time = time.monotonic()
+    results = run_workspaces(
+        runs,
+        max_workers,
+        failure_policy,
+        ResultReporter(runs),
+    )
+    LOGGER.info(
+        "Ran terraform %s on %d workspaces in %.1fs",
+        stage,
+        len(runs),
+        time.monotonic() - start_time,
+    )
+    unsuccessful = [result for result in results if result.status != SUCCEEDED]
+    for result in unsuccessful:
+        LOGGER.error(
+            "Terraform %s %s on account %s and region %s, see %s",
+            stage,
+            result.status.lower(),
+            result.account_id,
+            result.region,
+            result.log_path,
+        )
+    if unsuccessful:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -105,7 +105,7 @@ for REGION in $(echo "$REGIONS" | sed "s/,/ /g"); do
   # if TARGET_ACCOUNTS and TARGET_OUS are not defined apply to all accounts
   if [[ -z "$TARGET_ACCOUNTS" ]] && [[ -z "$TARGET_OUS" ]]; then
     echo "Apply to all accounts"
-    for ACCOUNT_ID in $(jq '.[].AccountId' "${CURRENT}/accounts.json" | sed 's/"//g'); do
+    for ACCOUNT_ID in $(cut -f1 "${CURRENT}/accounts.idx"); do
       tfrun
     done
   fi
@@ -120,7 +120,7 @@ for REGION in $(echo "$REGIONS" | sed "s/,/ /g"); do
 
   if ! [[ -z "$TARGET_OUS" ]]; then
     echo "List target OUs: $TARGET_OUS"
-    for ACCOUNT_ID in $(jq '.[].AccountId' "${CURRENT}/accounts_from_ous.json" | sed 's/"//g'); do
+    for ACCOUNT_ID in $(cut -f1 "${CURRENT}/accounts_from_ous.idx"); do
       tfrun
     done
   fi
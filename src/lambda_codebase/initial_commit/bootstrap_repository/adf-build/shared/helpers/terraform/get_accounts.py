@@ -3,12 +3,17 @@
 
 """
 Module used to get accounts list from target OUs.
+
+The accounts are written to accounts.json and accounts_from_ous.json
+while these are paginated. A compact index of each is written to
+accounts.idx and accounts_from_ous.idx, holding one line per account with
+the tab-separated account id, email, name, and organizational unit path.
 """
 
-import json
 import logging
 import os
 import boto3
+from account_writer import AccountWriter
 from paginator import paginator
 from partition import get_partition
 
@@ -25,17 +30,31 @@ PARTITION = get_partition(REGION_DEFAULT)
 sts = boto3.client('sts')
 ssm = boto3.client('ssm')
 ORGANIZATIONS_READONLY_ROLE = "adf/organizations/adf-organizations-readonly"
+# The fields written to the accounts files, mapped to the account details
+# they are read from.
+ACCOUNT_FIELDS = {
+    'AccountId': 'Id',
+    'Email': 'Email',
+}
 
 
 def main():
-    accounts = get_accounts()
-    with open('accounts.json', 'w', encoding='utf-8') as outfile:
-        json.dump(accounts, outfile)
+    with AccountWriter(
+        'accounts.json',
+        fields=ACCOUNT_FIELDS,
+        index_path='accounts.idx',
+    ) as writer:
+        for account in get_accounts():
+            writer.write(account)
 
     if TARGET_OUS:
-        accounts_from_ous = get_accounts_from_ous()
-        with open('accounts_from_ous.json', 'w', encoding='utf-8') as outfile:
-            json.dump(accounts_from_ous, outfile)
+        with AccountWriter(
+            'accounts_from_ous.json',
+            fields=ACCOUNT_FIELDS,
+            index_path='accounts_from_ous.idx',
+        ) as writer:
+            for account, ou_path in get_accounts_from_ous():
+                writer.write(account, ou_path)
 
 
 def list_organizational_units_for_parent(parent_ou):
@@ -60,7 +79,7 @@ def list_organizational_units_for_parent(parent_ou):
 
 
 def get_accounts():
-    # Return an array of objects like this: [{'AccountId':'xxx','Email':''}]
+    # Yield the details of the active accounts while these are paginated
     LOGGER.info(
         "Management Account ID: %s",
         MANAGEMENT_ACCOUNT_ID
@@ -75,23 +94,16 @@ def get_accounts():
         ),
         'getaccountIDs',
     )
-    return list(
-        map(
-            lambda account: {
-                'AccountId': account['Id'],
-                'Email': account['Email'],
-            },
-            filter(
-                lambda account: account['Status'] == 'ACTIVE',
-                paginator(organizations.list_accounts)
-            )
-        )
+    yield from filter(
+        lambda account: account['Status'] == 'ACTIVE',
+        paginator(organizations.list_accounts)
     )
 
 
 def get_accounts_from_ous():
+    # Yield the accounts of the target OUs, along with the path of the
+    # organizational unit ids they were found in.
     parent_ou_id = None
-    account_list = []
     organizations = get_boto3_client(
         'organizations',
         (
@@ -117,9 +129,7 @@ def get_accounts_from_ous():
         ou_hierarchy = path.strip('/').split('/')
         hierarchy_index = 0
         if path.strip() == '/':
-            account_list.extend(
-                get_account_recursive(organizations, parent_ou_id, '/')
-            )
+            yield from get_account_recursive(organizations, parent_ou_id, '/')
         else:
             while hierarchy_index < len(ou_hierarchy):
                 org_units = list_organizational_units_for_parent(parent_ou_id)
@@ -134,11 +144,8 @@ def get_accounts_from_ous():
                         f'OU list {org_units}.'
                     )
 
-            account_list.extend(
-                get_account_recursive(organizations, parent_ou_id, '/'),
-            )
+            yield from get_account_recursive(organizations, parent_ou_id, '/')
         parent_ou_id = None
-    return account_list
 
 
 def get_boto3_client(service, role, session_name):
@@ -155,8 +162,7 @@ def get_boto3_client(service, role, session_name):
     return session.client(service)
 
 
-def get_account_recursive(org_client: boto3.client, ou_id: str, path: str) -> list:
-    account_list = []
+def get_account_recursive(org_client: boto3.client, ou_id: str, path: str):
     # Get OUs
     paginator_item = org_client.get_paginator('list_children')
     pages = paginator_item.paginate(
@@ -165,12 +171,10 @@ def get_account_recursive(org_client: boto3.client, ou_id: str, path: str) -> li
     )
     for page in pages:
         for child in page['Children']:
-            account_list.extend(
-                get_account_recursive(
-                    org_client,
-                    child['Id'],
-                    f"{path}{ou_id}/",
-                )
+            yield from get_account_recursive(
+                org_client,
+                child['Id'],
+                f"{path}{ou_id}/",
             )
 
     # Get Accounts
@@ -180,10 +184,7 @@ def get_account_recursive(org_client: boto3.client, ou_id: str, path: str) -> li
     )
     for page in pages:
         for child in page['Children']:
-            account_list.append({
-                'AccountId': child['Id']
-            })
-    return account_list
+            yield child, f"{path}{ou_id}"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,362 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+import os
+import stat
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from mock import Mock, patch
+
+from adf_terraform import (
+    CANCELLED,
+    CONTINUE,
+    FAIL_FAST,
+    FAILED,
+    SUCCEEDED,
+    RegionConfig,
+    ResultReporter,
+    RunResult,
+    WorkspaceRun,
+    build_runs,
+    get_region_configs,
+    get_target_accounts,
+    run_workspaces,
+    warm_plugin_cache,
+)
+
+STUB_TERRAFORM = """#!/usr/bin/env bash
+echo "${TF_VAR_TARGET_ACCOUNT_ID:-none} ${TF_VAR_TARGET_REGION:-none} $*" \
+  >> "$STUB_TERRAFORM_CALLS"
+if [ "$1" = "init" ] && [ -z "$TF_VAR_TARGET_ACCOUNT_ID" ]; then
+  echo "# lock" > .terraform.lock.hcl
+fi
+if [ "$1" = "plan" ] && \
+   [ "$TF_VAR_TARGET_ACCOUNT_ID" = "$STUB_TERRAFORM_FAILING_ACCOUNT" ]; then
+  echo "Error: stub plan failure"
+  exit 1
+fi
+echo "terraform $1 of $TF_VAR_TARGET_ACCOUNT_ID in $TF_VAR_TARGET_REGION"
+"""
+
+
+@pytest.fixture
+def base_dir(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    terraform = bin_dir / "terraform"
+    terraform.write_text(STUB_TERRAFORM)
+    terraform.chmod(terraform.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+    monkeypatch.setenv("STUB_TERRAFORM_CALLS", str(tmp_path / "calls.txt"))
+
+    source_dir = tmp_path / "source"
+    (source_dir / "tf").mkdir(parents=True)
+    (source_dir / "tf" / "main.tf").write_text("# main")
+    (source_dir / "tfvars" / "111111111111" / "eu-west-1").mkdir(parents=True)
+    (source_dir / "tfvars" / "global.auto.tfvars").write_text("a = 1")
+    (source_dir / "tfvars" / "111111111111" / "account.auto.tfvars").write_text(
+        "b = 2",
+    )
+    (
+        source_dir / "tfvars" / "111111111111" / "eu-west-1"
+        / "region.auto.tfvars"
+    ).write_text("c = 3")
+    return source_dir
+
+
+def _calls(base_dir):
+    calls_path = base_dir.parent / "calls.txt"
+    if not calls_path.exists():
+        return []
+    return calls_path.read_text().splitlines()
+
+
+def _runs(base_dir, account_ids, regions, stage="apply"):
+    return [
+        WorkspaceRun(
+            account_id=account_id,
+            region=region,
+            stage=stage,
+            project_name="some-project",
+            base_dir=str(base_dir),
+            region_config=RegionConfig(
+                bucket_name=f"bucket-{region}",
+                kms_key_arn=f"kms-{region}",
+            ),
+            plugin_cache_dir=str(base_dir / "tmp" / "plugin-cache"),
+        )
+        for region in regions
+        for account_id in account_ids
+    ]
+
+
+def test_get_target_accounts_all_accounts(tmp_path):
+    (tmp_path / "accounts.json").write_text(json.dumps([
+        {"AccountId": "111111111111", "Email": "a@example.com"},
+        {"AccountId": "222222222222", "Email": "b@example.com"},
+    ]))
+
+    assert get_target_accounts(str(tmp_path), None, None) == [
+        "111111111111",
+        "222222222222",
+    ]
+
+
+def test_get_target_accounts_deduplicates_accounts_and_ous(tmp_path):
+    (tmp_path / "accounts_from_ous.json").write_text(json.dumps([
+        {"AccountId": "222222222222"},
+        {"AccountId": "333333333333"},
+    ]))
+
+    assert get_target_accounts(
+        str(tmp_path),
+        "111111111111, 222222222222",
+        "/some/ou",
+    ) == ["111111111111", "222222222222", "333333333333"]
+
+
+def test_get_target_accounts_prefers_index(tmp_path):
+    (tmp_path / "accounts.json").write_text("not parsed")
+    (tmp_path / "accounts.idx").write_text(
+        "111111111111\ta@example.com\t\t\n"
+        "222222222222\tb@example.com\t\t\n"
+    )
+
+    assert get_target_accounts(str(tmp_path), None, None) == [
+        "111111111111",
+        "222222222222",
+    ]
+
+
+def test_get_region_configs_single_call():
+    ssm_client = boto3.client("ssm", region_name="eu-west-1")
+    stubber = Stubber(ssm_client)
+    stubber.add_response(
+        "get_parameters",
+        {
+            "Parameters": [
+                {
+                    "Name": f"/adf/cross_region/{name}/{region}",
+                    "Value": f"{name}-{region}",
+                }
+                for region in ("eu-west-1", "us-east-1")
+                for name in ("s3_regional_bucket", "kms_arn")
+            ],
+        },
+        {
+            "Names": [
+                "/adf/cross_region/s3_regional_bucket/eu-west-1",
+                "/adf/cross_region/kms_arn/eu-west-1",
+                "/adf/cross_region/s3_regional_bucket/us-east-1",
+                "/adf/cross_region/kms_arn/us-east-1",
+            ],
+        },
+    )
+    stubber.activate()
+
+    assert get_region_configs(ssm_client, ["eu-west-1", "us-east-1"]) == {
+        "eu-west-1": RegionConfig(
+            bucket_name="s3_regional_bucket-eu-west-1",
+            kms_key_arn="kms_arn-eu-west-1",
+        ),
+        "us-east-1": RegionConfig(
+            bucket_name="s3_regional_bucket-us-east-1",
+            kms_key_arn="kms_arn-us-east-1",
+        ),
+    }
+    stubber.assert_no_pending_responses()
+
+
+def test_get_region_configs_unknown_region():
+    ssm_client = boto3.client("ssm", region_name="eu-west-1")
+    stubber = Stubber(ssm_client)
+    stubber.add_response(
+        "get_parameters",
+        {
+            "Parameters": [],
+            "InvalidParameters": [
+                "/adf/cross_region/s3_regional_bucket/eu-north-1",
+                "/adf/cross_region/kms_arn/eu-north-1",
+            ],
+        },
+    )
+    stubber.activate()
+
+    with pytest.raises(ValueError, match="eu-north-1"):
+        get_region_configs(ssm_client, ["eu-north-1"])
+
+
+def test_warm_plugin_cache_returns_lock_file(base_dir):
+    lock_file_path = warm_plugin_cache(
+        str(base_dir),
+        str(base_dir / "tmp" / "plugin-cache"),
+    )
+
+    assert lock_file_path == str(
+        base_dir / "tmp" / "plugin-cache-warm-up" / ".terraform.lock.hcl",
+    )
+    assert _calls(base_dir) == ["none none init -backend=false -input=false"]
+
+
+def test_build_runs_shares_plugin_cache(base_dir):
+    region_configs = {
+        region: RegionConfig(
+            bucket_name=f"bucket-{region}",
+            kms_key_arn=f"kms-{region}",
+        )
+        for region in ["eu-west-1", "us-east-1"]
+    }
+
+    runs = build_runs(
+        str(base_dir),
+        "plan",
+        "some-project",
+        region_configs,
+        ["111111111111", "222222222222"],
+    )
+
+    assert [run.name for run in runs] == [
+        "111111111111-eu-west-1",
+        "222222222222-eu-west-1",
+        "111111111111-us-east-1",
+        "222222222222-us-east-1",
+    ]
+    assert {run.region_config for run in runs} == set(region_configs.values())
+    assert {run.lock_file_path for run in runs} == {
+        str(base_dir / "tmp" / "plugin-cache-warm-up" / ".terraform.lock.hcl"),
+    }
+    assert _calls(base_dir) == ["none none init -backend=false -input=false"]
+
+
+def test_result_reporter_uploads_plan_log(base_dir, capsys):
+    runs = _runs(base_dir, ["111111111111"], ["eu-west-1", "us-east-1"])
+    plan_log_path = base_dir / "plan.log"
+    plan_log_path.write_text("plan output")
+    log_path = base_dir / "run.log"
+    log_path.write_text("run output")
+    s3_clients = {}
+
+    with patch(
+        "adf_terraform.boto3.client",
+        side_effect=lambda service, region_name: s3_clients.setdefault(
+            region_name,
+            Mock(),
+        ),
+    ):
+        reporter = ResultReporter(runs)
+    reporter(RunResult(
+        account_id="111111111111",
+        region="us-east-1",
+        status=SUCCEEDED,
+        log_path=str(log_path),
+        plan_log_path=str(plan_log_path),
+    ))
+    reporter(RunResult(
+        account_id="111111111111",
+        region="eu-west-1",
+        status=FAILED,
+        log_path=str(log_path),
+    ))
+
+    assert sorted(s3_clients) == ["eu-west-1", "us-east-1"]
+    s3_clients["eu-west-1"].upload_file.assert_not_called()
+    upload_args = s3_clients["us-east-1"].upload_file.call_args.args
+    assert upload_args[:2] == (str(plan_log_path), "bucket-us-east-1")
+    assert upload_args[2].startswith("some-project/tf-plan/")
+    assert capsys.readouterr().out.count("run output") == 2
+
+
+def test_run_workspaces_apply(base_dir):
+    runs = _runs(
+        base_dir,
+        ["111111111111", "222222222222"],
+        ["eu-west-1", "us-east-1"],
+    )
+    reported = []
+
+    results = run_workspaces(runs, 2, FAIL_FAST, reported.append)
+
+    assert [result.status for result in results] == [SUCCEEDED] * 4
+    assert [
+        (result.account_id, result.region) for result in results
+    ] == [(run.account_id, run.region) for run in runs]
+    assert sorted(reported, key=results.index) == results
+    calls = _calls(base_dir)
+    assert len(calls) == 12
+    assert (
+        "111111111111 us-east-1 init "
+        "-backend-config bucket=bucket-us-east-1 "
+        "-backend-config encrypt=true "
+        "-backend-config kms_key_id=kms-us-east-1 "
+        "-backend-config region=us-east-1 "
+        "-backend-config key=some-project/111111111111.tfstate "
+        "-backend-config dynamodb_table=adf-tflocktable"
+    ) in calls
+    assert (
+        "222222222222 eu-west-1 plan -out some-project-222222222222"
+    ) in calls
+    assert (
+        "222222222222 eu-west-1 apply some-project-222222222222"
+    ) in calls
+
+    work_dir = base_dir / "tmp" / "111111111111-eu-west-1"
+    assert sorted(os.listdir(work_dir)) == sorted([
+        "account.auto.tfvars",
+        "eu-west-1",
+        "global.auto.tfvars",
+        "main.tf",
+        os.path.basename(results[0].plan_log_path),
+        "region.auto.tfvars",
+    ])
+    assert not (
+        base_dir / "tmp" / "222222222222-eu-west-1" / "account.auto.tfvars"
+    ).exists()
+    log = (base_dir / "tmp" / "logs" / "222222222222-us-east-1.log").read_text()
+    assert "terraform apply of 222222222222 in us-east-1" in log
+
+
+def test_run_workspaces_continue(base_dir, monkeypatch):
+    monkeypatch.setenv("STUB_TERRAFORM_FAILING_ACCOUNT", "111111111111")
+    runs = _runs(
+        base_dir,
+        ["111111111111", "222222222222", "333333333333"],
+        ["eu-west-1"],
+    )
+
+    results = run_workspaces(runs, 2, CONTINUE)
+
+    assert [result.status for result in results] == [
+        FAILED,
+        SUCCEEDED,
+        SUCCEEDED,
+    ]
+    assert "returned non-zero exit status 1" in results[0].error
+    log = (base_dir / "tmp" / "logs" / "111111111111-eu-west-1.log").read_text()
+    assert "Error: stub plan failure" in log
+    assert not any(
+        call.startswith("111111111111 eu-west-1 apply")
+        for call in _calls(base_dir)
+    )
+
+
+def test_run_workspaces_fail_fast(base_dir, monkeypatch):
+    monkeypatch.setenv("STUB_TERRAFORM_FAILING_ACCOUNT", "111111111111")
+    account_ids = [f"{index}" * 12 for index in range(1, 7)]
+    runs = _runs(base_dir, account_ids, ["eu-west-1"])
+
+    results = run_workspaces(runs, 1, FAIL_FAST)
+
+    assert results[0].status == FAILED
+    assert results[-1].status == CANCELLED
+    executed_accounts = {call.split()[0] for call in _calls(base_dir)}
+    assert account_ids[-1] not in executed_accounts
+
+
+def test_run_workspaces_invalid_policy(base_dir):
+    with pytest.raises(ValueError, match="Invalid failure policy"):
+        run_workspaces(_runs(base_dir, ["111111111111"], ["eu-west-1"]), 1, "x")
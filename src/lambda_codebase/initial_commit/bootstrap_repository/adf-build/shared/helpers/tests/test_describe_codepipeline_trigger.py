@@ -0,0 +1,187 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+
+import boto3
+from botocore.stub import Stubber
+
+from describe_codepipeline_trigger import (
+    fetch_codepipeline_execution_trigger,
+    read_cached_trigger,
+    write_cached_trigger,
+)
+
+PIPELINE_NAME = "some-pipeline"
+EXECUTION_ID = "a-b-c-d"
+TRIGGER = {
+    "triggerType": "StartPipelineExecution",
+    "triggerDetail": "arn:aws:sts::111111111111:assumed-role/some-role",
+}
+TRIGGER_DATA = {
+    "trigger_type": "StartPipelineExecution",
+    "trigger_detail": "arn:aws:sts::111111111111:assumed-role/some-role",
+}
+
+
+def _execution_summary(execution_id):
+    return {
+        "pipelineExecutionId": execution_id,
+        "trigger": TRIGGER,
+    }
+
+
+def _stubbed_client():
+    cp_client = boto3.client("codepipeline", region_name="eu-west-1")
+    return cp_client, Stubber(cp_client)
+
+
+def test_fetch_trigger_directly():
+    cp_client, stubber = _stubbed_client()
+    stubber.add_response(
+        "get_pipeline_execution",
+        {
+            "pipelineExecution": {
+                "pipelineName": PIPELINE_NAME,
+                "pipelineExecutionId": EXECUTION_ID,
+                "trigger": TRIGGER,
+            },
+        },
+        {
+            "pipelineName": PIPELINE_NAME,
+            "pipelineExecutionId": EXECUTION_ID,
+        },
+    )
+    stubber.activate()
+
+    assert fetch_codepipeline_execution_trigger(
+        cp_client,
+        PIPELINE_NAME,
+        EXECUTION_ID,
+    ) == TRIGGER_DATA
+    stubber.assert_no_pending_responses()
+
+
+def test_fetch_trigger_falls_back_to_history():
+    cp_client, stubber = _stubbed_client()
+    stubber.add_client_error(
+        "get_pipeline_execution",
+        service_error_code="AccessDeniedException",
+    )
+    stubber.add_response(
+        "list_pipeline_executions",
+        {
+            "pipelineExecutionSummaries": [_execution_summary("other")],
+            "nextToken": "next",
+        },
+        {"pipelineName": PIPELINE_NAME, "maxResults": 100},
+    )
+    stubber.add_response(
+        "list_pipeline_executions",
+        {"pipelineExecutionSummaries": [_execution_summary(EXECUTION_ID)]},
+        {
+            "pipelineName": PIPELINE_NAME,
+            "maxResults": 100,
+            "nextToken": "next",
+        },
+    )
+    stubber.activate()
+
+    assert fetch_codepipeline_execution_trigger(
+        cp_client,
+        PIPELINE_NAME,
+        EXECUTION_ID,
+    ) == TRIGGER_DATA
+    stubber.assert_no_pending_responses()
+
+
+def test_fetch_trigger_stops_at_max_pages():
+    cp_client, stubber = _stubbed_client()
+    stubber.add_response(
+        "get_pipeline_execution",
+        {
+            "pipelineExecution": {
+                "pipelineName": PIPELINE_NAME,
+                "pipelineExecutionId": EXECUTION_ID,
+            },
+        },
+    )
+    stubber.add_response(
+        "list_pipeline_executions",
+        {
+            "pipelineExecutionSummaries": [_execution_summary("other")],
+            "nextToken": "next",
+        },
+    )
+    stubber.activate()
+
+    assert fetch_codepipeline_execution_trigger(
+        cp_client,
+        PIPELINE_NAME,
+        EXECUTION_ID,
+        max_pages=1,
+    ) is None
+    stubber.assert_no_pending_responses()
+
+
+def test_fetch_trigger_execution_not_found():
+    cp_client, stubber = _stubbed_client()
+    stubber.add_client_error(
+        "get_pipeline_execution",
+        service_error_code="PipelineExecutionNotFoundException",
+    )
+    stubber.activate()
+
+    assert fetch_codepipeline_execution_trigger(
+        cp_client,
+        PIPELINE_NAME,
+        EXECUTION_ID,
+    ) is None
+    stubber.assert_no_pending_responses()
+
+
+def test_trigger_cache(tmp_path):
+    cache_file = str(tmp_path / "triggers.json")
+
+    assert read_cached_trigger(cache_file, PIPELINE_NAME, EXECUTION_ID) is None
+
+    write_cached_trigger(cache_file, PIPELINE_NAME, EXECUTION_ID, TRIGGER_DATA)
+    write_cached_trigger(cache_file, PIPELINE_NAME, "other", TRIGGER_DATA)
+
+    assert read_cached_trigger(
+        cache_file,
+        PIPELINE_NAME,
+        EXECUTION_ID,
+    ) == TRIGGER_DATA
+    assert read_cached_trigger(cache_file, "other", EXECUTION_ID) is None
+    with open(cache_file, encoding="utf-8") as cache:
+        assert sorted(json.load(cache)) == [
+            f"{PIPELINE_NAME}/{EXECUTION_ID}",
+            f"{PIPELINE_NAME}/other",
+        ]
+
+
+def test_trigger_cache_ignores_invalid_file(tmp_path):
+    cache_file = tmp_path / "triggers.json"
+    cache_file.write_text("not json")
+
+    assert read_cached_trigger(
+        str(cache_file),
+        PIPELINE_NAME,
+        EXECUTION_ID,
+    ) is None
+
+    write_cached_trigger(
+        str(cache_file),
+        PIPELINE_NAME,
+        EXECUTION_ID,
+        TRIGGER_DATA,
+    )
+
+    assert read_cached_trigger(
+        str(cache_file),
+        PIPELINE_NAME,
+        EXECUTION_ID,
+    ) == TRIGGER_DATA
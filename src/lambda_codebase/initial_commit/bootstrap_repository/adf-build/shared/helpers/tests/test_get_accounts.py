@@ -0,0 +1,72 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+
+from mock import Mock, patch
+
+import get_accounts
+
+
+def _list_children(ParentId, ChildType):
+    children = {
+        ("r-root", "ORGANIZATIONAL_UNIT"): ["ou-a"],
+        ("r-root", "ACCOUNT"): ["111111111111"],
+        ("ou-a", "ORGANIZATIONAL_UNIT"): [],
+        ("ou-a", "ACCOUNT"): ["222222222222", "333333333333"],
+    }[(ParentId, ChildType)]
+    return [{
+        "Children": [
+            {"Id": child_id, "Type": ChildType}
+            for child_id in children
+        ],
+    }]
+
+
+@patch("get_accounts.get_boto3_client")
+def test_main_streams_accounts_and_index(get_client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(get_accounts, "TARGET_OUS", "/")
+    organizations = get_client.return_value
+    organizations.get_paginator.return_value.paginate.side_effect = (
+        _list_children
+    )
+    with patch("get_accounts.paginator") as paginator_mock:
+        paginator_mock.side_effect = lambda method: {
+            organizations.list_accounts: iter([
+                {
+                    "Id": "111111111111",
+                    "Email": "a@example.com",
+                    "Name": "a",
+                    "Status": "ACTIVE",
+                },
+                {
+                    "Id": "222222222222",
+                    "Email": "b@example.com",
+                    "Name": "b",
+                    "Status": "SUSPENDED",
+                },
+            ]),
+            organizations.list_roots: iter([{"Id": "r-root"}]),
+        }[method]
+
+        get_accounts.main()
+
+    assert json.loads((tmp_path / "accounts.json").read_text()) == [
+        {"AccountId": "111111111111", "Email": "a@example.com"},
+    ]
+    assert (tmp_path / "accounts.idx").read_text() == (
+        "111111111111\ta@example.com\ta\t\n"
+    )
+    assert json.loads((tmp_path / "accounts_from_ous.json").read_text()) == [
+        {"AccountId": "222222222222"},
+        {"AccountId": "333333333333"},
+        {"AccountId": "111111111111"},
+    ]
+    assert (tmp_path / "accounts_from_ous.idx").read_text() == (
+        "222222222222\t\t\t/r-root/ou-a\n"
+        "333333333333\t\t\t/r-root/ou-a\n"
+        "111111111111\t\t\t/r-root\n"
+    )
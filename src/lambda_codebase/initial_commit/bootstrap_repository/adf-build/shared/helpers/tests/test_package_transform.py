@@ -0,0 +1,325 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import io
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+from mock import Mock, patch
+
+from package_transform import (
+    RegionConfig,
+    copy_artifacts,
+    copy_templates,
+    find_artifact_keys,
+    find_nested_templates,
+    get_region_configs,
+    get_target_regions,
+    localize_template,
+    package_regions,
+)
+
+EU_CONFIG = RegionConfig(
+    bucket_name="adf-regional-bucket-eu",
+    kms_key_arn="arn:aws:kms:eu-west-1:111111111111:key/eu",
+)
+US_CONFIG = RegionConfig(
+    bucket_name="adf-regional-bucket-us",
+    kms_key_arn="arn:aws:kms:us-east-1:111111111111:key/us",
+)
+PACKAGED_TEMPLATE = """
+Resources:
+  Function:
+    Type: AWS::Serverless::Function
+    Properties:
+      CodeUri: s3://adf-regional-bucket-eu/0a1b2c3d
+      Role: !GetAtt Role.Arn
+  LegacyFunction:
+    Type: AWS::Lambda::Function
+    Properties:
+      Code:
+        S3Bucket: adf-regional-bucket-eu
+        S3Key: 4e5f6a7b
+      Environment:
+        Variables:
+          NAME: !Sub "${AWS::StackName}-function"
+  Nested:
+    Type: AWS::CloudFormation::Stack
+    Properties:
+      TemplateURL: https://s3.eu-west-1.amazonaws.com/adf-regional-bucket-eu/8c9d.template
+  Other:
+    Type: AWS::Serverless::LayerVersion
+    Properties:
+      ContentUri: s3://some-other-bucket/ffff
+"""
+NESTED_TEMPLATE = """
+Resources:
+  NestedFunction:
+    Type: AWS::Serverless::Function
+    Properties:
+      CodeUri: s3://adf-regional-bucket-eu/1234
+"""
+
+
+def _not_found():
+    return ClientError(
+        {"Error": {"Code": "404", "Message": "Not Found"}},
+        "HeadObject",
+    )
+
+
+def test_get_target_regions():
+    ssm_client = boto3.client("ssm", region_name="eu-west-1")
+    stubber = Stubber(ssm_client)
+    stubber.add_response(
+        "get_parameters",
+        {
+            "Parameters": [{
+                "Name": "/adf/deployment/S3/some-pipeline/regions",
+                "Value": "['eu-west-1', 'us-east-1']",
+            }],
+        },
+        {
+            "Names": ["/adf/deployment/S3/some-pipeline/regions"],
+            "WithDecryption": True,
+        },
+    )
+    stubber.activate()
+
+    assert get_target_regions(ssm_client, "S3", "some-pipeline") == [
+        "eu-west-1",
+        "us-east-1",
+    ]
+
+
+def test_get_region_configs_batches_lookups():
+    regions = [f"region-{index}" for index in range(6)]
+    ssm_client = boto3.client("ssm", region_name="eu-west-1")
+    stubber = Stubber(ssm_client)
+    for batch in (regions[:5], regions[5:]):
+        stubber.add_response(
+            "get_parameters",
+            {
+                "Parameters": [
+                    {
+                        "Name": f"/adf/cross_region/{name}/{region}",
+                        "Value": f"{name}-{region}",
+                    }
+                    for region in batch
+                    for name in ("s3_regional_bucket", "kms_arn")
+                ],
+            },
+        )
+    stubber.activate()
+
+    configs = get_region_configs(ssm_client, regions)
+
+    stubber.assert_no_pending_responses()
+    assert configs["region-5"] == RegionConfig(
+        bucket_name="s3_regional_bucket-region-5",
+        kms_key_arn="kms_arn-region-5",
+    )
+    assert len(configs) == 6
+
+
+def test_find_artifact_keys():
+    assert find_artifact_keys(
+        PACKAGED_TEMPLATE,
+        EU_CONFIG.bucket_name,
+    ) == {"0a1b2c3d", "4e5f6a7b", "8c9d.template"}
+
+
+def test_localize_template():
+    result = localize_template(
+        PACKAGED_TEMPLATE,
+        "eu-west-1",
+        EU_CONFIG,
+        "us-east-1",
+        US_CONFIG,
+    )
+
+    assert "adf-regional-bucket-eu" not in result
+    assert "CodeUri: s3://adf-regional-bucket-us/0a1b2c3d" in result
+    assert "S3Bucket: adf-regional-bucket-us" in result
+    assert (
+        "TemplateURL: https://s3.us-east-1.amazonaws.com/"
+        "adf-regional-bucket-us/8c9d.template"
+    ) in result
+    assert "ContentUri: s3://some-other-bucket/ffff" in result
+    assert localize_template(
+        PACKAGED_TEMPLATE,
+        "eu-west-1",
+        EU_CONFIG,
+        "eu-west-1",
+        EU_CONFIG,
+    ) == PACKAGED_TEMPLATE
+
+
+def test_find_nested_templates():
+    s3_client = Mock()
+    s3_client.get_object.return_value = {
+        "Body": io.BytesIO(NESTED_TEMPLATE.encode("utf-8")),
+    }
+
+    artifacts = find_nested_templates(
+        s3_client,
+        PACKAGED_TEMPLATE,
+        EU_CONFIG.bucket_name,
+    )
+
+    assert artifacts == {
+        "0a1b2c3d": None,
+        "4e5f6a7b": None,
+        "8c9d.template": NESTED_TEMPLATE,
+        "1234": None,
+    }
+    s3_client.get_object.assert_called_once_with(
+        Bucket=EU_CONFIG.bucket_name,
+        Key="8c9d.template",
+    )
+
+
+def test_copy_artifacts_skips_existing():
+    s3_client = Mock()
+    source_s3_client = Mock()
+    s3_client.head_object.side_effect = [
+        None,
+        _not_found(),
+        _not_found(),
+    ]
+
+    counts = copy_artifacts(
+        s3_client,
+        source_s3_client,
+        {
+            "0a1b2c3d": None,
+            "1234": None,
+            "8c9d.template": NESTED_TEMPLATE,
+        },
+        "eu-west-1",
+        EU_CONFIG,
+        "us-east-1",
+        US_CONFIG,
+    )
+
+    assert counts == {"copied": 2, "skipped": 1}
+    encryption = {
+        "ServerSideEncryption": "aws:kms",
+        "SSEKMSKeyId": US_CONFIG.kms_key_arn,
+    }
+    s3_client.copy.assert_called_once_with(
+        CopySource={"Bucket": EU_CONFIG.bucket_name, "Key": "1234"},
+        Bucket=US_CONFIG.bucket_name,
+        Key="1234",
+        ExtraArgs=encryption,
+        SourceClient=source_s3_client,
+    )
+    s3_client.put_object.assert_called_once_with(
+        Bucket=US_CONFIG.bucket_name,
+        Key="8c9d.template",
+        Body=NESTED_TEMPLATE.replace(
+            EU_CONFIG.bucket_name,
+            US_CONFIG.bucket_name,
+        ).encode("utf-8"),
+        **encryption,
+    )
+
+
+def test_copy_artifacts_head_object_error():
+    s3_client = Mock()
+    s3_client.head_object.side_effect = ClientError(
+        {"Error": {"Code": "403", "Message": "Forbidden"}},
+        "HeadObject",
+    )
+
+    with pytest.raises(ClientError):
+        copy_artifacts(
+            s3_client,
+            Mock(),
+            {"0a1b2c3d": None},
+            "eu-west-1",
+            EU_CONFIG,
+            "us-east-1",
+            US_CONFIG,
+        )
+
+
+@patch("package_transform.sam_package")
+def test_package_regions(sam_package, tmp_path):
+    source_template = tmp_path / "template_eu-west-1.yml"
+    source_template.write_text(PACKAGED_TEMPLATE)
+    sam_package.return_value = str(source_template)
+    eu_s3_client = Mock()
+    eu_s3_client.get_object.return_value = {
+        "Body": io.BytesIO(NESTED_TEMPLATE.encode("utf-8")),
+    }
+    us_s3_client = Mock()
+    us_s3_client.head_object.side_effect = _not_found()
+
+    package_regions(
+        str(tmp_path),
+        ["eu-west-1", "us-east-1"],
+        {"eu-west-1": EU_CONFIG, "us-east-1": US_CONFIG},
+        {"eu-west-1": eu_s3_client, "us-east-1": us_s3_client},
+        10,
+    )
+
+    sam_package.assert_called_once_with(str(tmp_path), "eu-west-1", EU_CONFIG)
+    assert us_s3_client.head_object.call_count == 4
+    assert us_s3_client.copy.call_count == 3
+    assert us_s3_client.put_object.call_count == 1
+    assert (tmp_path / "template_us-east-1.yml").read_text() == (
+        localize_template(
+            PACKAGED_TEMPLATE,
+            "eu-west-1",
+            EU_CONFIG,
+            "us-east-1",
+            US_CONFIG,
+        )
+    )
+
+
+@patch("package_transform.sam_package")
+def test_package_regions_raises_region_error(sam_package, tmp_path):
+    source_template = tmp_path / "template_eu-west-1.yml"
+    source_template.write_text(PACKAGED_TEMPLATE)
+    sam_package.return_value = str(source_template)
+    failing_s3_client = Mock()
+    failing_s3_client.head_object.side_effect = _not_found()
+    failing_s3_client.copy.side_effect = Exception("Access denied")
+    eu_s3_client = Mock()
+    eu_s3_client.get_object.return_value = {
+        "Body": io.BytesIO(NESTED_TEMPLATE.encode("utf-8")),
+    }
+
+    with pytest.raises(Exception, match="Access denied"):
+        package_regions(
+            str(tmp_path),
+            ["eu-west-1", "us-east-1", "us-west-2"],
+            {
+                "eu-west-1": EU_CONFIG,
+                "us-east-1": US_CONFIG,
+                "us-west-2": US_CONFIG,
+            },
+            {
+                "eu-west-1": eu_s3_client,
+                "us-east-1": Mock(),
+                "us-west-2": failing_s3_client,
+            },
+            10,
+        )
+
+    assert (tmp_path / "template_us-east-1.yml").exists()
+
+
+def test_copy_templates(tmp_path):
+    (tmp_path / "template.yml").write_text("Resources: {}")
+
+    copy_templates(str(tmp_path), ["eu-west-1", "us-east-1"])
+
+    assert (tmp_path / "template_us-east-1.yml").read_text() == "Resources: {}"
+    assert (tmp_path / "template_eu-west-1.yml").read_text() == "Resources: {}"
@@ -0,0 +1,86 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Process multiple accounts within a single Lambda invocation.
+
+The account management Lambda functions process a single account per
+invocation. When the event holds an accounts list instead, these accounts
+are processed concurrently within the same invocation. This allows the
+function to share its role sessions and configuration across the accounts.
+
+Every account results in an entry in the returned accounts list, marked
+as either SUCCEEDED or FAILED. A failed account does not fail the other
+accounts in the batch, its error is returned in the entry instead.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+# ADF imports
+from logger import configure_logger
+
+LOGGER = configure_logger(__name__)
+ACCOUNTS_KEY = "accounts"
+MAX_CONCURRENT_ACCOUNTS = 10
+
+
+def get_accounts(event):
+    """
+    Returns:
+        list[dict]: The accounts of a batch event, or the event itself when
+            it holds a single account.
+    """
+    if ACCOUNTS_KEY in event:
+        return event[ACCOUNTS_KEY]
+    return [event]
+
+
+def process_accounts(event, process_account):
+    """
+    Process the account of the event, or every account of a batch event
+    concurrently, using the process_account function.
+
+    Returns:
+        dict: The result of process_account when the event holds a single
+            account. For a batch event, the event with a result entry per
+            account in the accounts list.
+    """
+    if ACCOUNTS_KEY not in event:
+        return process_account(event)
+
+    accounts = event[ACCOUNTS_KEY]
+    with ThreadPoolExecutor(
+        max_workers=max(min(MAX_CONCURRENT_ACCOUNTS, len(accounts)), 1),
+    ) as executor:
+        futures = [
+            executor.submit(process_account, account)
+            for account in accounts
+        ]
+
+    results = []
+    for account, future in zip(accounts, futures):
+        error = future.exception()
+        if error:
+            LOGGER.error(
+                "Failed to process account %s (%s): %s",
+                account.get("account_full_name"),
+                account.get("account_id"),
+                error,
+            )
+            results.append({
+                **account,
+                "processing_status": "FAILED",
+                "processing_error": {
+                    "type": type(error).__name__,
+                    "message": str(error),
+                },
+            })
+        else:
+            results.append({
+                **future.result(),
+                "processing_status": "SUCCEEDED",
+            })
+    return {
+        **event,
+        ACCOUNTS_KEY: results,
+    }
@@ -0,0 +1,221 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Streaming writer of organization account details.
+
+The accounts are written as they are paginated, such that the list of
+accounts does not need to be held in memory. Their details are written
+as a JSON array or as JSON Lines, projected to the requested fields.
+
+Optionally, a compact index is written next to it. The index holds one
+line per account with the tab-separated account id, email, name, and
+organizational unit path. Shell scripts can read it with `cut` and Python
+consumers can look up an account with `find_account` without parsing the
+JSON document.
+"""
+
+import json
+import mmap
+import os
+import sys
+import textwrap
+from collections import namedtuple
+
+
+JSON_ARRAY = "json"
+JSON_LINES = "jsonl"
+OUTPUT_FORMATS = [JSON_ARRAY, JSON_LINES]
+
+AccountIndexEntry = namedtuple(
+    "AccountIndexEntry",
+    ["account_id", "email", "name", "ou_path"],
+)
+
+
+def _open_output(path):
+    if path == "-":
+        return sys.stdout, False
+    return open(path, mode="w", encoding="utf-8"), True
+
+
+class AccountWriter:
+    """
+    Writes account details to a file while these are retrieved.
+
+    Use it as a context manager, such that the JSON document is completed
+    and the files are closed when all accounts are written.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        output_path,
+        fields=None,
+        output_format=JSON_ARRAY,
+        indent=None,
+        index_path=None,
+    ):
+        """
+        Args:
+            output_path (str): The file to write the account details to, or
+                `-` to write them to stdout.
+
+            fields (list[str]|dict[str, str]): The fields of the account
+                details to write. When a list is given, the other fields
+                are dropped. When a dict is given, the keys define the
+                output field names and the values the account detail fields
+                they are read from. All fields are written if not set.
+
+            output_format (str): Either `json` to write a JSON array, or
+                `jsonl` to write one JSON document per line.
+
+            indent (int): The indentation of the JSON array, if any.
+
+            index_path (str): The file to write the compact index to, if
+                any.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format: {output_format}. "
+                f"Valid options include: {', '.join(OUTPUT_FORMATS)}."
+            )
+        self.output_path = output_path
+        self.fields = fields
+        self.output_format = output_format
+        self.indent = indent
+        self.index_path = index_path
+        self.count = 0
+        self._output = None
+        self._close_output = False
+        self._index = None
+
+    def __enter__(self):
+        self._output, self._close_output = _open_output(self.output_path)
+        if self.index_path:
+            self._index = open(  # pylint: disable=consider-using-with
+                self.index_path,
+                mode="w",
+                encoding="utf-8",
+            )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            # The JSON array is left incomplete when the retrieval of the
+            # accounts failed, such that it is not mistaken for a valid
+            # list of accounts.
+            if exc_type is None and self.output_format == JSON_ARRAY:
+                if self.count == 0:
+                    self._output.write("[]")
+                elif self.indent is None:
+                    self._output.write("]")
+                else:
+                    self._output.write("\n]")
+        finally:
+            if self._close_output:
+                self._output.close()
+            else:
+                self._output.flush()
+            if self._index:
+                self._index.close()
+
+    def project(self, account):
+        """
+        Returns:
+            dict: The requested fields of the given account details.
+        """
+        if isinstance(self.fields, dict):
+            return {
+                output_field: account[source_field]
+                for output_field, source_field in self.fields.items()
+                if source_field in account
+            }
+        if self.fields:
+            return {
+                key: value
+                for key, value in account.items()
+                if key in self.fields
+            }
+        return dict(account)
+
+    def write(self, account, ou_path=""):
+        """
+        Write the details of the given account.
+
+        Args:
+            account (dict): The account details, as returned by the
+                AWS Organizations API. It should contain the `Id` of the
+                account for it to be added to the index.
+
+            ou_path (str): The path of the organizational unit the account
+                was found in, if known. It is only written to the index.
+        """
+        body = json.dumps(
+            self.project(account),
+            indent=self.indent,
+            default=str,
+        )
+        if self.output_format == JSON_LINES:
+            self._output.write(f"{body}\n")
+        elif self.indent is None:
+            self._output.write(f"{', ' if self.count else '['}{body}")
+        else:
+            self._output.write(
+                f"{',' if self.count else '['}\n"
+                f"{textwrap.indent(body, ' ' * self.indent)}"
+            )
+        if self._index:
+            self._index.write(
+                "\t".join([
+                    account.get("Id", ""),
+                    account.get("Email", ""),
+                    account.get("Name", ""),
+                    ou_path,
+                ]) + "\n"
+            )
+        self.count += 1
+
+
+def read_account_index(index_path):
+    """
+    Read the entries of the given account index.
+
+    Returns:
+        Iterator[AccountIndexEntry]: The entries in the order the accounts
+            were written.
+    """
+    with open(index_path, mode="r", encoding="utf-8") as index_file:
+        for line in index_file:
+            yield AccountIndexEntry(*line.rstrip("\n").split("\t"))
+
+
+def find_account(index_path, account_id):
+    """
+    Look up the given account in the account index, using a memory map
+    such that the index is not read into memory as a whole.
+
+    Returns:
+        AccountIndexEntry: The entry of the account, or None if the
+            account is not part of the index.
+    """
+    with open(index_path, mode="rb") as index_file:
+        if os.fstat(index_file.fileno()).st_size == 0:
+            # An empty file cannot be memory-mapped
+            return None
+        with mmap.mmap(
+            index_file.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        ) as index_map:
+            needle = f"{account_id}\t".encode("utf-8")
+            if index_map[:len(needle)] == needle:
+                start = 0
+            else:
+                start = index_map.find(b"\n" + needle)
+                if start == -1:
+                    return None
+                start += 1
+            end = index_map.find(b"\n", start)
+            line = index_map[start:end if end != -1 else len(index_map)]
+            return AccountIndexEntry(*line.decode("utf-8").split("\t"))
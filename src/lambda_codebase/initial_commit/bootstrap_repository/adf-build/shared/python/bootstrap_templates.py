@@ -0,0 +1,159 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Module used to resolve the bootstrap templates and parameter files that
+apply to an organizational unit path.
+
+The bootstrap templates bucket is listed once, after which the templates
+and parameter files are resolved from memory. When a template or
+parameter file is not found at a given organizational unit path, the
+parent path is searched instead, up to the root of the prefix. The ETag of
+every object is kept as the hash of its content.
+"""
+
+import json
+import threading
+
+from errors import InvalidParameterFileError
+from logger import configure_logger
+
+
+LOGGER = configure_logger(__name__)
+BOOTSTRAP_PREFIX = "adf-bootstrap"
+
+
+class BootstrapTemplateIndex:
+    """
+    In-memory index of the bootstrap templates and parameter files that
+    are stored in the bootstrap templates bucket.
+
+    A single instance is meant to be shared by all worker threads of a
+    bootstrap run. The bucket is listed on first use and every parameter
+    file is read at most once.
+    """
+
+    def __init__(self, s3, prefix=BOOTSTRAP_PREFIX):
+        self.s3 = s3
+        self.prefix = prefix
+        self._keys = None
+        self._resolved_keys = {}
+        self._parameters = {}
+        self._lock = threading.Lock()
+
+    def _list_keys(self):
+        keys = {}
+        paginator = self.s3.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self.s3.bucket,
+            Prefix=f"{self.prefix}/",
+        ):
+            for obj in page.get("Contents", []):
+                keys[obj["Key"]] = obj.get("ETag", "").strip('"') or None
+        LOGGER.debug(
+            "Indexed %d bootstrap objects in s3://%s/%s",
+            len(keys),
+            self.s3.bucket,
+            self.prefix,
+        )
+        return keys
+
+    def _get_keys(self):
+        with self._lock:
+            if self._keys is None:
+                self._keys = self._list_keys()
+            return self._keys
+
+    def resolve_key(self, key):
+        """
+        Resolve the object key of the nearest template or parameter file.
+
+        Args:
+            key (str): The most specific object key to look for, for example
+                adf-bootstrap/team/dev/regional.yml.
+
+        Returns:
+            str | None: The key of the object that is found at the given
+                path or the nearest parent path, for example
+                adf-bootstrap/team/regional.yml. None if none exists.
+        """
+        if key in self._resolved_keys:
+            return self._resolved_keys[key]
+
+        keys = self._get_keys()
+        path_segments = key.split("/")
+        file_name = path_segments.pop()
+        resolved_key = None
+        while path_segments:
+            candidate = "/".join([*path_segments, file_name])
+            if candidate in keys:
+                resolved_key = candidate
+                break
+            path_segments.pop()
+
+        if resolved_key is None:
+            LOGGER.debug(
+                "Nothing could be found for %s when traversing the index",
+                key,
+            )
+        self._resolved_keys[key] = resolved_key
+        return resolved_key
+
+    def get_template_url(self, key):
+        """
+        Get the URL of the nearest template.
+
+        Args:
+            key (str): The most specific template key to look for.
+
+        Returns:
+            str | None: The URL of the template, or None if none exists.
+        """
+        resolved_key = self.resolve_key(key)
+        if resolved_key is None:
+            return None
+        LOGGER.debug("Found Template at: %s", resolved_key)
+        return self.s3.build_pathing_style("path", resolved_key)
+
+    def get_template_hash(self, key):
+        """
+        Get the hash of the nearest template, as reported by its ETag.
+
+        Args:
+            key (str): The most specific template key to look for.
+
+        Returns:
+            str | None: The hash of the template, or None if the template
+                or its ETag does not exist.
+        """
+        resolved_key = self.resolve_key(key)
+        if resolved_key is None:
+            return None
+        return self._get_keys()[resolved_key]
+
+    def get_parameters(self, key):
+        """
+        Get the parameters that are defined in the nearest parameter file.
+
+        Args:
+            key (str): The most specific parameter file key to look for.
+
+        Returns:
+            list[dict]: The CloudFormation parameters, empty if no
+                parameter file exists.
+        """
+        resolved_key = self.resolve_key(key)
+        if resolved_key is None:
+            return []
+        with self._lock:
+            if resolved_key not in self._parameters:
+                try:
+                    self._parameters[resolved_key] = json.loads(
+                        self.s3.read_object(resolved_key),
+                    )
+                except ValueError as error:
+                    raise InvalidParameterFileError(
+                        f"The parameter file {resolved_key} does not "
+                        f"contain valid JSON: {error}",
+                    ) from error
+            return self._parameters[resolved_key]
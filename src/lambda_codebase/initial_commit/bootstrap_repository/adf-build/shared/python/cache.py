@@ -5,14 +5,31 @@
 Used as a cache for AWS Organizations calls within threads.
 A single instance of this class is passed into all threads to act
 as a cache
+
+When a time to live is configured, the entries expire that many seconds
+after they were added. This allows an instance to be kept in a warm Lambda
+container and be reused across invocations. Expired entries are removed
+when their existence is checked, such that a get that follows an exists
+check always returns the entry.
 """
 
+import time
+
 
 class Cache:
-    def __init__(self):
+    def __init__(self, ttl_seconds=None, clock=time.monotonic):
         self._stash = {}
+        self._expires_at = {}
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+    def _expire(self, key):
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= self.clock():
+            self.remove(key)
 
     def exists(self, key):
+        self._expire(key)
         return key in self._stash
 
     def get(self, key):
@@ -23,7 +40,10 @@ class Cache:
 
     def add(self, key, value):
         self._stash[key] = value
+        if self.ttl_seconds is not None:
+            self._expires_at[key] = self.clock() + self.ttl_seconds
 
     def remove(self, key):
         if key in self._stash:
             del self._stash[key]
+        self._expires_at.pop(key, None)
@@ -0,0 +1,57 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Tracing and shared boto3 clients for AWS Lambda handlers.
+
+Creating boto3 clients takes a noticeable part of the cold start of a
+Lambda function. Instead of creating them when the handler module is
+imported, get_client creates them upon first use and shares them across
+the invocations that the same container processes. Code paths that do not
+use a client do not pay for its creation either.
+
+The AWS X-Ray patch_all function patches every library that the AWS X-Ray
+SDK supports, importing all of them. The handlers only need their AWS API
+calls to be traced, hence enable_tracing only patches botocore.
+"""
+
+import threading
+
+import boto3
+
+_LOCK = threading.Lock()
+_CLIENTS = {}
+_TRACING = {
+    "enabled": False,
+}
+
+
+def enable_tracing():
+    """
+    Patch botocore, such that the AWS API calls are traced with AWS X-Ray.
+    This only patches botocore once, subsequent calls have no effect.
+    """
+    with _LOCK:
+        if _TRACING["enabled"]:
+            return
+        # pylint: disable=import-outside-toplevel
+        from aws_xray_sdk.core import patch
+        patch(("botocore",))
+        _TRACING["enabled"] = True
+
+
+def get_client(service, region_name=None, config=None):
+    """
+    Returns the boto3 client of the given service in the given region,
+    created with the given config. The client is created upon first use
+    and the same client is returned afterwards.
+    """
+    key = (service, region_name, config)
+    with _LOCK:
+        if key not in _CLIENTS:
+            _CLIENTS[key] = boto3.client(
+                service,
+                region_name=region_name,
+                config=config,
+            )
+        return _CLIENTS[key]
@@ -4,6 +4,7 @@
 """CloudFormation module used throughout the ADF
 """
 
+import json
 import random
 import re
 import os
@@ -13,7 +14,11 @@ from botocore.config import Config
 import tenacity
 
 # ADF imports
-from errors import InvalidTemplateError, GenericAccountConfigureError
+from errors import (
+    GenericAccountConfigureError,
+    InvalidParameterFileError,
+    InvalidTemplateError,
+)
 from logger import configure_logger
 from paginator import paginator
 
@@ -29,6 +34,11 @@ CFN_CONFIG = Config(
 CFN_UNACCEPTED_CHARS = re.compile(r"[^-a-zA-Z0-9]")
 ADF_GLOBAL_IAM_STACK_NAME = 'adf-global-base-iam'
 ADF_GLOBAL_BOOTSTRAP_STACK_NAME = 'adf-global-base-bootstrap'
+# The hashes of the templates that passed validation already, such that the
+# same template is validated once only.
+VALIDATED_TEMPLATE_HASHES = set()
+# Marks a stack status that needs to be retrieved again.
+_UNKNOWN_STACK_STATUS = object()
 
 
 class StackProperties:
@@ -64,6 +74,12 @@ class StackProperties:
         'DELETE_IN_PROGRESS': 'stack_delete_complete',
         'REVIEW_IN_PROGRESS': 'change_set_create_complete',
     }
+    completed_state_by_waiter = {
+        'stack_create_complete': 'CREATE_COMPLETE',
+        'stack_update_complete': 'UPDATE_COMPLETE',
+        'stack_rollback_complete': 'UPDATE_ROLLBACK_COMPLETE',
+        'stack_delete_complete': None,
+    }
     all_except_deleted_states = [
         'CREATE_IN_PROGRESS',
         'CREATE_FAILED',
@@ -96,6 +112,7 @@ class StackProperties:
             stack_name,
             s3_key_path=None,
             s3=None,
+            template_index=None,
     ):
         self.region = region
         self.deployment_account_region = deployment_account_region
@@ -105,6 +122,8 @@ class StackProperties:
             else None
         )
         self.s3 = s3
+        self.template_index = template_index
+        self.template_hash = None
         self.stack_name = stack_name or self._get_stack_name()
 
     def _get_geo_prefix(self):
@@ -120,19 +139,42 @@ class StackProperties:
     def _create_parameter_path(self, path):
         return f'{path}/{self._get_geo_prefix()}-params.json'
 
+    def _fetch_template_url(self, template_path):
+        if self.template_index:
+            self.template_hash = self.template_index.get_template_hash(
+                template_path,
+            )
+            # Like fetch_s3_url, return an empty list if nothing was found,
+            # such that an explicitly set template_url is not replaced.
+            return self.template_index.get_template_url(template_path) or []
+        return self.s3.fetch_s3_url(template_path)
+
     def get_template_url(self):
-        return self.s3.fetch_s3_url(
+        return self._fetch_template_url(
             self._create_template_path(self.s3_key_path)
         )
 
     def get_parameters(self):
+        if self.template_index:
+            return self.template_index.get_parameters(
+                self._create_parameter_path(self.s3_key_path)
+            )
         try:
-            key = self.s3.fetch_s3_url(
+            key = self.s3.resolve_key(
                 self._create_parameter_path(self.s3_key_path)
             )
-            return self.s3.read_object(key) if key else []
+            if not key:
+                return []
+            body = self.s3.read_object(key)
         except ClientError:
             return []
+        try:
+            return json.loads(body)
+        except ValueError as error:
+            raise InvalidParameterFileError(
+                f"The parameter file {key} does not contain valid JSON: "
+                f"{error}",
+            ) from error
 
     def _get_stack_name(self):
         stack_suffix = (
@@ -170,6 +212,8 @@ class CloudFormation(StackProperties):
             parameters=None,
             account_id=None,  # Used for logging visibility
             role_arn=None,
+            *,
+            template_index=None,
     ):
         self.client = role.client(
             'cloudformation',
@@ -181,18 +225,39 @@ class CloudFormation(StackProperties):
         self.account_id = account_id
         self.template_url = template_url
         self.role_arn = role_arn
+        # Snapshot of the stack statuses in this account and region, such
+        # that every stack is described once only. It is kept up-to-date
+        # with the results of the waiters and operations that are performed
+        # through this instance.
+        self._stack_states = {}
+        self._stack_states_listed = False
         StackProperties.__init__(
             self,
             region=region,
             deployment_account_region=deployment_account_region,
             stack_name=stack_name,
             s3=s3,
-            s3_key_path=s3_key_path
+            s3_key_path=s3_key_path,
+            template_index=template_index,
         )
 
     def validate_template(self):
+        if self.template_hash in VALIDATED_TEMPLATE_HASHES:
+            LOGGER.debug(
+                "%s in %s - Template %s with hash %s is validated already",
+                self.account_id,
+                self.region,
+                self.template_url,
+                self.template_hash,
+            )
+            return None
         try:
-            return self.client.validate_template(TemplateURL=self.template_url)
+            response = self.client.validate_template(
+                TemplateURL=self.template_url,
+            )
+            if self.template_hash:
+                VALIDATED_TEMPLATE_HASHES.add(self.template_hash)
+            return response
         except ClientError as error:
             LOGGER.error(
                 "%s in %s - Template validation of %s failed, see %s",
@@ -234,7 +299,15 @@ class CloudFormation(StackProperties):
                     'MaxAttempts': 45
                 }
             )
+            if waiter_type in StackProperties.completed_state_by_waiter:
+                self._record_stack_status(
+                    stack_name,
+                    StackProperties.completed_state_by_waiter[waiter_type],
+                )
+            else:
+                self._forget_stack_status(stack_name)
         except (WaiterError, ClientError) as client_error:
+            self._forget_stack_status(stack_name)
             LOGGER.error(
                 "%s in %s - Failed to wait for stack %s error %s",
                 self.account_id,
@@ -388,6 +461,11 @@ class CloudFormation(StackProperties):
                     change_set_params["RoleARN"] = self.role_arn
                 self._clean_up_when_required()
                 self.client.create_change_set(**change_set_params)
+                if change_set_params["ChangeSetType"] == "CREATE":
+                    self._record_stack_status(
+                        self.stack_name,
+                        "REVIEW_IN_PROGRESS",
+                    )
                 self._wait_change_set()
                 return True
             return False
@@ -399,6 +477,7 @@ class CloudFormation(StackProperties):
                 self.stack_name,
                 exc_info=1,
             )
+            self._forget_stack_status(self.stack_name)
             self._delete_change_set()
             raise GenericAccountConfigureError(error) from error
         except WaiterError as error:
@@ -426,6 +505,7 @@ class CloudFormation(StackProperties):
                 err["StatusReason"],
                 exc_info=1,
             )
+            self._forget_stack_status(self.stack_name)
             self._delete_change_set()
             raise
 
@@ -486,10 +566,12 @@ class CloudFormation(StackProperties):
         )
         if self.wait:
             self._wait_stack(waiter, self.stack_name)
+        else:
+            self._forget_stack_status(self.stack_name)
 
     def create_iam_stack(self):
         try:
-            self.template_url = self.s3.fetch_s3_url(
+            self.template_url = self._fetch_template_url(
                 self._create_template_path(self.s3_key_path, 'global-iam')
             )
             self.stack_name = ADF_GLOBAL_IAM_STACK_NAME
@@ -538,12 +620,12 @@ class CloudFormation(StackProperties):
         }
 
     def delete_all_base_stacks(self, wait_override=False):
-        self._delete_base_stacks(
+        return self._delete_base_stacks(
             wait_override=wait_override,
         )
 
     def delete_deprecated_base_stacks(self):
-        self._delete_base_stacks(
+        return self._delete_base_stacks(
             wait_override=True,
             deprecated_only=True,
         )
@@ -553,12 +635,16 @@ class CloudFormation(StackProperties):
         wait_override=False,
         deprecated_only=False,
     ):
+        """
+        Deletes the ADF base stacks, or the deprecated ones only.
+
+        Returns:
+            list[str]: The names of the stacks that got deleted.
+        """
+        deleted_stacks = []
         deleted_any = False
         bootstrap_stack_found = False
-        for stack in paginator(
-            self.client.list_stacks,
-            StackStatusFilter=StackProperties.all_except_deleted_states,
-        ):
+        for stack in self._list_stacks():
             matches_search = bool(
                 re.search(
                     'adf-(global|regional)-base',
@@ -605,13 +691,15 @@ class CloudFormation(StackProperties):
                 # global-iam stack. Since the policies need to be deleted
                 # before one can delete the role, we need to delete the global
                 # IAM stack first.
-                self._delete_iam_stack_if_exists()
+                if self._delete_iam_stack_if_exists():
+                    deleted_stacks.append(ADF_GLOBAL_IAM_STACK_NAME)
 
-            self._delete_stack_or_instruct_user(
+            if self._delete_stack_or_instruct_user(
                 stack_name=stack.get('StackName'),
                 stack_status=stack.get('StackStatus'),
                 wait_override=wait_override,
-            )
+            ):
+                deleted_stacks.append(stack.get('StackName'))
             deleted_any = True
 
         if deprecated_only and not bootstrap_stack_found and not deleted_any:
@@ -620,9 +708,49 @@ class CloudFormation(StackProperties):
             # As the policies that the CloudFormation stack manages would
             # need to be recreated and applied to new IAM Roles as created
             # by a upcoming bootstrap stack.
-            self._delete_iam_stack_if_exists()
+            if self._delete_iam_stack_if_exists():
+                deleted_stacks.append(ADF_GLOBAL_IAM_STACK_NAME)
+        return deleted_stacks
+
+    def _list_stacks(self):
+        """
+        Lists the stacks that are not deleted and records their status in
+        the stack state snapshot, such that the statuses of these stacks
+        and the absence of other stacks are known without describing them.
+        """
+        stacks = list(paginator(
+            self.client.list_stacks,
+            StackStatusFilter=StackProperties.all_except_deleted_states,
+        ))
+        self._stack_states = {
+            stack.get('StackName'): stack.get('StackStatus')
+            for stack in stacks
+        }
+        self._stack_states_listed = True
+        return stacks
+
+    def _record_stack_status(self, name, status):
+        self._stack_states[name] = status
+
+    def _forget_stack_status(self, name):
+        self._stack_states[name] = _UNKNOWN_STACK_STATUS
 
     def _get_stack_status(self, name):
+        status = self._stack_states.get(
+            name,
+            None if self._stack_states_listed else _UNKNOWN_STACK_STATUS,
+        )
+        if status is not _UNKNOWN_STACK_STATUS:
+            return status
+        status = self._describe_stack_status(name)
+        self._record_stack_status(name, status)
+        return status
+
+    def _describe_stack_status(self, name):
+        stack = self._describe_stack(name)
+        return stack['StackStatus'] if stack else None
+
+    def _describe_stack(self, name):
         try:
             LOGGER.debug(
                 "%s in %s - Retrieve stack status of: %s",
@@ -634,7 +762,7 @@ class CloudFormation(StackProperties):
                 StackName=name,
             )
             if response and response.get('Stacks', []):
-                return response['Stacks'][0]['StackStatus']
+                return response['Stacks'][0]
             return None
         except (ClientError, ValidationError) as error:
             if error.response['Error']['Code'] == 'ValidationError':
@@ -659,11 +787,12 @@ class CloudFormation(StackProperties):
     def _delete_iam_stack_if_exists(self):
         iam_stack_status = self._get_stack_status(ADF_GLOBAL_IAM_STACK_NAME)
         if iam_stack_status:
-            self._delete_stack_or_instruct_user(
+            return self._delete_stack_or_instruct_user(
                 stack_name=ADF_GLOBAL_IAM_STACK_NAME,
                 stack_status=iam_stack_status,
                 wait_override=True,
             )
+        return False
 
     def _delete_stack_or_instruct_user(
         self,
@@ -677,7 +806,7 @@ class CloudFormation(StackProperties):
         if clean_stack_status:
             LOGGER.warning('Removing stack: %s', stack_name)
             self.delete_stack(stack_name, wait_override)
-            return
+            return True
 
         LOGGER.warning(
             'Please remove stack %s manually, state %s implies that it '
@@ -685,6 +814,7 @@ class CloudFormation(StackProperties):
             stack_name,
             stack_status,
         )
+        return False
 
     def get_stack_output(self, value):
         try:
@@ -707,6 +837,26 @@ class CloudFormation(StackProperties):
     def get_stack_status(self):
         return self._get_stack_status(self.stack_name)
 
+    def get_stack_outputs(self):
+        """
+        Retrieve the outputs of the stack, recording its status such that
+        it does not need to be described again when it is created or
+        updated next.
+
+        Returns:
+            dict[str, str]: The output values of the stack by output key,
+                or an empty dict if the stack does not exist.
+        """
+        stack = self._describe_stack(self.stack_name)
+        self._record_stack_status(
+            self.stack_name,
+            stack['StackStatus'] if stack else None,
+        )
+        return {
+            output['OutputKey']: output['OutputValue']
+            for output in (stack or {}).get('Outputs', [])
+        }
+
     def delete_stack(self, stack_name, wait_override=False):
         try:
             LOGGER.debug(
@@ -720,6 +870,8 @@ class CloudFormation(StackProperties):
             )
             if self.wait or wait_override:
                 self._wait_stack('stack_delete_complete', stack_name)
+            else:
+                self._forget_stack_status(stack_name)
         except ClientError as client_error:
             LOGGER.error(
                 "%s in %s - Failed to delete stack %s error %s",
@@ -5,21 +5,164 @@
 Standardized class for pushing CloudWatch metric data to a service within the ADF Namespace
 """
 
+import atexit
+import functools
+import json
+import threading
+import time
+from collections import Counter
+
 import boto3
 
+# CloudWatch accepts up to 1,000 metrics per PutMetricData call
+MAX_METRICS_PER_CALL = 1000
+# CloudWatch Embedded Metric Format accepts up to 100 values per metric
+MAX_EMF_VALUES_PER_METRIC = 100
+
 
 class ADFMetrics:
-    def __init__(self, client: boto3.client, service, namespace="ADF") -> None:
+    def __init__(
+        self,
+        client: boto3.client,
+        service,
+        namespace="ADF",
+        emit_as_emf=False,
+    ) -> None:
         """
-        Client: Any Boto3 CloudWatch client
+        Client: Any Boto3 CloudWatch client, not required if the metrics
+        are emitted in the CloudWatch Embedded Metric Format.
         Service: The name of the Service e.g PipelineManagement/Repository
         or AccountManagement/EnableSupport namespace.
         Defaults to ADF.
+        Emit As EMF: Whether to print the metrics to stdout in the CloudWatch
+        Embedded Metric Format instead of calling PutMetricData.
+        This is the preferred method inside AWS Lambda functions.
+
+        Metrics are buffered in memory and aggregated per metric name,
+        dimensions, and unit. They are sent when flush is called, which
+        happens automatically when the process exits or when the handler
+        decorated with flush_after returns.
         """
         self.cw_client = client
         self.namespace = f"{namespace}/{service}"
+        self.emit_as_emf = emit_as_emf
+        self._buffer = {}
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _get_key(metric):
+        return (
+            metric["MetricName"],
+            tuple(
+                (dimension["Name"], dimension["Value"])
+                for dimension in sorted(
+                    metric.get("Dimensions", []),
+                    key=lambda dimension: dimension["Name"],
+                )
+            ),
+            metric.get("Unit", "None"),
+        )
 
     def put_metric_data(self, metric_data):
         if not isinstance(metric_data, list):
             metric_data = [metric_data]
-        self.cw_client.put_metric_data(Namespace=self.namespace, MetricData=metric_data)
+        with self._lock:
+            for metric in metric_data:
+                values = self._buffer.setdefault(
+                    self._get_key(metric),
+                    Counter(),
+                )
+                values[metric["Value"]] += 1
+
+    def _drain(self):
+        with self._lock:
+            buffer = self._buffer
+            self._buffer = {}
+        return buffer
+
+    def flush(self):
+        """
+        Send all buffered metrics, either as PutMetricData calls in
+        batches of up to 1,000 metrics, or as Embedded Metric Format
+        documents on stdout.
+        """
+        buffer = self._drain()
+        if not buffer:
+            return
+        if self.emit_as_emf:
+            self._flush_as_emf(buffer)
+        else:
+            self._flush_to_api(buffer)
+
+    @staticmethod
+    def _to_statistic_set(values):
+        return {
+            "SampleCount": float(sum(values.values())),
+            "Sum": float(sum(value * count for value, count in values.items())),
+            "Minimum": float(min(values)),
+            "Maximum": float(max(values)),
+        }
+
+    def _flush_to_api(self, buffer):
+        metric_data = []
+        for (name, dimensions, unit), values in buffer.items():
+            metric = {
+                "MetricName": name,
+                "Unit": unit,
+            }
+            if dimensions:
+                metric["Dimensions"] = [
+                    {"Name": dimension_name, "Value": dimension_value}
+                    for dimension_name, dimension_value in dimensions
+                ]
+            if sum(values.values()) == 1:
+                metric["Value"] = next(iter(values))
+            else:
+                metric["StatisticValues"] = self._to_statistic_set(values)
+            metric_data.append(metric)
+
+        for index in range(0, len(metric_data), MAX_METRICS_PER_CALL):
+            self.cw_client.put_metric_data(
+                Namespace=self.namespace,
+                MetricData=metric_data[index:index + MAX_METRICS_PER_CALL],
+            )
+
+    def _flush_as_emf(self, buffer):
+        timestamp = int(time.time() * 1000)
+        for (name, dimensions, unit), values in buffer.items():
+            expanded_values = list(values.elements())
+            for index in range(
+                0,
+                len(expanded_values),
+                MAX_EMF_VALUES_PER_METRIC,
+            ):
+                print(json.dumps({
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [{
+                            "Namespace": self.namespace,
+                            "Dimensions": [
+                                [dimension_name for dimension_name, _ in dimensions],
+                            ],
+                            "Metrics": [{"Name": name, "Unit": unit}],
+                        }],
+                    },
+                    **dict(dimensions),
+                    name: expanded_values[
+                        index:index + MAX_EMF_VALUES_PER_METRIC
+                    ],
+                }), flush=True)
+
+    def flush_after(self, handler):
+        """
+        Decorator that flushes the buffered metrics once the decorated
+        (Lambda) handler returns or raises an exception.
+        """
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                self.flush()
+        return wrapper
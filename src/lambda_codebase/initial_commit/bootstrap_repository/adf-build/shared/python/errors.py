@@ -14,6 +14,13 @@ class RetryError(Exception):
     """Retry Error used for Step Functions logic"""
 
 
+class ConcurrencyLimitReachedError(Exception):
+    """
+    Raised when no slot is available to start the operation, as the
+    concurrency limit is reached. Step Functions retries these later.
+    """
+
+
 class ParameterNotFoundError(Exception):
     """
     Parameter not found in Parameter Store
@@ -55,6 +62,12 @@ class InvalidTemplateError(Exception):
     """
 
 
+class InvalidParameterFileError(Exception):
+    """
+    Raised when a bootstrap parameter file does not contain valid JSON
+    """
+
+
 class InvalidDeploymentMapError(Exception):
     """
     Raised when a Deployment Map is invalid
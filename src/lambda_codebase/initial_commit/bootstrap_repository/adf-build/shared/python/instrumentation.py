@@ -0,0 +1,311 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Opt-in instrumentation of the AWS API calls made via boto3.
+
+When enabled, it registers botocore event handlers on the boto3 sessions
+that are used by ADF. For every service and operation it records the
+number of calls, their latency, the number of retries and the number of
+throttled attempts.
+
+At the end of a run, the results are logged as a summary table and printed
+as CloudWatch Embedded Metric Format (EMF) log lines. Hence, no additional
+API calls are required to publish the metrics.
+
+The instrumentation is enabled by setting the `ADF_INSTRUMENTATION`
+environment variable to `enabled`.
+"""
+
+import json
+import os
+import threading
+import time
+from math import ceil
+
+import boto3
+
+from logger import configure_logger
+
+LOGGER = configure_logger(__name__)
+ENABLED_ENV_VAR = "ADF_INSTRUMENTATION"
+EMF_NAMESPACE = "ADF/Instrumentation"
+CONTEXT_START_KEY = "adf_instrumentation_start"
+THROTTLING_ERROR_CODES = (
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "TransactionInProgressException",
+    "RequestLimitExceeded",
+    "BandwidthLimitExceeded",
+    "LimitExceededException",
+    "RequestThrottled",
+    "SlowDown",
+    "PriorRequestNotComplete",
+    "EC2ThrottledException",
+)
+PERCENTILES = (50, 90, 99)
+
+
+def _percentile(sorted_values, percentile):
+    """
+    Returns the nearest-rank percentile of the given sorted values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(ceil(percentile / 100.0 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _service_and_operation(event_name):
+    # Event names are structured like: after-call.s3.GetObject
+    _, service, operation = event_name.split(".", 2)
+    return service, operation
+
+
+class OperationStats:
+    """
+    Class used to keep track of the calls made to a single operation.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttles = 0
+        self.latencies = []
+
+    def summarize(self):
+        """
+        Returns the summarized statistics of this operation.
+        """
+        sorted_latencies = sorted(self.latencies)
+        summary = {
+            "Calls": self.calls,
+            "Errors": self.errors,
+            "Retries": self.retries,
+            "Throttles": self.throttles,
+        }
+        for percentile in PERCENTILES:
+            summary[f"LatencyP{percentile}"] = round(
+                _percentile(sorted_latencies, percentile),
+                2,
+            )
+        summary["LatencyMax"] = round(
+            sorted_latencies[-1] if sorted_latencies else 0.0,
+            2,
+        )
+        return summary
+
+
+class ClientCallRecorder:
+    """
+    Class used to record the API calls made by instrumented boto3 sessions.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _get_stats(self, event_name):
+        key = _service_and_operation(event_name)
+        if key not in self.stats:
+            self.stats[key] = OperationStats()
+        return self.stats[key]
+
+    def instrument(self, session):
+        """
+        Register the event handlers on the given boto3 session.
+        Only the clients that are created after this call are instrumented.
+        """
+        events = session.events
+        events.register("before-parameter-build", self._start_call)
+        events.register("needs-retry", self._needs_retry)
+        events.register("after-call", self._after_call)
+        events.register("after-call-error", self._after_call_error)
+
+    def reset(self):
+        """
+        Forget the calls that were recorded so far.
+        """
+        with self._lock:
+            self.stats = {}
+
+    def _start_call(self, context, **_kwargs):
+        context[CONTEXT_START_KEY] = self.clock()
+
+    def _needs_retry(self, event_name, response=None, **_kwargs):
+        if not response:
+            return
+        error_code = response[1].get("Error", {}).get("Code")
+        if error_code in THROTTLING_ERROR_CODES:
+            with self._lock:
+                self._get_stats(event_name).throttles += 1
+
+    def _record(self, event_name, context, retries, failed):
+        start = context.get(CONTEXT_START_KEY)
+        with self._lock:
+            stats = self._get_stats(event_name)
+            stats.calls += 1
+            stats.retries += retries
+            if failed:
+                stats.errors += 1
+            if start is not None:
+                stats.latencies.append((self.clock() - start) * 1000.0)
+
+    def _after_call(self, event_name, parsed, context, **_kwargs):
+        self._record(
+            event_name,
+            context,
+            parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+            failed="Error" in parsed,
+        )
+
+    def _after_call_error(self, event_name, exception, context, **_kwargs):
+        response = getattr(exception, "response", None) or {}
+        self._record(
+            event_name,
+            context,
+            response.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+            failed=True,
+        )
+
+    def summarize(self):
+        """
+        Returns the summarized statistics per service and operation,
+        sorted by the total time spent in each operation.
+        """
+        with self._lock:
+            summaries = [
+                (service, operation, stats.summarize(), sum(stats.latencies))
+                for (service, operation), stats in self.stats.items()
+            ]
+        summaries.sort(key=lambda item: item[3], reverse=True)
+        return [
+            (service, operation, summary)
+            for service, operation, summary, _ in summaries
+        ]
+
+    def format_table(self):
+        """
+        Returns the summary as a human readable table.
+        """
+        columns = [
+            "Calls", "Errors", "Retries", "Throttles",
+            "LatencyP50", "LatencyP90", "LatencyP99", "LatencyMax",
+        ]
+        rows = [
+            [f"{service}.{operation}"] + [
+                str(summary[column]) for column in columns
+            ]
+            for service, operation, summary in self.summarize()
+        ]
+        header = ["Operation"] + columns
+        widths = [
+            max(len(row[index]) for row in [header] + rows)
+            for index in range(len(header))
+        ]
+        return "\n".join(
+            "  ".join(
+                value.ljust(widths[index]) if index == 0
+                else value.rjust(widths[index])
+                for index, value in enumerate(row)
+            )
+            for row in [header] + rows
+        )
+
+    def to_embedded_metrics(self, timestamp=None):
+        """
+        Returns the summary as CloudWatch Embedded Metric Format documents,
+        one per service and operation.
+        """
+        timestamp = timestamp or int(time.time() * 1000)
+        documents = []
+        for service, operation, summary in self.summarize():
+            documents.append({
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [{
+                        "Namespace": EMF_NAMESPACE,
+                        "Dimensions": [["Service", "Operation"]],
+                        "Metrics": [
+                            {
+                                "Name": name,
+                                "Unit": (
+                                    "Milliseconds"
+                                    if name.startswith("Latency")
+                                    else "Count"
+                                ),
+                            }
+                            for name in summary
+                        ],
+                    }],
+                },
+                "Service": service,
+                "Operation": operation,
+                **summary,
+            })
+        return documents
+
+
+_RECORDER = None
+
+
+def is_enabled():
+    return _RECORDER is not None
+
+
+def enable(recorder=None):
+    """
+    Enable the instrumentation of the default boto3 session.
+    The sessions created by sts.STS are instrumented too.
+
+    Returns:
+        ClientCallRecorder: The recorder that is used.
+    """
+    global _RECORDER  # pylint: disable=global-statement
+    if _RECORDER is None:
+        _RECORDER = recorder or ClientCallRecorder()
+        # pylint: disable=protected-access
+        _RECORDER.instrument(boto3._get_default_session())
+        LOGGER.info("Instrumentation of AWS API calls is enabled")
+    return _RECORDER
+
+
+def enable_from_environment():
+    """
+    Enable the instrumentation if requested via the environment.
+    """
+    if os.environ.get(ENABLED_ENV_VAR, "disabled").lower() == "enabled":
+        enable()
+
+
+def instrument_session(session):
+    """
+    Instrument the given boto3 session if the instrumentation is enabled.
+
+    Returns:
+        boto3.Session: The session that was passed.
+    """
+    if _RECORDER is not None:
+        _RECORDER.instrument(session)
+    return session
+
+
+def report():
+    """
+    Log the summary table and print the embedded metric documents.
+    This is a no-op when the instrumentation is not enabled.
+    """
+    if _RECORDER is None or not _RECORDER.stats:
+        return
+    LOGGER.info(
+        "AWS API call summary (latency in milliseconds):\n%s",
+        _RECORDER.format_table(),
+    )
+    for document in _RECORDER.to_embedded_metrics():
+        print(json.dumps(document), flush=True)
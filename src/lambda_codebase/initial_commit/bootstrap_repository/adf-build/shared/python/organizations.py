@@ -467,6 +467,62 @@ class Organizations:  # pylint: disable=R0904
             self.cache.add(cache_key, self._list_organizational_units_for_parent(parent_ou))
         return self.cache.get(cache_key)
 
+    def _list_accounts_for_parent(self, parent_id):
+        cache_key = f'accounts_{parent_id}'
+        if not self.cache.exists(cache_key):
+            self.cache.add(
+                cache_key,
+                list(self.get_accounts_for_parent(parent_id)),
+            )
+        return self.cache.get(cache_key)
+
+    def get_policy_target_id(self, path):
+        """
+        Resolves the id of the target that a policy path refers to.
+
+        Only the organizational units on the given path are listed, the
+        responses are cached. The last element of the path can refer to an
+        organizational unit or to an account, similar to the mapping that
+        is returned by get_organization_map.
+
+        Args:
+            path (str): The policy path, either "/" for the root of the
+                organization or a path like "ou-name/child-ou-name".
+
+        Returns:
+            str: The id of the root, organizational unit, or account.
+        """
+        target_id = self.get_ou_root_id()
+        if path == "/":
+            return target_id
+
+        path_names = path.split("/")
+        for index, name in enumerate(path_names):
+            child_ou_ids = [
+                ou["Id"]
+                for ou in self.list_organizational_units_for_parent(target_id)
+                if ou["Name"] == name
+            ]
+            if child_ou_ids:
+                target_id = child_ou_ids[0]
+                continue
+            is_last_element = index == len(path_names) - 1
+            account_ids = [
+                account["Id"]
+                for account in (
+                    self._list_accounts_for_parent(target_id)
+                    if is_last_element else []
+                )
+                if account["Name"] == name
+            ]
+            if not account_ids:
+                raise OrganizationsException(
+                    f"Path {path} failed to return a child OU or account "
+                    f"at '{name}'",
+                )
+            target_id = account_ids[0]
+        return target_id
+
     def get_account_id(self, account_name):
         for account in self.list_accounts():
             if account["Name"].strip() == account_name.strip():
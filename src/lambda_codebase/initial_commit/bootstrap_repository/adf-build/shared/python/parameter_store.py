@@ -15,6 +15,10 @@ from logger import configure_logger
 LOGGER = configure_logger(__name__)
 PARAMETER_DESCRIPTION = "DO NOT EDIT - Used by The AWS Deployment Framework"
 PARAMETER_PREFIX = "/adf"
+# The maximum number of parameters that can be fetched or deleted in a
+# single call
+GET_PARAMETERS_BATCH_SIZE = 10
+DELETE_PARAMETERS_BATCH_SIZE = 10
 SSM_CONFIG = Config(
     retries={
         "max_attempts": 10,
@@ -23,10 +27,19 @@ SSM_CONFIG = Config(
 
 
 class ParameterStore:
-    """Class used for modeling Parameters"""
+    """
+    Class used for modeling Parameters
 
-    def __init__(self, region, role, cache=None):
+    The parameters that were not found are tracked in the not_found_cache,
+    which defaults to the cache that holds the parameter values. Pass a
+    separate not_found_cache when the cache is reused for longer than the
+    parameters are expected to stay absent, such as across Lambda
+    invocations.
+    """
+
+    def __init__(self, region, role, cache=None, not_found_cache=None):
         self.cache = cache or Cache()
+        self.not_found_cache = not_found_cache or self.cache
         self.client = role.client("ssm", region_name=region, config=SSM_CONFIG)
 
     def put_parameter(self, name, value, tier="Standard"):
@@ -55,6 +68,7 @@ class ParameterStore:
                 Overwrite=True,
                 Tier=tier,
             )
+            self.not_found_cache.remove(param_name)
             self.cache.add(param_name, value)
 
     def delete_parameter(self, name):
@@ -62,6 +76,7 @@ class ParameterStore:
         try:
             LOGGER.debug("Deleting Parameter %s", param_name)
             self.cache.remove(param_name)
+            self.not_found_cache.remove(param_name)
             self.client.delete_parameter(
                 Name=param_name,
             )
@@ -71,6 +86,35 @@ class ParameterStore:
                 param_name,
             )
 
+    def delete_parameters(self, names):
+        """
+        Deletes the given Parameters, in batches of at most
+        DELETE_PARAMETERS_BATCH_SIZE parameters per call.
+
+        Returns:
+            list[str]: The names of the parameters that got deleted.
+        """
+        param_names = [
+            ParameterStore._build_param_name(name)
+            for name in names
+        ]
+        deleted_names = []
+        for index in range(0, len(param_names), DELETE_PARAMETERS_BATCH_SIZE):
+            batch = param_names[index:index + DELETE_PARAMETERS_BATCH_SIZE]
+            LOGGER.debug("Deleting Parameters %s", batch)
+            for param_name in batch:
+                self.cache.remove(param_name)
+                self.not_found_cache.remove(param_name)
+            response = self.client.delete_parameters(Names=batch)
+            deleted_names.extend(response.get("DeletedParameters", []))
+            if response.get("InvalidParameters"):
+                LOGGER.debug(
+                    "Attempted to delete Parameters %s but they were not "
+                    "found",
+                    response["InvalidParameters"],
+                )
+        return deleted_names
+
     def fetch_parameters_by_path(self, path):
         """Gets a Parameter(s) by Path from Parameter Store (Recursively)"""
         param_path = ParameterStore._build_param_name(path)
@@ -97,9 +141,19 @@ class ParameterStore:
         param_prefix = PARAMETER_PREFIX if add_prefix else ""
         return f"{param_prefix}{slash_name}"
 
+    def _cached_not_found(self, param_name):
+        if not self.not_found_cache.exists(param_name):
+            return None
+        not_found = self.not_found_cache.get(param_name)
+        return not_found if isinstance(not_found, ParameterNotFoundError) else None
+
     def fetch_parameter(self, name, with_decryption=False, adf_only=True):
         """Gets a Parameter from Parameter Store (Returns the Value)"""
         param_name = ParameterStore._build_param_name(name, adf_only)
+        not_found = self._cached_not_found(param_name)
+        if not_found:
+            LOGGER.debug("Reading Parameter from Cache: %s", param_name)
+            raise not_found
         if self.cache.exists(param_name):
             LOGGER.debug("Reading Parameter from Cache: %s", param_name)
             cached_value = self.cache.get(param_name)
@@ -119,9 +173,60 @@ class ParameterStore:
             not_found = ParameterNotFoundError(
                 f"Parameter {param_name} Not Found",
             )
-            self.cache.add(param_name, not_found)
+            self.not_found_cache.add(param_name, not_found)
             raise not_found from error
 
+    def fetch_parameters(self, names, with_decryption=False):
+        """
+        Gets multiple Parameters from Parameter Store, in batches of at most
+        GET_PARAMETERS_BATCH_SIZE parameters per call. The parameters that
+        are cached already are not fetched again.
+
+        The values are added to the cache and the parameters that were not
+        found are added to the not_found_cache, such that subsequent
+        fetch_parameter calls for these names do not require an API call.
+
+        Returns:
+            dict: The values of the parameters that were found, keyed by
+                the names as they were passed.
+        """
+        param_names = {
+            name: ParameterStore._build_param_name(name)
+            for name in names
+        }
+        names_to_fetch = sorted({
+            param_name
+            for param_name in param_names.values()
+            if not self.cache.exists(param_name)
+            and not self.not_found_cache.exists(param_name)
+        })
+        for index in range(0, len(names_to_fetch), GET_PARAMETERS_BATCH_SIZE):
+            batch = names_to_fetch[index:index + GET_PARAMETERS_BATCH_SIZE]
+            LOGGER.debug("Fetching Parameters %s", batch)
+            response = self.client.get_parameters(
+                Names=batch,
+                WithDecryption=with_decryption,
+            )
+            for parameter in response.get("Parameters", []):
+                self.cache.add(parameter["Name"], parameter["Value"])
+            for param_name in response.get("InvalidParameters", []):
+                LOGGER.debug("Parameter %s not found", param_name)
+                self.not_found_cache.add(
+                    param_name,
+                    ParameterNotFoundError(
+                        f"Parameter {param_name} Not Found",
+                    ),
+                )
+
+        values = {}
+        for name, param_name in param_names.items():
+            if self._cached_not_found(param_name):
+                continue
+            value = self.cache.get(param_name)
+            if not isinstance(value, ParameterNotFoundError):
+                values[name] = value
+        return values
+
     def fetch_parameter_accept_not_found(
         self,
         name,
@@ -0,0 +1,231 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Compact pipeline definitions.
+
+The pipeline definition holds every account that the pipeline deploys to.
+In the pipeline input, every wave target repeats the path, properties,
+provider, regions, and step name of the step that targeted the account.
+For pipelines that target many accounts, that makes the definition large.
+
+In the compact format, the fields that are shared by the wave targets of a
+step are stored once, in the target_steps list of the definition. Every
+wave target is stored as an [account id, account name, step index] tuple
+instead. The compact definition is stored gzip compressed in S3.
+
+When a compact definition is loaded, the wave targets are only expanded
+into their dictionaries when they are accessed.
+"""
+
+import gzip
+import json
+from collections.abc import Sequence
+
+COMPACT_FORMAT = "compact-v1"
+DEFINITION_FILE_NAME = "definition.json.gz"
+# The definition file name as stored before the compact format was
+# introduced, these definitions are uncompressed JSON documents.
+LEGACY_DEFINITION_FILE_NAME = "definition.json"
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+WAVE_TARGET_KEYS = ("id", "name")
+
+
+class CompactWave(Sequence):
+    """
+    The wave targets of a single wave of a compact pipeline definition.
+
+    The wave targets are expanded into their dictionaries upon access. The
+    fields that are shared by the wave targets of the same step reference
+    the same objects, these should be treated as read-only.
+    """
+
+    def __init__(self, wave_targets, target_steps):
+        self._wave_targets = wave_targets
+        self._target_steps = target_steps
+
+    def _expand(self, wave_target):
+        account_id, account_name, step_index = wave_target
+        return {
+            "id": account_id,
+            "name": account_name,
+            **self._target_steps[step_index],
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self._expand(wave_target)
+                for wave_target in self._wave_targets[index]
+            ]
+        return self._expand(self._wave_targets[index])
+
+    def __len__(self):
+        return len(self._wave_targets)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _get_environments(definition):
+    return definition["pipeline_input"].get("environments", {})
+
+
+def compact_definition(definition):
+    """
+    Convert the pipeline definition to the compact format.
+
+    Args:
+        definition (dict): The pipeline definition, holding the
+            pipeline_input and ssm_params.
+
+    Returns:
+        dict: The compact pipeline definition. The definition that was
+            passed is not modified.
+    """
+    target_steps = []
+    step_indexes = {}
+
+    def _compact_wave_target(wave_target):
+        step = {
+            key: value
+            for key, value in wave_target.items()
+            if key not in WAVE_TARGET_KEYS
+        }
+        step_key = json.dumps(step, sort_keys=True)
+        if step_key not in step_indexes:
+            step_indexes[step_key] = len(target_steps)
+            target_steps.append(step)
+        return [
+            wave_target["id"],
+            wave_target["name"],
+            step_indexes[step_key],
+        ]
+
+    environments = _get_environments(definition)
+    targets = [
+        [
+            [_compact_wave_target(wave_target) for wave_target in wave]
+            for wave in waves
+        ]
+        for waves in environments.get("targets", [])
+    ]
+    return {
+        **definition,
+        "definition_format": COMPACT_FORMAT,
+        "pipeline_input": {
+            **definition["pipeline_input"],
+            "environments": {
+                **environments,
+                "targets": targets,
+                "target_steps": target_steps,
+            },
+        },
+    }
+
+
+def expand_definition(definition):
+    """
+    Convert a compact pipeline definition to the regular format. The waves
+    are returned as CompactWave sequences, that expand the wave targets
+    upon access.
+
+    Args:
+        definition (dict): The compact pipeline definition.
+
+    Returns:
+        dict: The pipeline definition.
+    """
+    if definition.get("definition_format") != COMPACT_FORMAT:
+        return definition
+    environments = {**_get_environments(definition)}
+    target_steps = environments.pop("target_steps")
+    environments["targets"] = [
+        [CompactWave(wave, target_steps) for wave in waves]
+        for waves in environments["targets"]
+    ]
+    expanded = {
+        **definition,
+        "pipeline_input": {
+            **definition["pipeline_input"],
+            "environments": environments,
+        },
+    }
+    del expanded["definition_format"]
+    return expanded
+
+
+def serialize_definition(definition):
+    """
+    Returns:
+        bytes: The gzip compressed compact JSON document of the pipeline
+            definition.
+    """
+    return gzip.compress(
+        json.dumps(
+            compact_definition(definition),
+            separators=(",", ":"),
+        ).encode("utf-8"),
+        # Exclude the timestamp, so the same definition results in the
+        # same bytes.
+        mtime=0,
+    )
+
+
+def deserialize_definition(body):
+    """
+    Load the pipeline definition, as stored in the compact and gzip
+    compressed format, or in the legacy JSON format.
+
+    Args:
+        body (bytes): The content of the stored definition.
+
+    Returns:
+        dict: The pipeline definition.
+    """
+    if body[:2] == GZIP_MAGIC_NUMBER:
+        body = gzip.decompress(body)
+    return expand_definition(json.loads(body))
+
+
+def get_definition_key(pipeline_name):
+    return f"pipelines/{pipeline_name}/{DEFINITION_FILE_NAME}"
+
+
+def store_definition(s3_client, bucket_name, definition):
+    """
+    Store the pipeline definition in the compact format in S3.
+
+    Args:
+        s3_client (boto3.client): The S3 client.
+
+        bucket_name (str): The pipeline definition bucket name.
+
+        definition (dict): The pipeline definition, holding the
+            pipeline_input and ssm_params.
+
+    Returns:
+        str: The object key of the stored definition.
+    """
+    key = get_definition_key(definition["pipeline_input"]["name"])
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=serialize_definition(definition),
+        ContentType="application/gzip",
+    )
+    return key
+
+
+def load_definition_file(path):
+    """
+    Read the pipeline definition from the given file.
+
+    Returns:
+        dict: The pipeline definition.
+    """
+    with open(path, mode="rb") as definition_file:
+        return deserialize_definition(definition_file.read())
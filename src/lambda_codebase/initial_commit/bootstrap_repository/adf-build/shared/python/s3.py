@@ -6,6 +6,7 @@ S3 module used throughout the ADF
 """
 
 import boto3
+from botocore.exceptions import ClientError
 
 from logger import configure_logger
 
@@ -80,7 +81,15 @@ class S3:
             "virtual-hosted."
         )
 
-    def put_object(self, key, file_path, style="path", pre_check=False, object_acl='private'):
+    def put_object(
+        self,
+        key,
+        file_path,
+        style="path",
+        pre_check=False,
+        object_acl='private',
+        metadata=None,
+    ):
         """
         Put the object into S3 and return the reference to the object
         in the requested path style.
@@ -108,6 +117,9 @@ class S3:
                 'authenticated-read'|'aws-exec-read'|'bucket-owner-read'|
                 'bucket-owner-full-control'
 
+            metadata (dict[str, str]): The user-defined metadata to store
+                with the object, if any.
+
         Returns:
             str: The S3 object reference in the requested path style. This
                 will be returned regardless of whether or not an upload was
@@ -119,9 +131,31 @@ class S3:
         # If we don't need to check first, do. Otherwise, check if it exists
         # first and only upload if it does not exist.
         if not pre_check or not self._does_object_exist(key):
-            self._perform_put_object(key, file_path, object_acl)
+            self._perform_put_object(key, file_path, object_acl, metadata)
         return self.build_pathing_style(style, key)
 
+    def get_object_metadata(self, key):
+        """
+        Retrieve the user-defined metadata of the given S3 object key,
+        without downloading the object itself.
+
+        Args:
+            key (str): The S3 object key to retrieve the metadata of.
+
+        Returns:
+            dict[str, str]: The metadata of the object, or None if the
+                object does not exist.
+        """
+        try:
+            return self.client.head_object(
+                Bucket=self.bucket,
+                Key=key,
+            ).get('Metadata', {})
+        except ClientError as error:
+            if error.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return None
+            raise
+
     def _does_object_exist(self, key):
         """
         Check whether the given S3 object key exists in this bucket or not.
@@ -138,7 +172,13 @@ class S3:
         except self.client.exceptions.NoSuchKey:
             return False
 
-    def _perform_put_object(self, key, file_path, object_acl="private"):
+    def _perform_put_object(
+        self,
+        key,
+        file_path,
+        object_acl="private",
+        metadata=None,
+    ):
         """
         Perform actual put operation without any checks.
         This is called internally by the put_object method when the
@@ -150,6 +190,9 @@ class S3:
             file_path (str): The file to upload using binary write mode.
 
             object_acl (str): The object ACL to be applied.
+
+            metadata (dict[str, str]): The user-defined metadata to store
+                with the object, if any.
         """
         try:
             LOGGER.info(
@@ -167,6 +210,8 @@ class S3:
                 if self.kms_key_arn:
                     props['ServerSideEncryption'] = 'aws:kms'
                     props['SSEKMSKeyId'] = self.kms_key_arn
+                if metadata:
+                    props['Metadata'] = metadata
                 self.resource.Object(self.bucket, key).put(**props)
                 LOGGER.debug("Upload of %s was successful.", key)
         except BaseException:
@@ -183,20 +228,39 @@ class S3:
         Returns:
             str: The content of the object decoded using utf-8.
         """
+        return self.read_object_bytes(key).decode('utf-8')
+
+    def read_object_bytes(self, key):
+        """
+        Read the object from S3.
+
+        Args:
+            key (str): The object key.
+
+        Returns:
+            bytes: The content of the object.
+        """
         s3_object = self.resource.Object(self.bucket, key)
-        return s3_object.get()['Body'].read().decode('utf-8')
+        return s3_object.get()['Body'].read()
 
-    def fetch_s3_url(self, key):
+    def resolve_key(self, key):
         """
-        Recursively search for an object in S3 and return its URL
+        Recursively search for an object in S3 and return its key.
+
+        Args:
+            key (str): The most specific object key to look for, for example
+                adf-bootstrap/team/dev/regional.yml.
+
+        Returns:
+            str | None: The key of the object that is found at the given
+                path or the nearest parent path, for example
+                adf-bootstrap/team/regional.yml. None if none exists.
         """
         try:
             s3_object = self.resource.Object(self.bucket, key)
             s3_object.get()
             LOGGER.debug('Found Template at: %s', s3_object.key)
-            if self.region == 'us-east-1':
-                return f"https://s3.amazonaws.com/{self.bucket}/{key}"
-            return f"https://s3-{self.region}.amazonaws.com/{self.bucket}/{key}"
+            return key
         except self.client.exceptions.NoSuchKey:
             # Split the path to remove the last key entry from the string
             key_level_up = key.split('/')
@@ -207,7 +271,7 @@ class S3:
                     'Nothing could be found for %s when traversing the bucket',
                     key,
                 )
-                return []
+                return None
 
             LOGGER.debug(
                 'Unable to find the specified Key: %s - looking one level up',
@@ -221,4 +285,18 @@ class S3:
             # Join it back together, and recursive call the function with the
             # new trimmed key until a template/params is found
             next_level_up_key = '/'.join(key_level_up)
-            return self.fetch_s3_url(next_level_up_key)
+            return self.resolve_key(next_level_up_key)
+
+    def fetch_s3_url(self, key):
+        """
+        Recursively search for an object in S3 and return its URL
+        """
+        resolved_key = self.resolve_key(key)
+        if resolved_key is None:
+            return []
+        if self.region == 'us-east-1':
+            return f"https://s3.amazonaws.com/{self.bucket}/{resolved_key}"
+        return (
+            f"https://s3-{self.region}.amazonaws.com/"
+            f"{self.bucket}/{resolved_key}"
+        )
@@ -5,7 +5,9 @@
 Schema Validation for Deployment map files
 """
 
-from schema import Schema, And, Use, Or, Optional, Regex
+from schema import (
+    Schema, SchemaError, And, Use, Or, Optional, Regex, Hook,
+)
 
 # ADF imports
 from logger import configure_logger
@@ -289,6 +291,25 @@ PROVIDER_DEPLOY_SCHEMAS = {
     'service_catalog': Schema(DEFAULT_SERVICECATALOG_DEPLOY),
     'codebuild': Schema(DEFAULT_CODEBUILD_DEPLOY),
 }
+# The provider specific checks of the default providers. These are named,
+# such that the compiled validator can run the provider schemas these
+# checks validate against directly. They remain lambdas, such that the
+# schema errors read the same.
+# pylint: disable=unnecessary-lambda-assignment,unnecessary-lambda
+SOURCE_PROVIDER_CHECK = (
+    lambda x: PROVIDER_SOURCE_SCHEMAS[x['provider']].validate(x)
+)
+BUILD_DISABLED_CHECK = lambda x: PROVIDER_BUILD_DISABLED_SCHEMA.validate(x)
+CODEBUILD_BUILD_CHECK = (
+    lambda x: PROVIDER_BUILD_SCHEMAS['codebuild'].validate(x)
+)
+BUILD_PROVIDER_CHECK = (
+    lambda x: PROVIDER_BUILD_SCHEMAS[x['provider']].validate(x)
+)
+DEPLOY_PROVIDER_CHECK = (
+    lambda x: PROVIDER_DEPLOY_SCHEMAS[x['provider']].validate(x)
+)
+# pylint: enable=unnecessary-lambda-assignment,unnecessary-lambda
 PROVIDER_SCHEMA = {
     'source': Or(
         And(
@@ -296,16 +317,14 @@ PROVIDER_SCHEMA = {
                 'provider': Or('s3', 'codeconnections'),
                 'properties': dict,
             },
-            # pylint: disable=W0108
-            lambda x: PROVIDER_SOURCE_SCHEMAS[x['provider']].validate(x),
+            SOURCE_PROVIDER_CHECK,
         ),
         And(
             {
                 'provider': Or('codecommit'),
                 Optional('properties'): dict,
             },
-            # pylint: disable=W0108
-            lambda x: PROVIDER_SOURCE_SCHEMAS[x['provider']].validate(x),
+            SOURCE_PROVIDER_CHECK,
         ),
     ),
     'build': Or(
@@ -315,8 +334,7 @@ PROVIDER_SCHEMA = {
                 Optional('enabled'): bool,
                 Optional('properties'): dict,
             },
-            # pylint: disable=W0108
-            lambda x: PROVIDER_BUILD_DISABLED_SCHEMA.validate(x)
+            BUILD_DISABLED_CHECK,
         ),
         And(
             {
@@ -324,8 +342,7 @@ PROVIDER_SCHEMA = {
                 Optional('enabled'): bool,
                 'properties': dict,
             },
-            # pylint: disable=W0108
-            lambda x: PROVIDER_BUILD_SCHEMAS['codebuild'].validate(x),
+            CODEBUILD_BUILD_CHECK,
         ),
         And(
             {
@@ -333,8 +350,7 @@ PROVIDER_SCHEMA = {
                 Optional('enabled'): bool,
                 Optional('properties'): dict,
             },
-            # pylint: disable=W0108
-            lambda x: PROVIDER_BUILD_SCHEMAS[x['provider']].validate(x),
+            BUILD_PROVIDER_CHECK,
         ),
     ),
     Optional('deploy'): And(
@@ -346,8 +362,7 @@ PROVIDER_SCHEMA = {
             Optional('enabled'): bool,
             Optional('properties'): dict,
         },
-        # pylint: disable=W0108
-        lambda x: PROVIDER_DEPLOY_SCHEMAS[x['provider']].validate(x),
+        DEPLOY_PROVIDER_CHECK,
     ),
 }
 REGION_SCHEMA = Or(
@@ -433,6 +448,319 @@ TOP_LEVEL_SCHEMA = {
 }
 
 
+# The schemas that the provider checks validate against. When the check
+# looks up the schema by the provider of the data, it is listed per provider.
+PROVIDER_CHECK_SCHEMAS = {
+    SOURCE_PROVIDER_CHECK: PROVIDER_SOURCE_SCHEMAS,
+    BUILD_DISABLED_CHECK: PROVIDER_BUILD_DISABLED_SCHEMA,
+    CODEBUILD_BUILD_CHECK: PROVIDER_BUILD_SCHEMAS['codebuild'],
+    BUILD_PROVIDER_CHECK: PROVIDER_BUILD_SCHEMAS,
+    DEPLOY_PROVIDER_CHECK: PROVIDER_DEPLOY_SCHEMAS,
+}
+
+_MISSING = object()
+
+
+class _Mismatch(Exception):
+    """
+    Raised by a compiled validator when the data does not match the schema.
+    It does not describe the mismatch, the schema library is used to
+    produce the error message instead.
+    """
+
+
+def _is_dict_item(item):
+    return isinstance(item[1], dict)
+
+
+def _provider_guard(branch):
+    """
+    Returns the providers accepted by the given Or branch, and whether the
+    provider is optional. None is returned when the branch is not an And
+    of a dict that defines the provider as one or more literal strings.
+    """
+    # Subclasses of And could validate differently, these are not guarded.
+    # pylint: disable=unidiomatic-typecheck
+    if (
+        type(branch) is not And
+        or not branch.args
+        or not isinstance(branch.args[0], dict)
+    ):
+        return None
+    provider_keys = [
+        key for key in branch.args[0]
+        if key == "provider"
+        or (isinstance(key, Optional) and key.schema == "provider")
+    ]
+    if len(provider_keys) != 1:
+        return None
+    providers = branch.args[0][provider_keys[0]]
+    if isinstance(providers, Or) and not providers.only_one:
+        providers = providers.args
+    elif isinstance(providers, str):
+        providers = (providers,)
+    else:
+        return None
+    if not all(isinstance(provider, str) for provider in providers):
+        return None
+    return tuple(providers), isinstance(provider_keys[0], Optional)
+
+
+class SchemaCompiler:
+    """
+    Compiles a schema into a validator function that returns the same
+    validated data as the schema library does.
+
+    The schema library creates a new Schema for every node it validates and
+    formats an error message for every Or branch that does not match. The
+    compiled validator does neither, it raises a _Mismatch instead. When an
+    Or branch requires a given provider, it is only tried if the provider
+    of the data matches, instead of trying every branch in turn. Schema
+    nodes that cannot be compiled are validated by the schema library.
+    """
+
+    def __init__(self, check_schemas=None):
+        self.check_schemas = check_schemas or {}
+        self._compiled = {}
+
+    def compile(self, schema):
+        """
+        Returns:
+            Callable: The validator of the given schema, it returns the
+                validated data or raises a _Mismatch.
+        """
+        # Schemas are reused across the tree, these are compiled once.
+        # The schema is kept as well, such that its id is not reused.
+        if id(schema) not in self._compiled:
+            self._compiled[id(schema)] = (schema, self._compile(schema))
+        return self._compiled[id(schema)][1]
+
+    # pylint: disable=too-many-return-statements
+    def _compile(self, schema):
+        if type(schema) in (list, tuple, set, frozenset):
+            return self._compile_iterable(schema)
+        if isinstance(schema, dict):
+            return self._compile_dict(schema)
+        if issubclass(type(schema), type):
+            return self._compile_type(schema)
+        # Subclasses, such as Optional of Schema, validate differently.
+        # These are only compiled by their exact type.
+        # pylint: disable=unidiomatic-typecheck
+        if type(schema) is Or and not schema.only_one:
+            return self._compile_or(schema.args)
+        if type(schema) is And:
+            return self._compile_and(schema.args)
+        if type(schema) is Schema and not schema.ignore_extra_keys:
+            return self.compile(schema.schema)
+        if hasattr(schema, "validate"):
+            return self._compile_fallback(schema)
+        if callable(schema):
+            return self._compile_callable(schema)
+        return self._compile_comparable(schema)
+
+    @staticmethod
+    def _compile_fallback(schema):
+        def validate_fallback(data):
+            try:
+                return Schema(schema).validate(data)
+            except SchemaError:
+                raise _Mismatch() from None
+        return validate_fallback
+
+    def _compile_iterable(self, schema):
+        container = type(schema)
+        validate_item = self._compile_or(tuple(schema))
+
+        def validate_iterable(data):
+            if not isinstance(data, container):
+                raise _Mismatch()
+            return type(data)(validate_item(item) for item in data)
+        return validate_iterable
+
+    def _compile_dict(self, schema):
+        if any(isinstance(key, Hook) for key in schema):
+            return self._compile_fallback(schema)
+        # The schema library matches every data key with the first schema
+        # key that validates it, in the order of the key priorities. The
+        # literal keys go first, hence these are looked up directly.
+        literal_keys = {}
+        other_keys = []
+        # pylint: disable=protected-access
+        for skey in sorted(schema, key=Schema._dict_key_priority):
+            key_schema = skey.schema if isinstance(skey, Optional) else skey
+            validate_value = self.compile(schema[skey])
+            # A str subclass could define validate, the schema library
+            # would not compare such a key literally.
+            # pylint: disable=unidiomatic-typecheck
+            if type(key_schema) is str and not other_keys:
+                literal_keys.setdefault(key_schema, (skey, validate_value))
+            else:
+                other_keys.append((
+                    skey,
+                    self.compile(key_schema),
+                    validate_value,
+                ))
+        required = set(
+            key for key in schema if not isinstance(key, Optional)
+        )
+        defaults = set(
+            key for key in schema
+            if isinstance(key, Optional) and hasattr(key, "default")
+        )
+
+        def validate_dict(data):
+            if not isinstance(data, dict):
+                raise _Mismatch()
+            new = type(data)()
+            coverage = set()
+            # Like the schema library, dictionaries are evaluated last
+            for key, value in sorted(data.items(), key=_is_dict_item):
+                match = (
+                    literal_keys.get(key) if isinstance(key, str) else None
+                )
+                if match:
+                    new[key] = match[1](value)
+                    coverage.add(match[0])
+                    continue
+                for skey, validate_key, validate_value in other_keys:
+                    try:
+                        new_key = validate_key(key)
+                    except _Mismatch:
+                        continue
+                    new[new_key] = validate_value(value)
+                    coverage.add(skey)
+                    break
+            if not required.issubset(coverage) or len(new) != len(data):
+                raise _Mismatch()
+            for default in defaults - coverage:
+                new[default.key] = (
+                    default.default()
+                    if callable(default.default)
+                    else default.default
+                )
+            return new
+        return validate_dict
+
+    @staticmethod
+    def _compile_type(schema):
+        if schema is int:
+            def validate_int(data):
+                if isinstance(data, int) and not isinstance(data, bool):
+                    return data
+                raise _Mismatch()
+            return validate_int
+
+        def validate_type(data):
+            if isinstance(data, schema):
+                return data
+            raise _Mismatch()
+        return validate_type
+
+    def _compile_or(self, options):
+        branches = [
+            (_provider_guard(option), self.compile(option))
+            for option in options
+        ]
+
+        def validate_or(data):
+            provider = (
+                data.get("provider", _MISSING)
+                if isinstance(data, dict)
+                else None
+            )
+            for guard, validate in branches:
+                # Skip the branches that would reject the provider
+                if guard and provider is not None and not (
+                    guard[1] if provider is _MISSING
+                    else provider in guard[0]
+                ):
+                    continue
+                try:
+                    return validate(data)
+                except _Mismatch:
+                    pass
+            raise _Mismatch()
+        return validate_or
+
+    def _compile_and(self, steps):
+        steps = [self.compile(step) for step in steps]
+
+        def validate_and(data):
+            for validate in steps:
+                data = validate(data)
+            return data
+        return validate_and
+
+    def _compile_callable(self, schema):
+        if schema in self.check_schemas:
+            return self._compile_check(self.check_schemas[schema])
+
+        def validate_callable(data):
+            try:
+                valid = schema(data)
+            except Exception:  # pylint: disable=broad-except
+                raise _Mismatch() from None
+            if not valid:
+                raise _Mismatch()
+            return data
+        return validate_callable
+
+    def _compile_check(self, schemas):
+        if not isinstance(schemas, dict):
+            validate_schema = self.compile(schemas)
+
+            def validate_check(data):
+                if not validate_schema(data):
+                    raise _Mismatch()
+                return data
+            return validate_check
+
+        provider_schemas = {
+            provider: self.compile(schema)
+            for provider, schema in schemas.items()
+        }
+
+        def validate_provider_check(data):
+            try:
+                validate_schema = provider_schemas[data["provider"]]
+            except (KeyError, TypeError):
+                raise _Mismatch() from None
+            if not validate_schema(data):
+                raise _Mismatch()
+            return data
+        return validate_provider_check
+
+    @staticmethod
+    def _compile_comparable(schema):
+        def validate_comparable(data):
+            if schema == data:
+                return data
+            raise _Mismatch()
+        return validate_comparable
+
+
+_COMPILED_TOP_LEVEL_SCHEMA = None
+
+
+def compiled_top_level_schema():
+    """
+    Returns:
+        Callable: The compiled validator of the deployment map schema, it
+            is compiled once per process.
+    """
+    global _COMPILED_TOP_LEVEL_SCHEMA  # pylint: disable=global-statement
+    if _COMPILED_TOP_LEVEL_SCHEMA is None:
+        _COMPILED_TOP_LEVEL_SCHEMA = SchemaCompiler(
+            PROVIDER_CHECK_SCHEMAS,
+        ).compile(TOP_LEVEL_SCHEMA)
+    return _COMPILED_TOP_LEVEL_SCHEMA
+
+
 class SchemaValidation:
     def __init__(self, map_input: dict):
-        self.validated = Schema(TOP_LEVEL_SCHEMA).validate(map_input)
+        try:
+            self.validated = compiled_top_level_schema()(map_input)
+        except _Mismatch:
+            # The compiled validator does not explain what is wrong,
+            # the schema library raises the SchemaError that describes it.
+            self.validated = Schema(TOP_LEVEL_SCHEMA).validate(map_input)
@@ -0,0 +1,388 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Counting semaphores used to limit the number of processes that operate on
+the same resource concurrently, for example the number of accounts that
+are bootstrapped in a given region at the same time.
+
+Every semaphore key tracks the holders of a slot and the holders that
+are waiting for a slot. The latter is used to report the queue depth.
+Waiting holders are admitted in the order in which they started waiting:
+a free slot is only granted to a holder when fewer holders that waited
+longer are waiting for the same key than there are free slots. This
+prevents a waiting holder from being starved by holders that happen to
+retry more often.
+
+The DynamoDBSemaphore stores this state in a DynamoDB table, such that it
+is shared across Lambda invocations. The LocalSemaphore keeps it in memory
+and can be used as a stand-in in tests and local runs.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+from botocore.config import Config
+
+# ADF imports
+from logger import configure_logger
+
+LOGGER = configure_logger(__name__)
+# A single DynamoDB transaction accepts up to 100 items
+MAX_KEYS_PER_TRANSACTION = 100
+DYNAMODB_CONFIG = Config(
+    retries={
+        "max_attempts": 10,
+    },
+)
+# Waiting holders are stored as <waiting since>|<holder>, such that the
+# waiting set records the order in which the holders started waiting.
+WAITING_SEPARATOR = "|"
+
+
+def format_timestamp(seconds):
+    """
+    Returns:
+        str: The ISO 8601 UTC timestamp of the given epoch seconds, in the
+            format that AWS Step Functions uses for its timestamps.
+    """
+    return (
+        datetime.fromtimestamp(seconds, timezone.utc)
+        .strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+        + "Z"
+    )
+
+
+def _waiting_ahead(holder, waiting_since, waiting):
+    """
+    Returns:
+        int: The number of other holders that started waiting before the
+            given holder.
+    """
+    return sum(
+        1 for other, other_since in waiting.items()
+        if other != holder and (other_since, other) < (waiting_since, holder)
+    )
+
+
+def _is_available(holder, waiting_since, key_state):
+    waiting_since = min(
+        waiting_since,
+        key_state["waiting"].get(holder, waiting_since),
+    )
+    return (
+        holder in key_state["holders"]
+        or _waiting_ahead(holder, waiting_since, key_state["waiting"])
+        < key_state["limit"] - len(key_state["holders"])
+    )
+
+
+def _encode_waiting(holder, waiting_since):
+    return f"{waiting_since}{WAITING_SEPARATOR}{holder}"
+
+
+def _decode_waiting(entries):
+    waiting = {}
+    for entry in entries:
+        waiting_since, _, holder = entry.rpartition(WAITING_SEPARATOR)
+        waiting[holder] = min(waiting.get(holder, waiting_since), waiting_since)
+    return waiting
+
+
+class LocalSemaphore:
+    """
+    In-memory implementation of the semaphore interface.
+    """
+
+    def __init__(self, default_limit, limits=None, clock=time.time):
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self.clock = clock
+        self._holders = {}
+        self._waiting = {}
+        self._claimed_at = {}
+        self._lock = threading.Lock()
+
+    def describe(self, keys):
+        """
+        Returns the current state of the given keys.
+
+        Returns:
+            dict: The holders, the waiting holders mapped to the time they
+                started waiting, and the limit per key.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "holders": set(self._holders.get(key, set())),
+                    "waiting": dict(self._waiting.get(key, {})),
+                    "limit": self.limits.get(key, self.default_limit),
+                }
+                for key in keys
+            }
+
+    def try_acquire(self, holder, keys, waiting_since=None):
+        """
+        Acquire a slot for the holder in all of the given keys, or in none
+        of them when any of the keys has no slot available for the holder.
+        In the latter case, the holder is registered as waiting for these
+        keys since the given time, which defaults to now.
+
+        Returns:
+            bool: Whether the slots were acquired.
+        """
+        waiting_since = waiting_since or format_timestamp(self.clock())
+        state = self.describe(keys)
+        with self._lock:
+            available = all(
+                _is_available(holder, waiting_since, state[key])
+                for key in keys
+            )
+            for key in keys:
+                if available:
+                    self._holders.setdefault(key, set()).add(holder)
+                    self._waiting.get(key, {}).pop(holder, None)
+                else:
+                    self._waiting.setdefault(key, {}).setdefault(
+                        holder,
+                        waiting_since,
+                    )
+            return available
+
+    def release(self, holder, keys):
+        """
+        Release the slots and waiting registrations of the holder.
+        """
+        with self._lock:
+            for key in keys:
+                self._holders.get(key, set()).discard(holder)
+                self._waiting.get(key, {}).pop(holder, None)
+
+    def try_claim_maintenance(self, key, interval_seconds):
+        """
+        Claim the right to perform maintenance on the key, such as releasing
+        the slots of holders that stopped without releasing them. This can
+        be claimed at most once per interval.
+
+        Returns:
+            bool: Whether the claim was granted.
+        """
+        with self._lock:
+            now = self.clock()
+            claimed_at = self._claimed_at.get(key)
+            if claimed_at is not None and claimed_at > now - interval_seconds:
+                return False
+            self._claimed_at[key] = now
+            return True
+
+
+class DynamoDBSemaphore:
+    """
+    Semaphore that stores its state in a DynamoDB table with a string
+    partition key named semaphore_key. The limit of a key can be overridden
+    by setting the concurrency_limit number attribute on its item.
+    """
+
+    def __init__(self, table_name, role, region, default_limit, clock=time.time):
+        self.table_name = table_name
+        self.default_limit = default_limit
+        self.clock = clock
+        self.client = role.client(
+            "dynamodb",
+            region_name=region,
+            config=DYNAMODB_CONFIG,
+        )
+
+    def describe(self, keys):
+        """
+        Returns the current state of the given keys.
+
+        Returns:
+            dict: The holders, the waiting holders mapped to the time they
+                started waiting, and the limit per key.
+        """
+        state = {
+            key: {
+                "holders": set(),
+                "waiting": {},
+                "limit": self.default_limit,
+            }
+            for key in keys
+        }
+        request = {
+            self.table_name: {
+                "Keys": [{"semaphore_key": {"S": key}} for key in keys],
+                "ConsistentRead": True,
+            },
+        }
+        while request:
+            response = self.client.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(self.table_name, []):
+                key_state = state[item["semaphore_key"]["S"]]
+                key_state["holders"] = set(item.get("holders", {}).get("SS", []))
+                key_state["waiting"] = _decode_waiting(
+                    item.get("waiting", {}).get("SS", []),
+                )
+                if "concurrency_limit" in item:
+                    key_state["limit"] = int(item["concurrency_limit"]["N"])
+            request = response.get("UnprocessedKeys")
+        return state
+
+    def try_acquire(self, holder, keys, waiting_since=None):
+        """
+        Acquire a slot for the holder in all of the given keys in a single
+        transaction, or in none of them when any of the keys has no slot
+        available for the holder. In the latter case, the holder is
+        registered as waiting for these keys since the given time, which
+        defaults to now.
+
+        Returns:
+            bool: Whether the slots were acquired.
+        """
+        keys = sorted(set(keys))
+        if len(keys) > MAX_KEYS_PER_TRANSACTION:
+            raise ValueError(
+                f"Cannot acquire more than {MAX_KEYS_PER_TRANSACTION} keys "
+                "at once",
+            )
+        waiting_since = waiting_since or format_timestamp(self.clock())
+        state = self.describe(keys)
+        available = all(
+            _is_available(holder, waiting_since, state[key])
+            for key in keys
+        )
+        if available:
+            try:
+                self.client.transact_write_items(
+                    TransactItems=[
+                        {
+                            "Update": self._acquire_update(
+                                holder,
+                                key,
+                                state[key],
+                                waiting_since,
+                            ),
+                        }
+                        for key in keys
+                    ],
+                )
+                return True
+            except self.client.exceptions.TransactionCanceledException:
+                LOGGER.debug(
+                    "Slots for %s got taken concurrently, keys: %s",
+                    holder,
+                    keys,
+                )
+        for key in keys:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key={"semaphore_key": {"S": key}},
+                UpdateExpression="ADD #waiting :waiting",
+                ExpressionAttributeNames={"#waiting": "waiting"},
+                ExpressionAttributeValues={
+                    ":waiting": {
+                        "SS": [
+                            _encode_waiting(
+                                holder,
+                                state[key]["waiting"].get(
+                                    holder,
+                                    waiting_since,
+                                ),
+                            ),
+                        ],
+                    },
+                },
+            )
+        return False
+
+    @staticmethod
+    def _waiting_entries(holder, key_state, waiting_since=None):
+        return sorted({
+            _encode_waiting(holder, since)
+            for since in (key_state["waiting"].get(holder), waiting_since)
+            if since is not None
+        })
+
+    def _acquire_update(self, holder, key, key_state, waiting_since):
+        return {
+            "TableName": self.table_name,
+            "Key": {"semaphore_key": {"S": key}},
+            "UpdateExpression": "ADD #holders :holder DELETE #waiting :waiting",
+            "ConditionExpression": (
+                "attribute_not_exists(#holders) "
+                "OR contains(#holders, :holder_name) "
+                "OR size(#holders) < :limit"
+            ),
+            "ExpressionAttributeNames": {
+                "#holders": "holders",
+                "#waiting": "waiting",
+            },
+            "ExpressionAttributeValues": {
+                ":holder": {"SS": [holder]},
+                ":waiting": {
+                    "SS": self._waiting_entries(holder, key_state, waiting_since),
+                },
+                ":holder_name": {"S": holder},
+                ":limit": {"N": str(key_state["limit"])},
+            },
+        }
+
+    def release(self, holder, keys):
+        """
+        Release the slots and waiting registrations of the holder.
+        """
+        state = self.describe(sorted(set(keys)))
+        for key, key_state in state.items():
+            waiting_entries = self._waiting_entries(holder, key_state)
+            if not waiting_entries:
+                self.client.update_item(
+                    TableName=self.table_name,
+                    Key={"semaphore_key": {"S": key}},
+                    UpdateExpression="DELETE #holders :holder",
+                    ExpressionAttributeNames={"#holders": "holders"},
+                    ExpressionAttributeValues={":holder": {"SS": [holder]}},
+                )
+                continue
+            self.client.update_item(
+                TableName=self.table_name,
+                Key={"semaphore_key": {"S": key}},
+                UpdateExpression="DELETE #holders :holder, #waiting :waiting",
+                ExpressionAttributeNames={
+                    "#holders": "holders",
+                    "#waiting": "waiting",
+                },
+                ExpressionAttributeValues={
+                    ":holder": {"SS": [holder]},
+                    ":waiting": {"SS": waiting_entries},
+                },
+            )
+
+    def try_claim_maintenance(self, key, interval_seconds):
+        """
+        Claim the right to perform maintenance on the key, such as releasing
+        the slots of holders that stopped without releasing them. This can
+        be claimed at most once per interval.
+
+        Returns:
+            bool: Whether the claim was granted.
+        """
+        now = int(self.clock())
+        try:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key={"semaphore_key": {"S": key}},
+                UpdateExpression="SET #claimed_at = :now",
+                ConditionExpression=(
+                    "attribute_not_exists(#claimed_at) "
+                    "OR #claimed_at <= :threshold"
+                ),
+                ExpressionAttributeNames={"#claimed_at": "maintenance_claimed_at"},
+                ExpressionAttributeValues={
+                    ":now": {"N": str(now)},
+                    ":threshold": {"N": str(now - interval_seconds)},
+                },
+            )
+            return True
+        except self.client.exceptions.ConditionalCheckFailedException:
+            return False
@@ -13,6 +13,137 @@ from logger import configure_logger
 from partition import get_partition
 
 LOGGER = configure_logger(__name__)
+FAILED_EXECUTION_STATUSES = ('FAILED', 'ABORTED', 'TIMED_OUT')
+
+
+class ExecutionWatcher:
+    """
+    Class used to wait for a known set of state machine executions.
+
+    Instead of listing the execution history of a state machine over and
+    over again, the executions of interest are discovered once. From then
+    on, only the executions that are still running are polled using
+    describe_execution. The delay between polls increases while no progress
+    is made, and resets when an execution finished.
+    """
+
+    def __init__(
+        self,
+        client,
+        initial_delay=5,
+        max_delay=60,
+        backoff_factor=2,
+    ):
+        self.client = client
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff_factor = backoff_factor
+        self.running_executions = {}
+        self.finished_executions = {}
+
+    def track_execution(self, execution_arn, status='RUNNING'):
+        """
+        Track the given execution, if its status is not final yet it will
+        be polled when waiting.
+        """
+        if status == 'RUNNING':
+            self.running_executions[execution_arn] = status
+        else:
+            self.running_executions.pop(execution_arn, None)
+            self.finished_executions[execution_arn] = status
+
+    def track_running_executions(self, state_machine_arn, filter_lambda=None):
+        """
+        Track all executions of the given state machine that are running
+        at the moment. The running executions are filtered server-side.
+        """
+        paginator = self.client.get_paginator('list_executions')
+        for page in paginator.paginate(
+            stateMachineArn=state_machine_arn,
+            statusFilter='RUNNING',
+        ):
+            for execution in page['executions']:
+                if filter_lambda and not filter_lambda(execution):
+                    continue
+                self.track_execution(execution['executionArn'])
+
+    def track_executions_started_after(
+        self,
+        state_machine_arn,
+        started_after,
+        filter_lambda=None,
+    ):
+        """
+        Track all executions of the given state machine that started at
+        or after the given unix timestamp.
+
+        Executions are listed with the most recent one first. Hence, it
+        stops listing executions as soon as it encounters an execution that
+        started before the given timestamp.
+        """
+        paginator = self.client.get_paginator('list_executions')
+        for page in paginator.paginate(stateMachineArn=state_machine_arn):
+            for execution in page['executions']:
+                if execution['startDate'].timestamp() < started_after:
+                    return
+                if filter_lambda and not filter_lambda(execution):
+                    continue
+                self.track_execution(
+                    execution['executionArn'],
+                    execution['status'],
+                )
+
+    def failed_executions(self):
+        """
+        Returns the list of execution ARNs that failed, timed out, or were
+        aborted.
+        """
+        return [
+            execution_arn
+            for execution_arn, status in self.finished_executions.items()
+            if status in FAILED_EXECUTION_STATUSES
+        ]
+
+    def poll(self):
+        """
+        Describe the executions that are still running to update their
+        status.
+
+        Returns:
+            int: The number of executions that finished since the last poll.
+        """
+        finished = 0
+        for execution_arn in list(self.running_executions):
+            status = self.client.describe_execution(
+                executionArn=execution_arn,
+            ).get('status')
+            self.track_execution(execution_arn, status)
+            if status != 'RUNNING':
+                finished += 1
+        return finished
+
+    def wait(self):
+        """
+        Waits until all tracked executions finished.
+        """
+        delay = self.initial_delay
+        while self.running_executions:
+            LOGGER.info(
+                "Waiting for %d state machine %s to finish, "
+                "%d finished so far. Checking again in %d seconds.",
+                len(self.running_executions),
+                (
+                    "executions" if len(self.running_executions) > 1
+                    else "execution"
+                ),
+                len(self.finished_executions),
+                delay,
+            )
+            sleep(delay)
+            if self.poll():
+                delay = self.initial_delay
+            else:
+                delay = min(delay * self.backoff_factor, self.max_delay)
 
 
 class StepFunctions:
@@ -101,16 +232,19 @@ class StepFunctions:
         )
         self._execution_status = execution.get('status', None)
 
-    # Is there a legit waiter for this?
     def _wait_state_machine_execution(self):
         """
         Waits until the state machine is complete
         """
-        while self.execution_status == 'RUNNING':
-            self._fetch_statemachine_status()
-            sleep(10)  # Wait for 10 seconds and check the status again
+        if self.execution_status == 'RUNNING':
+            watcher = ExecutionWatcher(self.client)
+            watcher.track_execution(self.execution_arn)
+            watcher.wait()
+            self._execution_status = (
+                watcher.finished_executions[self.execution_arn]
+            )
 
-        if self.execution_status in ('FAILED', 'ABORTED', 'TIMED_OUT'):
+        if self.execution_status in FAILED_EXECUTION_STATUSES:
             raise AssertionError(
                 "State Machine on Deployment account "
                 f"{self.deployment_account_id} has "
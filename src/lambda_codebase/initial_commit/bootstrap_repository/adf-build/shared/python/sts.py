@@ -6,6 +6,7 @@
 
 import boto3
 import botocore
+from instrumentation import instrument_session
 from logger import configure_logger
 
 LOGGER = configure_logger(__name__)
@@ -45,11 +46,11 @@ class STS:
             role_session_name,
         )
 
-        return boto3.Session(
+        return instrument_session(boto3.Session(
             aws_access_key_id=sts_response['Credentials']['AccessKeyId'],
             aws_secret_access_key=sts_response['Credentials']['SecretAccessKey'],
             aws_session_token=sts_response['Credentials']['SessionToken'],
-        )
+        ))
 
     @staticmethod
     def _build_role_arn(
@@ -59,6 +60,30 @@ class STS:
     ):
         return f"arn:{partition}:iam::{account_id}:role/{role_name}"
 
+    def assume_jump_role(
+        self,
+        partition,
+        management_account_id,
+        role_session_name,
+    ):
+        """
+        Assumes into the ADF Account-Bootstrapping Jump Role.
+
+        Returns:
+            STS: The STS instance that uses the jump role session, it can be
+                passed to assume_bootstrap_deployment_role to assume into
+                multiple accounts with the same jump role session.
+        """
+        jump_role_session = self.assume_cross_account_role(
+            STS._build_role_arn(
+                partition,
+                management_account_id,
+                ADF_JUMP_ROLE_NAME,
+            ),
+            role_session_name,
+        )
+        return STS(jump_role_session.client('sts'))
+
     def assume_bootstrap_deployment_role(
         self,
         partition,
@@ -66,6 +91,7 @@ class STS:
         account_id,
         privileged_role_name,
         role_session_name,
+        jump_role_sts=None,
     ):
         """
         Assuming into the JumpRole first, while using the role credentials
@@ -79,22 +105,21 @@ class STS:
         the account is not bootstrapped by ADF yet. Or when ADF is configured
         with a GrantOrgWidePrivilegedBootstrapAccessUntil date/time that is in
         the future.
+
+        When the jump_role_sts is passed, as returned by assume_jump_role,
+        that jump role session is used instead of assuming the jump role
+        again.
         """
         LOGGER.info(
             "Using ADF Account-Bootstrapping Jump Role to assume "
             "into account %s",
             account_id,
         )
-        jump_role_session = self.assume_cross_account_role(
-            STS._build_role_arn(
-                partition,
-                management_account_id,
-                ADF_JUMP_ROLE_NAME,
-            ),
+        jump_role_sts = jump_role_sts or self.assume_jump_role(
+            partition,
+            management_account_id,
             role_session_name,
         )
-
-        jump_role_sts = STS(jump_role_session.client('sts'))
         try:
             session = jump_role_sts.assume_cross_account_role(
                 STS._build_role_arn(
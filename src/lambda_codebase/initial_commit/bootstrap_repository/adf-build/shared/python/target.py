@@ -9,6 +9,8 @@ require mutation depending on their structure.
 
 import re
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 import boto3
 
@@ -33,6 +35,25 @@ AWS_ACCOUNT_ID_REGEX = re.compile(AWS_ACCOUNT_ID_REGEX_STR)
 CLOUDFORMATION_PROVIDER_NAME = "cloudformation"
 RECURSIVE_SUFFIX = "/**/*"
 PIPELINE_MAXIMUM_ACTIONS = 1000
+# The number of targets that are resolved concurrently. This bounds the
+# number of concurrent AWS Organizations API calls, as these are throttled
+# at a low rate.
+MAX_CONCURRENT_TARGET_RESOLUTIONS = 8
+
+
+def fetch_allow_empty_target(parameter_store=None) -> bool:
+    """
+    Returns:
+        bool: Whether targets that resolve to zero accounts are allowed.
+    """
+    parameter_store = (
+        parameter_store
+        or ParameterStore(DEPLOYMENT_ACCOUNT_REGION, boto3)
+    )
+    return parameter_store.fetch_parameter(
+        "deployment_maps/allow_empty_target"
+    ).lower() == "enabled"
+
 
 class TargetStructure:
     def __init__(self, target):
@@ -149,6 +170,7 @@ class Target:
         target_structure,
         organizations,
         step,
+        allow_empty_target=None,
     ):
         self.path = path
         self.step_name = step.get('name', '')
@@ -161,12 +183,12 @@ class Target:
         )
         self.target_structure = target_structure
         self.organizations = organizations
+        self.accounts = []
         # Set adf_deployment_maps_allow_empty_target as bool
-        parameter_store = ParameterStore(DEPLOYMENT_ACCOUNT_REGION, boto3)
         self.adf_deployment_maps_allow_empty_target = (
-            parameter_store.fetch_parameter(
-                "deployment_maps/allow_empty_target"
-            ).lower() == "enabled"
+            fetch_allow_empty_target()
+            if allow_empty_target is None
+            else allow_empty_target
         )
 
     @staticmethod
@@ -185,7 +207,7 @@ class Target:
         }
 
     def _target_is_approval(self):
-        self.target_structure.account_list.append(
+        self.accounts.append(
             self._create_target_info("approval", "approval")
         )
 
@@ -198,7 +220,7 @@ class Target:
             )
             if is_active_not_excluded:
                 accounts_found += 1
-                self.target_structure.account_list.append(
+                self.accounts.append(
                     self._create_target_info(
                         response.get("Name"), str(response.get("Id"))
                     )
@@ -295,8 +317,24 @@ class Target:
         responses = self.organizations.dir_to_ou(self.path)
         self._create_response_object(responses)
 
-    # pylint: disable=R0911
     def fetch_accounts_for_target(self):
+        self.target_structure.account_list.extend(self.resolve_accounts())
+
+    def resolve_accounts(self):
+        """
+        Resolve the accounts of this target, without adding them to the
+        account list of the target structure. Such that the targets of the
+        same target structure can be resolved concurrently.
+
+        Returns:
+            list[dict]: The target info of the accounts that were found.
+        """
+        self.accounts = []
+        self._fetch_accounts()
+        return self.accounts
+
+    # pylint: disable=R0911
+    def _fetch_accounts(self):
         if self.path == "approval":
             self._target_is_approval()
             return
@@ -341,3 +379,49 @@ class Target:
             self._target_is_null_path()
             return
         raise InvalidDeploymentMapError(f"Unknown definition for target: {self.path}")
+
+
+def resolve_targets(targets, max_workers=MAX_CONCURRENT_TARGET_RESOLUTIONS):
+    """
+    Resolve the accounts of the targets concurrently. Once all targets are
+    resolved, their accounts are added to the account list of their target
+    structure in the order of the targets. Hence, the resulting account
+    lists are identical to resolving the targets one after another.
+
+    Args:
+        targets (list[Target]): The targets to resolve.
+
+        max_workers (int): The number of targets to resolve concurrently.
+    """
+    def _resolve(target):
+        start_time = time.perf_counter()
+        accounts = target.resolve_accounts()
+        LOGGER.info(
+            "Resolved target %s of step '%s' to %d account(s) in %.2f seconds",
+            target.path,
+            target.step_name,
+            len(accounts),
+            time.perf_counter() - start_time,
+        )
+        return accounts
+
+    with ThreadPoolExecutor(
+        max_workers=max(min(max_workers, len(targets)), 1),
+    ) as executor:
+        futures = [executor.submit(_resolve, target) for target in targets]
+
+    errors = []
+    for target, future in zip(targets, futures):
+        error = future.exception()
+        if error:
+            LOGGER.error(
+                "Failed to resolve target %s: %s",
+                target.path,
+                error,
+            )
+            errors.append(error)
+    if errors:
+        raise errors[0]
+
+    for target, future in zip(targets, futures):
+        target.target_structure.account_list.extend(future.result())
@@ -0,0 +1,70 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+from account_batch import get_accounts, process_accounts
+
+
+def _process_account(account):
+    if account["account_id"] == "222222222222":
+        raise ValueError("Some error")
+    return {**account, "processed": True}
+
+
+def test_get_accounts_single_account():
+    event = {"account_id": "111111111111"}
+    assert get_accounts(event) == [event]
+
+
+def test_get_accounts_batch():
+    accounts = [{"account_id": "111111111111"}]
+    assert get_accounts({"accounts": accounts}) == accounts
+
+
+def test_process_accounts_single_account():
+    assert process_accounts(
+        {"account_id": "111111111111"},
+        _process_account,
+    ) == {"account_id": "111111111111", "processed": True}
+
+
+def test_process_accounts_batch_reports_status_per_account():
+    event = {
+        "accounts": [
+            {"account_id": "111111111111", "account_full_name": "one"},
+            {"account_id": "222222222222", "account_full_name": "two"},
+            {"account_id": "333333333333", "account_full_name": "three"},
+        ],
+    }
+    assert process_accounts(event, _process_account) == {
+        "accounts": [
+            {
+                "account_id": "111111111111",
+                "account_full_name": "one",
+                "processed": True,
+                "processing_status": "SUCCEEDED",
+            },
+            {
+                "account_id": "222222222222",
+                "account_full_name": "two",
+                "processing_status": "FAILED",
+                "processing_error": {
+                    "type": "ValueError",
+                    "message": "Some error",
+                },
+            },
+            {
+                "account_id": "333333333333",
+                "account_full_name": "three",
+                "processed": True,
+                "processing_status": "SUCCEEDED",
+            },
+        ],
+    }
+
+
+def test_process_accounts_empty_batch():
+    assert process_accounts({"accounts": []}, _process_account) == {
+        "accounts": [],
+    }
@@ -0,0 +1,148 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+from datetime import datetime
+
+from pytest import raises
+
+from account_writer import (
+    JSON_LINES,
+    AccountIndexEntry,
+    AccountWriter,
+    find_account,
+    read_account_index,
+)
+
+ACCOUNTS = [
+    {
+        "Id": "111111111111",
+        "Arn": "arn:aws:organizations::111111111111:account/o-a/111111111111",
+        "Email": "one@example.com",
+        "Name": "one",
+        "Status": "ACTIVE",
+        "JoinedTimestamp": datetime(2020, 1, 1),
+    },
+    {
+        "Id": "222222222222",
+        "Email": "two@example.com",
+        "Name": "two",
+        "Status": "ACTIVE",
+    },
+]
+
+
+def _write(output_path, accounts, **kwargs):
+    with AccountWriter(str(output_path), **kwargs) as writer:
+        for account in accounts:
+            writer.write(account, f"/r-root/ou-{account['Name']}")
+    return writer
+
+
+def test_json_array_matches_json_dumps(tmp_path):
+    for indent in [None, 2]:
+        for accounts in [ACCOUNTS, []]:
+            output_path = tmp_path / "accounts.json"
+            _write(output_path, accounts, indent=indent)
+
+            assert output_path.read_text() == json.dumps(
+                accounts,
+                indent=indent,
+                default=str,
+            )
+
+
+def test_json_lines_with_field_projection(tmp_path):
+    output_path = tmp_path / "accounts.jsonl"
+
+    writer = _write(
+        output_path,
+        ACCOUNTS,
+        fields=["Id", "Email"],
+        output_format=JSON_LINES,
+    )
+
+    assert writer.count == 2
+    assert [
+        json.loads(line)
+        for line in output_path.read_text().splitlines()
+    ] == [
+        {"Id": "111111111111", "Email": "one@example.com"},
+        {"Id": "222222222222", "Email": "two@example.com"},
+    ]
+
+
+def test_field_mapping(tmp_path):
+    output_path = tmp_path / "accounts.json"
+
+    _write(
+        output_path,
+        ACCOUNTS,
+        fields={"AccountId": "Id", "Email": "Email"},
+    )
+
+    assert json.loads(output_path.read_text()) == [
+        {"AccountId": "111111111111", "Email": "one@example.com"},
+        {"AccountId": "222222222222", "Email": "two@example.com"},
+    ]
+
+
+def test_invalid_output_format(tmp_path):
+    with raises(ValueError, match="Unknown output format: yaml"):
+        AccountWriter(str(tmp_path / "accounts.yml"), output_format="yaml")
+
+
+def test_incomplete_array_on_error(tmp_path):
+    output_path = tmp_path / "accounts.json"
+
+    def _accounts():
+        yield ACCOUNTS[0]
+        raise RuntimeError("Access denied")
+
+    with raises(RuntimeError):
+        _write(output_path, _accounts())
+
+    with raises(json.JSONDecodeError):
+        json.loads(output_path.read_text())
+
+
+def test_account_index(tmp_path):
+    index_path = tmp_path / "accounts.idx"
+
+    _write(tmp_path / "accounts.json", ACCOUNTS, index_path=str(index_path))
+
+    assert index_path.read_text() == (
+        "111111111111\tone@example.com\tone\t/r-root/ou-one\n"
+        "222222222222\ttwo@example.com\ttwo\t/r-root/ou-two\n"
+    )
+    assert list(read_account_index(str(index_path))) == [
+        AccountIndexEntry(
+            "111111111111",
+            "one@example.com",
+            "one",
+            "/r-root/ou-one",
+        ),
+        AccountIndexEntry(
+            "222222222222",
+            "two@example.com",
+            "two",
+            "/r-root/ou-two",
+        ),
+    ]
+    assert find_account(str(index_path), "111111111111").name == "one"
+    assert find_account(str(index_path), "222222222222").email == (
+        "two@example.com"
+    )
+    assert find_account(str(index_path), "333333333333") is None
+    assert find_account(str(index_path), "11111111111") is None
+
+
+def test_find_account_empty_index(tmp_path):
+    index_path = tmp_path / "accounts.idx"
+
+    _write(tmp_path / "accounts.json", [], index_path=str(index_path))
+
+    assert index_path.read_text() == ""
+    assert find_account(str(index_path), "111111111111") is None
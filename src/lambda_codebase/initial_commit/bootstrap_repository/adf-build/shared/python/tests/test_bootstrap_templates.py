@@ -0,0 +1,121 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+
+from mock import Mock
+from pytest import fixture, raises
+
+from bootstrap_templates import BootstrapTemplateIndex
+from errors import InvalidParameterFileError
+from s3 import S3
+
+
+@fixture
+def s3():
+    s3 = S3('eu-west-1', 'some_bucket')
+    s3.client = Mock()
+    s3.client.get_paginator.return_value.paginate.return_value = [
+        {
+            "Contents": [
+                {"Key": "adf-bootstrap/global.yml", "ETag": '"global-hash"'},
+                {"Key": "adf-bootstrap/regional.yml"},
+                {"Key": "adf-bootstrap/global-params.json"},
+            ],
+        },
+        {
+            "Contents": [
+                {"Key": "adf-bootstrap/team/regional.yml", "ETag": '"team-hash"'},
+                {"Key": "adf-bootstrap/team/dev/regional-params.json"},
+            ],
+        },
+    ]
+    s3.read_object = Mock(return_value=json.dumps([
+        {"ParameterKey": "Team", "ParameterValue": "dev"},
+    ]))
+    return s3
+
+
+def test_lists_bucket_once(s3):
+    index = BootstrapTemplateIndex(s3)
+    index.resolve_key("adf-bootstrap/team/dev/regional.yml")
+    index.resolve_key("adf-bootstrap/other/global.yml")
+    index.resolve_key("adf-bootstrap/team/dev/regional.yml")
+    s3.client.get_paginator.assert_called_once_with("list_objects_v2")
+    s3.client.get_paginator.return_value.paginate.assert_called_once_with(
+        Bucket="some_bucket",
+        Prefix="adf-bootstrap/",
+    )
+
+
+def test_resolve_key_inherits_from_parent_paths(s3):
+    index = BootstrapTemplateIndex(s3)
+    assert (
+        index.resolve_key("adf-bootstrap/team/dev/regional.yml")
+        == "adf-bootstrap/team/regional.yml"
+    )
+    assert (
+        index.resolve_key("adf-bootstrap/team/dev/global.yml")
+        == "adf-bootstrap/global.yml"
+    )
+    assert (
+        index.resolve_key("adf-bootstrap/team/dev/global-iam.yml")
+        is None
+    )
+
+
+def test_get_template_url(s3):
+    index = BootstrapTemplateIndex(s3)
+    assert (
+        index.get_template_url("adf-bootstrap/team/dev/regional.yml")
+        == "https://s3-eu-west-1.amazonaws.com/some_bucket/"
+        "adf-bootstrap/team/regional.yml"
+    )
+    assert index.get_template_url("adf-bootstrap/team/global-iam.yml") is None
+
+
+def test_get_template_hash(s3):
+    index = BootstrapTemplateIndex(s3)
+    assert (
+        index.get_template_hash("adf-bootstrap/team/dev/regional.yml")
+        == "team-hash"
+    )
+    assert (
+        index.get_template_hash("adf-bootstrap/other/global.yml")
+        == "global-hash"
+    )
+    assert index.get_template_hash("adf-bootstrap/team/global-iam.yml") is None
+
+
+def test_get_parameters_reads_each_file_once(s3):
+    index = BootstrapTemplateIndex(s3)
+    expected = [{"ParameterKey": "Team", "ParameterValue": "dev"}]
+    assert (
+        index.get_parameters("adf-bootstrap/team/dev/regional-params.json")
+        == expected
+    )
+    assert (
+        index.get_parameters("adf-bootstrap/team/dev/regional-params.json")
+        == expected
+    )
+    s3.read_object.assert_called_once_with(
+        "adf-bootstrap/team/dev/regional-params.json",
+    )
+
+
+def test_get_parameters_without_parameter_file(s3):
+    index = BootstrapTemplateIndex(s3)
+    assert index.get_parameters("adf-bootstrap/team/regional-params.json") == []
+    s3.read_object.assert_not_called()
+
+
+def test_get_parameters_invalid_json(s3):
+    s3.read_object.return_value = "not json"
+    index = BootstrapTemplateIndex(s3)
+    with raises(
+        InvalidParameterFileError,
+        match="adf-bootstrap/team/dev/regional-params.json",
+    ):
+        index.get_parameters("adf-bootstrap/team/dev/regional-params.json")
@@ -81,3 +81,28 @@ def test_remove_multiple_keys(cls):
     assert cls.exists("key2") is True
     assert cls.get("key1") is None
     assert cls.get("key2") == "value2"
+
+
+def test_entries_expire_after_ttl():
+    # Arrange
+    now = [100.0]
+    cache = Cache(ttl_seconds=60, clock=lambda: now[0])
+    cache.add("test_key", "test_value")
+
+    # Act
+    now[0] = 159.0
+    exists_before_ttl = cache.exists("test_key")
+    now[0] = 160.0
+
+    # Assert
+    assert exists_before_ttl is True
+    assert cache.exists("test_key") is False
+    assert cache.get("test_key") is None
+
+
+def test_entries_do_not_expire_without_ttl():
+    now = [100.0]
+    cache = Cache(clock=lambda: now[0])
+    cache.add("test_key", "test_value")
+    now[0] = 100000.0
+    assert cache.get("test_key") == "test_value"
@@ -0,0 +1,65 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+import subprocess
+import sys
+
+from mock import patch, sentinel
+
+import clients
+
+
+@patch("clients._CLIENTS", {})
+@patch("clients.boto3")
+def test_get_client_creates_client_once(boto3_mock):
+    boto3_mock.client.side_effect = [sentinel.ssm, sentinel.ssm_eu_west_1]
+
+    assert clients.get_client("ssm") is sentinel.ssm
+    assert clients.get_client("ssm") is sentinel.ssm
+    assert clients.get_client("ssm", region_name="eu-west-1") is (
+        sentinel.ssm_eu_west_1
+    )
+
+    assert boto3_mock.client.call_count == 2
+    boto3_mock.client.assert_called_with(
+        "ssm",
+        region_name="eu-west-1",
+        config=None,
+    )
+
+
+@patch("clients._TRACING", {"enabled": False})
+@patch("aws_xray_sdk.core.patch")
+def test_enable_tracing_patches_botocore_once(patch_mock):
+    clients.enable_tracing()
+    clients.enable_tracing()
+
+    patch_mock.assert_called_once_with(("botocore",))
+
+
+def test_import_defers_tracing_to_botocore_only():
+    probe = (
+        "import json, sys\n"
+        "import clients\n"
+        "imported = sorted(sys.modules)\n"
+        "clients.enable_tracing()\n"
+        "print(json.dumps([imported, sorted(sys.modules)]))\n"
+    )
+    imported, traced = json.loads(subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout)
+
+    assert not [
+        module for module in imported if module.startswith("aws_xray_sdk")
+    ]
+    assert {
+        module.split(".")[2]
+        for module in traced
+        if module.startswith("aws_xray_sdk.ext.")
+    } <= {"boto_utils", "botocore", "util"}
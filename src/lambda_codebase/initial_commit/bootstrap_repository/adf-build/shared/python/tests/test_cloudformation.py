@@ -6,11 +6,13 @@
 import os
 import boto3
 from botocore.stub import Stubber
+from botocore.exceptions import ClientError
 from pytest import fixture, raises
 from stubs import stub_cloudformation
 from mock import Mock, call, patch
 
 from cloudformation import CloudFormation, StackProperties
+from errors import InvalidParameterFileError
 from s3 import S3
 
 s3 = S3('us-east-1', 'some_bucket')
@@ -252,7 +254,19 @@ def test_delete_all_base_stacks(paginator_mock, logger, global_cls):
             },
         ],
     }
-    global_cls.delete_all_base_stacks()
+    deleted_stacks = global_cls.delete_all_base_stacks()
+    assert deleted_stacks == [
+        'adf-global-base-iam',
+        'adf-global-base-bootstrap',
+        'adf-regional-base-bootstrap',
+        'adf-global-base-deployment',
+        'adf-global-base-deployment-SomeOtherStack',
+        'adf-global-base-adf-build',
+        'adf-global-base-dev',
+        'adf-global-base-test',
+        'adf-global-base-acceptance',
+        'adf-global-base-prod',
+    ]
     global_cls.client.delete_stack.assert_has_calls([
         call(StackName='adf-global-base-iam'),
         call(StackName='adf-global-base-bootstrap'),
@@ -402,7 +416,7 @@ def test_delete_deprecated_base_stacks_all_valid(paginator_mock, logger, global_
             },
         ],
     }
-    global_cls.delete_deprecated_base_stacks()
+    assert global_cls.delete_deprecated_base_stacks() == []
     global_cls.client.delete_stack.assert_not_called()
     logger.warning.assert_not_called()
 
@@ -494,3 +508,243 @@ def test_delete_deprecated_base_stacks_regional(paginator_mock, logger, regional
             'CREATE_IN_PROGRESS',
         ),
     ])
+
+
+def test_template_index_is_used_when_set():
+    template_index = Mock()
+    template_index.get_template_url.return_value = (
+        "https://s3-eu-west-1.amazonaws.com/some_bucket/adf-bootstrap/regional.yml"
+    )
+    template_index.get_parameters.return_value = [
+        {"ParameterKey": "Team", "ParameterValue": "dev"},
+    ]
+    cfn = CloudFormation(
+        region='eu-west-1',
+        deployment_account_region='us-east-1',
+        role=boto3,
+        s3=s3,
+        s3_key_path='adf-bootstrap/team/dev',
+        account_id=123,
+        template_index=template_index,
+    )
+    assert cfn.get_template_url() == (
+        "https://s3-eu-west-1.amazonaws.com/some_bucket/adf-bootstrap/regional.yml"
+    )
+    assert cfn.get_parameters() == [
+        {"ParameterKey": "Team", "ParameterValue": "dev"},
+    ]
+    template_index.get_template_url.assert_called_once_with(
+        'adf-bootstrap/team/dev/regional.yml',
+    )
+    template_index.get_parameters.assert_called_once_with(
+        'adf-bootstrap/team/dev/regional-params.json',
+    )
+
+
+def test_get_parameters_without_template_index():
+    param_s3 = Mock()
+    param_s3.resolve_key.return_value = (
+        'adf-bootstrap/team/regional-params.json'
+    )
+    param_s3.read_object.return_value = (
+        '[{"ParameterKey": "Team", "ParameterValue": "dev"}]'
+    )
+    cfn = CloudFormation(
+        region='eu-west-1',
+        deployment_account_region='us-east-1',
+        role=boto3,
+        s3=param_s3,
+        s3_key_path='adf-bootstrap/team/dev',
+        account_id=123,
+    )
+    assert cfn.get_parameters() == [
+        {"ParameterKey": "Team", "ParameterValue": "dev"},
+    ]
+    param_s3.resolve_key.assert_called_once_with(
+        'adf-bootstrap/team/dev/regional-params.json',
+    )
+    param_s3.read_object.assert_called_once_with(
+        'adf-bootstrap/team/regional-params.json',
+    )
+
+
+def test_get_parameters_without_template_index_nothing_found():
+    param_s3 = Mock()
+    param_s3.resolve_key.return_value = None
+    cfn = CloudFormation(
+        region='eu-west-1',
+        deployment_account_region='us-east-1',
+        role=boto3,
+        s3=param_s3,
+        s3_key_path='adf-bootstrap/team/dev',
+        account_id=123,
+    )
+    assert cfn.get_parameters() == []
+    param_s3.read_object.assert_not_called()
+
+
+def test_get_parameters_without_template_index_invalid_json():
+    param_s3 = Mock()
+    param_s3.resolve_key.return_value = (
+        'adf-bootstrap/team/regional-params.json'
+    )
+    param_s3.read_object.return_value = '[{"ParameterKey": "Team",'
+    cfn = CloudFormation(
+        region='eu-west-1',
+        deployment_account_region='us-east-1',
+        role=boto3,
+        s3=param_s3,
+        s3_key_path='adf-bootstrap/team/dev',
+        account_id=123,
+    )
+    with raises(
+        InvalidParameterFileError,
+        match='adf-bootstrap/team/regional-params.json',
+    ):
+        cfn.get_parameters()
+
+
+def test_template_index_missing_template():
+    template_index = Mock()
+    template_index.get_template_url.return_value = None
+    cfn = CloudFormation(
+        region='us-east-1',
+        deployment_account_region='us-east-1',
+        role=boto3,
+        s3=s3,
+        s3_key_path='adf-bootstrap/team',
+        account_id=123,
+        template_index=template_index,
+    )
+    assert cfn.get_template_url() == []
+
+
+def test_create_stack_describes_stack_once(global_cls):
+    global_cls.client = Mock()
+    global_cls.client.describe_stacks.return_value = {
+        "Stacks": [
+            {
+                'StackName': 'adf-global-base-bootstrap',
+                'StackStatus': 'UPDATE_COMPLETE',
+            },
+        ],
+    }
+    global_cls.client.describe_change_set.side_effect = ClientError(
+        {"Error": {"Code": "ChangeSetNotFound"}},
+        "DescribeChangeSet",
+    )
+    global_cls.parameters = []
+    global_cls.wait = True
+    global_cls.create_stack()
+    assert global_cls.client.describe_stacks.call_count == 1
+    global_cls.client.create_change_set.assert_called_once()
+    assert (
+        global_cls.client.create_change_set.call_args.kwargs["ChangeSetType"]
+        == 'UPDATE'
+    )
+    global_cls.client.get_waiter.assert_has_calls([
+        call('change_set_create_complete'),
+        call('stack_update_complete'),
+    ], any_order=True)
+    assert global_cls.get_stack_status() == 'UPDATE_COMPLETE'
+    assert global_cls.client.describe_stacks.call_count == 1
+
+
+@patch("cloudformation.paginator")
+def test_create_stack_after_listing_stacks_does_not_describe(paginator_mock, global_cls):
+    global_cls.client = Mock()
+    paginator_mock.return_value = [
+        {
+            'StackName': 'adf-global-base-bootstrap',
+            'StackStatus': 'UPDATE_COMPLETE',
+        },
+    ]
+    global_cls.client.describe_change_set.return_value = False
+    global_cls.parameters = []
+    global_cls.delete_deprecated_base_stacks()
+    global_cls.create_stack()
+    paginator_mock.assert_called_once()
+    global_cls.client.describe_stacks.assert_not_called()
+    global_cls.client.delete_stack.assert_not_called()
+    assert (
+        global_cls.client.create_change_set.call_args.kwargs["ChangeSetType"]
+        == 'UPDATE'
+    )
+    # The IAM stack was not listed, so it does not exist
+    assert global_cls._get_stack_status('adf-global-base-iam') is None
+    global_cls.client.describe_stacks.assert_not_called()
+
+
+def test_stack_status_is_described_again_without_waiting(global_cls):
+    global_cls.client = Mock()
+    global_cls.client.describe_stacks.return_value = {"Stacks": []}
+    global_cls.client.describe_change_set.return_value = False
+    global_cls.parameters = []
+    global_cls.create_stack()
+    assert (
+        global_cls.client.create_change_set.call_args.kwargs["ChangeSetType"]
+        == 'CREATE'
+    )
+    assert global_cls.client.describe_stacks.call_count == 1
+    global_cls.client.describe_stacks.return_value = stub_cloudformation.describe_stack
+    assert global_cls.get_stack_status() == 'CREATE_IN_PROGRESS'
+    assert global_cls.client.describe_stacks.call_count == 2
+
+
+def test_get_stack_outputs(global_cls):
+    global_cls.client = Mock()
+    global_cls.client.describe_stacks.return_value = {
+        "Stacks": [
+            {
+                'StackName': 'adf-global-base-bootstrap',
+                'StackStatus': 'UPDATE_COMPLETE',
+                'Outputs': [
+                    {'OutputKey': 'SomeKey', 'OutputValue': 'some-value'},
+                ],
+            },
+        ],
+    }
+    assert global_cls.get_stack_outputs() == {'SomeKey': 'some-value'}
+    assert global_cls.get_stack_status() == 'UPDATE_COMPLETE'
+    assert global_cls.client.describe_stacks.call_count == 1
+
+
+def test_get_stack_outputs_missing_stack(global_cls):
+    global_cls.client = Mock()
+    global_cls.client.describe_stacks.return_value = {"Stacks": []}
+    assert global_cls.get_stack_outputs() == {}
+    assert global_cls.get_stack_status() is None
+    assert global_cls.client.describe_stacks.call_count == 1
+
+
+@patch('cloudformation.VALIDATED_TEMPLATE_HASHES', set())
+def test_validate_template_once_per_template_hash():
+    template_index = Mock()
+    template_index.get_template_url.return_value = (
+        "https://s3-eu-west-1.amazonaws.com/some_bucket/adf-bootstrap/regional.yml"
+    )
+    template_index.get_template_hash.return_value = "some-hash"
+    validated = []
+    for account_id in [111111111111, 222222222222]:
+        cfn = CloudFormation(
+            region='eu-west-1',
+            deployment_account_region='us-east-1',
+            role=boto3,
+            s3=s3,
+            s3_key_path='adf-bootstrap/team',
+            account_id=account_id,
+            template_index=template_index,
+        )
+        cfn.client = Mock()
+        cfn.template_url = cfn.get_template_url()
+        cfn.validate_template()
+        validated.append(cfn.client.validate_template.call_count)
+    assert validated == [1, 0]
+
+
+@patch('cloudformation.VALIDATED_TEMPLATE_HASHES', set())
+def test_validate_template_without_hash(regional_cls):
+    regional_cls.client = Mock()
+    regional_cls.validate_template()
+    regional_cls.validate_template()
+    assert regional_cls.client.validate_template.call_count == 2
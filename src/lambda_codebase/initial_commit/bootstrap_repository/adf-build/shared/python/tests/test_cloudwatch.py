@@ -0,0 +1,120 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+
+from mock import Mock
+from cloudwatch import ADFMetrics
+
+
+def test_put_metric_data_is_buffered():
+    client = Mock()
+    metrics = ADFMetrics(client, "PIPELINE_MANAGEMENT/RULE")
+    metrics.put_metric_data(
+        {"MetricName": "CreateOrUpdate", "Value": 1, "Unit": "Count"}
+    )
+    client.put_metric_data.assert_not_called()
+
+
+def test_flush_aggregates_statistic_sets():
+    client = Mock()
+    metrics = ADFMetrics(client, "PIPELINE_MANAGEMENT/RULE")
+    for value in [1, 1, 3]:
+        metrics.put_metric_data(
+            {"MetricName": "CreateOrUpdate", "Value": value, "Unit": "Count"}
+        )
+    metrics.put_metric_data([
+        {"MetricName": "CacheInitialized", "Value": 1, "Unit": "Count"},
+    ])
+    metrics.flush()
+    client.put_metric_data.assert_called_once_with(
+        Namespace="ADF/PIPELINE_MANAGEMENT/RULE",
+        MetricData=[
+            {
+                "MetricName": "CreateOrUpdate",
+                "Unit": "Count",
+                "StatisticValues": {
+                    "SampleCount": 3.0,
+                    "Sum": 5.0,
+                    "Minimum": 1.0,
+                    "Maximum": 3.0,
+                },
+            },
+            {
+                "MetricName": "CacheInitialized",
+                "Unit": "Count",
+                "Value": 1,
+            },
+        ],
+    )
+
+    # Nothing left to flush
+    metrics.flush()
+    assert client.put_metric_data.call_count == 1
+
+
+def test_flush_batches_per_thousand_metrics():
+    client = Mock()
+    metrics = ADFMetrics(client, "ACCOUNT_MANAGEMENT")
+    metrics.put_metric_data([
+        {
+            "MetricName": "Processed",
+            "Dimensions": [{"Name": "Account", "Value": str(index)}],
+            "Value": 1,
+            "Unit": "Count",
+        }
+        for index in range(2500)
+    ])
+    metrics.flush()
+    assert [
+        len(call.kwargs["MetricData"])
+        for call in client.put_metric_data.call_args_list
+    ] == [1000, 1000, 500]
+
+
+def test_flush_as_emf(capsys):
+    metrics = ADFMetrics(None, "PIPELINE_MANAGEMENT/REPO", emit_as_emf=True)
+    metrics.put_metric_data([
+        {
+            "MetricName": "CreateOrUpdate",
+            "Dimensions": [{"Name": "Pipeline", "Value": "sample"}],
+            "Value": 1,
+            "Unit": "Count",
+        },
+        {
+            "MetricName": "CreateOrUpdate",
+            "Dimensions": [{"Name": "Pipeline", "Value": "sample"}],
+            "Value": 1,
+            "Unit": "Count",
+        },
+    ])
+    metrics.flush()
+    documents = [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+    ]
+    assert len(documents) == 1
+    assert documents[0]["CreateOrUpdate"] == [1, 1]
+    assert documents[0]["Pipeline"] == "sample"
+    assert documents[0]["_aws"]["CloudWatchMetrics"] == [{
+        "Namespace": "ADF/PIPELINE_MANAGEMENT/REPO",
+        "Dimensions": [["Pipeline"]],
+        "Metrics": [{"Name": "CreateOrUpdate", "Unit": "Count"}],
+    }]
+
+
+def test_flush_after_handler():
+    client = Mock()
+    metrics = ADFMetrics(client, "PIPELINE_MANAGEMENT/RULE")
+
+    @metrics.flush_after
+    def handler(event, _):
+        metrics.put_metric_data(
+            {"MetricName": "CreateOrUpdate", "Value": 1, "Unit": "Count"}
+        )
+        return event
+
+    assert handler({"some": "event"}, None) == {"some": "event"}
+    client.put_metric_data.assert_called_once()
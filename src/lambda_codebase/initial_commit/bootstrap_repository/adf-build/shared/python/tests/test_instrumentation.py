@@ -0,0 +1,130 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+"""Tests for instrumentation.py"""
+
+# pylint: skip-file
+
+import itertools
+
+import boto3
+from botocore.stub import Stubber
+
+from instrumentation import ClientCallRecorder, _percentile
+
+
+def build_instrumented_client(recorder, service):
+    session = boto3.Session(
+        aws_access_key_id="ak",
+        aws_secret_access_key="sak",
+        region_name="eu-central-1",
+    )
+    recorder.instrument(session)
+    return session.client(service)
+
+
+def build_clock(step=0.5):
+    # Every call to the clock moves it forward by step seconds.
+    counter = itertools.count()
+    return lambda: next(counter) * step
+
+
+def test_percentile():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    assert _percentile(values, 50) == 5.0
+    assert _percentile(values, 90) == 9.0
+    assert _percentile(values, 99) == 10.0
+    assert _percentile([], 50) == 0.0
+
+
+def test_records_calls_and_latency():
+    recorder = ClientCallRecorder(clock=build_clock())
+    client = build_instrumented_client(recorder, "ssm")
+    stubber = Stubber(client)
+    for _ in range(3):
+        stubber.add_response(
+            "get_parameter",
+            {"Parameter": {"Name": "/adf/some", "Value": "value"}},
+            {"Name": "/adf/some"},
+        )
+    stubber.add_client_error("get_parameter", "ParameterNotFound")
+    stubber.activate()
+
+    for _ in range(3):
+        client.get_parameter(Name="/adf/some")
+    try:
+        client.get_parameter(Name="/adf/some")
+    except client.exceptions.ParameterNotFound:
+        pass
+
+    summary = recorder.summarize()
+    assert len(summary) == 1
+    service, operation, stats = summary[0]
+    assert (service, operation) == ("ssm", "GetParameter")
+    assert stats["Calls"] == 4
+    assert stats["Errors"] == 1
+    assert stats["Retries"] == 0
+    assert stats["LatencyP50"] == 500.0
+    assert stats["LatencyMax"] == 500.0
+
+
+def test_records_throttles():
+    recorder = ClientCallRecorder(clock=build_clock())
+    recorder._needs_retry(
+        event_name="needs-retry.ssm.GetParameter",
+        response=(None, {"Error": {"Code": "ThrottlingException"}}),
+    )
+    recorder._needs_retry(
+        event_name="needs-retry.ssm.GetParameter",
+        response=(None, {"Error": {"Code": "ParameterNotFound"}}),
+    )
+    recorder._needs_retry(
+        event_name="needs-retry.ssm.GetParameter",
+        response=None,
+    )
+    recorder._after_call(
+        event_name="after-call.ssm.GetParameter",
+        parsed={"ResponseMetadata": {"RetryAttempts": 1}},
+        context={},
+    )
+    _, _, stats = recorder.summarize()[0]
+    assert stats["Throttles"] == 1
+    assert stats["Retries"] == 1
+    assert stats["Calls"] == 1
+
+    recorder.reset()
+    assert recorder.summarize() == []
+
+
+def test_embedded_metrics_and_table():
+    recorder = ClientCallRecorder(clock=build_clock())
+    client = build_instrumented_client(recorder, "sts")
+    stubber = Stubber(client)
+    stubber.add_response(
+        "get_caller_identity",
+        {
+            "Account": "111111111111",
+            "Arn": "arn:aws:iam::111111111111:user/adf",
+            "UserId": "user",
+        },
+        {},
+    )
+    stubber.activate()
+    client.get_caller_identity()
+
+    documents = recorder.to_embedded_metrics(timestamp=1234)
+    assert len(documents) == 1
+    document = documents[0]
+    assert document["Service"] == "sts"
+    assert document["Operation"] == "GetCallerIdentity"
+    assert document["Calls"] == 1
+    metadata = document["_aws"]["CloudWatchMetrics"][0]
+    assert document["_aws"]["Timestamp"] == 1234
+    assert metadata["Namespace"] == "ADF/Instrumentation"
+    assert metadata["Dimensions"] == [["Service", "Operation"]]
+    assert {"Name": "LatencyP99", "Unit": "Milliseconds"} in metadata["Metrics"]
+    assert {"Name": "Calls", "Unit": "Count"} in metadata["Metrics"]
+
+    table = recorder.format_table().splitlines()
+    assert table[0].startswith("Operation")
+    assert table[1].startswith("sts.GetCallerIdentity")
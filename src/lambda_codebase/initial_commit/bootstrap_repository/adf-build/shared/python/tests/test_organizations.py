@@ -1386,3 +1386,43 @@ class OrgClientInitTestCases(unittest.TestCase):
         with self.assertRaises(OrganizationsException) as context:
             Organizations()
         assert Organizations(role=boto3)
+
+
+@patch("organizations.paginator")
+def test_get_policy_target_id(paginator_mock, cls, cache):
+    cache.add('root_id', 'r-1234')
+    cache.add('children_r-1234', [
+        {"Id": "ou-dev", "Name": "Development"},
+        {"Id": "ou-prod", "Name": "Production"},
+    ])
+    cache.add('children_ou-dev', [{"Id": "ou-app", "Name": "App1"}])
+    paginator_mock.return_value = [
+        {"Id": "111111111111", "Name": "dev-account"},
+    ]
+
+    assert cls.get_policy_target_id("/") == "r-1234"
+    assert cls.get_policy_target_id("Development") == "ou-dev"
+    assert cls.get_policy_target_id("Development/App1") == "ou-app"
+    assert (
+        cls.get_policy_target_id("Development/dev-account")
+        == "111111111111"
+    )
+    assert (
+        cls.get_policy_target_id("Development/dev-account")
+        == "111111111111"
+    )
+    paginator_mock.assert_called_once_with(
+        cls.client.list_accounts_for_parent,
+        ParentId="ou-dev",
+    )
+
+
+def test_get_policy_target_id_not_found(cls, cache):
+    cache.add('root_id', 'r-1234')
+    cache.add('children_r-1234', [{"Id": "ou-dev", "Name": "Development"}])
+    cache.add('children_ou-dev', [])
+    cache.add('accounts_ou-dev', [])
+    with raises(OrganizationsException):
+        cls.get_policy_target_id("Development/Unknown")
+    with raises(OrganizationsException):
+        cls.get_policy_target_id("Unknown/App1")
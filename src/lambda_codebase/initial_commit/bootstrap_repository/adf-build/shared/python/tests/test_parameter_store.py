@@ -170,6 +170,33 @@ def test_delete_parameter_removes_from_cache_even_when_failing(cls, mock_ssm_cli
     assert not cls.cache.exists(full_param_name)
 
 
+def test_delete_parameters_in_batches(cls, mock_ssm_client):
+    # Arrange
+    parameter_names = [f"/adf/test-param-{index}" for index in range(23)]
+    cls.cache.add("/adf/test-param-0", "test-value")
+    mock_ssm_client.delete_parameters.side_effect = lambda Names: {
+        "DeletedParameters": Names[:-1],
+        "InvalidParameters": Names[-1:],
+    }
+
+    # Act
+    deleted_names = cls.delete_parameters(parameter_names)
+
+    # Assert
+    assert [
+        len(call.kwargs["Names"])
+        for call in mock_ssm_client.delete_parameters.call_args_list
+    ] == [10, 10, 3]
+    assert len(deleted_names) == 20
+    assert "/adf/test-param-9" not in deleted_names
+    assert not cls.cache.exists("/adf/test-param-0")
+
+
+def test_delete_parameters_without_parameters(cls, mock_ssm_client):
+    assert cls.delete_parameters([]) == []
+    mock_ssm_client.delete_parameters.assert_not_called()
+
+
 def test_fetch_parameter_returns_cached_value(cls, mock_ssm_client):
     # Arrange
     parameter_name = "test-param"
@@ -249,3 +276,74 @@ def test_fetch_parameter_accept_not_found_with_cached_error(cls):
 
     # Assert
     assert result == default_value
+
+
+def test_fetch_parameters_in_batches(cls, mock_ssm_client):
+    # Arrange
+    names = [f"test-param-{index}" for index in range(12)] + ["missing"]
+    cls.cache.add("/adf/test-param-0", "cached-value")
+    mock_ssm_client.get_parameters.side_effect = lambda Names, WithDecryption: {
+        "Parameters": [
+            {"Name": name, "Value": f"value-of-{name}"}
+            for name in Names
+            if name != "/adf/missing"
+        ],
+        "InvalidParameters": [
+            name for name in Names if name == "/adf/missing"
+        ],
+    }
+
+    # Act
+    values = cls.fetch_parameters(names)
+
+    # Assert
+    assert [
+        len(call.kwargs["Names"])
+        for call in mock_ssm_client.get_parameters.call_args_list
+    ] == [10, 2]
+    assert "/adf/test-param-0" not in (
+        mock_ssm_client.get_parameters.call_args_list[0].kwargs["Names"]
+    )
+    assert values["test-param-0"] == "cached-value"
+    assert values["test-param-11"] == "value-of-/adf/test-param-11"
+    assert "missing" not in values
+    assert cls.fetch_parameter("test-param-5") == "value-of-/adf/test-param-5"
+    with raises(ParameterNotFoundError):
+        cls.fetch_parameter("missing")
+    mock_ssm_client.get_parameter.assert_not_called()
+
+
+def test_fetch_parameters_all_cached(cls, mock_ssm_client):
+    cls.cache.add("/adf/test-param", "cached-value")
+    assert cls.fetch_parameters(["test-param"]) == {
+        "test-param": "cached-value",
+    }
+    mock_ssm_client.get_parameters.assert_not_called()
+
+
+def test_fetch_parameters_separate_not_found_cache(mock_role, mock_ssm_client):
+    # Arrange
+    cache = Cache()
+    mock_ssm_client.get_parameters.return_value = {
+        "Parameters": [{"Name": "/adf/found", "Value": "found-value"}],
+        "InvalidParameters": ["/adf/missing"],
+    }
+    first = ParameterStore("us-east-1", mock_role, cache, Cache())
+    second = ParameterStore("us-east-1", mock_role, cache, Cache())
+
+    # Act
+    first.fetch_parameters(["found", "missing"])
+
+    # Assert
+    with raises(ParameterNotFoundError):
+        first.fetch_parameter("missing")
+    assert not cache.exists("/adf/missing")
+    mock_ssm_client.get_parameter.return_value = {
+        "Parameter": {"Value": "created-value"},
+    }
+    assert second.fetch_parameter("found") == "found-value"
+    assert second.fetch_parameter("missing") == "created-value"
+    mock_ssm_client.get_parameter.assert_called_once_with(
+        Name="/adf/missing",
+        WithDecryption=False,
+    )
@@ -0,0 +1,153 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import gzip
+import json
+
+import boto3
+from botocore.stub import ANY, Stubber
+from pytest import fixture
+
+from pipeline_definition import (
+    COMPACT_FORMAT,
+    compact_definition,
+    deserialize_definition,
+    expand_definition,
+    serialize_definition,
+    store_definition,
+)
+
+
+def _wave_target(account_id, step_name="", regions=None):
+    return {
+        "id": account_id,
+        "name": f"account-{account_id}",
+        "path": "/some/ou",
+        "properties": {"stack_name": "some-stack"},
+        "provider": "cloudformation",
+        "regions": regions or ["eu-west-1"],
+        "step_name": step_name,
+    }
+
+
+@fixture
+def definition():
+    return {
+        "pipeline_definition": {"name": "some-pipeline"},
+        "pipeline_input": {
+            "name": "some-pipeline",
+            "environments": {
+                "targets": [
+                    [
+                        [_wave_target("111111111111"), _wave_target("222222222222")],
+                        [_wave_target("333333333333")],
+                    ],
+                    [
+                        [
+                            _wave_target("111111111111", "second", ["us-east-1"]),
+                        ],
+                    ],
+                ],
+            },
+        },
+        "ssm_params": {"eu-west-1": {"s3": "some-bucket"}},
+    }
+
+
+def test_compact_definition_interns_steps(definition):
+    result = compact_definition(definition)
+
+    assert result["definition_format"] == COMPACT_FORMAT
+    environments = result["pipeline_input"]["environments"]
+    assert environments["targets"] == [
+        [
+            [
+                ["111111111111", "account-111111111111", 0],
+                ["222222222222", "account-222222222222", 0],
+            ],
+            [["333333333333", "account-333333333333", 0]],
+        ],
+        [
+            [["111111111111", "account-111111111111", 1]],
+        ],
+    ]
+    assert environments["target_steps"] == [
+        {
+            "path": "/some/ou",
+            "properties": {"stack_name": "some-stack"},
+            "provider": "cloudformation",
+            "regions": ["eu-west-1"],
+            "step_name": "",
+        },
+        {
+            "path": "/some/ou",
+            "properties": {"stack_name": "some-stack"},
+            "provider": "cloudformation",
+            "regions": ["us-east-1"],
+            "step_name": "second",
+        },
+    ]
+    assert result["ssm_params"] == definition["ssm_params"]
+    # The definition that was passed is not modified
+    assert "target_steps" not in definition["pipeline_input"]["environments"]
+
+
+def test_expand_definition_round_trip(definition):
+    expected = json.loads(json.dumps(definition))
+
+    result = expand_definition(
+        json.loads(json.dumps(compact_definition(definition))),
+    )
+
+    assert result == expected
+    wave = result["pipeline_input"]["environments"]["targets"][0][0]
+    assert len(wave) == 2
+    assert wave[0] == _wave_target("111111111111")
+    assert wave[-1]["id"] == "222222222222"
+    assert [target["id"] for target in wave[:1]] == ["111111111111"]
+
+
+def test_expand_definition_legacy_format(definition):
+    assert expand_definition(definition) is definition
+
+
+def test_serialize_definition_is_compressed_and_deterministic(definition):
+    body = serialize_definition(definition)
+
+    assert body[:2] == b"\x1f\x8b"
+    assert body == serialize_definition(definition)
+    assert json.loads(gzip.decompress(body)) == json.loads(
+        json.dumps(compact_definition(definition)),
+    )
+
+
+def test_deserialize_definition(definition):
+    expected = json.loads(json.dumps(definition))
+
+    assert deserialize_definition(serialize_definition(definition)) == expected
+    assert deserialize_definition(
+        json.dumps(definition).encode("utf-8"),
+    ) == expected
+
+
+def test_store_definition(definition):
+    s3_client = boto3.client("s3", region_name="eu-west-1")
+    stubber = Stubber(s3_client)
+    stubber.add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "some-bucket",
+            "Key": "pipelines/some-pipeline/definition.json.gz",
+            "Body": ANY,
+            "ContentType": "application/gzip",
+        },
+    )
+    stubber.activate()
+
+    key = store_definition(s3_client, "some-bucket", definition)
+
+    assert key == "pipelines/some-pipeline/definition.json.gz"
+    stubber.assert_no_pending_responses()
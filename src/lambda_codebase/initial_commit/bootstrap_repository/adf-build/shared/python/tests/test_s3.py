@@ -173,7 +173,7 @@ def test_put_object_no_checks_always_upload(does_exist, perform_put,
     assert return_value == object_path
 
     does_exist.assert_not_called()
-    perform_put.assert_called_once_with(object_key, file_path, 'private')
+    perform_put.assert_called_once_with(object_key, file_path, 'private', None)
     build_path.assert_called_once_with(path_style, object_key)
 
 
@@ -199,7 +199,7 @@ def test_put_object_do_check_upload_when_missing(
     assert return_value == object_path
 
     does_exist.assert_called_once_with(object_key)
-    perform_put.assert_called_once_with(object_key, file_path, 'private')
+    perform_put.assert_called_once_with(object_key, file_path, 'private', None)
     build_path.assert_called_once_with(path_style, object_key)
 
 
@@ -279,6 +279,73 @@ def test_does_object_exist_no(boto3_client):
     s3_client_stubber.assert_no_pending_responses()
 
 
+@patch('s3.boto3.client')
+def test_get_object_metadata(boto3_client):
+    s3_client = botocore.session.get_session().create_client('s3')
+    s3_client_stubber = Stubber(s3_client)
+    boto3_client.return_value = s3_client
+    object_key = "some"
+
+    s3_cls = S3(
+        'eu-west-1',
+        'some_bucket'
+    )
+    s3_client_stubber.add_response(
+        'head_object',
+        {'Metadata': {'some-key': 'some-value'}},
+        {'Bucket': s3_cls.bucket, 'Key': object_key},
+    )
+    s3_client_stubber.add_client_error(
+        'head_object',
+        expected_params={'Bucket': s3_cls.bucket, 'Key': object_key},
+        http_status_code=404,
+        service_error_code='404',
+    )
+    s3_client_stubber.add_client_error(
+        'head_object',
+        expected_params={'Bucket': s3_cls.bucket, 'Key': object_key},
+        http_status_code=403,
+        service_error_code='403',
+    )
+    s3_client_stubber.activate()
+
+    assert s3_cls.get_object_metadata(object_key) == {
+        'some-key': 'some-value',
+    }
+    assert s3_cls.get_object_metadata(object_key) is None
+    with raises(botocore.exceptions.ClientError):
+        s3_cls.get_object_metadata(object_key)
+
+    s3_client_stubber.assert_no_pending_responses()
+
+
+@patch('s3.boto3.resource')
+def test_perform_put_object_with_metadata(boto3_resource):
+    s3_resource = Mock()
+    s3_object = Mock()
+    s3_resource.Object.return_value = s3_object
+    boto3_resource.return_value = s3_resource
+
+    s3_cls = S3(
+        'eu-west-1',
+        'some_bucket',
+        'some-kms-key-arn',
+    )
+    with patch("builtins.open", mock_open(read_data='data')) as mock_file:
+        s3_cls._perform_put_object(
+            key="some",
+            file_path="some-file.json",
+            metadata={'some-key': 'some-value'},
+        )
+        s3_object.put.assert_called_once_with(
+            ACL='private',
+            Body=mock_file.return_value,
+            ServerSideEncryption='aws:kms',
+            SSEKMSKeyId='some-kms-key-arn',
+            Metadata={'some-key': 'some-value'},
+        )
+
+
 @patch('s3.boto3.resource')
 @patch('s3.LOGGER')
 def test_perform_put_object_success(logger, boto3_resource):
@@ -409,3 +476,48 @@ def test_perform_put_object_failed(logger, boto3_resource):
         exc_info=True,
     )
     boto3_resource.assert_called_with('s3', region_name='eu-west-1')
+
+
+def test_resolve_key_looks_one_level_up(eu_west_1_cls):
+    eu_west_1_cls.resource = Mock()
+    eu_west_1_cls.client = Mock()
+    eu_west_1_cls.client.exceptions.NoSuchKey = botocore.exceptions.ClientError
+    not_found = botocore.exceptions.ClientError(
+        {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}},
+        "GetObject",
+    )
+    eu_west_1_cls.resource.Object.return_value.get.side_effect = [
+        not_found,
+        None,
+    ]
+
+    assert eu_west_1_cls.resolve_key(
+        'adf-bootstrap/team/dev/regional.yml',
+    ) == 'adf-bootstrap/team/regional.yml'
+
+
+def test_fetch_s3_url_nothing_found(eu_west_1_cls):
+    with patch.object(eu_west_1_cls, 'resolve_key', return_value=None):
+        assert eu_west_1_cls.fetch_s3_url('adf-bootstrap/regional.yml') == []
+
+
+def test_fetch_s3_url(us_east_1_cls, eu_west_1_cls):
+    with patch.object(
+        us_east_1_cls,
+        'resolve_key',
+        return_value='adf-bootstrap/regional.yml',
+    ):
+        assert us_east_1_cls.fetch_s3_url(
+            'adf-bootstrap/team/regional.yml',
+        ) == 'https://s3.amazonaws.com/some_bucket/adf-bootstrap/regional.yml'
+    with patch.object(
+        eu_west_1_cls,
+        'resolve_key',
+        return_value='adf-bootstrap/regional.yml',
+    ):
+        assert eu_west_1_cls.fetch_s3_url(
+            'adf-bootstrap/team/regional.yml',
+        ) == (
+            'https://s3-eu-west-1.amazonaws.com/some_bucket/'
+            'adf-bootstrap/regional.yml'
+        )
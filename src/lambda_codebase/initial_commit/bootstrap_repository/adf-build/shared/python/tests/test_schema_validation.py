@@ -5,9 +5,16 @@
 Tests for schema validation
 """
 
+import copy
+import glob
+import json
+import os
+import re
 import unittest
+
+import yaml
 import schema_validation
-from schema import Schema
+from schema import Schema, SchemaError
 
 
 class NotificationSchemaValidationHappyPaths(unittest.TestCase):
@@ -248,3 +255,209 @@ class TargetSchemaValidationHappyPaths(unittest.TestCase):
             Schema(schema_validation.TARGET_SCHEMA).validate(target_schema),
             target_schema,
         )
+
+
+def _pipeline(**kwargs):
+    return {
+        "name": "some-pipeline",
+        "default_providers": {
+            "source": {
+                "provider": "codecommit",
+                "properties": {"account_id": "111111111111"},
+            },
+            "build": {
+                "provider": "codebuild",
+                "properties": {"image": "STANDARD_7_0"},
+            },
+        },
+        **kwargs,
+    }
+
+
+REPOSITORY_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), *[".."] * 8),
+)
+EXAMPLE_DEPLOYMENT_MAP_PATH = os.path.join(
+    REPOSITORY_ROOT,
+    "src/lambda_codebase/initial_commit/bootstrap_repository/adf-bootstrap",
+    "deployment/lambda_codebase/initial_commit/pipelines_repository",
+    "example-deployment_map.yml",
+)
+YAML_BLOCK_PATTERN = re.compile(r"```ya?ml\n(.*?)```", re.DOTALL)
+
+
+def _documented_deployment_maps():
+    """
+    Returns the deployment maps, and the lists of pipelines, that are
+    documented in the guides and samples, keyed by their file and line.
+    Most of these are excerpts, which need not be valid on their own.
+    """
+    maps = {}
+    for path in sorted(
+        glob.glob(os.path.join(REPOSITORY_ROOT, "docs", "*.md"))
+        + glob.glob(os.path.join(REPOSITORY_ROOT, "samples", "*", "*.md"))
+    ):
+        with open(path, encoding="utf-8") as stream:
+            text = stream.read()
+        for match in YAML_BLOCK_PATTERN.finditer(text):
+            try:
+                data = yaml.safe_load(match.group(1))
+            except yaml.YAMLError:
+                continue
+            if isinstance(data, list) and data and all(
+                isinstance(pipeline, dict) and "name" in pipeline
+                for pipeline in data
+            ):
+                data = {"pipelines": data}
+            if isinstance(data, dict) and "pipelines" in data:
+                line = text.count("\n", 0, match.start()) + 1
+                name = f"{os.path.relpath(path, REPOSITORY_ROOT)}:{line}"
+                maps[name] = data
+    return maps
+
+
+class CompiledSchemaValidation(unittest.TestCase):
+    def assert_same_as_schema_library(self, map_input):
+        expected = Schema(schema_validation.TOP_LEVEL_SCHEMA).validate(
+            copy.deepcopy(map_input)
+        )
+        validated = schema_validation.compiled_top_level_schema()(
+            copy.deepcopy(map_input)
+        )
+        self.assertEqual(validated, expected)
+        # The keys should be in the same order too
+        self.assertEqual(json.dumps(validated), json.dumps(expected))
+
+    def assert_same_error_as_schema_library(self, map_input):
+        with self.assertRaises(SchemaError) as expected:
+            Schema(schema_validation.TOP_LEVEL_SCHEMA).validate(map_input)
+        with self.assertRaises(SchemaError) as error:
+            schema_validation.SchemaValidation(map_input)
+        self.assertEqual(error.exception.code, expected.exception.code)
+
+    def assert_same_outcome_as_schema_library(self, map_input):
+        try:
+            Schema(schema_validation.TOP_LEVEL_SCHEMA).validate(
+                copy.deepcopy(map_input)
+            )
+        except SchemaError:
+            self.assert_same_error_as_schema_library(map_input)
+        else:
+            self.assert_same_as_schema_library(map_input)
+
+    def test_compiled_once(self):
+        self.assertIs(
+            schema_validation.compiled_top_level_schema(),
+            schema_validation.compiled_top_level_schema(),
+        )
+
+    def test_stub_deployment_map(self):
+        with open(
+            os.path.join(
+                os.path.dirname(__file__),
+                "stubs",
+                "stub_deployment_map.yml",
+            ),
+            encoding="utf-8",
+        ) as stream:
+            self.assert_same_as_schema_library(yaml.safe_load(stream))
+
+    def test_example_deployment_maps(self):
+        if not os.path.isdir(os.path.join(REPOSITORY_ROOT, "docs")):
+            self.skipTest("The documentation is not available")
+        maps = _documented_deployment_maps()
+        with open(EXAMPLE_DEPLOYMENT_MAP_PATH, encoding="utf-8") as stream:
+            maps["example-deployment_map.yml"] = yaml.safe_load(stream)
+        self.assertGreater(len(maps), 1)
+        for name, map_input in maps.items():
+            with self.subTest(deployment_map=name):
+                self.assert_same_outcome_as_schema_library(map_input)
+
+    def test_defaults(self):
+        map_input = {
+            "x-anchors": {"owner": "some-owner"},
+            "pipelines": [_pipeline(
+                params={"restart_execution_on_update": True},
+                targets=[
+                    "/some/ou",
+                    123456789012,
+                    ["/some/ou", 123456789012],
+                    {"path": "/some/ou"},
+                    {"tags": {"team": "some-team"}, "exclude": ["/other"]},
+                ],
+            )],
+        }
+        validated = schema_validation.SchemaValidation(map_input).validated
+        pipeline = validated["pipelines"][0]
+        self.assertEqual(pipeline["params"]["pipeline_type"], "default")
+        self.assertEqual(
+            pipeline["targets"][3],
+            {"path": "/some/ou", "exclude": [], "wave": {"size": 50}},
+        )
+        self.assert_same_as_schema_library(map_input)
+
+    def test_provider_dispatch(self):
+        providers = [
+            {
+                "source": {
+                    "provider": "s3",
+                    "properties": {
+                        "account_id": 111111111111,
+                        "bucket_name": "some-bucket",
+                        "object_key": "some-object.zip",
+                    },
+                },
+                "build": {"provider": "jenkins"},
+                "deploy": {
+                    "provider": "lambda",
+                    "properties": {"function_name": "some-function"},
+                },
+            },
+            {
+                "source": {
+                    "provider": "codeconnections",
+                    "properties": {
+                        "owner": "some-owner",
+                        "codeconnections_param_path": "/some/path",
+                    },
+                },
+                "build": {"enabled": False},
+                "deploy": {
+                    "provider": "codebuild",
+                    "properties": {"image": "STANDARD_7_0"},
+                },
+            },
+        ]
+        self.assert_same_as_schema_library({
+            "pipelines": [
+                _pipeline(default_providers=default_providers)
+                for default_providers in providers
+            ],
+        })
+
+    def test_same_errors_as_schema_library(self):
+        invalid_pipelines = [
+            _pipeline(name=""),
+            _pipeline(targets=[True]),
+            _pipeline(unknown_key="some-value"),
+            _pipeline(default_providers={
+                "source": {"provider": "codecommit"},
+                "build": {"provider": "jenkins", "enabled": "yes"},
+            }),
+            _pipeline(default_providers={
+                "source": {"provider": "github", "properties": {}},
+                "build": {"provider": "codebuild"},
+            }),
+            _pipeline(default_providers={
+                "source": {
+                    "provider": "codecommit",
+                    "properties": {"account_id": "not-an-account-id"},
+                },
+                "build": {"provider": "codebuild", "properties": {}},
+            }),
+        ]
+        for pipeline in invalid_pipelines:
+            with self.subTest(pipeline=pipeline):
+                self.assert_same_error_as_schema_library({
+                    "pipelines": [pipeline],
+                })
@@ -0,0 +1,379 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import boto3
+from botocore.stub import ANY, Stubber
+from pytest import fixture
+
+from semaphore import DynamoDBSemaphore, LocalSemaphore
+
+
+@fixture
+def dynamodb_semaphore():
+    semaphore = DynamoDBSemaphore(
+        "some_table",
+        boto3,
+        "eu-west-1",
+        default_limit=2,
+        clock=lambda: 1000,
+    )
+    stubber = Stubber(semaphore.client)
+    stubber.activate()
+    yield semaphore, stubber
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
+def _batch_get_item_response(items):
+    return {"Responses": {"some_table": items}}
+
+
+def test_local_semaphore_limits_holders_per_key():
+    semaphore = LocalSemaphore(default_limit=1, limits={"eu-west-1": 2})
+
+    assert semaphore.try_acquire("a", ["eu-west-1", "us-east-1"]) is True
+    assert semaphore.try_acquire("b", ["eu-west-1"]) is True
+    assert semaphore.try_acquire(
+        "c",
+        ["eu-west-1", "us-east-1"],
+        waiting_since="2024-01-01T00:00:00.000Z",
+    ) is False
+    assert semaphore.try_acquire("a", ["eu-west-1", "us-east-1"]) is True
+
+    state = semaphore.describe(["eu-west-1", "us-east-1"])
+    assert state["eu-west-1"] == {
+        "holders": {"a", "b"},
+        "waiting": {"c": "2024-01-01T00:00:00.000Z"},
+        "limit": 2,
+    }
+    assert state["us-east-1"] == {
+        "holders": {"a"},
+        "waiting": {"c": "2024-01-01T00:00:00.000Z"},
+        "limit": 1,
+    }
+
+
+def test_local_semaphore_release_admits_waiting_holder():
+    semaphore = LocalSemaphore(default_limit=1)
+    semaphore.try_acquire("a", ["eu-west-1"])
+    assert semaphore.try_acquire("b", ["eu-west-1"]) is False
+
+    semaphore.release("a", ["eu-west-1"])
+
+    assert semaphore.try_acquire("b", ["eu-west-1"]) is True
+    assert semaphore.describe(["eu-west-1"])["eu-west-1"] == {
+        "holders": {"b"},
+        "waiting": {},
+        "limit": 1,
+    }
+
+
+def test_local_semaphore_admits_waiting_holders_in_order():
+    semaphore = LocalSemaphore(default_limit=1)
+    semaphore.try_acquire("a", ["eu-west-1"])
+    assert semaphore.try_acquire(
+        "b",
+        ["eu-west-1"],
+        waiting_since="2024-01-01T00:00:00.000Z",
+    ) is False
+    assert semaphore.try_acquire(
+        "c",
+        ["eu-west-1"],
+        waiting_since="2024-01-01T00:05:00.000Z",
+    ) is False
+
+    semaphore.release("a", ["eu-west-1"])
+
+    # c retries first, but b has been waiting longer.
+    assert semaphore.try_acquire(
+        "c",
+        ["eu-west-1"],
+        waiting_since="2024-01-01T00:05:00.000Z",
+    ) is False
+    assert semaphore.try_acquire(
+        "b",
+        ["eu-west-1"],
+        waiting_since="2024-01-01T00:00:00.000Z",
+    ) is True
+    assert semaphore.describe(["eu-west-1"])["eu-west-1"]["waiting"] == {
+        "c": "2024-01-01T00:05:00.000Z",
+    }
+
+
+def test_local_semaphore_release_removes_waiting_holder():
+    semaphore = LocalSemaphore(default_limit=1)
+    semaphore.try_acquire("a", ["eu-west-1"])
+    semaphore.try_acquire("b", ["eu-west-1"])
+
+    semaphore.release("b", ["eu-west-1"])
+
+    assert semaphore.describe(["eu-west-1"])["eu-west-1"]["waiting"] == {}
+
+
+def test_local_semaphore_maintenance_claimed_once_per_interval():
+    now = [1000]
+    semaphore = LocalSemaphore(default_limit=1, clock=lambda: now[0])
+
+    assert semaphore.try_claim_maintenance("eu-west-1", 300) is True
+    assert semaphore.try_claim_maintenance("eu-west-1", 300) is False
+    now[0] = 1300
+    assert semaphore.try_claim_maintenance("eu-west-1", 300) is True
+
+
+def test_dynamodb_semaphore_acquires_all_keys_in_one_transaction(
+    dynamodb_semaphore,
+):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response(
+        "batch_get_item",
+        _batch_get_item_response([
+            {
+                "semaphore_key": {"S": "eu-west-1"},
+                "holders": {"SS": ["a"]},
+                "concurrency_limit": {"N": "5"},
+            },
+        ]),
+        {
+            "RequestItems": {
+                "some_table": {
+                    "Keys": [
+                        {"semaphore_key": {"S": "eu-west-1"}},
+                        {"semaphore_key": {"S": "us-east-1"}},
+                    ],
+                    "ConsistentRead": True,
+                },
+            },
+        },
+    )
+    stubber.add_response(
+        "transact_write_items",
+        {},
+        {"TransactItems": ANY},
+    )
+
+    assert semaphore.try_acquire("b", ["us-east-1", "eu-west-1"]) is True
+
+
+def test_dynamodb_semaphore_registers_waiting_when_full(dynamodb_semaphore):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response(
+        "batch_get_item",
+        _batch_get_item_response([
+            {
+                "semaphore_key": {"S": "eu-west-1"},
+                "holders": {"SS": ["a", "b"]},
+            },
+        ]),
+    )
+    stubber.add_response(
+        "update_item",
+        {},
+        {
+            "TableName": "some_table",
+            "Key": {"semaphore_key": {"S": "eu-west-1"}},
+            "UpdateExpression": "ADD #waiting :waiting",
+            "ExpressionAttributeNames": {"#waiting": "waiting"},
+            "ExpressionAttributeValues": {
+                ":waiting": {"SS": ["1970-01-01T00:16:40.000Z|c"]},
+            },
+        },
+    )
+
+    assert semaphore.try_acquire("c", ["eu-west-1"]) is False
+
+
+def test_dynamodb_semaphore_keeps_holders_waiting_longer_first(
+    dynamodb_semaphore,
+):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response(
+        "batch_get_item",
+        _batch_get_item_response([
+            {
+                "semaphore_key": {"S": "eu-west-1"},
+                "holders": {"SS": ["a"]},
+                "waiting": {"SS": ["2024-01-01T00:00:00.000Z|b"]},
+            },
+        ]),
+    )
+    stubber.add_response(
+        "update_item",
+        {},
+        {
+            "TableName": "some_table",
+            "Key": {"semaphore_key": {"S": "eu-west-1"}},
+            "UpdateExpression": "ADD #waiting :waiting",
+            "ExpressionAttributeNames": {"#waiting": "waiting"},
+            "ExpressionAttributeValues": {
+                ":waiting": {"SS": ["2024-01-01T00:05:00.000Z|c"]},
+            },
+        },
+    )
+
+    assert semaphore.try_acquire(
+        "c",
+        ["eu-west-1"],
+        waiting_since="2024-01-01T00:05:00.000Z",
+    ) is False
+
+
+def test_dynamodb_semaphore_acquire_removes_waiting_entry(
+    dynamodb_semaphore,
+):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response(
+        "batch_get_item",
+        _batch_get_item_response([
+            {
+                "semaphore_key": {"S": "eu-west-1"},
+                "holders": {"SS": ["a"]},
+                "waiting": {
+                    "SS": [
+                        "2024-01-01T00:00:00.000Z|b",
+                        "2024-01-01T00:05:00.000Z|c",
+                    ],
+                },
+            },
+        ]),
+    )
+    stubber.add_response(
+        "transact_write_items",
+        {},
+        {
+            "TransactItems": [
+                {
+                    "Update": {
+                        "TableName": "some_table",
+                        "Key": {"semaphore_key": {"S": "eu-west-1"}},
+                        "UpdateExpression": (
+                            "ADD #holders :holder DELETE #waiting :waiting"
+                        ),
+                        "ConditionExpression": ANY,
+                        "ExpressionAttributeNames": ANY,
+                        "ExpressionAttributeValues": {
+                            ":holder": {"SS": ["b"]},
+                            ":waiting": {
+                                "SS": ["2024-01-01T00:00:00.000Z|b"],
+                            },
+                            ":holder_name": {"S": "b"},
+                            ":limit": {"N": "2"},
+                        },
+                    },
+                },
+            ],
+        },
+    )
+
+    assert semaphore.try_acquire(
+        "b",
+        ["eu-west-1"],
+        waiting_since="2024-01-01T00:00:00.000Z",
+    ) is True
+
+
+def test_dynamodb_semaphore_release_removes_waiting_entry(dynamodb_semaphore):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response(
+        "batch_get_item",
+        _batch_get_item_response([
+            {
+                "semaphore_key": {"S": "eu-west-1"},
+                "holders": {"SS": ["a"]},
+                "waiting": {"SS": ["2024-01-01T00:00:00.000Z|b"]},
+            },
+        ]),
+    )
+    stubber.add_response(
+        "update_item",
+        {},
+        {
+            "TableName": "some_table",
+            "Key": {"semaphore_key": {"S": "eu-west-1"}},
+            "UpdateExpression": "DELETE #holders :holder, #waiting :waiting",
+            "ExpressionAttributeNames": {
+                "#holders": "holders",
+                "#waiting": "waiting",
+            },
+            "ExpressionAttributeValues": {
+                ":holder": {"SS": ["b"]},
+                ":waiting": {"SS": ["2024-01-01T00:00:00.000Z|b"]},
+            },
+        },
+    )
+
+    semaphore.release("b", ["eu-west-1"])
+
+
+def test_dynamodb_semaphore_registers_waiting_when_taken_concurrently(
+    dynamodb_semaphore,
+):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response("batch_get_item", _batch_get_item_response([]))
+    stubber.add_client_error(
+        "transact_write_items",
+        service_error_code="TransactionCanceledException",
+    )
+    stubber.add_response("update_item", {})
+
+    assert semaphore.try_acquire("c", ["eu-west-1"]) is False
+
+
+def test_dynamodb_semaphore_describe(dynamodb_semaphore):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response(
+        "batch_get_item",
+        _batch_get_item_response([
+            {
+                "semaphore_key": {"S": "eu-west-1"},
+                "holders": {"SS": ["a"]},
+                "waiting": {
+                    "SS": [
+                        "2024-01-01T00:00:00.000Z|b",
+                        "2024-01-01T00:05:00.000Z|c",
+                    ],
+                },
+            },
+        ]),
+    )
+
+    assert semaphore.describe(["eu-west-1", "us-east-1"]) == {
+        "eu-west-1": {
+            "holders": {"a"},
+            "waiting": {
+                "b": "2024-01-01T00:00:00.000Z",
+                "c": "2024-01-01T00:05:00.000Z",
+            },
+            "limit": 2,
+        },
+        "us-east-1": {"holders": set(), "waiting": {}, "limit": 2},
+    }
+
+
+def test_dynamodb_semaphore_maintenance_claim(dynamodb_semaphore):
+    semaphore, stubber = dynamodb_semaphore
+    stubber.add_response(
+        "update_item",
+        {},
+        {
+            "TableName": "some_table",
+            "Key": {"semaphore_key": {"S": "eu-west-1"}},
+            "UpdateExpression": "SET #claimed_at = :now",
+            "ConditionExpression": ANY,
+            "ExpressionAttributeNames": {
+                "#claimed_at": "maintenance_claimed_at",
+            },
+            "ExpressionAttributeValues": {
+                ":now": {"N": "1000"},
+                ":threshold": {"N": "700"},
+            },
+        },
+    )
+    stubber.add_client_error(
+        "update_item",
+        service_error_code="ConditionalCheckFailedException",
+    )
+
+    assert semaphore.try_claim_maintenance("eu-west-1", 300) is True
+    assert semaphore.try_claim_maintenance("eu-west-1", 300) is False
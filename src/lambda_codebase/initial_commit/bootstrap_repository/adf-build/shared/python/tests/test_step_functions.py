@@ -4,11 +4,12 @@
 # pylint: skip-file
 
 import os
+from datetime import datetime, timezone
 import boto3
 from pytest import fixture, raises
 from stubs import stub_step_functions
-from mock import Mock
-from stepfunctions import StepFunctions
+from mock import Mock, patch, call
+from stepfunctions import ExecutionWatcher, StepFunctions
 
 
 @fixture
@@ -48,3 +49,95 @@ def test_wait_failed_state_machine_execution(cls):
     assert cls._execution_status == 'FAILED'
     with raises(Exception):
         cls._wait_state_machine_execution()
+
+
+def _execution(name, status, start_timestamp):
+    return {
+        'executionArn': f'arn:aws:states:eu-central-1:111111111111:execution:sfn:{name}',
+        'name': name,
+        'status': status,
+        'startDate': datetime.fromtimestamp(start_timestamp, tz=timezone.utc),
+    }
+
+
+def test_watcher_track_executions_stops_at_older_pages():
+    client = Mock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {'executions': [
+            _execution('new-running', 'RUNNING', 2000),
+            _execution('new-failed', 'FAILED', 1500),
+        ]},
+        {'executions': [
+            _execution('old-failed', 'FAILED', 500),
+        ]},
+        # Should never be reached
+        None,
+    ]
+    watcher = ExecutionWatcher(client)
+    watcher.track_executions_started_after('sfn', started_after=1000)
+    assert list(watcher.running_executions) == [
+        _execution('new-running', 'RUNNING', 0)['executionArn'],
+    ]
+    assert watcher.failed_executions() == [
+        _execution('new-failed', 'FAILED', 0)['executionArn'],
+    ]
+
+
+def test_watcher_track_executions_with_filter():
+    client = Mock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {'executions': [
+            _execution('match-running', 'RUNNING', 2000),
+            _execution('other-running', 'RUNNING', 2000),
+        ]},
+    ]
+    watcher = ExecutionWatcher(client)
+    watcher.track_running_executions(
+        'sfn',
+        filter_lambda=lambda item: item['name'].startswith('match'),
+    )
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        stateMachineArn='sfn',
+        statusFilter='RUNNING',
+    )
+    assert list(watcher.running_executions) == [
+        _execution('match-running', 'RUNNING', 0)['executionArn'],
+    ]
+
+
+@patch('stepfunctions.sleep')
+def test_watcher_wait_backs_off_until_finished(sleep_mock):
+    client = Mock()
+    client.describe_execution.side_effect = [
+        {'status': 'RUNNING'},
+        {'status': 'RUNNING'},
+        {'status': 'SUCCEEDED'},
+    ]
+    watcher = ExecutionWatcher(
+        client,
+        initial_delay=5,
+        max_delay=15,
+        backoff_factor=2,
+    )
+    watcher.track_execution('some_execution_arn')
+    watcher.wait()
+    assert sleep_mock.call_args_list == [call(5), call(10), call(15)]
+    assert watcher.running_executions == {}
+    assert watcher.finished_executions == {
+        'some_execution_arn': 'SUCCEEDED',
+    }
+    assert watcher.failed_executions() == []
+
+
+@patch('stepfunctions.sleep')
+def test_wait_running_state_machine_execution_fails(sleep_mock, cls):
+    cls.execution_arn = 'some_execution_arn'
+    cls.execution_status = 'RUNNING'
+    cls.client.describe_execution.side_effect = [
+        {'status': 'RUNNING'},
+        {'status': 'TIMED_OUT'},
+    ]
+    with raises(AssertionError):
+        cls._wait_state_machine_execution()
+    assert cls.execution_status == 'TIMED_OUT'
+    assert sleep_mock.call_count == 2
@@ -532,3 +532,46 @@ def test_assume_bootstrap_deployment_role_deployment_access_denied_too(
         ),
     ])
     assert jump_session_sts_client.assume_role.call_count == 2
+
+
+@patch("sts.boto3")
+@patch("sts.LOGGER")
+def test_assume_bootstrap_deployment_role_reuses_jump_role(logger, boto_mock):
+    root_sts_client = build_mocked_sts_client_success('-jump')
+    jump_session_mock = Mock()
+    deploy_session_mock = Mock()
+    boto_mock.Session.side_effect = [
+        jump_session_mock,
+        deploy_session_mock,
+        deploy_session_mock,
+    ]
+
+    jump_session_sts_client = build_mocked_sts_client_success('-privileged')
+    jump_session_mock.client.return_value = jump_session_sts_client
+
+    sts = STS(root_sts_client)
+    jump_role_sts = sts.assume_jump_role(
+        "aws",
+        '999999999999',
+        "test-session",
+    )
+    for account_id in ["111111111111", "222222222222"]:
+        session = sts.assume_bootstrap_deployment_role(
+            "aws",
+            '999999999999',
+            account_id,
+            "test-privileged-role",
+            "test-session",
+            jump_role_sts=jump_role_sts,
+        )
+        assert session == deploy_session_mock
+
+    root_sts_client.assume_role.assert_called_once_with(
+        RoleArn=STS._build_role_arn(
+            "aws",
+            '999999999999',
+            ADF_JUMP_ROLE_NAME,
+        ),
+        RoleSessionName="test-session",
+    )
+    assert jump_session_sts_client.assume_role.call_count == 2
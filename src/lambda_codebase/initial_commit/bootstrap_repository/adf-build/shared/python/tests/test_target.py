@@ -4,13 +4,14 @@
 # pylint: skip-file
 
 import os
+import time
 import boto3
 from errors import InvalidDeploymentMapError
 from pytest import fixture, raises
 from mock import Mock, patch,call
 from .stubs import stub_target
 from ..target import Target, TargetStructure
-from ..target import TooManyActionsError
+from ..target import TooManyActionsError, resolve_targets
 from parameter_store import ParameterStore
 
 
@@ -611,3 +612,78 @@ def test_target_wave_structure_respects_exclude_config():
                     "step_name": "",
                 },
             ]
+
+
+class MockSlowOrgClient:
+    def __init__(self, accounts_per_path, delays) -> None:
+        self.accounts_per_path = accounts_per_path
+        self.delays = delays
+
+    def get_accounts_in_path(
+        self, path, ou_id, resolve_children=False, excluded_paths=[]
+    ):
+        time.sleep(self.delays.get(path, 0))
+        if path not in self.accounts_per_path:
+            raise InvalidDeploymentMapError(f"Unknown path {path}")
+        return self.accounts_per_path[path]
+
+
+def _create_targets(target_structure, organizations):
+    return [
+        Target(
+            path=path,
+            target_structure=target_structure,
+            organizations=organizations,
+            step={**step, "regions": ["region1"]},
+            allow_empty_target=False,
+        )
+        for step in target_structure.target
+        for path in step["path"]
+    ]
+
+
+def test_resolve_targets_preserves_order():
+    target_structure = TargetStructure(
+        target={"path": ["/slow", "/fast"]},
+    )
+    organizations = MockSlowOrgClient(
+        {
+            "/slow": [
+                {"Name": "slow-1", "Id": "1", "Status": "ACTIVE"},
+                {"Name": "slow-2", "Id": "2", "Status": "ACTIVE"},
+            ],
+            "/fast": [
+                {"Name": "fast-3", "Id": "3", "Status": "ACTIVE"},
+            ],
+        },
+        delays={"/slow": 0.2},
+    )
+    targets = _create_targets(target_structure, organizations)
+
+    resolve_targets(targets)
+
+    assert [
+        account["name"]
+        for account in target_structure.account_list
+    ] == ["slow-1", "slow-2", "fast-3"]
+
+
+def test_resolve_targets_raises_after_all_targets_resolved():
+    target_structure = TargetStructure(
+        target={"path": ["/unknown", "/fast"]},
+    )
+    organizations = MockSlowOrgClient(
+        {
+            "/fast": [
+                {"Name": "fast-3", "Id": "3", "Status": "ACTIVE"},
+            ],
+        },
+        delays={},
+    )
+    targets = _create_targets(target_structure, organizations)
+
+    with raises(InvalidDeploymentMapError):
+        resolve_targets(targets)
+
+    assert targets[1].accounts[0]["name"] == "fast-3"
+    assert target_structure.account_list == []
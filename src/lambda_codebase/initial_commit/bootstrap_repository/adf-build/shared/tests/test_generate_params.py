@@ -8,8 +8,10 @@ import json
 import os
 
 from pytest import fixture, mark
+from botocore.exceptions import ClientError
 from mock import Mock, patch
 from generate_params import Parameters
+from pipeline_definition import serialize_definition
 from parameter_store import ParameterStore
 from cloudformation import CloudFormation
 from sts import STS
@@ -110,13 +112,13 @@ def input_definition_targets(
 def cls():
     parameter_store = Mock()
     definition_s3 = Mock()
-    definition_s3.read_object.return_value = json.dumps({
+    definition_s3.read_object_bytes.return_value = json.dumps({
         'pipeline_input': {
             'environments': {
                 'targets': [],
             }
         }
-    })
+    }).encode("utf-8")
     parameter_store.fetch_parameter.return_value = str({})
     parameters = Parameters(
         build_name='some_name',
@@ -148,13 +150,13 @@ def test_retrieve_pipeline_targets_empty(cls):
 
 
 def test_retrieve_pipeline_targets(cls, input_definition_targets):
-    cls.definition_s3.read_object.return_value = json.dumps({
+    cls.definition_s3.read_object_bytes.return_value = json.dumps({
         'pipeline_input': {
             'environments': {
                 'targets': input_definition_targets,
             }
         }
-    })
+    }).encode("utf-8")
     targets = cls._retrieve_pipeline_targets()
     assert targets['111111111111'] == {
         'id': '111111111111',
@@ -201,6 +203,51 @@ def test_parse(cls, file, to_file, ext):
     }
 
 
+def test_retrieve_pipeline_targets_compact_definition(
+    cls,
+    input_definition_targets,
+):
+    cls.definition_s3.read_object_bytes.return_value = serialize_definition({
+        'pipeline_input': {
+            'name': 'some_name',
+            'environments': {
+                'targets': input_definition_targets,
+            },
+        },
+    })
+    targets = cls._retrieve_pipeline_targets()
+    cls.definition_s3.read_object_bytes.assert_called_once_with(
+        'pipelines/some_name/definition.json.gz',
+    )
+    assert targets['222222222222'] == {
+        'id': '222222222222',
+        'account_name': 'account_name2',
+        'path': '/two/path',
+        'regions': sorted(['eu-west-2', 'eu-south-1', 'us-west-2']),
+    }
+
+
+def test_retrieve_pipeline_definition_legacy_fallback(cls):
+    legacy_definition = {
+        'pipeline_input': {
+            'environments': {
+                'targets': [],
+            },
+        },
+    }
+    cls.definition_s3.read_object_bytes.side_effect = [
+        ClientError(
+            {'Error': {'Code': 'NoSuchKey', 'Message': 'Not found'}},
+            'GetObject',
+        ),
+        json.dumps(legacy_definition).encode('utf-8'),
+    ]
+    assert cls._retrieve_pipeline_definition() == legacy_definition
+    cls.definition_s3.read_object_bytes.assert_called_with(
+        'pipelines/some_name/definition.json',
+    )
+
+
 def test_parse_not_found(cls):
     parse = cls._parse(
         cls.cwd,
@@ -282,13 +329,13 @@ def test_merge_params_with_preset(cls):
 
 
 def test_create_parameter_files(cls, input_definition_targets):
-    cls.definition_s3.read_object.return_value = json.dumps({
+    cls.definition_s3.read_object_bytes.return_value = json.dumps({
         'pipeline_input': {
             'environments': {
                 'targets': input_definition_targets,
             }
         }
-    })
+    }).encode("utf-8")
     with patch.object(
         ParameterStore,
         'fetch_parameter',
@@ -308,13 +355,13 @@ def test_create_parameter_files(cls, input_definition_targets):
 
 
 def test_ensure_parameter_default_contents(cls, input_definition_targets):
-    cls.definition_s3.read_object.return_value = json.dumps({
+    cls.definition_s3.read_object_bytes.return_value = json.dumps({
         'pipeline_input': {
             'environments': {
                 'targets': input_definition_targets,
             }
         }
-    })
+    }).encode("utf-8")
     shutil.copy(
         f"{cls.cwd}/stub_cfn_global.json",
         f"{cls.cwd}/params/global.json",
@@ -344,13 +391,13 @@ def test_ensure_parameter_default_contents(cls, input_definition_targets):
 
 
 def test_using_deprecated_input_attribute_key(cls, input_definition_targets):
-    cls.definition_s3.read_object.return_value = json.dumps({
+    cls.definition_s3.read_object_bytes.return_value = json.dumps({
         'input': {
             'environments': {
                 'targets': input_definition_targets,
             }
         }
-    })
+    }).encode("utf-8")
     shutil.copy(
         f"{cls.cwd}/stub_cfn_global.json",
         f"{cls.cwd}/params/global.json",
@@ -385,7 +432,7 @@ def test_ensure_parameter_overrides(
     input_wave_target_one_north,
     input_wave_target_two
 ):
-    cls.definition_s3.read_object.return_value = json.dumps({
+    cls.definition_s3.read_object_bytes.return_value = json.dumps({
         'pipeline_input': {
             'environments': {
                 'targets': [
@@ -405,7 +452,7 @@ def test_ensure_parameter_overrides(
                 ]
             }
         }
-    })
+    }).encode("utf-8")
     os.mkdir(f'{cls.cwd}/params/one')
     shutil.copy(
         f"{cls.cwd}/stub_cfn_global.json",
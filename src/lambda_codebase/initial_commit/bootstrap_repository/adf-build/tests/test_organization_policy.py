@@ -0,0 +1,173 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import ast
+import json
+
+from pytest import fixture
+from mock import Mock, call
+
+from errors import ParameterNotFoundError
+from organization_policy import OrganizationPolicy
+from organizations import OrganizationsException
+
+SCP = {"Version": "2012-10-17", "Statement": []}
+
+
+@fixture
+def bootstrap_dir(tmp_path, monkeypatch):
+    (tmp_path / "adf-bootstrap" / "banking" / "dev").mkdir(parents=True)
+    (tmp_path / "adf-bootstrap" / "deployment").mkdir(parents=True)
+    for path in ["banking/dev/scp.json", "deployment/scp.json"]:
+        (tmp_path / "adf-bootstrap" / path).write_text(json.dumps(SCP))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@fixture
+def organizations():
+    organizations = Mock()
+    organizations.get_organization_info.return_value = {"feature_set": "ALL"}
+    organizations.get_policy_target_id.side_effect = lambda path: f"ou-{path}"
+    organizations.describe_policy_id_for_target.return_value = []
+    organizations.create_policy.side_effect = (
+        lambda content, path, policy_type: f"p-{path}"
+    )
+    organizations.client.exceptions.DuplicatePolicyAttachmentException = (
+        KeyError
+    )
+    organizations.client.exceptions.DuplicatePolicyException = KeyError
+    return organizations
+
+
+def _parameter_store(stored_values):
+    parameter_store = Mock()
+
+    def fetch_parameter(name):
+        if name not in stored_values:
+            raise ParameterNotFoundError(name)
+        return stored_values[name]
+
+    parameter_store.fetch_parameter.side_effect = fetch_parameter
+    parameter_store.put_parameter.side_effect = (
+        lambda name, value: stored_values.__setitem__(name, value)
+    )
+    return parameter_store
+
+
+def test_apply_creates_new_policies(bootstrap_dir, organizations):
+    stored_values = {}
+    parameter_store = _parameter_store(stored_values)
+
+    OrganizationPolicy().apply(organizations, parameter_store, {})
+
+    organizations.create_policy.assert_has_calls([
+        call(json.dumps(SCP, separators=(',', ':')), "banking/dev", "SERVICE_CONTROL_POLICY"),
+        call(json.dumps(SCP, separators=(',', ':')), "deployment", "SERVICE_CONTROL_POLICY"),
+    ], any_order=True)
+    organizations.attach_policy.assert_has_calls([
+        call("p-banking/dev", "ou-banking/dev"),
+        call("p-deployment", "ou-deployment"),
+    ], any_order=True)
+    organizations.get_organization_map.assert_not_called()
+    stored_scps = ast.literal_eval(stored_values["scp"])
+    assert sorted(stored_scps) == [
+        "./banking/dev/scp.json",
+        "./deployment/scp.json",
+    ]
+    assert ast.literal_eval(stored_values["tagging_policy"]) == {}
+
+
+def test_apply_skips_unchanged_policies(bootstrap_dir, organizations):
+    stored_values = {}
+    OrganizationPolicy().apply(organizations, _parameter_store(stored_values), {})
+    organizations.reset_mock()
+
+    parameter_store = _parameter_store(stored_values)
+    OrganizationPolicy().apply(organizations, parameter_store, {})
+
+    organizations.enable_organization_policies.assert_not_called()
+    organizations.get_policy_target_id.assert_not_called()
+    organizations.describe_policy_id_for_target.assert_not_called()
+    parameter_store.put_parameter.assert_not_called()
+
+
+def test_apply_only_touches_changed_policies(bootstrap_dir, organizations):
+    stored_values = {}
+    OrganizationPolicy().apply(organizations, _parameter_store(stored_values), {})
+    organizations.reset_mock()
+    organizations.describe_policy_id_for_target.return_value = "p-deployment"
+    organizations.describe_policy.return_value = {"Content": "{}"}
+    (bootstrap_dir / "adf-bootstrap" / "deployment" / "scp.json").write_text(
+        json.dumps({**SCP, "Statement": [{"Effect": "Deny"}]}),
+    )
+
+    OrganizationPolicy().apply(organizations, _parameter_store(stored_values), {})
+
+    organizations.get_policy_target_id.assert_called_once_with("deployment")
+    organizations.update_policy.assert_called_once()
+    assert organizations.update_policy.call_args.args[1] == "p-deployment"
+
+
+def test_apply_removes_deleted_policies(bootstrap_dir, organizations):
+    stored_values = {}
+    OrganizationPolicy().apply(organizations, _parameter_store(stored_values), {})
+    organizations.reset_mock()
+    organizations.describe_policy_id_for_target.return_value = "p-banking/dev"
+    (bootstrap_dir / "adf-bootstrap" / "banking" / "dev" / "scp.json").unlink()
+
+    OrganizationPolicy().apply(organizations, _parameter_store(stored_values), {})
+
+    organizations.get_policy_target_id.assert_called_once_with("banking/dev")
+    organizations.detach_policy.assert_called_once_with(
+        "p-banking/dev",
+        "ou-banking/dev",
+    )
+    organizations.delete_policy.assert_called_once_with("p-banking/dev")
+    assert list(ast.literal_eval(stored_values["scp"])) == ["./deployment/scp.json"]
+
+
+def test_apply_reapplies_policies_stored_without_hashes(
+    bootstrap_dir,
+    organizations,
+):
+    stored_values = {
+        "scp": str(["./deployment/scp.json", "./old/scp.json"]),
+        "tagging_policy": str([]),
+    }
+    organizations.get_policy_target_id.side_effect = lambda path: (
+        (_ for _ in ()).throw(OrganizationsException(path))
+        if path == "old" else f"ou-{path}"
+    )
+
+    OrganizationPolicy().apply(organizations, _parameter_store(stored_values), {})
+
+    organizations.get_policy_target_id.assert_has_calls([
+        call("old"),
+        call("banking/dev"),
+        call("deployment"),
+    ], any_order=True)
+    organizations.delete_policy.assert_not_called()
+    assert sorted(ast.literal_eval(stored_values["scp"])) == [
+        "./banking/dev/scp.json",
+        "./deployment/scp.json",
+    ]
+
+
+def test_apply_keep_default_scp_change_is_applied(bootstrap_dir, organizations):
+    stored_values = {}
+    OrganizationPolicy().apply(organizations, _parameter_store(stored_values), {})
+    organizations.reset_mock()
+
+    OrganizationPolicy().apply(
+        organizations,
+        _parameter_store(stored_values),
+        {"scp": {"keep-default-scp": "enabled"}},
+    )
+
+    organizations.attach_policy.assert_has_calls([
+        call("p-FullAWSAccess", "ou-banking/dev"),
+        call("p-FullAWSAccess", "ou-deployment"),
+    ], any_order=True)
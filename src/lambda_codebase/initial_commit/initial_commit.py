@@ -7,8 +7,11 @@ initial bootstrap repository content.
 """
 
 import os
+import hashlib
 import logging
-from typing import Mapping, Optional, Union, List, Dict, Any, Tuple
+from typing import (
+    Mapping, Optional, Union, List, Dict, Any, Tuple, Iterator, Set,
+)
 from dataclasses import dataclass, fields
 from enum import Enum
 from pathlib import Path
@@ -42,14 +45,22 @@ REWRITE_PATHS: Dict[str, str] = {
     "adf.yml.j2": "adf-accounts/adf.yml",
     "adfconfig.yml.j2": "adfconfig.yml",
 }
+# CodeCommit allows up to 100 files per commit, while the file contents
+# are sent base64 encoded in a request that is limited to 6 MB.
+MAX_FILES_PER_COMMIT = 99
+MAX_BYTES_PER_COMMIT = 4 * 1024 * 1024
+READ_BLOCK_SIZE = 64 * 1024
 EXECUTABLE_FILES: List[str] = [
+    "adf-build/shared/helpers/package_transform.py",
     "adf-build/shared/helpers/package_transform.sh",
     "adf-build/shared/helpers/retrieve_organization_accounts.py",
     "adf-build/shared/helpers/sync_to_s3.py",
     "adf-build/shared/helpers/sts.sh",
+    "adf-build/shared/helpers/terraform/adf_terraform.py",
     "adf-build/shared/helpers/terraform/adf_terraform.sh",
     "adf-build/shared/helpers/terraform/install_terraform.sh",
 ]
+EXECUTABLE_FILES_SET: Set[str] = set(EXECUTABLE_FILES)
 
 ADF_LOG_LEVEL = os.environ.get("ADF_LOG_LEVEL", "INFO")
 logging.basicConfig(level=logging.INFO)
@@ -140,6 +151,20 @@ class FileMode(Enum):
     SYMLINK = "SYMLINK"
 
 
+# The git file modes as returned in the blob metadata by CodeCommit.
+GIT_FILE_MODES: Dict[FileMode, str] = {
+    FileMode.EXECUTABLE: "100755",
+    FileMode.NORMAL: "100644",
+    FileMode.SYMLINK: "120000",
+}
+
+
+@dataclass
+class ExistingBlob:
+    blobId: Optional[str]
+    mode: Optional[str]
+
+
 @dataclass
 class FileToCommit:
     filePath: str
@@ -210,6 +235,41 @@ def chunks(list_to_chunk, number_to_chunk_into):
     )
 
 
+def chunk_files(
+    files_to_commit: List[FileToCommit],
+    max_files: int = MAX_FILES_PER_COMMIT,
+    max_bytes: int = MAX_BYTES_PER_COMMIT,
+) -> Iterator[List[FileToCommit]]:
+    """
+    Split the files in segments that fit in a single commit.
+
+    Args:
+        files_to_commit (FileToCommit[]): The files to split into chunks.
+        max_files (int): The number of files per chunk that is allowed max.
+        max_bytes (int): The combined size of the file contents per chunk
+            that is allowed max. A file that exceeds this size by itself is
+            put in a chunk of its own.
+
+    Returns:
+        generator(FileToCommit[]): The chunks of the files_to_commit.
+    """
+    chunk: List[FileToCommit] = []
+    chunk_bytes = 0
+    for file_to_commit in files_to_commit:
+        file_bytes = len(file_to_commit.fileContent)
+        if chunk and (
+            len(chunk) >= max_files
+            or chunk_bytes + file_bytes > max_bytes
+        ):
+            yield chunk
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(file_to_commit)
+        chunk_bytes += file_bytes
+    if chunk:
+        yield chunk
+
+
 def generate_commit_input(
     repo_name,
     version,
@@ -319,9 +379,15 @@ def generate_commits(event, repo_name, directory, parent_commit_id=None):
     else:
         branch_name = default_branch_name
 
-    # CodeCommit only allows 100 files per commit, so we chunk them up here
-    files_to_commit = get_files_to_commit(directory_path)
     create_first_branch = parent_commit_id is None
+    # Only the files that differ from the branch we build upon need to be
+    # committed, these are determined by comparing their git blob ids.
+    existing_blobs = (
+        {}
+        if create_first_branch
+        else get_existing_blobs(repo_name, parent_commit_id)
+    )
+    files_to_commit = get_files_to_commit(directory_path, existing_blobs)
 
     if create_first_branch and directory == "bootstrap_repository":
         adf_config = create_adf_config_file(
@@ -355,10 +421,11 @@ def generate_commits(event, repo_name, directory, parent_commit_id=None):
         files_to_commit.append(initial_sample_global_iam)
         files_to_commit.append(initial_deploy_sample_global_iam)
 
-    chunked_files = chunks([f.as_dict() for f in files_to_commit], 99)
+    # CodeCommit limits the number of files and their size per commit,
+    # so we chunk them up here
     commit_id = parent_commit_id
     commits_created = []
-    for index, files in enumerate(chunked_files):
+    for index, files in enumerate(chunk_files(files_to_commit)):
         try:
             commit_id = CC_CLIENT.create_commit(
                 **generate_commit_input(
@@ -366,7 +433,7 @@ def generate_commits(event, repo_name, directory, parent_commit_id=None):
                     version,
                     index,
                     branch_name,
-                    puts=files,
+                    puts=[f.as_dict() for f in files],
                     parent_commit_id=commit_id,
                 )
             )["commitId"]
@@ -380,9 +447,16 @@ def generate_commits(event, repo_name, directory, parent_commit_id=None):
     if not create_first_branch:
         # If the branch exists already with files inside, we may need to
         # check which of these files should be deleted:
-        files_to_delete = get_files_to_delete(repo_name, directory_path)
+        files_to_delete = get_files_to_delete(
+            repo_name,
+            directory_path,
+            existing_blobs,
+        )
         for index, deletes in enumerate(
-            chunks([f.as_dict() for f in files_to_delete], 99)
+            chunks(
+                [f.as_dict() for f in files_to_delete],
+                MAX_FILES_PER_COMMIT,
+            )
         ):
             try:
                 commit_id = CC_CLIENT.create_commit(**generate_commit_input(
@@ -497,36 +571,54 @@ def repo_arn_to_name(repo_arn: str) -> str:
     return repo_arn.split(":")[-1]
 
 
-def get_files_to_delete(
+def get_existing_blobs(
     repo_name: str,
-    directory_path: Path,
-) -> List[FileToDelete]:
+    commit_specifier: str = 'HEAD',
+) -> Dict[str, ExistingBlob]:
+    """
+    Get the blobs of all files in the repository at the given commit.
+
+    Returns:
+        dict(str, ExistingBlob): The blob id and file mode of every file,
+            keyed by the path of the file.
+    """
     paginator = CC_CLIENT.get_paginator('get_differences')
     page_iterator = paginator.paginate(
         repositoryName=repo_name,
-        afterCommitSpecifier='HEAD',
+        afterCommitSpecifier=commit_specifier,
     )
-    unfiltered_file_paths = []
+    existing_blobs = {}
     for page in page_iterator:
-        unfiltered_file_paths.extend(list(
-            map(
-                lambda obj: Path(obj['afterBlob']['path']),
-                page['differences'],
-            ),
-        ))
+        for difference in page['differences']:
+            after_blob = difference['afterBlob']
+            existing_blobs[after_blob['path']] = ExistingBlob(
+                after_blob.get('blobId'),
+                after_blob.get('mode'),
+            )
+    return existing_blobs
 
-    file_paths = list(filter(
+
+def get_files_to_delete(
+    repo_name: str,
+    directory_path: Path,
+    existing_blobs: Optional[Dict[str, ExistingBlob]] = None,
+) -> List[FileToDelete]:
+    if existing_blobs is None:
+        existing_blobs = get_existing_blobs(repo_name)
+
+    file_paths = [
+        Path(path)
+        for path in existing_blobs
         # We never want to delete JSON or YAML files
-        lambda path: not CONFIG_FILE_REGEX.match(str(path)),
-        unfiltered_file_paths,
-    ))
+        if not CONFIG_FILE_REGEX.match(path)
+    ]
 
-    blobs = [
+    blobs = {
         # Get the paths relative to the directory path so we can compare them
         # correctly.
         str(filename.relative_to(directory_path))
         for filename in directory_path.rglob('*')
-    ]
+    }
 
     return [
         FileToDelete(
@@ -539,25 +631,76 @@ def get_files_to_delete(
 
 
 def determine_file_mode(entry: Path, directory_path: Path) -> FileMode:
-    if str(entry.relative_to(directory_path)) in EXECUTABLE_FILES:
+    if str(entry.relative_to(directory_path)) in EXECUTABLE_FILES_SET:
         return FileMode.EXECUTABLE
 
     return FileMode.NORMAL
 
 
-def get_files_to_commit(directory_path: Path) -> List[FileToCommit]:
-    return [
-        FileToCommit(
-            str(entry.relative_to(directory_path)),
-            determine_file_mode(
-                entry,
-                directory_path,
-            ),
-            entry.read_bytes(),
+def git_blob_id(entry: Path) -> str:
+    """
+    Calculate the git blob id of the file, as git and CodeCommit would.
+    The file is read in blocks, so it is not loaded in memory at once.
+    """
+    digest = hashlib.sha1(
+        f"blob {entry.stat().st_size}\0".encode(),
+        usedforsecurity=False,
+    )
+    with open(entry, mode="rb") as file:
+        for block in iter(lambda: file.read(READ_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_unchanged(
+    entry: Path,
+    file_mode: FileMode,
+    existing_blob: Optional[ExistingBlob],
+) -> bool:
+    return (
+        existing_blob is not None
+        and existing_blob.mode == GIT_FILE_MODES[file_mode]
+        and existing_blob.blobId == git_blob_id(entry)
+    )
+
+
+def get_files_to_commit(
+    directory_path: Path,
+    existing_blobs: Optional[Dict[str, ExistingBlob]] = None,
+) -> List[FileToCommit]:
+    """
+    Get the files in the directory that need to be committed.
+
+    Args:
+        directory_path (Path): The directory to process.
+
+        existing_blobs (dict(str, ExistingBlob)): The blobs in the
+            repository that the commits build upon. Files that match the
+            blob id and file mode of these are unchanged and skipped.
+
+    Returns:
+        FileToCommit[]: The files that were added or changed.
+    """
+    existing_blobs = existing_blobs or {}
+    files_to_commit = []
+    unchanged_files = 0
+    for entry in directory_path.glob("**/*"):
+        if entry.is_dir():
+            continue
+        file_path = str(entry.relative_to(directory_path))
+        file_mode = determine_file_mode(entry, directory_path)
+        if is_unchanged(entry, file_mode, existing_blobs.get(file_path)):
+            unchanged_files += 1
+            continue
+        files_to_commit.append(
+            FileToCommit(file_path, file_mode, entry.read_bytes()),
         )
-        for entry in directory_path.glob("**/*")
-        if not entry.is_dir()
-    ]
+    LOGGER.info(
+        "Found %d added or changed files to commit, %d files are unchanged",
+        len(files_to_commit),
+        unchanged_files,
+    )
+    return files_to_commit
 
 
 def create_adf_config_file(
@@ -10,10 +10,15 @@ import pytest
 from mock import Mock, patch
 from initial_commit import (
     EXECUTABLE_FILES,
+    ExistingBlob,
     FileMode,
+    FileToCommit,
     FileToDelete,
+    chunk_files,
     determine_file_mode,
+    get_files_to_commit,
     get_files_to_delete,
+    git_blob_id,
 )
 
 
@@ -142,3 +147,67 @@ def test_determine_file_mode_executable(entry):
         new_entry,
         base_path,
     ) == FileMode.EXECUTABLE
+
+
+def test_git_blob_id(tmp_path):
+    entry = tmp_path / "some.txt"
+    entry.write_bytes(b"Test")
+    # As returned by: printf Test | git hash-object --stdin
+    assert git_blob_id(entry) == "8318c86b357b6ddbf674ad238b8745d2781cab4b"
+
+
+def test_get_files_to_commit_skips_unchanged_files(tmp_path):
+    for name in ["unchanged.txt", "changed.txt", "added.txt", "mode.txt"]:
+        (tmp_path / name).write_bytes(b"Test")
+    existing_blobs = {
+        "unchanged.txt": ExistingBlob(
+            "8318c86b357b6ddbf674ad238b8745d2781cab4b",
+            "100644",
+        ),
+        "changed.txt": ExistingBlob("0" * 40, "100644"),
+        "mode.txt": ExistingBlob(
+            "8318c86b357b6ddbf674ad238b8745d2781cab4b",
+            "100755",
+        ),
+    }
+
+    result = get_files_to_commit(tmp_path, existing_blobs)
+
+    assert sorted(x.filePath for x in result) == [
+        "added.txt",
+        "changed.txt",
+        "mode.txt",
+    ]
+    assert all(x.fileContent == b"Test" for x in result)
+
+
+def test_get_files_to_commit_without_existing_blobs(tmp_path):
+    (tmp_path / "samples").mkdir()
+    (tmp_path / "samples/some.txt").write_bytes(b"Test")
+
+    assert get_files_to_commit(tmp_path) == [
+        FileToCommit("samples/some.txt", FileMode.NORMAL, b"Test"),
+    ]
+
+
+def test_chunk_files_by_count_and_size():
+    files = [
+        FileToCommit(f"file-{size}", FileMode.NORMAL, b"x" * size)
+        for size in [4, 4, 4, 9, 1, 1]
+    ]
+
+    result = [
+        [x.filePath for x in chunk]
+        for chunk in chunk_files(files, max_files=2, max_bytes=8)
+    ]
+
+    assert result == [
+        ["file-4", "file-4"],
+        ["file-4"],
+        ["file-9"],
+        ["file-1", "file-1"],
+    ]
+
+
+def test_chunk_files_empty():
+    assert list(chunk_files([])) == []
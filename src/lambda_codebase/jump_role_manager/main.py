@@ -30,18 +30,18 @@ import json
 import math
 import os
 
-from aws_xray_sdk.core import patch_all
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # ADF imports
+from clients import enable_tracing, get_client
 from logger import configure_logger
 from organizations import Organizations
 from parameter_store import ParameterStore
 from sts import STS
 
-patch_all()
+enable_tracing()
 
 LOGGER = configure_logger(__name__)
 
@@ -86,10 +86,6 @@ BOTO_ORG_CONFIG = Config(
         "max_attempts": 15,
     },
 )
-IAM_CLIENT = boto3.client("iam")
-ORGANIZATIONS_CLIENT = boto3.client("organizations", config=BOTO_ORG_CONFIG)
-TAGGING_CLIENT = boto3.client("resourcegroupstaggingapi")
-CODEPIPELINE_CLIENT = boto3.client("codepipeline")
 
 
 def _verify_bootstrap_exists(sts, account_id):
@@ -530,8 +526,8 @@ def _handle_event(
 
 def lambda_handler(event, context):
     organizations = Organizations(
-        org_client=ORGANIZATIONS_CLIENT,
-        tagging_client=TAGGING_CLIENT,
+        org_client=get_client("organizations", config=BOTO_ORG_CONFIG),
+        tagging_client=get_client("resourcegroupstaggingapi"),
     )
     parameter_store = ParameterStore(
         region=AWS_REGION,
@@ -539,11 +535,11 @@ def lambda_handler(event, context):
     )
     sts = STS()
     return _handle_event(
-        iam=IAM_CLIENT,
+        iam=get_client("iam"),
         organizations=organizations,
         parameter_store=parameter_store,
         sts=sts,
-        codepipeline=CODEPIPELINE_CLIENT,
+        codepipeline=get_client("codepipeline"),
         event=event,
         exec_id=context.log_stream_name,
     )
@@ -8,6 +8,7 @@ is moved to the root of the Organization.
 
 import ast
 import os
+import time
 from thread import PropagatingThread
 
 import boto3
@@ -15,7 +16,8 @@ import boto3
 # ADF imports
 from cloudformation import CloudFormation
 from logger import configure_logger
-from parameter_store import ParameterStore
+from paginator import paginator
+from parameter_store import ParameterStore, PARAMETER_PREFIX
 from partition import get_partition
 from sts import STS
 
@@ -27,16 +29,31 @@ S3_BUCKET = os.environ.get("S3_BUCKET_NAME")
 ADF_PARAM_DESCRIPTION = 'Used by The AWS Deployment Framework'
 
 
+def delete_adf_parameters(parameter_store):
+    """
+    Deletes the parameters that ADF created in the /adf path.
+
+    Returns:
+        int: The number of parameters that got deleted.
+    """
+    parameter_names = [
+        parameter.get('Name')
+        for parameter in paginator(
+            parameter_store.client.describe_parameters,
+            ParameterFilters=[{
+                'Key': 'Path',
+                'Option': 'Recursive',
+                'Values': [PARAMETER_PREFIX],
+            }],
+        )
+        if ADF_PARAM_DESCRIPTION in parameter.get('Description', '')
+    ]
+    return len(parameter_store.delete_parameters(parameter_names))
+
+
 def worker_thread(region, account_id, role, event):
+    start_time = time.perf_counter()
     parameter_store = ParameterStore(region, role)
-    paginator = parameter_store.client.get_paginator('describe_parameters')
-    page_iterator = paginator.paginate()
-    for page in page_iterator:
-        for parameter in page['Parameters']:
-            description = parameter.get('Description', '')
-            if ADF_PARAM_DESCRIPTION in description:
-                parameter_store.delete_parameter(parameter.get('Name'))
-
     cloudformation = CloudFormation(
         region=region,
         deployment_account_region=event.get('deployment_account_region'),
@@ -47,7 +64,23 @@ def worker_thread(region, account_id, role, event):
         s3_key_path=None,
         account_id=account_id
     )
-    return cloudformation.delete_all_base_stacks()
+    # The parameters are deleted while the base stacks are deleted, as
+    # these do not depend on each other.
+    parameter_thread = PropagatingThread(
+        target=delete_adf_parameters,
+        args=(parameter_store,),
+    )
+    parameter_thread.start()
+    try:
+        deleted_stacks = cloudformation.delete_all_base_stacks()
+    finally:
+        deleted_parameter_count = parameter_thread.join()
+    return {
+        'region': region,
+        'deleted_parameters': deleted_parameter_count,
+        'deleted_stacks': len(deleted_stacks),
+        'elapsed_seconds': time.perf_counter() - start_time,
+    }
 
 
 def remove_base(account_id, regions, privileged_role_name, event):
@@ -86,8 +119,17 @@ def remove_base(account_id, regions, privileged_role_name, event):
         thread.start()
         threads.append(thread)
 
-    for thread in threads:
-        thread.join()
+    summaries = [thread.join() for thread in threads]
+    for summary in sorted(summaries, key=lambda item: item['region']):
+        LOGGER.info(
+            '%s in %s - Deleted %d ADF parameter(s) and %d base stack(s) '
+            'in %.1f seconds',
+            account_id,
+            summary['region'],
+            summary['deleted_parameters'],
+            summary['deleted_stacks'],
+            summary['elapsed_seconds'],
+        )
 
 
 def execute_move_action(action, account_id, parameter_store, event):
@@ -0,0 +1,125 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+from mock import Mock, patch
+from pytest import fixture, raises
+
+import account_bootstrap
+from account_bootstrap import (
+    COMPLETED_REGIONS_KEY,
+    DEPLOY_TIME_IN_MS,
+    PENDING_KEY,
+    lambda_handler,
+)
+
+DEPLOYMENT_REGION = "eu-central-1"
+REGIONS = ["eu-west-1", "us-east-1"]
+
+
+@fixture
+def event():
+    return {
+        "account_id": "111111111111",
+        "cross_account_access_role": "OrganizationAccountAccessRole",
+        "deployment_account_id": "222222222222",
+        "deployment_account_region": DEPLOYMENT_REGION,
+        "regions": REGIONS,
+        "full_path": "adf-bootstrap/team",
+        "is_deployment_account": False,
+    }
+
+
+@fixture
+def mocks():
+    with patch.object(account_bootstrap, "STS"), \
+            patch.object(account_bootstrap, "configure_generic_account"), \
+            patch.object(
+                account_bootstrap,
+                "S3",
+                side_effect=lambda **kwargs: Mock(),
+            ) as s3_cls, \
+            patch.object(
+                account_bootstrap,
+                "CloudFormation",
+                side_effect=lambda **kwargs: Mock(**kwargs),
+            ) as cloudformation_cls:
+        yield s3_cls, cloudformation_cls
+
+
+def _context(*remaining_times):
+    context = Mock()
+    context.get_remaining_time_in_millis.side_effect = list(remaining_times)
+    return context
+
+
+def _created_regions(cloudformation_cls):
+    return sorted(
+        call.kwargs["region"]
+        for call in cloudformation_cls.call_args_list
+    )
+
+
+def test_deploys_all_regions_concurrently(event, mocks):
+    s3_cls, cloudformation_cls = mocks
+    enough_time = DEPLOY_TIME_IN_MS * 2
+
+    result = lambda_handler(event, _context(*[enough_time] * 3))
+
+    assert result[COMPLETED_REGIONS_KEY] == sorted(
+        [DEPLOYMENT_REGION, *REGIONS],
+    )
+    assert result[PENDING_KEY] == 0
+    assert _created_regions(cloudformation_cls) == sorted(
+        [DEPLOYMENT_REGION, *REGIONS],
+    )
+    # Every region worker gets its own S3 helper
+    s3_helpers = [
+        call.kwargs["s3"] for call in cloudformation_cls.call_args_list
+    ]
+    assert len({id(s3) for s3 in s3_helpers}) == 3
+    assert s3_cls.call_count == 3
+
+
+def test_resumes_pending_regions(event, mocks):
+    _, cloudformation_cls = mocks
+    enough_time = DEPLOY_TIME_IN_MS * 2
+    not_enough_time = DEPLOY_TIME_IN_MS - 1
+
+    # The deployment account region is deployed first, after which the
+    # time left is not sufficient to deploy the other regions.
+    result = lambda_handler(
+        event,
+        _context(enough_time, not_enough_time, not_enough_time),
+    )
+    assert result[COMPLETED_REGIONS_KEY] == [DEPLOYMENT_REGION]
+    assert result[PENDING_KEY] == 1
+
+    # The next execution only deploys the pending regions
+    cloudformation_cls.reset_mock()
+    result = lambda_handler(result, _context(enough_time, enough_time))
+    assert result[COMPLETED_REGIONS_KEY] == sorted(
+        [DEPLOYMENT_REGION, *REGIONS],
+    )
+    assert result[PENDING_KEY] == 0
+    assert _created_regions(cloudformation_cls) == sorted(REGIONS)
+
+
+def test_raises_region_error_after_other_regions(event, mocks):
+    _, cloudformation_cls = mocks
+    cloudformations = {}
+
+    def _create(**kwargs):
+        cloudformation = Mock(**kwargs)
+        if kwargs["region"] == "eu-west-1":
+            cloudformation.create_stack.side_effect = Exception("Failed")
+        cloudformations[kwargs["region"]] = cloudformation
+        return cloudformation
+    cloudformation_cls.side_effect = _create
+
+    with raises(Exception, match="Failed"):
+        lambda_handler(event, _context(*[DEPLOY_TIME_IN_MS * 2] * 3))
+
+    cloudformations[DEPLOYMENT_REGION].create_iam_stack.assert_called_once()
+    cloudformations["us-east-1"].create_stack.assert_called_once()
@@ -0,0 +1,190 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+from mock import Mock, call, patch
+from pytest import fixture, raises
+
+import bootstrap_admission
+from bootstrap_admission import lambda_handler
+from errors import ConcurrencyLimitReachedError
+from semaphore import LocalSemaphore
+
+REGIONS = ["eu-central-1", "eu-west-1"]
+WAITING_SINCE = "2026-01-01T00:00:00Z"
+
+
+def _event(
+    action,
+    execution_id,
+    account_id="111111111111",
+    waiting_since=WAITING_SINCE,
+):
+    return {
+        "action": action,
+        "execution_id": execution_id,
+        "waiting_since": waiting_since,
+        "event": {
+            "account_id": account_id,
+            "deployment_account_region": "eu-central-1",
+            "regions": ["eu-west-1"],
+        },
+    }
+
+
+@fixture
+def semaphore():
+    return LocalSemaphore(default_limit=1)
+
+
+@fixture
+def stepfunctions():
+    stepfunctions = Mock()
+    stepfunctions.exceptions.ExecutionDoesNotExist = KeyError
+    stepfunctions.describe_execution.return_value = {"status": "RUNNING"}
+    return stepfunctions
+
+
+@fixture(autouse=True)
+def mocks(semaphore, stepfunctions):
+    with patch.object(
+        bootstrap_admission,
+        "DynamoDBSemaphore",
+        return_value=semaphore,
+    ), patch.object(bootstrap_admission, "boto3") as boto3:
+        boto3.client.return_value = stepfunctions
+        yield
+
+
+def test_admits_execution_when_slots_are_available(semaphore):
+    event = _event("acquire", "execution-1")
+
+    assert lambda_handler(event, None) == event["event"]
+    assert all(
+        state["holders"] == {"execution-1"}
+        for state in semaphore.describe(REGIONS).values()
+    )
+
+
+def test_raises_when_slots_are_held_by_running_execution(
+    semaphore, stepfunctions,
+):
+    lambda_handler(_event("acquire", "execution-1"), None)
+
+    with raises(ConcurrencyLimitReachedError):
+        lambda_handler(
+            _event("acquire", "execution-2", "222222222222"),
+            None,
+        )
+
+    assert stepfunctions.describe_execution.call_args_list == [
+        call(executionArn="execution-1"),
+        call(executionArn="execution-2"),
+    ]
+    assert semaphore.describe(["eu-west-1"])["eu-west-1"]["waiting"] == {
+        "execution-2": WAITING_SINCE,
+    }
+
+
+def test_release_frees_slots_for_waiting_execution(semaphore):
+    lambda_handler(_event("acquire", "execution-1"), None)
+
+    lambda_handler(_event("release", "execution-1"), None)
+    lambda_handler(_event("acquire", "execution-2", "222222222222"), None)
+
+    assert all(
+        state["holders"] == {"execution-2"}
+        for state in semaphore.describe(REGIONS).values()
+    )
+
+
+def test_releases_slots_of_timed_out_execution(semaphore, stepfunctions):
+    lambda_handler(_event("acquire", "execution-1"), None)
+    stepfunctions.describe_execution.return_value = {"status": "TIMED_OUT"}
+
+    lambda_handler(_event("acquire", "execution-2", "222222222222"), None)
+
+    assert all(
+        state["holders"] == {"execution-2"}
+        for state in semaphore.describe(REGIONS).values()
+    )
+
+
+def test_admits_waiting_executions_in_order(semaphore):
+    lambda_handler(_event("acquire", "execution-1"), None)
+    for execution_id, waiting_since in [
+        ("execution-2", "2026-01-01T00:01:00Z"),
+        ("execution-3", "2026-01-01T00:02:00Z"),
+    ]:
+        with raises(ConcurrencyLimitReachedError):
+            lambda_handler(
+                _event("acquire", execution_id, waiting_since=waiting_since),
+                None,
+            )
+
+    lambda_handler(_event("release", "execution-1"), None)
+
+    with raises(ConcurrencyLimitReachedError):
+        lambda_handler(
+            _event(
+                "acquire",
+                "execution-3",
+                waiting_since="2026-01-01T00:02:00Z",
+            ),
+            None,
+        )
+    lambda_handler(
+        _event("acquire", "execution-2", waiting_since="2026-01-01T00:01:00Z"),
+        None,
+    )
+    assert semaphore.describe(["eu-west-1"])["eu-west-1"]["holders"] == {
+        "execution-2",
+    }
+
+
+def test_releases_queue_position_of_stopped_waiting_execution(
+    semaphore, stepfunctions,
+):
+    lambda_handler(_event("acquire", "execution-1"), None)
+    with raises(ConcurrencyLimitReachedError):
+        lambda_handler(
+            _event(
+                "acquire",
+                "execution-2",
+                waiting_since="2026-01-01T00:01:00Z",
+            ),
+            None,
+        )
+    with raises(ConcurrencyLimitReachedError):
+        lambda_handler(
+            _event(
+                "acquire",
+                "execution-3",
+                waiting_since="2026-01-01T00:02:00Z",
+            ),
+            None,
+        )
+    stepfunctions.describe_execution.side_effect = lambda executionArn: {
+        "status": "ABORTED" if executionArn == "execution-2" else "RUNNING",
+    }
+    semaphore.clock = lambda: 10 ** 10
+
+    with raises(ConcurrencyLimitReachedError):
+        lambda_handler(
+            _event(
+                "acquire",
+                "execution-3",
+                waiting_since="2026-01-01T00:02:00Z",
+            ),
+            None,
+        )
+
+    assert semaphore.describe(REGIONS) == {
+        region: {
+            "holders": {"execution-1"},
+            "waiting": {"execution-3": "2026-01-01T00:02:00Z"},
+            "limit": 1,
+        }
+        for region in REGIONS
+    }
@@ -0,0 +1,85 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+from mock import Mock, patch
+from pytest import fixture
+
+import determine_event
+from cache import Cache
+from determine_event import lambda_handler
+
+MOVED_ACCOUNT_ID = "111111111111"
+DEPLOYMENT_ACCOUNT_ID = "222222222222"
+PARAMETERS = {
+    "/adf/config": str({
+        "main-notification-endpoint": [{"target": "team@example.com"}],
+        "protected": [],
+    }),
+    "/adf/target_regions": str(["eu-west-1"]),
+    "/adf/deployment_account_region": "eu-central-1",
+    "/adf/cross_account_access_role": "OrganizationAccountAccessRole",
+}
+
+
+@fixture
+def event():
+    return {
+        "detail": {
+            "requestParameters": {
+                "accountId": MOVED_ACCOUNT_ID,
+                "sourceParentId": "ou-source",
+                "destinationParentId": "ou-destination",
+            },
+        },
+    }
+
+
+@fixture
+def mock_ssm_client():
+    ssm_client = Mock()
+    ssm_client.exceptions.ParameterNotFound = KeyError
+    return ssm_client
+
+
+@fixture
+def parameters(mock_ssm_client):
+    parameters = dict(PARAMETERS)
+    mock_ssm_client.get_parameters.side_effect = (
+        lambda Names, WithDecryption: {
+            "Parameters": [
+                {"Name": name, "Value": parameters[name]}
+                for name in Names
+                if name in parameters
+            ],
+            "InvalidParameters": [
+                name for name in Names if name not in parameters
+            ],
+        }
+    )
+    mock_ssm_client.get_parameter.side_effect = (
+        lambda Name, WithDecryption: {
+            "Parameter": {"Value": parameters[Name]},
+        }
+    )
+    with patch.object(determine_event, "boto3") as boto3, \
+            patch.object(determine_event, "Organizations") as organizations, \
+            patch.object(determine_event, "CACHE", Cache(ttl_seconds=60)):
+        boto3.client.return_value = mock_ssm_client
+        organizations.return_value.build_account_path.return_value = "team"
+        organizations.return_value.describe_ou_name.return_value = "team"
+        organizations.return_value.get_organization_info.return_value = {}
+        yield parameters
+
+
+def test_reads_deployment_account_id_created_after_previous_invocation(
+    event, parameters,
+):
+    first = lambda_handler(event, None)
+    parameters["/adf/deployment_account_id"] = DEPLOYMENT_ACCOUNT_ID
+    second = lambda_handler(event, None)
+
+    assert first["deployment_account_id"] == MOVED_ACCOUNT_ID
+    assert second["deployment_account_id"] == DEPLOYMENT_ACCOUNT_ID
+    assert second["full_path"] == "adf-bootstrap/team"
@@ -0,0 +1,67 @@
+# Copyright Amazon.com Inc. or its affiliates.
+# SPDX-License-Identifier: MIT-0
+
+# pylint: skip-file
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from pytest import mark
+
+LAMBDA_CODEBASE = Path(__file__).resolve().parent.parent
+BASELINE_PATH = (
+    LAMBDA_CODEBASE.parent.parent / "benchmarks/import_time_baseline.json"
+)
+# The fastest of the imports is compared against the budget, to reduce the
+# noise of the machine the tests run on.
+REPEAT = 3
+IMPORT_TIME_PATTERN = re.compile(
+    r"^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| (?P<module>\S+)$",
+)
+
+with open(BASELINE_PATH, encoding="utf-8") as baseline_file:
+    BASELINE = json.load(baseline_file)
+
+
+def _import_time_ms(handler):
+    package, module = handler.rsplit(".", 1)
+    directory = LAMBDA_CODEBASE / package
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=directory,
+        env={
+            **os.environ,
+            "AWS_ACCESS_KEY_ID": "testing",
+            "AWS_SECRET_ACCESS_KEY": "testing",
+            "AWS_SESSION_TOKEN": "testing",
+            "PYTHONPATH": os.pathsep.join(
+                [str(directory)]
+                + os.environ.get("PYTHONPATH", "").split(os.pathsep)
+            ),
+        },
+        text=True,
+    )
+    return next(
+        int(match.group("cumulative")) / 1000
+        for match in map(IMPORT_TIME_PATTERN.match, process.stderr.splitlines())
+        if match and match.group("module") == module
+    )
+
+
+@mark.parametrize("handler", sorted(BASELINE["handlers"]))
+def test_handler_import_time_within_budget(handler):
+    budget_ms = BASELINE["handlers"][handler]["budget_ms"]
+
+    import_time_ms = min(_import_time_ms(handler) for _ in range(REPEAT))
+
+    assert import_time_ms <= budget_ms, (
+        f"Importing {handler} took {import_time_ms:.1f}ms, the budget is "
+        f"{budget_ms}ms. After an intended change, record a new baseline "
+        "with benchmarks/import_time.py --output"
+    )